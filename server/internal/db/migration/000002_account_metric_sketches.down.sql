@@ -0,0 +1,10 @@
+-- ============================================================
+-- STREAMING QUANTILE SKETCHES - ROLLBACK
+-- Migration: 000002_account_metric_sketches
+-- ============================================================
+
+BEGIN;
+
+DROP TABLE IF EXISTS account_metric_sketches;
+
+COMMIT;
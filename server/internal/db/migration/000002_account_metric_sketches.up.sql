@@ -0,0 +1,37 @@
+-- ============================================================
+-- STREAMING QUANTILE SKETCHES
+-- Migration: 000002_account_metric_sketches
+-- Created: 2026-10-18
+-- ============================================================
+-- Per-(username, platform) quantile sketches for likes, comments,
+-- views and engagement, one row per account per posted_at day.
+-- Maintained by the post uploaders (viral/sketch_store.py) so the
+-- viral scan can read medians without PERCENTILE_CONT over raw
+-- posts. Posts stored before this migration are loaded with
+-- python -m viral.backfill_sketches.
+-- ============================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS account_metric_sketches (
+    username TEXT NOT NULL,
+    platform VARCHAR(50) NOT NULL,
+    bucket_date DATE NOT NULL,          -- posted_at day (UTC)
+
+    -- Serialized QuantileSketch blobs (NULL = no values yet)
+    likes BYTEA,
+    comments BYTEA,
+    views BYTEA,
+    engagement BYTEA,
+
+    post_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT (NOW() AT TIME ZONE 'UTC'),
+
+    PRIMARY KEY (username, platform, bucket_date)
+);
+
+-- Window reads scan recent days across all accounts
+CREATE INDEX IF NOT EXISTS idx_account_metric_sketches_bucket
+    ON account_metric_sketches(bucket_date);
+
+COMMIT;
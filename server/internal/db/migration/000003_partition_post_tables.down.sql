@@ -0,0 +1,143 @@
+-- ============================================================
+-- TIME-PARTITIONED POST TABLES - ROLLBACK
+-- Migration: 000003_partition_post_tables
+-- ============================================================
+-- Copies the attached partitions back into plain tables. Partitions
+-- already detached by the retention job are only in the archive.
+-- ============================================================
+
+BEGIN;
+
+DROP VIEW IF EXISTS unified_posts;
+
+-- ============================================================
+-- 1. COMPETITOR_POSTS
+-- ============================================================
+
+ALTER TABLE competitor_posts RENAME TO competitor_posts_partitioned;
+ALTER SEQUENCE competitor_posts_id_seq OWNED BY NONE;
+DROP INDEX IF EXISTS idx_competitor_posts_id;
+DROP INDEX IF EXISTS idx_competitor_posts_post_id;
+DROP INDEX IF EXISTS idx_competitor_posts_profile_id;
+DROP INDEX IF EXISTS idx_competitor_posts_scan;
+DROP INDEX IF EXISTS idx_competitor_posts_posted_at;
+
+CREATE TABLE competitor_posts (
+  id INT PRIMARY KEY DEFAULT nextval('competitor_posts_id_seq'),
+  competitor_id UUID REFERENCES competitors(id) ON DELETE CASCADE,
+  username TEXT,
+  platform VARCHAR(50) NOT NULL,
+  post_id VARCHAR(100) NOT NULL,
+  content TEXT,
+  media JSONB DEFAULT '{}'::jsonb,
+  posted_at TIMESTAMP,
+  engagement JSONB DEFAULT '{}'::jsonb,
+  hashtags TEXT[] DEFAULT '{}',
+  scraped_at TIMESTAMP DEFAULT NOW(),
+  caption_hash TEXT,
+  profile_id UUID REFERENCES competitor_profiles(id) ON DELETE CASCADE,
+  UNIQUE (platform, post_id)
+);
+
+ALTER SEQUENCE competitor_posts_id_seq OWNED BY competitor_posts.id;
+
+INSERT INTO competitor_posts
+SELECT DISTINCT ON (platform, post_id) *
+FROM competitor_posts_partitioned
+ORDER BY platform, post_id, scraped_at DESC NULLS LAST;
+
+DROP TABLE competitor_posts_partitioned CASCADE;
+
+CREATE INDEX IF NOT EXISTS idx_competitor_posts_profile_id ON competitor_posts(profile_id);
+CREATE INDEX IF NOT EXISTS idx_competitor_posts_scan
+    ON competitor_posts(platform, username, posted_at DESC);
+CREATE INDEX IF NOT EXISTS idx_competitor_posts_posted_at
+    ON competitor_posts(posted_at DESC);
+
+-- ============================================================
+-- 2. HASHTAG_POSTS
+-- ============================================================
+
+ALTER TABLE hashtag_posts RENAME TO hashtag_posts_partitioned;
+ALTER SEQUENCE hashtag_posts_id_seq OWNED BY NONE;
+DROP INDEX IF EXISTS idx_hashtag_posts_id;
+DROP INDEX IF EXISTS idx_hashtag_posts_post_id;
+DROP INDEX IF EXISTS idx_hashtag_posts_hashtag;
+DROP INDEX IF EXISTS idx_hashtag_posts_posted_at;
+DROP INDEX IF EXISTS idx_hashtag_posts_platform;
+DROP INDEX IF EXISTS idx_hashtag_posts_username;
+DROP INDEX IF EXISTS idx_hashtag_posts_scan;
+
+CREATE TABLE hashtag_posts (
+  id INT PRIMARY KEY DEFAULT nextval('hashtag_posts_id_seq'),
+  hashtag TEXT NOT NULL,
+  platform VARCHAR(50) NOT NULL,
+  post_id VARCHAR(100) NOT NULL,
+  username TEXT,
+  content TEXT,
+  media JSONB DEFAULT '{}'::jsonb,
+  posted_at TIMESTAMP,
+  likes BIGINT DEFAULT 0,
+  comments_count BIGINT DEFAULT 0,
+  hashtags TEXT[] DEFAULT '{}',
+  scraped_at TIMESTAMP DEFAULT NOW(),
+  caption_hash TEXT,
+  UNIQUE (platform, post_id)
+);
+
+ALTER SEQUENCE hashtag_posts_id_seq OWNED BY hashtag_posts.id;
+
+INSERT INTO hashtag_posts
+SELECT DISTINCT ON (platform, post_id) *
+FROM hashtag_posts_partitioned
+ORDER BY platform, post_id, scraped_at DESC NULLS LAST;
+
+DROP TABLE hashtag_posts_partitioned CASCADE;
+
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_hashtag ON hashtag_posts(hashtag);
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_posted_at ON hashtag_posts(posted_at);
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_platform ON hashtag_posts(platform);
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_username ON hashtag_posts(username);
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_scan
+    ON hashtag_posts(platform, username, posted_at DESC);
+
+DROP FUNCTION IF EXISTS drop_moved_post_version();
+DROP FUNCTION IF EXISTS ensure_monthly_partitions(TEXT, DATE, DATE);
+
+-- ============================================================
+-- 3. RECREATE UNIFIED_POSTS VIEW
+-- ============================================================
+
+CREATE OR REPLACE VIEW unified_posts AS
+SELECT
+    'competitor_posts' as source_table,
+    id as source_id,
+    username,
+    platform,
+    content,
+    posted_at,
+    COALESCE((engagement->>'likes')::bigint, 0) as likes,
+    COALESCE((engagement->>'comments')::bigint, 0) as comments,
+    CASE
+        WHEN engagement ? 'views' THEN (engagement->>'views')::bigint
+        ELSE NULL
+    END as views
+FROM competitor_posts
+WHERE posted_at >= (NOW() AT TIME ZONE 'UTC') - INTERVAL '30 days'
+
+UNION ALL
+
+SELECT
+    'hashtag_posts' as source_table,
+    id as source_id,
+    username,
+    platform,
+    content,
+    posted_at,
+    COALESCE(likes, 0) as likes,
+    COALESCE(comments_count, 0) as comments,
+    NULL::bigint as views
+FROM hashtag_posts
+WHERE posted_at >= (NOW() AT TIME ZONE 'UTC') - INTERVAL '30 days';
+
+COMMIT;
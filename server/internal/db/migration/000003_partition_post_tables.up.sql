@@ -0,0 +1,250 @@
+-- ============================================================
+-- TIME-PARTITIONED POST TABLES
+-- Migration: 000003_partition_post_tables
+-- Created: 2026-10-18
+-- ============================================================
+-- Converts competitor_posts and hashtag_posts into tables
+-- partitioned by month on posted_at so that:
+--   1. unified_posts, hashtag discovery and context aggregation
+--      (all filtered on posted_at) only touch recent partitions
+--   2. old months can be detached and archived instead of being
+--      scanned forever (worker/post_retention.py)
+--
+-- Layout per table:
+--   <table>_yYYYYmMM   one partition per calendar month
+--   <table>_history    everything before the first monthly partition
+--   <table>_default    NULL posted_at and months not created yet
+--
+-- Unique keys on partitioned tables must include the partition key,
+-- so (platform, post_id) becomes (platform, post_id, posted_at) with
+-- NULLS NOT DISTINCT. A BEFORE INSERT trigger removes a stale copy of
+-- the same post stored under a different posted_at, which keeps
+-- (platform, post_id) unique in practice.
+--
+-- ids are preserved (viral_outliers.source_id points at them) and
+-- keep coming from the original SERIAL sequences.
+-- ============================================================
+
+BEGIN;
+
+DROP VIEW IF EXISTS unified_posts;
+
+-- ============================================================
+-- 1. PARTITION MANAGEMENT HELPERS
+-- ============================================================
+
+-- Create missing monthly partitions of `parent` covering from_month..to_month.
+-- Returns the number of partitions created. Idempotent.
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent TEXT, from_month DATE, to_month DATE)
+RETURNS INT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_month)::date;
+    partition_name TEXT;
+    created INT := 0;
+BEGIN
+    WHILE month_start <= date_trunc('month', to_month)::date LOOP
+        partition_name := format('%s_y%sm%s', parent, to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, (month_start + INTERVAL '1 month')::date
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + INTERVAL '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Drop a stale copy of the incoming post stored under another posted_at
+-- (e.g. first scraped without a date). TG_TABLE_NAME is the parent.
+CREATE OR REPLACE FUNCTION drop_moved_post_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    EXECUTE format(
+        'DELETE FROM %I WHERE platform = $1 AND post_id = $2 AND posted_at IS DISTINCT FROM $3',
+        TG_TABLE_NAME
+    ) USING NEW.platform, NEW.post_id, NEW.posted_at;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================
+-- 2. COMPETITOR_POSTS
+-- ============================================================
+
+ALTER TABLE competitor_posts RENAME TO competitor_posts_legacy;
+ALTER SEQUENCE competitor_posts_id_seq OWNED BY NONE;
+ALTER TABLE competitor_posts_legacy RENAME CONSTRAINT competitor_posts_pkey TO competitor_posts_legacy_pkey;
+ALTER TABLE competitor_posts_legacy RENAME CONSTRAINT competitor_posts_platform_post_id_key TO competitor_posts_legacy_post_key;
+DROP INDEX IF EXISTS idx_competitor_posts_profile_id;
+DROP INDEX IF EXISTS idx_competitor_posts_scan;
+DROP INDEX IF EXISTS idx_competitor_posts_posted_at;
+
+-- Column order matches the original table (sqlc models rely on it)
+CREATE TABLE competitor_posts (
+  id INT NOT NULL DEFAULT nextval('competitor_posts_id_seq'),
+  competitor_id UUID REFERENCES competitors(id) ON DELETE CASCADE,
+  username TEXT,
+  platform VARCHAR(50) NOT NULL,
+  post_id VARCHAR(100) NOT NULL,
+  content TEXT,
+  media JSONB DEFAULT '{}'::jsonb,
+  posted_at TIMESTAMP,
+  engagement JSONB DEFAULT '{}'::jsonb,
+  hashtags TEXT[] DEFAULT '{}',
+  scraped_at TIMESTAMP DEFAULT NOW(),
+  caption_hash TEXT,
+  profile_id UUID REFERENCES competitor_profiles(id) ON DELETE CASCADE,
+  CONSTRAINT competitor_posts_post_key UNIQUE NULLS NOT DISTINCT (platform, post_id, posted_at)
+) PARTITION BY RANGE (posted_at);
+
+ALTER SEQUENCE competitor_posts_id_seq OWNED BY competitor_posts.id;
+
+CREATE TABLE competitor_posts_default PARTITION OF competitor_posts DEFAULT;
+
+-- Monthly partitions for the last 24 months and 3 months ahead;
+-- anything older lands in a single history partition
+CREATE TABLE competitor_posts_history PARTITION OF competitor_posts
+    FOR VALUES FROM (MINVALUE) TO (date_trunc('month', (NOW() AT TIME ZONE 'UTC') - INTERVAL '24 months'));
+SELECT ensure_monthly_partitions(
+    'competitor_posts',
+    ((NOW() AT TIME ZONE 'UTC') - INTERVAL '24 months')::date,
+    ((NOW() AT TIME ZONE 'UTC') + INTERVAL '3 months')::date
+);
+
+INSERT INTO competitor_posts (
+    id, competitor_id, username, platform, post_id, content, media,
+    posted_at, engagement, hashtags, scraped_at, caption_hash, profile_id
+)
+SELECT
+    id, competitor_id, username, platform, post_id, content, media,
+    posted_at, engagement, hashtags, scraped_at, caption_hash, profile_id
+FROM competitor_posts_legacy;
+
+DROP TABLE competitor_posts_legacy;
+
+CREATE INDEX IF NOT EXISTS idx_competitor_posts_id ON competitor_posts(id);
+CREATE INDEX IF NOT EXISTS idx_competitor_posts_post_id ON competitor_posts(platform, post_id);
+CREATE INDEX IF NOT EXISTS idx_competitor_posts_profile_id ON competitor_posts(profile_id);
+CREATE INDEX IF NOT EXISTS idx_competitor_posts_scan
+    ON competitor_posts(platform, username, posted_at DESC);
+CREATE INDEX IF NOT EXISTS idx_competitor_posts_posted_at
+    ON competitor_posts(posted_at DESC);
+
+CREATE TRIGGER competitor_posts_drop_moved
+    BEFORE INSERT ON competitor_posts
+    FOR EACH ROW EXECUTE FUNCTION drop_moved_post_version();
+
+-- ============================================================
+-- 3. HASHTAG_POSTS
+-- ============================================================
+
+ALTER TABLE hashtag_posts RENAME TO hashtag_posts_legacy;
+ALTER SEQUENCE hashtag_posts_id_seq OWNED BY NONE;
+ALTER TABLE hashtag_posts_legacy RENAME CONSTRAINT hashtag_posts_pkey TO hashtag_posts_legacy_pkey;
+ALTER TABLE hashtag_posts_legacy RENAME CONSTRAINT hashtag_posts_platform_post_id_key TO hashtag_posts_legacy_post_key;
+DROP INDEX IF EXISTS idx_hashtag_posts_hashtag;
+DROP INDEX IF EXISTS idx_hashtag_posts_posted_at;
+DROP INDEX IF EXISTS idx_hashtag_posts_platform;
+DROP INDEX IF EXISTS idx_hashtag_posts_username;
+DROP INDEX IF EXISTS idx_hashtag_posts_scan;
+
+CREATE TABLE hashtag_posts (
+  id INT NOT NULL DEFAULT nextval('hashtag_posts_id_seq'),
+  hashtag TEXT NOT NULL,
+  platform VARCHAR(50) NOT NULL,
+  post_id VARCHAR(100) NOT NULL,
+  username TEXT,
+  content TEXT,
+  media JSONB DEFAULT '{}'::jsonb,
+  posted_at TIMESTAMP,
+  likes BIGINT DEFAULT 0,
+  comments_count BIGINT DEFAULT 0,
+  hashtags TEXT[] DEFAULT '{}',
+  scraped_at TIMESTAMP DEFAULT NOW(),
+  caption_hash TEXT,
+  CONSTRAINT hashtag_posts_post_key UNIQUE NULLS NOT DISTINCT (platform, post_id, posted_at)
+) PARTITION BY RANGE (posted_at);
+
+ALTER SEQUENCE hashtag_posts_id_seq OWNED BY hashtag_posts.id;
+
+CREATE TABLE hashtag_posts_default PARTITION OF hashtag_posts DEFAULT;
+
+CREATE TABLE hashtag_posts_history PARTITION OF hashtag_posts
+    FOR VALUES FROM (MINVALUE) TO (date_trunc('month', (NOW() AT TIME ZONE 'UTC') - INTERVAL '24 months'));
+SELECT ensure_monthly_partitions(
+    'hashtag_posts',
+    ((NOW() AT TIME ZONE 'UTC') - INTERVAL '24 months')::date,
+    ((NOW() AT TIME ZONE 'UTC') + INTERVAL '3 months')::date
+);
+
+INSERT INTO hashtag_posts (
+    id, hashtag, platform, post_id, username, content, media,
+    posted_at, likes, comments_count, hashtags, scraped_at, caption_hash
+)
+SELECT
+    id, hashtag, platform, post_id, username, content, media,
+    posted_at, likes, comments_count, hashtags, scraped_at, caption_hash
+FROM hashtag_posts_legacy;
+
+DROP TABLE hashtag_posts_legacy;
+
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_id ON hashtag_posts(id);
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_post_id ON hashtag_posts(platform, post_id);
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_hashtag ON hashtag_posts(hashtag);
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_platform ON hashtag_posts(platform);
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_username ON hashtag_posts(username);
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_scan
+    ON hashtag_posts(platform, username, posted_at DESC);
+CREATE INDEX IF NOT EXISTS idx_hashtag_posts_posted_at
+    ON hashtag_posts(posted_at DESC);
+
+CREATE TRIGGER hashtag_posts_drop_moved
+    BEFORE INSERT ON hashtag_posts
+    FOR EACH ROW EXECUTE FUNCTION drop_moved_post_version();
+
+-- ============================================================
+-- 4. RECREATE UNIFIED_POSTS VIEW
+-- ============================================================
+-- Unchanged definition. The NOW()-relative posted_at filter is
+-- pruned at executor startup, so only the current and previous
+-- monthly partitions are scanned.
+
+CREATE OR REPLACE VIEW unified_posts AS
+-- competitor_posts (JSONB engagement)
+SELECT
+    'competitor_posts' as source_table,
+    id as source_id,
+    username,
+    platform,
+    content,
+    posted_at,
+    COALESCE((engagement->>'likes')::bigint, 0) as likes,
+    COALESCE((engagement->>'comments')::bigint, 0) as comments,
+    -- Views: NULL when key doesn't exist (NOT 0!)
+    CASE
+        WHEN engagement ? 'views' THEN (engagement->>'views')::bigint
+        ELSE NULL
+    END as views
+FROM competitor_posts
+WHERE posted_at >= (NOW() AT TIME ZONE 'UTC') - INTERVAL '30 days'
+
+UNION ALL
+
+-- hashtag_posts (direct BIGINT columns)
+SELECT
+    'hashtag_posts' as source_table,
+    id as source_id,
+    username,
+    platform,
+    content,
+    posted_at,
+    COALESCE(likes, 0) as likes,
+    COALESCE(comments_count, 0) as comments,
+    NULL::bigint as views  -- hashtag_posts doesn't have views
+FROM hashtag_posts
+WHERE posted_at >= (NOW() AT TIME ZONE 'UTC') - INTERVAL '30 days';
+
+COMMIT;
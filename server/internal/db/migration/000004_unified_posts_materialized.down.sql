@@ -0,0 +1,11 @@
+-- ============================================================
+-- MATERIALIZED UNIFIED_POSTS - ROLLBACK
+-- Migration: 000004_unified_posts_materialized
+-- ============================================================
+
+BEGIN;
+
+DROP MATERIALIZED VIEW IF EXISTS unified_posts_mv;
+DROP TABLE IF EXISTS materialized_view_refreshes;
+
+COMMIT;
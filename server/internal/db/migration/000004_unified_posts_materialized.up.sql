@@ -0,0 +1,76 @@
+-- ============================================================
+-- MATERIALIZED UNIFIED_POSTS
+-- Migration: 000004_unified_posts_materialized
+-- Created: 2026-10-18
+-- ============================================================
+-- unified_posts_mv holds the same rows as the unified_posts view
+-- (30-day window, JSONB engagement already extracted) so the viral
+-- scan doesn't re-run the UNION and JSON extraction for every
+-- reference to the view.
+--
+-- Refreshed CONCURRENTLY (readers are never blocked) by
+-- viral/materialized_posts.py: after ingest batches and by the
+-- viral scan when the last refresh is too old. The window is
+-- frozen at refresh time, so readers keep their own posted_at
+-- filters.
+-- ============================================================
+
+BEGIN;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS unified_posts_mv AS
+SELECT
+    'competitor_posts' as source_table,
+    id as source_id,
+    username,
+    platform,
+    content,
+    posted_at,
+    COALESCE((engagement->>'likes')::bigint, 0) as likes,
+    COALESCE((engagement->>'comments')::bigint, 0) as comments,
+    -- Views: NULL when key doesn't exist (NOT 0!)
+    CASE
+        WHEN engagement ? 'views' THEN (engagement->>'views')::bigint
+        ELSE NULL
+    END as views
+FROM competitor_posts
+WHERE posted_at >= (NOW() AT TIME ZONE 'UTC') - INTERVAL '30 days'
+
+UNION ALL
+
+SELECT
+    'hashtag_posts' as source_table,
+    id as source_id,
+    username,
+    platform,
+    content,
+    posted_at,
+    COALESCE(likes, 0) as likes,
+    COALESCE(comments_count, 0) as comments,
+    NULL::bigint as views
+FROM hashtag_posts
+WHERE posted_at >= (NOW() AT TIME ZONE 'UTC') - INTERVAL '30 days'
+WITH DATA;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_unified_posts_mv_source
+    ON unified_posts_mv(source_table, source_id);
+
+-- Per-account medians and the post_metrics join
+CREATE INDEX IF NOT EXISTS idx_unified_posts_mv_account
+    ON unified_posts_mv(username, platform, posted_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_unified_posts_mv_posted_at
+    ON unified_posts_mv(posted_at DESC);
+
+-- Last refresh per materialized view (staleness checks)
+CREATE TABLE IF NOT EXISTS materialized_view_refreshes (
+    view_name VARCHAR(100) PRIMARY KEY,
+    refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    duration_ms INT
+);
+
+INSERT INTO materialized_view_refreshes (view_name, refreshed_at)
+VALUES ('unified_posts_mv', NOW())
+ON CONFLICT (view_name) DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,56 @@
+-- ============================================================
+-- PARTITIONED VIRAL_OUTLIERS - ROLLBACK
+-- Migration: 000005_partition_viral_outliers
+-- ============================================================
+
+BEGIN;
+
+ALTER TABLE viral_outliers RENAME TO viral_outliers_partitioned;
+ALTER SEQUENCE viral_outliers_id_seq OWNED BY NONE;
+DROP INDEX IF EXISTS idx_viral_outliers_source;
+DROP INDEX IF EXISTS idx_viral_outliers_multiplier;
+DROP INDEX IF EXISTS idx_viral_outliers_platform;
+DROP INDEX IF EXISTS idx_viral_outliers_username;
+
+CREATE TABLE viral_outliers (
+    id INT PRIMARY KEY DEFAULT nextval('viral_outliers_id_seq'),
+    source_table VARCHAR(50) NOT NULL,
+    source_id INT NOT NULL,
+    multiplier INT NOT NULL,
+    median_engagement BIGINT NOT NULL,
+    actual_engagement BIGINT NOT NULL,
+    available_count INT NOT NULL,
+    support_count INT NOT NULL,
+    hook TEXT,
+    cta TEXT,
+    platform VARCHAR(50),
+    username TEXT,
+    analyzed_at TIMESTAMP WITH TIME ZONE DEFAULT (NOW() AT TIME ZONE 'UTC'),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    ai_analysis JSONB DEFAULT '{}',
+    UNIQUE (source_table, source_id),
+    CONSTRAINT valid_multiplier CHECK (multiplier IN (5, 10, 50, 100)),
+    CONSTRAINT positive_median CHECK (median_engagement > 0),
+    CONSTRAINT positive_engagement CHECK (actual_engagement >= 0),
+    CONSTRAINT valid_available CHECK (available_count BETWEEN 1 AND 3),
+    CONSTRAINT valid_support CHECK (support_count >= 0 AND support_count <= available_count),
+    CONSTRAINT valid_expiry CHECK (expires_at > analyzed_at)
+);
+
+ALTER SEQUENCE viral_outliers_id_seq OWNED BY viral_outliers.id;
+
+-- Latest live row per source
+INSERT INTO viral_outliers
+SELECT DISTINCT ON (source_table, source_id) *
+FROM viral_outliers_partitioned
+WHERE expires_at > NOW()
+ORDER BY source_table, source_id, expires_at DESC;
+
+DROP TABLE viral_outliers_partitioned CASCADE;
+
+CREATE INDEX IF NOT EXISTS idx_viral_outliers_multiplier ON viral_outliers(multiplier DESC);
+CREATE INDEX IF NOT EXISTS idx_viral_outliers_platform ON viral_outliers(platform);
+CREATE INDEX IF NOT EXISTS idx_viral_outliers_username ON viral_outliers(username);
+CREATE INDEX IF NOT EXISTS idx_viral_outliers_expires ON viral_outliers(expires_at);
+
+COMMIT;
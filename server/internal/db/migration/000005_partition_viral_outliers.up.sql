@@ -0,0 +1,120 @@
+-- ============================================================
+-- PARTITIONED VIRAL_OUTLIERS
+-- Migration: 000005_partition_viral_outliers
+-- Created: 2026-10-18
+-- ============================================================
+-- viral_outliers becomes RANGE-partitioned by expires_at, one
+-- partition per UTC day (viral_outliers_pYYYYMMDD). Expiry no longer
+-- DELETEs rows: cleanup drops the partitions whose day has passed
+-- (viral/outlier_partitions.py), so the table and its indexes don't
+-- accumulate dead tuples.
+--
+-- Re-detections move a row to a later partition with a plain UPDATE
+-- (ON CONFLICT cannot move rows between partitions), and uniqueness
+-- of (source_table, source_id) among live rows is kept by the upsert
+-- under the scan lock instead of a UNIQUE constraint, which would
+-- have to include expires_at.
+--
+-- Only live (unexpired) rows are carried over.
+-- ============================================================
+
+BEGIN;
+
+ALTER TABLE viral_outliers RENAME TO viral_outliers_legacy;
+ALTER SEQUENCE viral_outliers_id_seq OWNED BY NONE;
+ALTER TABLE viral_outliers_legacy RENAME CONSTRAINT viral_outliers_pkey TO viral_outliers_legacy_pkey;
+ALTER TABLE viral_outliers_legacy RENAME CONSTRAINT viral_outliers_source_table_source_id_key TO viral_outliers_legacy_source_key;
+DROP INDEX IF EXISTS idx_viral_outliers_multiplier;
+DROP INDEX IF EXISTS idx_viral_outliers_platform;
+DROP INDEX IF EXISTS idx_viral_outliers_username;
+DROP INDEX IF EXISTS idx_viral_outliers_expires;
+
+CREATE TABLE viral_outliers (
+    id INT NOT NULL DEFAULT nextval('viral_outliers_id_seq'),
+    source_table VARCHAR(50) NOT NULL,
+    source_id INT NOT NULL,
+
+    -- Metrics
+    multiplier INT NOT NULL,
+    median_engagement BIGINT NOT NULL,
+    actual_engagement BIGINT NOT NULL,
+
+    -- Availability tracking
+    available_count INT NOT NULL,  -- How many metrics were available (1-3)
+    support_count INT NOT NULL,    -- How many metrics were outliers
+
+    -- Content
+    hook TEXT,
+    cta TEXT,
+    platform VARCHAR(50),
+    username TEXT,
+
+    -- Timestamps (UTC)
+    analyzed_at TIMESTAMP WITH TIME ZONE DEFAULT (NOW() AT TIME ZONE 'UTC'),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+
+    -- AI analysis results
+    ai_analysis JSONB DEFAULT '{}',
+
+    -- Constraints (primary key must include the partition key)
+    PRIMARY KEY (id, expires_at),
+    CONSTRAINT valid_multiplier CHECK (multiplier IN (5, 10, 50, 100)),
+    CONSTRAINT positive_median CHECK (median_engagement > 0),
+    CONSTRAINT positive_engagement CHECK (actual_engagement >= 0),
+    CONSTRAINT valid_available CHECK (available_count BETWEEN 1 AND 3),
+    CONSTRAINT valid_support CHECK (support_count >= 0 AND support_count <= available_count),
+    CONSTRAINT valid_expiry CHECK (expires_at > analyzed_at)
+) PARTITION BY RANGE (expires_at);
+
+ALTER SEQUENCE viral_outliers_id_seq OWNED BY viral_outliers.id;
+
+-- Safety net for expiries beyond the pre-created days
+CREATE TABLE viral_outliers_default PARTITION OF viral_outliers DEFAULT;
+
+-- Daily partitions for the next two weeks (scans create more as needed)
+DO $$
+DECLARE
+    day DATE;
+BEGIN
+    FOR day IN
+        SELECT generate_series(
+            (NOW() AT TIME ZONE 'UTC')::date,
+            (NOW() AT TIME ZONE 'UTC')::date + 14,
+            INTERVAL '1 day'
+        )::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF viral_outliers FOR VALUES FROM (%L) TO (%L)',
+            'viral_outliers_p' || to_char(day, 'YYYYMMDD'),
+            day::timestamp AT TIME ZONE 'UTC',
+            (day + 1)::timestamp AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END;
+$$;
+
+INSERT INTO viral_outliers (
+    id, source_table, source_id, multiplier, median_engagement, actual_engagement,
+    available_count, support_count, hook, cta, platform, username,
+    analyzed_at, expires_at, ai_analysis
+)
+SELECT
+    id, source_table, source_id, multiplier, median_engagement, actual_engagement,
+    available_count, support_count, hook, cta, platform, username,
+    analyzed_at, expires_at, ai_analysis
+FROM viral_outliers_legacy
+WHERE expires_at > NOW();
+
+DROP TABLE viral_outliers_legacy;
+
+-- Upsert lookup (replaces the UNIQUE constraint)
+CREATE INDEX IF NOT EXISTS idx_viral_outliers_source ON viral_outliers(source_table, source_id);
+
+-- Query performance indexes
+CREATE INDEX IF NOT EXISTS idx_viral_outliers_multiplier ON viral_outliers(multiplier DESC);
+CREATE INDEX IF NOT EXISTS idx_viral_outliers_platform ON viral_outliers(platform);
+CREATE INDEX IF NOT EXISTS idx_viral_outliers_username ON viral_outliers(username);
+
+-- idx_viral_outliers_expires is gone: expiry filters prune partitions
+
+COMMIT;
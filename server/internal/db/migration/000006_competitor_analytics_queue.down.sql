@@ -0,0 +1,10 @@
+-- ============================================================
+-- COMPETITOR ANALYTICS QUEUE - ROLLBACK
+-- Migration: 000006_competitor_analytics_queue
+-- ============================================================
+
+BEGIN;
+
+DROP TABLE IF EXISTS competitor_analytics_queue;
+
+COMMIT;
@@ -0,0 +1,21 @@
+-- ============================================================
+-- COMPETITOR ANALYTICS QUEUE
+-- Migration: 000006_competitor_analytics_queue
+-- Created: 2026-10-18
+-- ============================================================
+-- Dirty flags for competitor_profiles whose posts or follower
+-- counts changed. The uploaders only upsert a row here; the
+-- periodic batch job (worker/competitor_analytics.py) recomputes
+-- engagement_rate, posting_frequency and growth_rate for every
+-- queued profile in one set-based statement and deletes the rows
+-- it consumed.
+-- ============================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS competitor_analytics_queue (
+    profile_id UUID PRIMARY KEY REFERENCES competitor_profiles(id) ON DELETE CASCADE,
+    enqueued_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+COMMIT;
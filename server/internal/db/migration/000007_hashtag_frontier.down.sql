@@ -0,0 +1,10 @@
+-- ============================================================
+-- HASHTAG DISCOVERY FRONTIER - ROLLBACK
+-- Migration: 000007_hashtag_frontier
+-- ============================================================
+
+BEGIN;
+
+DROP TABLE IF EXISTS hashtag_frontier;
+
+COMMIT;
@@ -0,0 +1,55 @@
+-- ============================================================
+-- HASHTAG DISCOVERY FRONTIER
+-- Migration: 000007_hashtag_frontier
+-- Created: 2026-10-18
+-- ============================================================
+-- Persistent work list of recursive hashtag discovery
+-- (worker/hashtag_frontier.py). A discovery run seeds it with
+-- the unscraped hashtags of competitor posts (depth 0); every
+-- scraped hashtag adds the hashtags its posts use most at
+-- depth + 1, up to the run's max_depth and depth_budget.
+-- Workers claim one pending row at a time (FOR UPDATE SKIP
+-- LOCKED), so discovery runs on several workers at once and
+-- picks up where it stopped after a crash or timeout: lost
+-- claims go back to pending until attempts runs out.
+-- ============================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS hashtag_frontier (
+    id BIGSERIAL PRIMARY KEY,
+    platform VARCHAR(50) NOT NULL,
+    hashtag TEXT NOT NULL,
+    depth INT NOT NULL DEFAULT 0,
+    priority BIGINT NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'claimed', 'done', 'failed')),
+    attempts INT NOT NULL DEFAULT 0,
+    run_id UUID NOT NULL,
+    max_depth INT NOT NULL DEFAULT 0,
+    depth_budget INT NOT NULL DEFAULT 10,
+    max_posts INT NOT NULL DEFAULT 50,
+    parent_hashtag TEXT,
+    posts_scraped INT NOT NULL DEFAULT 0,
+    last_error TEXT,
+    claimed_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    UNIQUE (platform, hashtag)
+);
+
+-- Next hashtag to claim: shallowest first, then most frequent
+CREATE INDEX IF NOT EXISTS idx_hashtag_frontier_pending
+    ON hashtag_frontier(platform, depth, priority DESC)
+    WHERE status = 'pending';
+
+-- Expired claims
+CREATE INDEX IF NOT EXISTS idx_hashtag_frontier_claimed
+    ON hashtag_frontier(claimed_at)
+    WHERE status = 'claimed';
+
+-- Per-run depth budget
+CREATE INDEX IF NOT EXISTS idx_hashtag_frontier_run
+    ON hashtag_frontier(run_id, depth);
+
+COMMIT;
@@ -0,0 +1,10 @@
+-- ============================================================
+-- HASHTAG STATS - ROLLBACK
+-- Migration: 000008_hashtag_stats
+-- ============================================================
+
+BEGIN;
+
+DROP TABLE IF EXISTS hashtag_stats;
+
+COMMIT;
@@ -0,0 +1,80 @@
+-- ============================================================
+-- HASHTAG STATS
+-- Migration: 000008_hashtag_stats
+-- Created: 2026-10-18
+-- ============================================================
+-- One row per (platform, hashtag) with how often the hashtag
+-- appears in competitor_posts and hashtag_posts, when it was
+-- first and last used, and when it was last scraped.
+-- The bulk loader (socialmedia/shared/bulk_loader.py) updates
+-- it in the statement that merges a batch of posts, counting
+-- newly inserted posts only. Hashtag discovery reads it instead
+-- of unnesting every post and filtering scraped hashtags in
+-- Python.
+-- Hashtags are keyed lower case, without '#'.
+-- ============================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS hashtag_stats (
+    platform VARCHAR(50) NOT NULL,
+    hashtag TEXT NOT NULL,
+    competitor_frequency BIGINT NOT NULL DEFAULT 0,
+    hashtag_post_frequency BIGINT NOT NULL DEFAULT 0,
+    first_seen_at TIMESTAMP,
+    last_seen_at TIMESTAMP,
+    last_scraped_at TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (platform, hashtag)
+);
+
+-- Discovery: most frequent hashtags not scraped yet
+CREATE INDEX IF NOT EXISTS idx_hashtag_stats_unscraped
+    ON hashtag_stats(platform, (competitor_frequency + hashtag_post_frequency) DESC)
+    WHERE last_scraped_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_hashtag_stats_unscraped_competitor
+    ON hashtag_stats(platform, competitor_frequency DESC)
+    WHERE last_scraped_at IS NULL AND competitor_frequency > 0;
+
+-- Backfill from the posts already stored
+INSERT INTO hashtag_stats (
+    platform, hashtag, competitor_frequency, hashtag_post_frequency,
+    first_seen_at, last_seen_at, last_scraped_at
+)
+SELECT platform, hashtag,
+       SUM(competitor_frequency), SUM(hashtag_post_frequency),
+       MIN(first_seen_at), MAX(last_seen_at), MAX(last_scraped_at)
+FROM (
+    SELECT cp.platform, LOWER(LTRIM(BTRIM(tag), '#')) AS hashtag,
+           COUNT(*) AS competitor_frequency, 0 AS hashtag_post_frequency,
+           MIN(COALESCE(cp.posted_at, cp.scraped_at)) AS first_seen_at,
+           MAX(COALESCE(cp.posted_at, cp.scraped_at)) AS last_seen_at,
+           NULL::timestamp AS last_scraped_at
+    FROM competitor_posts cp
+    CROSS JOIN LATERAL UNNEST(cp.hashtags) AS tag
+    GROUP BY 1, 2
+
+    UNION ALL
+
+    SELECT hp.platform, LOWER(LTRIM(BTRIM(tag), '#')),
+           0, COUNT(*),
+           MIN(COALESCE(hp.posted_at, hp.scraped_at)),
+           MAX(COALESCE(hp.posted_at, hp.scraped_at)),
+           NULL::timestamp
+    FROM hashtag_posts hp
+    CROSS JOIN LATERAL UNNEST(hp.hashtags) AS tag
+    GROUP BY 1, 2
+
+    UNION ALL
+
+    SELECT hp.platform, LOWER(LTRIM(BTRIM(hp.hashtag), '#')),
+           0, 0, NULL, NULL, MAX(COALESCE(hp.scraped_at, NOW()))
+    FROM hashtag_posts hp
+    GROUP BY 1, 2
+) counts
+WHERE hashtag <> ''
+GROUP BY platform, hashtag
+ON CONFLICT (platform, hashtag) DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- ============================================================
+-- HASHTAG CO-OCCURRENCE - ROLLBACK
+-- Migration: 000009_hashtag_cooccurrence
+-- ============================================================
+
+BEGIN;
+
+DROP TABLE IF EXISTS hashtag_cooccurrence;
+
+DROP INDEX IF EXISTS idx_hashtag_frontier_pending;
+CREATE INDEX IF NOT EXISTS idx_hashtag_frontier_pending
+    ON hashtag_frontier(platform, depth, priority DESC)
+    WHERE status = 'pending';
+
+ALTER TABLE hashtag_frontier
+    DROP COLUMN IF EXISTS user_id,
+    DROP COLUMN IF EXISTS group_id;
+
+COMMIT;
@@ -0,0 +1,70 @@
+-- ============================================================
+-- HASHTAG CO-OCCURRENCE
+-- Migration: 000009_hashtag_cooccurrence
+-- Created: 2026-10-18
+-- ============================================================
+-- Undirected hashtag co-occurrence graph: how many posts use
+-- both hashtags, stored once per pair (hashtag_a < hashtag_b).
+-- The bulk loader adds the pairs of newly inserted posts
+-- (the first 30 hashtags of each post) in the statement that
+-- merges them. Hashtag discovery ranks candidates by
+-- personalized PageRank on this graph, seeded with the
+-- tenant's competitor hashtags
+-- (socialmedia/hashtag/hashtag_relevance.py).
+--
+-- hashtag_frontier rows now record the tenant of their
+-- discovery run and are claimed best-first by priority (the
+-- relevance score) instead of breadth-first.
+-- ============================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS hashtag_cooccurrence (
+    platform VARCHAR(50) NOT NULL,
+    hashtag_a TEXT NOT NULL,
+    hashtag_b TEXT NOT NULL,
+    weight BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (platform, hashtag_a, hashtag_b),
+    CHECK (hashtag_a < hashtag_b)
+);
+
+-- Neighbours of a hashtag on the other side of the pair
+CREATE INDEX IF NOT EXISTS idx_hashtag_cooccurrence_b
+    ON hashtag_cooccurrence(platform, hashtag_b);
+
+ALTER TABLE hashtag_frontier
+    ADD COLUMN IF NOT EXISTS user_id INT,
+    ADD COLUMN IF NOT EXISTS group_id INT;
+
+DROP INDEX IF EXISTS idx_hashtag_frontier_pending;
+CREATE INDEX IF NOT EXISTS idx_hashtag_frontier_pending
+    ON hashtag_frontier(platform, priority DESC)
+    WHERE status = 'pending';
+
+-- Backfill from the posts already stored
+WITH post_tags AS (
+    SELECT DISTINCT 'competitor' AS source, p.platform, p.post_id, p.posted_at,
+           LOWER(LTRIM(BTRIM(tag), '#')) AS hashtag
+    FROM competitor_posts p
+    CROSS JOIN LATERAL UNNEST(p.hashtags[1:30]) AS tag
+    UNION
+    SELECT DISTINCT 'hashtag', p.platform, p.post_id, p.posted_at,
+           LOWER(LTRIM(BTRIM(tag), '#'))
+    FROM hashtag_posts p
+    CROSS JOIN LATERAL UNNEST(p.hashtags[1:30]) AS tag
+)
+INSERT INTO hashtag_cooccurrence (platform, hashtag_a, hashtag_b, weight)
+SELECT a.platform, a.hashtag, b.hashtag, COUNT(*)
+FROM post_tags a
+JOIN post_tags b
+  ON b.source = a.source
+ AND b.platform = a.platform
+ AND b.post_id = a.post_id
+ AND b.posted_at IS NOT DISTINCT FROM a.posted_at
+ AND a.hashtag < b.hashtag
+WHERE a.hashtag <> ''
+GROUP BY 1, 2, 3
+ON CONFLICT (platform, hashtag_a, hashtag_b) DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,10 @@
+-- ============================================================
+-- HASHTAG TRENDS - ROLLBACK
+-- Migration: 000010_hashtag_trends
+-- ============================================================
+
+BEGIN;
+
+DROP TABLE IF EXISTS hashtag_trends;
+
+COMMIT;
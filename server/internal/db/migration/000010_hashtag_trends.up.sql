@@ -0,0 +1,39 @@
+-- ============================================================
+-- HASHTAG TRENDS
+-- Migration: 000010_hashtag_trends
+-- Created: 2026-10-18
+-- ============================================================
+-- Daily snapshots of TikTok Creative Center's popular hashtags
+-- (trends/hashtag_trends.py): rank, post and view counts per
+-- hashtag, region and period. A hashtag has one row per day; a
+-- second scrape on the same day updates it, so the table is a
+-- de-duplicated time series that trend queries read instead of
+-- scraping the page again.
+-- Hashtags are keyed lower case, without '#'.
+-- ============================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS hashtag_trends (
+    id BIGSERIAL PRIMARY KEY,
+    source VARCHAR(50) NOT NULL DEFAULT 'tiktok_creative_center',
+    region VARCHAR(10) NOT NULL DEFAULT '',
+    period_days INT NOT NULL DEFAULT 7,
+    hashtag TEXT NOT NULL,
+    snapshot_date DATE NOT NULL DEFAULT CURRENT_DATE,
+    rank INT,
+    posts BIGINT,
+    views BIGINT,
+    scraped_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    UNIQUE (source, region, period_days, snapshot_date, hashtag)
+);
+
+-- Latest snapshot in rank order
+CREATE INDEX IF NOT EXISTS idx_hashtag_trends_snapshot
+    ON hashtag_trends(source, region, period_days, snapshot_date DESC, rank);
+
+-- History of one hashtag
+CREATE INDEX IF NOT EXISTS idx_hashtag_trends_hashtag
+    ON hashtag_trends(hashtag, snapshot_date DESC);
+
+COMMIT;
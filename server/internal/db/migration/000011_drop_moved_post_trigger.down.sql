@@ -0,0 +1,27 @@
+-- ============================================================
+-- DROP MOVED-POST TRIGGER - ROLLBACK
+-- Migration: 000011_drop_moved_post_trigger
+-- ============================================================
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION drop_moved_post_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    EXECUTE format(
+        'DELETE FROM %I WHERE platform = $1 AND post_id = $2 AND posted_at IS DISTINCT FROM $3',
+        TG_TABLE_NAME
+    ) USING NEW.platform, NEW.post_id, NEW.posted_at;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER competitor_posts_drop_moved
+    BEFORE INSERT ON competitor_posts
+    FOR EACH ROW EXECUTE FUNCTION drop_moved_post_version();
+
+CREATE TRIGGER hashtag_posts_drop_moved
+    BEFORE INSERT ON hashtag_posts
+    FOR EACH ROW EXECUTE FUNCTION drop_moved_post_version();
+
+COMMIT;
@@ -0,0 +1,25 @@
+-- ============================================================
+-- DROP MOVED-POST TRIGGER
+-- Migration: 000011_drop_moved_post_trigger
+-- Created: 2026-10-18
+-- ============================================================
+-- 000003_partition_post_tables kept (platform, post_id) unique with
+-- a BEFORE INSERT trigger that deleted a stale copy of the post
+-- stored under another posted_at. It ran a dynamic DELETE across
+-- every partition for each inserted row (no pruning, since the old
+-- posted_at is unknown), and the re-inserted post got a new id,
+-- orphaning viral_outliers.source_id.
+--
+-- The bulk loader (socialmedia/shared/bulk_loader.py) now handles
+-- moved posts once per batch: a post re-scraped without a date keeps
+-- its stored posted_at, and a post whose date changed is moved by
+-- UPDATE, which keeps its id.
+-- ============================================================
+
+BEGIN;
+
+DROP TRIGGER IF EXISTS competitor_posts_drop_moved ON competitor_posts;
+DROP TRIGGER IF EXISTS hashtag_posts_drop_moved ON hashtag_posts;
+DROP FUNCTION IF EXISTS drop_moved_post_version();
+
+COMMIT;
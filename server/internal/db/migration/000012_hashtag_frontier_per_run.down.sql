@@ -0,0 +1,21 @@
+-- ============================================================
+-- HASHTAG FRONTIER PER RUN - ROLLBACK
+-- Migration: 000012_hashtag_frontier_per_run
+-- ============================================================
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_hashtag_frontier_active;
+
+ALTER TABLE hashtag_frontier
+    DROP CONSTRAINT IF EXISTS hashtag_frontier_run_hashtag_key;
+
+-- Keep the newest row of each hashtag
+DELETE FROM hashtag_frontier f
+USING hashtag_frontier newer
+WHERE newer.platform = f.platform AND newer.hashtag = f.hashtag AND newer.id > f.id;
+
+ALTER TABLE hashtag_frontier
+    ADD CONSTRAINT hashtag_frontier_platform_hashtag_key UNIQUE (platform, hashtag);
+
+COMMIT;
@@ -0,0 +1,30 @@
+-- ============================================================
+-- HASHTAG FRONTIER PER RUN
+-- Migration: 000012_hashtag_frontier_per_run
+-- Created: 2026-10-18
+-- ============================================================
+-- hashtag_frontier was UNIQUE (platform, hashtag) with inserts
+-- ON CONFLICT DO NOTHING, so a hashtag that was done or failed
+-- could never be enqueued again, and a second discovery run (or
+-- another tenant) silently inherited the first run's row: its
+-- run_id, max_depth, budgets and user/group.
+--
+-- Rows are now unique per run. Seeding skips hashtags the same
+-- tenant already has pending or claimed in another run, which
+-- the partial index below serves; finished rows no longer block
+-- anything.
+-- ============================================================
+
+BEGIN;
+
+ALTER TABLE hashtag_frontier
+    DROP CONSTRAINT IF EXISTS hashtag_frontier_platform_hashtag_key;
+ALTER TABLE hashtag_frontier
+    ADD CONSTRAINT hashtag_frontier_run_hashtag_key UNIQUE (run_id, platform, hashtag);
+
+-- Hashtags in flight, looked up when seeding and expanding
+CREATE INDEX IF NOT EXISTS idx_hashtag_frontier_active
+    ON hashtag_frontier(platform, hashtag)
+    WHERE status IN ('pending', 'claimed');
+
+COMMIT;
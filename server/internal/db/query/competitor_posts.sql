@@ -21,10 +21,9 @@ VALUES (
   $8, -- hashtags (TEXT[])
   $9  -- scraped_at (TIMESTAMP)
 )
-ON CONFLICT (platform, post_id) DO UPDATE SET
+ON CONFLICT (platform, post_id, posted_at) DO UPDATE SET
   content = EXCLUDED.content,
   media = EXCLUDED.media,
-  posted_at = EXCLUDED.posted_at,
   engagement = EXCLUDED.engagement,
   hashtags = EXCLUDED.hashtags,
   scraped_at = EXCLUDED.scraped_at
@@ -16,13 +16,13 @@ from bs4 import BeautifulSoup
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+from socialmedia.drivers import get_browser_pool
+
 # ── DATABASE SETUP ────────────────────────────────────────────────────────────
 
 def connectDB():
@@ -126,37 +126,12 @@ def retry_on_failure(max_retries: int = 3, delay: int = 2):
 
 @contextmanager
 def get_selenium_driver():
-    """Context manager for Selenium WebDriver."""
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-plugins")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
-    
-    # Random user agent
-    user_agent = random.choice(config.user_agents)
-    options.add_argument(f"--user-agent={user_agent}")
-    
-    driver = None
-    try:
-        driver = webdriver.Chrome(options=options)
-        driver.set_page_load_timeout(config.selenium_timeout)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        yield driver
-    except Exception as e:
-        logger.error(f"WebDriver setup error: {e}")
-        raise
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception as e:
-                logger.warning(f"Error closing WebDriver: {e}")
+    """Context manager for a Selenium WebDriver leased from the browser pool."""
+    # Pooled undetected Chrome: no cold start per platform, and the
+    # browser goes back to the pool (or is replaced if it crashed)
+    with get_browser_pool().lease(headless=True, force_undetected=True) as browser:
+        browser.set_page_load_timeout(config.selenium_timeout)
+        yield browser.driver
 
 def wait_for_element(driver, xpath: str, timeout: int = 10) -> Optional[str]:
     """Wait for element and return its text."""
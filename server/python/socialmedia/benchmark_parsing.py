@@ -0,0 +1,422 @@
+"""
+Scraper Parsing Benchmark
+=========================
+
+Measures InstagramScraper.scrape_post and TikTokScraper.scrape_video on a
+fixture corpus (drivers/fixture_driver): no browser, no network, no
+politeness delays, so the numbers are the scrapers' own parsing cost.
+
+For Instagram the embedded-JSON extractor scrape_post tries first
+(instagram/scraper/post_json) is also measured on its own, on the same
+post pages.
+
+Per target it reports:
+
+    time     wall time per page, median and p95 over --repeats passes
+    memory   peak traced allocation per page (tracemalloc, in a separate
+             pass so tracing does not skew the timings)
+    records  pages that produced a record, and records with text
+             (caption / description) and likes
+
+Without --corpus a synthetic corpus is generated (--posts pages per
+platform), shaped like the live pages: the ?__a=1 JSON endpoint for half
+of the Instagram posts and full post HTML with its embedded data blobs for
+the rest, TikTok video pages with the rehydration JSON, and the recorded
+dom_extract results both scrapers read.
+
+Usage:
+    python -m socialmedia.benchmark_parsing --posts 50 --repeats 5
+    python -m socialmedia.benchmark_parsing --corpus fixtures/captured --json
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import argparse
+import contextlib
+import html
+import io
+import json
+import logging
+import random
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from .drivers import base_scraper
+from .drivers.dom_extract import build_script
+from .drivers.fixture_driver import FixtureCorpus, FixtureDriver, FixturePage, FixtureRecorder, script_key, wait_key
+from .shared.post_record import PostRecord
+
+log = logging.getLogger(__name__)
+
+# Post pages the benchmark parses, by platform
+TARGET_URLS = {
+    "instagram": re.compile(r"^https://www\.instagram\.com/(?:p|reel)/[^/?#]+/$"),
+    "tiktok": re.compile(r"^https://www\.tiktok\.com/@[^/]+/video/\d+$"),
+}
+
+_WORDS = ("launch", "summer", "drop", "coffee", "studio", "behind", "scenes", "new", "collab",
+          "today", "weekend", "limited", "edition", "thanks", "everyone", "live", "soon")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Synthetic corpus
+# ─────────────────────────────────────────────────────────────────────────────
+def _sentence(rng: random.Random, words: int, tags: int = 0) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return text + "".join(f" #{rng.choice(_WORDS)}{rng.randint(1, 99)}" for _ in range(tags))
+
+
+def _filler_scripts(rng: random.Random, count: int, size: int) -> str:
+    """Module bundles and config blobs as they bulk up the live pages."""
+    scripts = []
+    for i in range(count):
+        define = [[f"Module{i}_{j}", [], {"token": f"{rng.getrandbits(64):x}", "flags": [rng.random() > 0.5] * 8},
+                   rng.randint(1, 9999)] for j in range(size // 120)]
+        blob = json.dumps({"require": [["ScheduledServerJS", "handle", None, [{"__bbox": {"define": define}}]]]})
+        scripts.append(f'<script type="application/json" data-sjs>{blob}</script>')
+    return "\n".join(scripts)
+
+
+def _extract_call(spec: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, List[str]]:
+    """A recorded extract_page call returning values."""
+    return {script_key(build_script(spec)): [json.dumps(dict(values, height=4200, script_ms=3.1))]}
+
+
+def _ig_item(rng: random.Random, shortcode: str, username: str, taken_at: int) -> Dict[str, Any]:
+    def image(n):
+        return {"candidates": [{"url": f"https://scontent.cdninstagram.com/v/t51/{shortcode}_{n}_{w}.jpg",
+                                "width": w, "height": w} for w in (1080, 750, 640, 320)]}
+
+    media_type = rng.choice((1, 2, 8))
+    item = {
+        "code": shortcode,
+        "pk": str(rng.getrandbits(60)),
+        "taken_at": taken_at,
+        "media_type": media_type,
+        "user": {"username": username, "full_name": username.title(), "is_verified": True},
+        "caption": {"text": _sentence(rng, 24, 3), "created_at": taken_at},
+        "like_count": rng.randint(100, 500000),
+        "comment_count": rng.randint(0, 5000),
+        "image_versions2": image(0),
+    }
+    if media_type == 2:
+        item["video_versions"] = [{"url": f"https://scontent.cdninstagram.com/v/t50/{shortcode}.mp4", "type": 101}]
+        item["play_count"] = rng.randint(1000, 5000000)
+    elif media_type == 8:
+        item["carousel_media"] = [{"media_type": 1, "image_versions2": image(n)} for n in range(1, 4)]
+    return item
+
+
+def _ig_comments(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    return [{"username": f"fan_{rng.randint(1, 9999)}", "text": _sentence(rng, rng.randint(3, 12)),
+             "likes": rng.randint(0, 300), "created_at": 1760000000 + i} for i in range(count)]
+
+
+def _ig_api_page(url: str, item: Dict[str, Any], comments: List[Dict[str, Any]]) -> FixturePage:
+    """The ?__a=1&__d=dis endpoint (legacy GraphQL shape), served as a JSON body."""
+    node = {
+        "__typename": {1: "GraphImage", 2: "GraphVideo", 8: "GraphSidecar"}[item["media_type"]],
+        "shortcode": item["code"],
+        "taken_at_timestamp": item["taken_at"],
+        "is_video": item["media_type"] == 2,
+        "display_url": item["image_versions2"]["candidates"][0]["url"],
+        "video_url": (item.get("video_versions") or [{}])[0].get("url"),
+        "edge_media_to_caption": {"edges": [{"node": {"text": item["caption"]["text"]}}]},
+        "edge_media_preview_like": {"count": item["like_count"]},
+        "edge_media_to_parent_comment": {"count": item["comment_count"], "edges": [
+            {"node": {"text": c["text"], "created_at": c["created_at"], "owner": {"username": c["username"]},
+                      "edge_liked_by": {"count": c["likes"]}}} for c in comments]},
+        "edge_sidecar_to_children": {"edges": [
+            {"node": {"is_video": False, "display_url": m["image_versions2"]["candidates"][0]["url"]}}
+            for m in item.get("carousel_media", [])]},
+    }
+    body = html.escape(json.dumps({"graphql": {"shortcode_media": node}}), quote=False)
+    return FixturePage(url, title="", html=f"<html><head></head><body><pre>{body}</pre></body></html>",
+                       calls={wait_key("wait_for_selector", "body", False): [True]})
+
+
+def _ig_post_page(rng: random.Random, url: str, item: Dict[str, Any],
+                  comments: List[Dict[str, Any]]) -> FixturePage:
+    """A post page as rendered: meta tags, article markup and the data blobs."""
+    from .instagram.scraper.profile_scraper import POST_COMMENTS_SPEC
+
+    username, caption = item["user"]["username"], item["caption"]["text"]
+    posted = datetime.fromtimestamp(item["taken_at"], tz=timezone.utc)
+    og = (f"{item['like_count']:,} likes, {item['comment_count']:,} comments - {username} on "
+          f"{posted:%B %d, %Y}: &quot;{html.escape(caption)}&quot;. ")
+    media = item.get("carousel_media") or [item]
+    images = "".join(f'<img alt="Photo by {username}" src="{m["image_versions2"]["candidates"][0]["url"]}">'
+                     for m in media)
+    comment_items = "".join(
+        f'<li><div><span>{c["username"]}</span><span>{html.escape(c["text"])}</span></div></li>' for c in comments
+    )
+    data = {"require": [["ScheduledServerJS", "handle", None, [{"__bbox": {"require": [
+        ["RelayPrefetchedStreamCache", "next", [], [f"adp_PolarisPostRootQueryRelayPreloader_{item['pk']}", {
+            "__bbox": {"complete": True, "result": {"data": {
+                "xdt_api__v1__media__shortcode__web_info": {"items": [item]},
+            }}},
+        }]],
+        ["RelayPrefetchedStreamCache", "next", [], [f"adp_PolarisPostCommentsQueryRelayPreloader_{item['pk']}", {
+            "__bbox": {"complete": True, "result": {"data": {
+                "xdt_api__v1__media__media_id__comments__connection": {"edges": [
+                    {"node": {"text": c["text"], "created_at": c["created_at"], "comment_like_count": c["likes"],
+                              "user": {"username": c["username"]}}} for c in comments
+                ]},
+            }}},
+        }]],
+    ]}}]]]}
+    page_html = f"""<!DOCTYPE html><html lang="en"><head>
+<meta property="og:description" content="{og}">
+<meta property="og:title" content="{username} on Instagram">
+<title>{username} on Instagram</title>
+{_filler_scripts(rng, 30, 6000)}
+<script type="application/json" data-sjs>{json.dumps(data)}</script>
+</head><body><div id="root"><main><article>
+<header><span>{username}</span><span>Follow</span></header>
+<div>{images}</div>
+<section><span>{item['like_count']:,} likes</span></section>
+<div><span>{html.escape(caption)}</span></div>
+<time datetime="{posted:%Y-%m-%dT%H:%M:%S.000Z}">{posted:%B %d}</time>
+<ul><li><ul>{comment_items}</ul></li></ul>
+</article></main></div></body></html>"""
+    calls = _extract_call(POST_COMMENTS_SPEC, {
+        "nested": [{"full_text": f"{c['username']}\n{c['text']}"} for c in comments],
+        "spans": [],
+        "article": [],
+    })
+    calls[wait_key("wait_for_selector", "article", False)] = [True]
+    return FixturePage(url, title=f"{username} on Instagram", html=page_html, calls=calls)
+
+
+def _tiktok_pages(rng: random.Random, username: str, video_id: str, created: int) -> List[FixturePage]:
+    """A video page and its author's profile page."""
+    from .tiktok.scraper.profile_scraper import PROFILE_STATS_SPEC, VIDEO_SPEC
+
+    desc = _sentence(rng, 16, 4)
+    stats = {"diggCount": rng.randint(100, 900000), "shareCount": rng.randint(0, 20000),
+             "commentCount": rng.randint(0, 9000), "playCount": rng.randint(10000, 9000000),
+             "collectCount": rng.randint(0, 40000)}
+    author_stats = {"followerCount": rng.randint(1000, 9000000), "followingCount": rng.randint(0, 900),
+                    "heartCount": rng.randint(10000, 90000000), "videoCount": rng.randint(10, 900)}
+    comments = [{"username": f"viewer{rng.randint(1, 99999)}", "text": _sentence(rng, rng.randint(2, 10)),
+                 "likes": str(rng.randint(0, 999))} for _ in range(20)]
+    item = {
+        "id": video_id, "desc": desc, "createTime": str(created),
+        "author": {"uniqueId": username, "nickname": username.title(), "verified": True},
+        "authorStats": author_stats,
+        "stats": stats,
+        "statsV2": {k: str(v) for k, v in stats.items()},
+        "video": {"duration": rng.randint(5, 180), "playAddr": f"https://v16-webapp.tiktok.com/{video_id}/?mime_type=video_mp4"},
+        "challenges": [{"title": tag[1:]} for tag in re.findall(r"#\w+", desc)],
+    }
+    rehydration = {"__DEFAULT_SCOPE__": {
+        "webapp.app-context": {"language": "en", "region": "US", "user": {}},
+        "webapp.video-detail": {"itemInfo": {"itemStruct": item}, "statusCode": 0},
+    }}
+    url = f"https://www.tiktok.com/@{username}/video/{video_id}"
+    video_html = f"""<!DOCTYPE html><html lang="en"><head><title>{username} on TikTok</title>
+{_filler_scripts(rng, 20, 8000)}
+<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">{json.dumps(rehydration)}</script>
+</head><body><div id="app"><main>
+<span data-e2e="browse-username">{username}</span>
+<div data-e2e="browse-video-desc">{html.escape(desc)}</div>
+<span>{rng.randint(1, 6)}d ago</span>
+<strong data-e2e="like-count">{stats['diggCount']}</strong>
+<strong data-e2e="comment-count">{stats['commentCount']}</strong>
+<strong data-e2e="shared_count">{stats['shareCount']}</strong>
+<strong data-e2e="undefined-count">{stats['collectCount']}</strong>
+<video><source src="{item['video']['playAddr']}"></video>
+</main></div></body></html>"""
+    video = FixturePage(url, title=f"{username} on TikTok", html=video_html, calls=_extract_call(VIDEO_SPEC, {
+        "author": username,
+        "description": desc,
+        "search_link_label": "",
+        "post_date": "3d ago",
+        "likes_label": "",
+        "likes": str(stats["diggCount"]),
+        "comments_count": str(stats["commentCount"]),
+        "shared_count": str(stats["shareCount"]),
+        "saved_count": str(stats["collectCount"]),
+        "video_url": item["video"]["playAddr"],
+        "comments": comments,
+    }))
+    profile_url = f"https://www.tiktok.com/@{username}"
+    profile_html = f"""<html><head><title>{username}</title>{_filler_scripts(rng, 10, 8000)}</head><body>
+<strong data-e2e="followers-count">{author_stats['followerCount']}</strong>
+<strong data-e2e="following-count">{author_stats['followingCount']}</strong>
+<strong data-e2e="likes-count">{author_stats['heartCount']}</strong></body></html>"""
+    profile = FixturePage(profile_url, title=username, html=profile_html, calls=_extract_call(PROFILE_STATS_SPEC, {
+        "followers": str(author_stats["followerCount"]),
+        "following": str(author_stats["followingCount"]),
+        "likes": str(author_stats["heartCount"]),
+    }))
+    return [video, profile]
+
+
+def build_synthetic_corpus(directory: str, posts: int = 20, seed: int = 42) -> FixtureCorpus:
+    """
+    Write posts Instagram and posts TikTok pages into directory. Even
+    Instagram posts also get the JSON endpoint; odd ones only parse as HTML.
+    """
+    rng = random.Random(seed)
+    recorder = FixtureRecorder(directory)
+    start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    for i in range(posts):
+        username = f"brand{i % 5}"
+        taken_at = int((start - timedelta(hours=rng.randint(1, 2000))).timestamp())
+
+        shortcode = f"C{rng.getrandbits(40):x}"
+        url = f"https://www.instagram.com/p/{shortcode}/"
+        item = _ig_item(rng, shortcode, username, taken_at)
+        comments = _ig_comments(rng, 20)
+        if i % 2 == 0:
+            recorder.save(_ig_api_page(f"{url}?__a=1&__d=dis", item, comments))
+        recorder.save(_ig_post_page(rng, url, item, comments))
+
+        for page in _tiktok_pages(rng, username, str(7300000000000000000 + rng.getrandbits(50)), taken_at):
+            recorder.save(page)
+    return FixtureCorpus(directory)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Measurement
+# ─────────────────────────────────────────────────────────────────────────────
+def make_scraper(platform: str, driver: FixtureDriver):
+    """A scraper of the platform running on the fixture driver."""
+    if platform == "instagram":
+        from .instagram.scraper.profile_scraper import InstagramScraper
+        return InstagramScraper(use_cookies=False, driver_type="fixture", driver=driver)
+    from .tiktok.scraper.profile_scraper import TikTokScraper
+    return TikTokScraper(driver_type="fixture", driver=driver)
+
+
+def _parse(platform: str, scraper, url: str):
+    if platform == "instagram":
+        return scraper.scrape_post(url)
+    return scraper.scrape_video(url, retries=0)
+
+
+def _extract(platform: str, page: FixturePage):
+    """The embedded-JSON extractor alone, on a recorded page."""
+    from .instagram.scraper.post_json import parse_post_html
+    return parse_post_html(page.html, page.url)
+
+
+# Targets per platform: the full post parser on the fixture driver, and the
+# embedded-JSON extractor it tries first
+EXTRACTOR_TARGETS = {
+    "instagram": "instagram.post_json",
+}
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _measure(target: str, urls: List[str], corpus: FixtureCorpus, parse: Callable[[str], Any],
+             repeats: int) -> Dict[str, Any]:
+    timings: List[float] = []
+    peaks: List[int] = []
+    records = []
+    # The scrapers print progress per page
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeats):
+            for url in urls:
+                corpus.rewind()
+                began = time.perf_counter()
+                parse(url)
+                timings.append(time.perf_counter() - began)
+
+        tracemalloc.start()
+        try:
+            for url in urls:
+                corpus.rewind()
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                records.append(parse(url))
+                peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            tracemalloc.stop()
+
+    parsed = [PostRecord.from_instagram(r) if isinstance(r, dict) else r for r in records if r is not None]
+    return {
+        "target": target,
+        "pages": len(urls),
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "p95_ms": round(_percentile(timings, 0.95) * 1000, 2),
+        "peak_kib": round(statistics.mean(peaks) / 1024, 1),
+        "records": len(parsed),
+        "with_text": sum(1 for r in parsed if r.caption),
+        "with_likes": sum(1 for r in parsed if r.likes),
+    }
+
+
+def run_target(corpus: FixtureCorpus, platform: str, repeats: int = 3,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Benchmark one platform's post parser over the corpus pages it covers."""
+    urls = [url for url in corpus.urls() if TARGET_URLS[platform].match(url)][:limit]
+    if not urls:
+        return []
+    scraper = make_scraper(platform, FixtureDriver(corpus))
+    target = f"{platform}.{'scrape_post' if platform == 'instagram' else 'scrape_video'}"
+    results = [_measure(target, urls, corpus, lambda url: _parse(platform, scraper, url), repeats)]
+
+    if platform in EXTRACTOR_TARGETS:
+        # The extractor reads the post page as recorded, without the driver
+        pages = {url: corpus.pages[url][-1] for url in urls}
+        results.append(_measure(EXTRACTOR_TARGETS[platform], urls, corpus,
+                                lambda url: _extract(platform, pages[url]), repeats))
+    return results
+
+
+def run_benchmark(corpus: FixtureCorpus, platforms: List[str], repeats: int = 3,
+                  limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    # Failed pages retry with politeness delays; those are not parsing time
+    scale, base_scraper.SCRAPE_POLITENESS_SCALE = base_scraper.SCRAPE_POLITENESS_SCALE, 0
+    try:
+        return [result for platform in platforms for result in run_target(corpus, platform, repeats, limit)]
+    finally:
+        base_scraper.SCRAPE_POLITENESS_SCALE = scale
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark scraper page parsing on a fixture corpus")
+    parser.add_argument("--corpus", help="Captured corpus directory (default: generate a synthetic one)")
+    parser.add_argument("--posts", type=int, default=20, help="Synthetic pages per platform")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--limit", type=int, help="Parse at most this many pages per platform")
+    parser.add_argument("--platforms", nargs="+", default=["instagram", "tiktok"], choices=sorted(TARGET_URLS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # force: the scraper modules configure INFO logging on import
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s: %(message)s", force=True)
+
+    with tempfile.TemporaryDirectory(prefix="fixture_corpus_") as scratch:
+        if args.corpus:
+            corpus = FixtureCorpus(args.corpus)
+        else:
+            corpus = build_synthetic_corpus(scratch, args.posts, args.seed)
+        results = run_benchmark(corpus, args.platforms, args.repeats, args.limit)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n{'target':<24} {'pages':>6} {'median ms':>10} {'p95 ms':>9} {'peak KiB':>9} "
+          f"{'records':>8} {'text':>6} {'likes':>6}")
+    for r in results:
+        print(f"{r['target']:<24} {r['pages']:>6} {r['median_ms']:>10.2f} {r['p95_ms']:>9.2f} "
+              f"{r['peak_kib']:>9.1f} {r['records']:>8} {r['with_text']:>6} {r['with_likes']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 # Scraper Drivers Package
 from .driver_factory import get_driver, switch_to_fallback, BotDetectedError
+from .browser_pool import BrowserPool, PooledDriver, get_browser_pool
+from .context_pool import PlaywrightContextPool, PolitenessLimiter
+from .network_filter import NetworkAccountant, ResourcePolicy
+from .dom_extract import extract_page
+from .fixture_driver import CaptureDriver, FixtureDriver
 from .seleniumbase_driver import SeleniumBaseDriver
 from .playwright_stealth_driver import PlaywrightStealthDriver
 from .undetected_chrome_driver import UndetectedChromeDriver
@@ -8,6 +13,16 @@ __all__ = [
     'get_driver', 
     'switch_to_fallback', 
     'BotDetectedError', 
+    'BrowserPool',
+    'PooledDriver',
+    'get_browser_pool',
+    'PlaywrightContextPool',
+    'PolitenessLimiter',
+    'NetworkAccountant',
+    'ResourcePolicy',
+    'extract_page',
+    'CaptureDriver',
+    'FixtureDriver',
     'SeleniumBaseDriver', 
     'PlaywrightStealthDriver',
     'UndetectedChromeDriver'
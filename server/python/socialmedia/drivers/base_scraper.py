@@ -1,10 +1,55 @@
 """
 Base Scraper Interface
 Abstract base class defining the common interface for all scraper drivers.
+
+Waiting comes in two kinds that are configured separately:
+
+    - load waits (wait_for_selector, wait_for_network_idle,
+      wait_for_scroll_height_change) return as soon as the page is ready
+      and give up after a bounded timeout (SCRAPE_WAIT_TIMEOUT seconds)
+    - politeness delays (polite_delay) are deliberate pauses between
+      requests to a site, scaled by SCRAPE_POLITENESS_SCALE (0 disables)
 """
 
+import json
+import logging
+import os
+import random
+import time
 from abc import ABC, abstractmethod
-from typing import List, Optional, Any, Dict
+from typing import Callable, List, Optional, Any, Dict
+
+log = logging.getLogger(__name__)
+
+SCRAPE_WAIT_TIMEOUT = float(os.getenv("SCRAPE_WAIT_TIMEOUT", "15"))
+SCRAPE_POLITENESS_SCALE = float(os.getenv("SCRAPE_POLITENESS_SCALE", "1"))
+WAIT_POLL_INTERVAL = 0.25
+
+
+def polite_delay(min_seconds: float, max_seconds: Optional[float] = None) -> None:
+    """Pause between requests to a site, scaled by SCRAPE_POLITENESS_SCALE."""
+    seconds = random.uniform(min_seconds, max_seconds) if max_seconds else min_seconds
+    if SCRAPE_POLITENESS_SCALE > 0:
+        time.sleep(seconds * SCRAPE_POLITENESS_SCALE)
+
+
+def is_xpath(selector: str) -> bool:
+    """Selectors starting with "/", "./" or "(" are XPath, others CSS."""
+    return selector.startswith(("/", "./", "("))
+
+
+def _poll(check: Callable[[], Any], timeout: float, interval: Optional[float] = None) -> Any:
+    """Call check until it returns something truthy or timeout passes."""
+    interval = WAIT_POLL_INTERVAL if interval is None else interval
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            value = check()
+        except Exception:
+            value = None
+        if value or time.monotonic() >= deadline:
+            return value
+        time.sleep(interval)
 
 
 class BaseScraper(ABC):
@@ -78,6 +123,89 @@ class BaseScraper(ABC):
         """Clean up and close the driver."""
         pass
     
+    # ─────────────────────────────────────────────────────────────────────────
+    # Load waits: polling defaults through execute_script; Playwright-based
+    # drivers override them with their event-driven equivalents
+    # ─────────────────────────────────────────────────────────────────────────
+    def wait_for_selector(self, selector: str, timeout: Optional[float] = None,
+                          visible: bool = False) -> bool:
+        """
+        Wait until a CSS or XPath selector matches (and is visible).
+
+        Returns:
+            True once it matches, False after the timeout
+        """
+        script = (
+            "return (function (s, x, v) {"
+            " var el = x ? document.evaluate(s, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)"
+            ".singleNodeValue : document.querySelector(s);"
+            " return !!el && (!v || !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length));"
+            f" }})({json.dumps(selector)}, {json.dumps(is_xpath(selector))}, {json.dumps(visible)})"
+        )
+        return bool(_poll(lambda: self.execute_script(script), self._wait_timeout(timeout)))
+    
+    def wait_for_network_idle(self, idle_time: float = 0.5, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the document has loaded and no new resources were
+        fetched for idle_time seconds.
+
+        Returns:
+            True when idle, False after the timeout
+        """
+        script = ("return document.readyState + ':' + "
+                  "performance.getEntriesByType('resource').length")
+        state = {"value": None, "since": time.monotonic()}
+        
+        def idle():
+            value = self.execute_script(script)
+            now = time.monotonic()
+            if value != state["value"]:
+                state["value"], state["since"] = value, now
+            return value.startswith("complete:") and now - state["since"] >= idle_time
+        
+        return bool(_poll(idle, self._wait_timeout(timeout), interval=min(WAIT_POLL_INTERVAL, idle_time)))
+    
+    def wait_for_scroll_height_change(self, previous_height: int, timeout: Optional[float] = None) -> int:
+        """
+        Wait for lazy-loaded content to grow the page after a scroll.
+
+        Returns:
+            The new document.body.scrollHeight, or previous_height if it
+            did not change within the timeout
+        """
+        def grown():
+            height = self.execute_script("return document.body.scrollHeight")
+            return height if height != previous_height else None
+        
+        return _poll(grown, self._wait_timeout(timeout)) or previous_height
+    
+    @staticmethod
+    def _wait_timeout(timeout: Optional[float]) -> float:
+        return SCRAPE_WAIT_TIMEOUT if timeout is None else timeout
+    
+    def network_stats(self):
+        """
+        Per-page network accounting (network_filter.NetworkAccountant),
+        or None when the driver does not collect it.
+        """
+        return getattr(self, '_network', None)
+    
+    def _log_network_summary(self) -> None:
+        """Log the accounting totals; drivers call this when they quit."""
+        try:
+            stats = self.network_stats()
+        except Exception:
+            return
+        if stats is not None and stats.pages:
+            log.info(f"{type(self).__name__} network: {stats.summary()}")
+    
+    def reset_session(self) -> None:
+        """
+        Leave the browser blank for the next user (used by the browser pool).
+        Override to also clear cookies; the default only navigates away.
+        """
+        self.get("about:blank")
+    
     def is_bot_detected(self) -> bool:
         """
         Check if bot detection has been triggered.
@@ -0,0 +1,371 @@
+"""
+Browser Pool
+============
+
+Per-process pool of long-lived scraper browsers.
+
+Every scraper used to launch a full Chrome through DriverFactory and quit
+it again when done, so each task paid the browser cold start (often
+5-15s, more with xvfb and stealth patches). The pool keeps finished
+browsers alive and hands them to the next scraper of the same kind:
+
+    - lease/return: acquire() returns a PooledDriver; its quit() gives
+      the browser back instead of closing it
+    - health checks: an idle browser must answer a trivial script before
+      it is leased again; dead ones are closed and replaced (crash
+      recovery)
+    - recycling: browsers older than BROWSER_POOL_MAX_AGE seconds or past
+      BROWSER_POOL_MAX_PAGES navigations are closed on return
+    - reset: returned browsers are sent to about:blank with cookies
+      cleared, so a lease starts like a fresh browser
+
+Browsers are keyed by the DriverFactory arguments (headless, driver
+preference, proxy), so a lease never changes proxy or driver type. The
+pool belongs to one process: a Celery prefork child that inherits a pool
+from its parent starts empty instead of sharing the parent's browsers.
+
+Configuration (environment):
+    BROWSER_POOL_ENABLED     Use the pool in get_driver() (default 1)
+    BROWSER_POOL_MAX_IDLE    Idle browsers kept per key (default 1)
+    BROWSER_POOL_MAX_AGE     Seconds before a browser is recycled (default 1800)
+    BROWSER_POOL_MAX_PAGES   Navigations before a browser is recycled (default 200)
+
+Usage:
+    from socialmedia.drivers import get_browser_pool
+
+    with get_browser_pool().lease(force_undetected=True) as browser:
+        browser.get("https://www.instagram.com/")
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .base_scraper import BaseScraper
+
+log = logging.getLogger(__name__)
+
+BROWSER_POOL_ENABLED = os.getenv("BROWSER_POOL_ENABLED", "1").lower() not in ("0", "false", "no")
+BROWSER_POOL_MAX_IDLE = int(os.getenv("BROWSER_POOL_MAX_IDLE", "1"))
+BROWSER_POOL_MAX_AGE = float(os.getenv("BROWSER_POOL_MAX_AGE", "1800"))
+BROWSER_POOL_MAX_PAGES = int(os.getenv("BROWSER_POOL_MAX_PAGES", "200"))
+
+# (headless, force_playwright, force_undetected, proxy)
+PoolKey = Tuple[bool, bool, bool, Optional[str]]
+
+
+class _PooledBrowser:
+    """One browser owned by the pool, with its usage counters."""
+
+    __slots__ = ("key", "driver", "driver_type", "created_at", "pages", "leases")
+
+    def __init__(self, key: PoolKey, driver: BaseScraper, driver_type: str):
+        self.key = key
+        self.driver = driver
+        self.driver_type = driver_type
+        self.created_at = time.monotonic()
+        self.pages = 0
+        self.leases = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Lease
+# ─────────────────────────────────────────────────────────────────────────────
+class PooledDriver(BaseScraper):
+    """
+    A leased browser behind the BaseScraper interface.
+
+    Calls go to the pooled driver; driver-specific attributes (.driver,
+    .sb, .page, solve_captcha, ...) are forwarded as well. quit() returns
+    the browser to the pool, discard() closes it for good (e.g. after bot
+    detection). Navigations through get() count towards max_pages; code
+    that navigates the underlying Selenium driver directly is counted as
+    one page per lease.
+    """
+
+    def __init__(self, pool: "BrowserPool", browser: _PooledBrowser):
+        self._pool = pool
+        self._browser = browser
+        self._pages = 0
+
+    @property
+    def wrapped(self) -> BaseScraper:
+        if self._browser is None:
+            raise RuntimeError("Browser lease already returned to the pool")
+        return self._browser.driver
+
+    @property
+    def driver_type(self) -> str:
+        return self._browser.driver_type if self._browser else None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes PooledDriver does not define itself
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.wrapped, name)
+
+    def setup(self) -> None:
+        # Pooled browsers are set up by the pool
+        pass
+
+    def get(self, url: str, *args, **kwargs) -> None:
+        self._pages += 1
+        return self.wrapped.get(url, *args, **kwargs)
+
+    def find_element(self, by: str, value: str) -> Any:
+        return self.wrapped.find_element(by, value)
+
+    def find_elements(self, by: str, value: str) -> List[Any]:
+        return self.wrapped.find_elements(by, value)
+
+    @property
+    def page_source(self) -> str:
+        return self.wrapped.page_source
+
+    @property
+    def current_url(self) -> str:
+        return self.wrapped.current_url
+
+    @property
+    def title(self) -> str:
+        return self.wrapped.title
+
+    def execute_script(self, script: str, *args) -> Any:
+        return self.wrapped.execute_script(script, *args)
+
+    def get_cookies(self) -> List[Dict]:
+        return self.wrapped.get_cookies()
+
+    def add_cookie(self, cookie: Dict) -> None:
+        self.wrapped.add_cookie(cookie)
+
+    def save_screenshot(self, filename: str) -> None:
+        self.wrapped.save_screenshot(filename)
+
+    def set_page_load_timeout(self, timeout: int) -> None:
+        self.wrapped.set_page_load_timeout(timeout)
+
+    def reset_session(self) -> None:
+        self.wrapped.reset_session()
+
+    def wait_for_selector(self, selector: str, timeout: Optional[float] = None,
+                          visible: bool = False) -> bool:
+        return self.wrapped.wait_for_selector(selector, timeout, visible)
+
+    def wait_for_network_idle(self, idle_time: float = 0.5, timeout: Optional[float] = None) -> bool:
+        return self.wrapped.wait_for_network_idle(idle_time, timeout)
+
+    def wait_for_scroll_height_change(self, previous_height: int, timeout: Optional[float] = None) -> int:
+        return self.wrapped.wait_for_scroll_height_change(previous_height, timeout)
+
+    def network_stats(self):
+        return self.wrapped.network_stats()
+
+    def is_bot_detected(self) -> bool:
+        return self.wrapped.is_bot_detected()
+
+    def quit(self) -> None:
+        """Return the browser to the pool (safe to call twice)."""
+        self._finish(discard=False)
+
+    def discard(self) -> None:
+        """Close the browser instead of returning it."""
+        self._finish(discard=True)
+
+    def _finish(self, discard: bool) -> None:
+        browser, self._browser = self._browser, None
+        if browser is None:
+            return
+        browser.pages += max(self._pages, 1)
+        self._pool.release(browser, discard=discard)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pool
+# ─────────────────────────────────────────────────────────────────────────────
+class BrowserPool:
+    """
+    Keeps idle browsers per DriverFactory configuration.
+
+    Args:
+        factory: Callable with DriverFactory.create's signature
+        max_idle: Idle browsers kept per key; extra returns are closed
+        max_age: Seconds after which a browser is recycled
+        max_pages: Navigations after which a browser is recycled
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Tuple[BaseScraper, str]],
+        max_idle: int = BROWSER_POOL_MAX_IDLE,
+        max_age: float = BROWSER_POOL_MAX_AGE,
+        max_pages: int = BROWSER_POOL_MAX_PAGES,
+    ):
+        self.factory = factory
+        self.max_idle = max_idle
+        self.max_age = max_age
+        self.max_pages = max_pages
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "crashed": 0}
+        self._idle: Dict[PoolKey, List[_PooledBrowser]] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _check_process(self) -> None:
+        # Browsers inherited through fork belong to the parent process:
+        # forget them without quitting
+        if os.getpid() != self._pid:
+            self._idle = {}
+            self._pid = os.getpid()
+
+    def _expired(self, browser: _PooledBrowser) -> bool:
+        return browser.age >= self.max_age or browser.pages >= self.max_pages
+
+    @staticmethod
+    def _healthy(browser: _PooledBrowser) -> bool:
+        try:
+            return browser.driver.execute_script("return 1") == 1
+        except Exception as e:
+            log.warning(f"Pooled {browser.driver_type} browser failed health check: {e}")
+            return False
+
+    @staticmethod
+    def _close(browser: _PooledBrowser) -> None:
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            log.warning(f"Error closing pooled {browser.driver_type} browser: {e}")
+
+    def acquire(
+        self,
+        headless: bool = True,
+        force_playwright: bool = False,
+        force_undetected: bool = False,
+        proxy: Optional[str] = None,
+    ) -> Tuple[PooledDriver, str]:
+        """
+        Lease a browser; same arguments and return value as get_driver().
+
+        An idle browser of the same configuration is reused when it is
+        still young and answers the health check; otherwise a new one is
+        launched through the factory.
+        """
+        key = (headless, force_playwright, force_undetected, proxy)
+        with self._lock:
+            self._check_process()
+            idle = self._idle.get(key, [])
+            candidates, idle[:] = list(idle), []
+
+        browser = None
+        while candidates:
+            candidate = candidates.pop()
+            if self._expired(candidate):
+                self._count("recycled")
+                self._close(candidate)
+            elif not self._healthy(candidate):
+                self._count("crashed")
+                self._close(candidate)
+            else:
+                browser = candidate
+                break
+        for leftover in candidates:
+            self._release_idle(leftover)
+
+        if browser is None:
+            driver, driver_type = self.factory(
+                headless=headless,
+                force_playwright=force_playwright,
+                force_undetected=force_undetected,
+                proxy=proxy,
+            )
+            browser = _PooledBrowser(key, driver, driver_type)
+            self._count("created")
+        else:
+            self._count("reused")
+            log.info(f"Reusing pooled {browser.driver_type} browser "
+                     f"(age {browser.age:.0f}s, {browser.pages} pages)")
+
+        browser.leases += 1
+        return PooledDriver(self, browser), browser.driver_type
+
+    def release(self, browser: _PooledBrowser, discard: bool = False) -> None:
+        """Take a browser back: keep it idle, or close it if spent or broken."""
+        if discard:
+            self._close(browser)
+            return
+        if self._expired(browser):
+            self._count("recycled")
+            self._close(browser)
+            return
+        try:
+            browser.driver.reset_session()
+        except Exception as e:
+            log.warning(f"Pooled {browser.driver_type} browser failed to reset: {e}")
+            self._count("crashed")
+            self._close(browser)
+            return
+        self._release_idle(browser)
+
+    def _count(self, stat: str) -> None:
+        """Bump a stats counter (leases run on several threads)."""
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _release_idle(self, browser: _PooledBrowser) -> None:
+        with self._lock:
+            self._check_process()
+            idle = self._idle.setdefault(browser.key, [])
+            if len(idle) < self.max_idle:
+                idle.append(browser)
+                return
+        self._close(browser)
+
+    @contextmanager
+    def lease(self, **kwargs) -> Iterator[PooledDriver]:
+        """Lease a browser for a with-block; it is discarded if the block raises."""
+        driver, _ = self.acquire(**kwargs)
+        try:
+            yield driver
+        except BaseException:
+            driver.discard()
+            raise
+        else:
+            driver.quit()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+    def shutdown(self) -> None:
+        """Close every idle browser (leased ones close when returned)."""
+        with self._lock:
+            self._check_process()
+            idle = [browser for browsers in self._idle.values() for browser in browsers]
+            self._idle = {}
+        for browser in idle:
+            self._close(browser)
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide browser pool, closed at interpreter exit."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from .driver_factory import DriverFactory
+            _pool = BrowserPool(DriverFactory.create)
+            atexit.register(_pool.shutdown)
+        return _pool
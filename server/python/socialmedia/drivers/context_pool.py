@@ -0,0 +1,254 @@
+"""
+Playwright Context Pool
+=======================
+
+Concurrent scraping with N isolated browser contexts in one Chromium
+process.
+
+The weekly schedulers scraped competitors one at a time with a fixed
+sleep in between, so wall time grew linearly with the competitor count.
+PlaywrightContextPool starts Playwright's Chromium with a local DevTools
+port and runs N worker threads. Each worker opens its own
+PlaywrightStealthDriver context through connect_over_cdp, with its own
+cookies, storage and stealth patches, and pulls items from one shared
+work queue until it is empty. The Playwright sync API is per-thread, so
+every worker keeps its own Playwright connection, the same way
+SeleniumBaseDriver attaches Playwright to its CDP browser.
+
+Per-site rates are bounded by a PolitenessLimiter shared by all
+contexts. It limits page navigations per domain (www. stripped):
+
+    - max_in_flight: navigations to one domain running at once
+    - min_interval: seconds between navigation starts to one domain
+
+So adding contexts raises throughput across sites, and waits on
+rendering and scrolling overlap, but never the request rate against
+any one site.
+
+Usage:
+    from socialmedia.drivers.context_pool import PlaywrightContextPool, PolitenessLimiter
+
+    pool = PlaywrightContextPool(workers=4, limiter=PolitenessLimiter(2, 2.0))
+    results = pool.run(competitors, handler=lambda scraper, c: scrape(scraper, c),
+                       init=lambda driver: TikTokScraper(driver=driver, driver_type='playwright'))
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import logging
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from .playwright_stealth_driver import LAUNCH_ARGS, PlaywrightStealthDriver, playwright_proxy
+
+log = logging.getLogger(__name__)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-domain politeness
+# ─────────────────────────────────────────────────────────────────────────────
+class PolitenessLimiter:
+    """
+    Thread-safe per-domain navigation limiter.
+
+    Args:
+        max_in_flight: Concurrent navigations allowed per domain
+        min_interval: Minimum seconds between navigation starts per domain
+    """
+
+    def __init__(self, max_in_flight: int = 1, min_interval: float = 0.0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.min_interval = max(0.0, min_interval)
+        self._cond = threading.Condition()
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._last_start: Dict[str, float] = {}
+
+    @staticmethod
+    def domain(url: str) -> str:
+        host = (urlparse(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def _wait_time(self, domain: str, now: float) -> Optional[float]:
+        """0 when a navigation may start; else seconds to wait (None: until notified)."""
+        if self._in_flight[domain] >= self.max_in_flight:
+            return None
+        last = self._last_start.get(domain)
+        if last is None:
+            return 0.0
+        return max(0.0, last + self.min_interval - now)
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Hold one navigation slot for the domain of url."""
+        domain = self.domain(url)
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(domain, now)
+                if wait == 0.0:
+                    break
+                self._cond.wait(timeout=wait)
+            self._in_flight[domain] += 1
+            self._last_start[domain] = now
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight[domain] -= 1
+                self._cond.notify_all()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Context pool
+# ─────────────────────────────────────────────────────────────────────────────
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class PlaywrightContextPool:
+    """
+    Runs work items on N browser contexts of one shared Chromium.
+
+    Args:
+        workers: Number of contexts (worker threads)
+        headless: Run the shared browser headless
+        proxy: Optional proxy for the shared browser (all contexts)
+        limiter: PolitenessLimiter shared by all contexts
+    """
+
+    def __init__(self, workers: int = 2, headless: bool = True,
+                 proxy: Optional[str] = None, limiter: Optional[PolitenessLimiter] = None):
+        self.workers = max(1, workers)
+        self.headless = headless
+        self.proxy = proxy
+        self.limiter = limiter or PolitenessLimiter()
+
+    @contextmanager
+    def _shared_browser(self) -> Iterator[str]:
+        """Start the shared Chromium and yield its DevTools endpoint."""
+        from playwright.sync_api import sync_playwright
+
+        # Playwright's bundled Chromium, started as a plain process: no
+        # client connection in this thread has to keep reading its events
+        with sync_playwright() as playwright:
+            executable = playwright.chromium.executable_path
+
+        port = _free_port()
+        endpoint = f"http://127.0.0.1:{port}"
+        profile_dir = tempfile.mkdtemp(prefix="scrape-contexts-")
+        args = [executable, *LAUNCH_ARGS, f"--remote-debugging-port={port}",
+                f"--user-data-dir={profile_dir}", "--no-first-run"]
+        if self.headless:
+            args.append("--headless=new")
+        if self.proxy:
+            args.append(f"--proxy-server={playwright_proxy(self.proxy)['server']}")
+        args.append("about:blank")
+
+        process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            self._wait_for_endpoint(endpoint, process)
+            yield endpoint
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    @staticmethod
+    def _wait_for_endpoint(endpoint: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Shared browser exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(f"{endpoint}/json/version", timeout=2):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError(f"Shared browser did not open {endpoint} within {timeout:.0f}s")
+
+    def _work(self, endpoint: str, items: "queue.Queue", results: List[Any],
+              handler: Callable[[Any, Any], Any], init: Optional[Callable[[Any], Any]]) -> None:
+        driver = PlaywrightStealthDriver(headless=self.headless, limiter=self.limiter)
+        try:
+            driver.setup(cdp_endpoint=endpoint)
+            state = init(driver) if init else driver
+        except Exception as e:
+            log.error(f"Browser context failed to start: {e}")
+            driver.quit()
+            return
+
+        try:
+            while True:
+                try:
+                    index, item = items.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    results[index] = handler(state, item)
+                except Exception as e:
+                    log.error(f"Work item {index} failed: {e}")
+        finally:
+            # A scraper that switched to a fallback browser owns it
+            if state is not driver and hasattr(state, "close"):
+                state.close()
+            driver.quit()
+
+    def run(self, items: Sequence[Any], handler: Callable[[Any, Any], Any],
+            init: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+        """
+        Process items on all contexts.
+
+        Args:
+            items: Work items, consumed from one shared queue
+            handler: handler(state, item) -> result, called on a worker thread
+            init: init(driver) -> state, once per context (default: the driver)
+
+        Returns:
+            Results in item order; None for items that raised or were never
+            processed because every context failed to start
+        """
+        results: List[Any] = [None] * len(items)
+        if not items:
+            return results
+
+        work: "queue.Queue" = queue.Queue()
+        for entry in enumerate(items):
+            work.put(entry)
+
+        started = time.monotonic()
+        with self._shared_browser() as endpoint:
+            threads = [
+                threading.Thread(
+                    target=self._work,
+                    args=(endpoint, work, results, handler, init),
+                    name=f"scrape-context-{n}",
+                    daemon=True,
+                )
+                for n in range(min(self.workers, len(items)))
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        if not work.empty():
+            log.error(f"{work.qsize()} work items left unprocessed: no browser context could start")
+        log.info(f"Context pool processed {len(items)} items on {len(threads)} contexts "
+                 f"in {time.monotonic() - started:.1f}s")
+        return results
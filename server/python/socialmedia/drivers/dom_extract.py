@@ -0,0 +1,214 @@
+"""
+DOM Extract
+===========
+
+Single-round-trip page extraction for the scrapers.
+
+The scrapers collected page data with WebDriver calls per element: a
+find_elements per selector, then .text / .get_attribute per match, and on
+TikTok video pages dozens of XPath fallbacks tried one after another,
+each a round trip with its own NoSuchElementException. extract_page()
+injects one script per page instead. The script evaluates a spec inside
+the page and returns every value as one JSON object, so a page costs one
+execute_script call however many selectors it tries.
+
+A spec has three sections:
+
+    fields  name -> candidate selectors, tried in order inside the page;
+            the first non-empty value wins (like the old for/try loops)
+    links   name -> selectors whose matches are collected (deduplicated,
+            absolute hrefs), optionally filtered by substrings
+    lists   name -> container selectors (first one with at least
+            min_matches matches wins), a limit and per-item fields
+            relative to each container; items missing the "require"
+            field are dropped
+
+Selectors starting with "/", "./" or "(" are XPath ("." alone is the
+list item itself), everything else is CSS. A candidate is a selector
+string (element text) or a (selector, attribute) tuple; a field given as
+a dict may add a "match" regex the value must satisfy. Every result also
+carries the page's scroll height, so scroll loops need no extra call.
+
+The script is plain JavaScript that returns a JSON string, so it runs
+unchanged through Selenium's execute_script and the Playwright-based
+drivers' evaluate().
+
+Usage:
+    from socialmedia.drivers.dom_extract import extract_page
+
+    SPEC = {
+        "fields": {"author": ["//span[@data-e2e='browse-username']", "//h1//span"],
+                   "likes": [("strong[data-e2e='like-count']", "aria-label")]},
+        "links": {"videos": {"query": "div[data-e2e='user-post-item'] a", "contains": ["/video/"]}},
+    }
+    page = extract_page(driver, SPEC)
+    page["author"], page["videos"], page["height"]
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, List, Union
+
+log = logging.getLogger(__name__)
+
+Candidate = Union[str, tuple]
+
+_EXTRACT_SCRIPT = r"""
+(function (spec) {
+  var started = performance.now();
+  function isXPath(query) { return query === "." || /^(\.?\/|\()/.test(query); }
+  function find(query, root) {
+    root = root || document;
+    if (isXPath(query)) {
+      var snapshot = document.evaluate(query, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      var nodes = [];
+      for (var i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+      return nodes;
+    }
+    return Array.prototype.slice.call(root.querySelectorAll(query));
+  }
+  function read(el, attr) {
+    var value;
+    if (!attr) value = el.innerText !== undefined ? el.innerText : el.textContent;
+    else if ((attr === "href" || attr === "src") && el[attr]) value = el[attr];
+    else value = el.getAttribute(attr);
+    return value ? String(value).trim() : "";
+  }
+  function first(field, root) {
+    var pattern = field.match ? new RegExp(field.match, "i") : null;
+    for (var i = 0; i < field.candidates.length; i++) {
+      var c = field.candidates[i];
+      try {
+        var nodes = find(c.query, root);
+        if (!nodes.length) continue;
+        var value = read(nodes[0], c.attr);
+        if (value && (!pattern || pattern.test(value))) return value;
+      } catch (e) {}
+    }
+    return "";
+  }
+  var result = {};
+  Object.keys(spec.fields).forEach(function (name) {
+    result[name] = first(spec.fields[name], document);
+  });
+  Object.keys(spec.links).forEach(function (name) {
+    var group = spec.links[name], seen = {}, values = [];
+    group.queries.forEach(function (query) {
+      try {
+        find(query).forEach(function (el) {
+          var value = read(el, group.attr);
+          if (!value || seen[value]) return;
+          if (group.contains.length && !group.contains.some(function (s) { return value.indexOf(s) >= 0; })) return;
+          seen[value] = true;
+          values.push(value);
+        });
+      } catch (e) {}
+    });
+    result[name] = values;
+  });
+  Object.keys(spec.lists).forEach(function (name) {
+    var list = spec.lists[name], items = [];
+    for (var i = 0; i < list.containers.length; i++) {
+      var nodes;
+      try { nodes = find(list.containers[i]); } catch (e) { continue; }
+      if (nodes.length < list.min_matches) continue;
+      nodes.slice(0, list.limit).forEach(function (node) {
+        var item = {};
+        Object.keys(list.fields).forEach(function (key) { item[key] = first(list.fields[key], node); });
+        if (!list.require || item[list.require]) items.push(item);
+      });
+      break;
+    }
+    result[name] = items;
+  });
+  result.height = document.body ? document.body.scrollHeight : 0;
+  result.script_ms = Math.round((performance.now() - started) * 10) / 10;
+  return JSON.stringify(result);
+})(__SPEC__)
+"""
+
+
+def _candidate(candidate: Candidate) -> Dict[str, Any]:
+    if isinstance(candidate, str):
+        return {"query": candidate, "attr": None}
+    query, attr = candidate
+    return {"query": query, "attr": attr}
+
+
+def _field(field: Union[List[Candidate], Dict[str, Any]]) -> Dict[str, Any]:
+    if isinstance(field, dict):
+        return {"candidates": [_candidate(c) for c in field["candidates"]], "match": field.get("match")}
+    return {"candidates": [_candidate(c) for c in field], "match": None}
+
+
+def compile_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a spec into the form the page script reads."""
+    links = {}
+    for name, group in spec.get("links", {}).items():
+        queries = group["query"]
+        links[name] = {
+            "queries": [queries] if isinstance(queries, str) else list(queries),
+            "attr": group.get("attr", "href"),
+            "contains": list(group.get("contains", ())),
+        }
+    lists = {}
+    for name, group in spec.get("lists", {}).items():
+        lists[name] = {
+            "containers": list(group["containers"]),
+            "limit": group.get("limit", 20),
+            "min_matches": group.get("min_matches", 1),
+            "fields": {key: _field(f) for key, f in group["fields"].items()},
+            "require": group.get("require"),
+        }
+    return {
+        "fields": {name: _field(f) for name, f in spec.get("fields", {}).items()},
+        "links": links,
+        "lists": lists,
+    }
+
+
+def build_script(spec: Dict[str, Any]) -> str:
+    """
+    The page script for a spec. The spec is embedded as a JSON literal and
+    the script starts with "return", which the Playwright-based drivers
+    turn into an arrow function.
+    """
+    return "return " + _EXTRACT_SCRIPT.strip().replace("__SPEC__", json.dumps(compile_spec(spec)))
+
+
+def _empty_result(spec: Dict[str, Any]) -> Dict[str, Any]:
+    result: Dict[str, Any] = {name: "" for name in spec.get("fields", {})}
+    result.update({name: [] for name in spec.get("links", {})})
+    result.update({name: [] for name in spec.get("lists", {})})
+    result["height"] = 0
+    return result
+
+
+def extract_page(driver, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a spec against the current page with one execute_script call.
+
+    Args:
+        driver: Any driver with execute_script (Selenium or the BaseScraper drivers)
+        spec: fields / links / lists spec (see module docstring)
+
+    Returns:
+        Dict with one key per spec entry plus "height"; on script failure
+        every field is "" and every collection empty, so callers fall back
+        the same way as when nothing matched
+    """
+    result = _empty_result(spec)
+    started = time.monotonic()
+    try:
+        raw = driver.execute_script(build_script(spec))
+        result.update(json.loads(raw) if isinstance(raw, str) else raw)
+    except Exception as e:
+        log.warning(f"Page extraction failed: {e}")
+        return result
+    log.debug(f"Extracted page in {(time.monotonic() - started) * 1000:.0f}ms "
+              f"(in-page {result.get('script_ms')}ms)")
+    return result
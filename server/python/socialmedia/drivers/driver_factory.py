@@ -10,6 +10,8 @@ from .seleniumbase_driver import SeleniumBaseDriver
 from .playwright_stealth_driver import PlaywrightStealthDriver
 from .undetected_chrome_driver import UndetectedChromeDriver
 from .base_scraper import BaseScraper
+from .browser_pool import BROWSER_POOL_ENABLED, get_browser_pool
+from .fixture_driver import capture
 
 log = logging.getLogger(__name__)
 
@@ -92,6 +94,7 @@ def get_driver(
     force_playwright: bool = False,
     force_undetected: bool = False,
     proxy: Optional[str] = None,
+    pooled: Optional[bool] = None,
 ) -> Tuple[BaseScraper, str]:
     """
     Convenience function to get a scraper driver.
@@ -101,16 +104,31 @@ def get_driver(
         force_playwright: Skip other drivers and use Playwright directly
         force_undetected: Use undetected-chromedriver (best for anti-bot sites)
         proxy: Optional proxy string
+        pooled: Lease from the per-process browser pool; quit() then returns
+            the browser instead of closing it (default: BROWSER_POOL_ENABLED)
+    
+    With SCRAPE_CAPTURE_DIR set, the driver is wrapped in a CaptureDriver
+    that records every visited page (see fixture_driver).
     
     Returns:
         Tuple of (driver instance, driver type string)
     """
-    return DriverFactory.create(
-        headless=headless, 
-        force_playwright=force_playwright, 
-        force_undetected=force_undetected,
-        proxy=proxy
-    )
+    if BROWSER_POOL_ENABLED if pooled is None else pooled:
+        driver, driver_type = get_browser_pool().acquire(
+            headless=headless,
+            force_playwright=force_playwright,
+            force_undetected=force_undetected,
+            proxy=proxy
+        )
+    else:
+        driver, driver_type = DriverFactory.create(
+            headless=headless, 
+            force_playwright=force_playwright, 
+            force_undetected=force_undetected,
+            proxy=proxy
+        )
+    # Record the visited pages as fixtures when SCRAPE_CAPTURE_DIR is set
+    return capture(driver), driver_type
 
 
 def switch_to_fallback(
@@ -133,7 +151,11 @@ def switch_to_fallback(
     log.info("Switching to fallback driver due to bot detection...")
     
     try:
-        current_driver.quit()
+        # A pooled browser that tripped bot detection must not be leased again
+        if hasattr(current_driver, 'discard'):
+            current_driver.discard()
+        else:
+            current_driver.quit()
     except Exception as e:
         log.warning(f"Error closing current driver: {e}")
     
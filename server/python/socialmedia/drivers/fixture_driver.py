@@ -0,0 +1,527 @@
+"""
+Fixture Driver
+==============
+
+Offline replay of recorded pages, for deterministic scraper tests and
+benchmarks.
+
+Scraper parsing could only be exercised against the live sites, so its
+speed and correctness changed with whatever Instagram or TikTok served
+that minute. Pages are now recorded once and replayed without a browser:
+
+    - CaptureDriver wraps any driver and records every page it visits:
+      the final page source, URL, title and cookies, plus the results of
+      execute_script and the load waits. get_driver() wraps its drivers
+      in one when SCRAPE_CAPTURE_DIR is set
+    - FixtureDriver implements BaseScraper on such a corpus: get() loads
+      the recorded visit, page_source / find_element(s) work on the
+      recorded HTML, execute_script and the waits replay the recorded
+      results in call order (the last one repeats)
+
+A corpus is a directory with one <key>.json (metadata and call results)
+and one <key>.html (page source) per visit. Script results are keyed by
+a hash of the script text and arguments, so a changed extraction spec
+needs a fresh capture; unrecorded scripts return None like a script
+without a return value. A URL visited several times replays its visits
+in order.
+
+find_element(s) evaluate CSS selectors with BeautifulSoup and XPath with
+lxml; elements offer the WebElement basics (text, get_attribute,
+is_displayed, nested find_element(s)) and clicks are no-ops.
+
+Configuration (environment):
+    SCRAPE_CAPTURE_DIR   Record every driver from get_driver() into this corpus
+
+Usage:
+    # capture
+    SCRAPE_CAPTURE_DIR=fixtures/tiktok python -m socialmedia.tiktok.scraper.profile_scraper
+
+    # replay
+    from socialmedia.drivers.fixture_driver import FixtureDriver
+
+    scraper = TikTokScraper(driver_type="fixture", driver=FixtureDriver("fixtures/tiktok"))
+    scraper.scrape_video("https://www.tiktok.com/@brand/video/7301234567890123456")
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from .base_scraper import BaseScraper, is_xpath
+
+log = logging.getLogger(__name__)
+
+SCRAPE_CAPTURE_DIR = os.getenv("SCRAPE_CAPTURE_DIR", "")
+
+
+class FixtureMissError(LookupError):
+    """The corpus has no recording of the requested URL."""
+    pass
+
+
+def script_key(script: str, args: tuple = ()) -> str:
+    """Key of an execute_script call in a recording."""
+    payload = script if not args else script + "\x00" + json.dumps(args, sort_keys=True, default=str)
+    return "script:" + hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def wait_key(method: str, *args) -> str:
+    return f"{method}:{json.dumps(args)}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Recording
+# ─────────────────────────────────────────────────────────────────────────────
+class FixturePage:
+    """One recorded page visit."""
+
+    def __init__(self, url: str, current_url: str = "", title: str = "", html: str = "",
+                 cookies: Optional[List[Dict]] = None, calls: Optional[Dict[str, List[Any]]] = None,
+                 scripts: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.current_url = current_url or url
+        self.title = title
+        self.html = html
+        self.cookies = cookies or []
+        # key -> results in call order
+        self.calls = calls or {}
+        # script key -> start of the script, to tell recordings apart
+        self.scripts = scripts or {}
+
+    def record(self, key: str, result: Any, script: Optional[str] = None) -> None:
+        try:
+            json.dumps(result)
+        except (TypeError, ValueError):
+            return  # element handles and other live objects can't be replayed
+        self.calls.setdefault(key, []).append(result)
+        if script is not None:
+            self.scripts.setdefault(key, script[:120])
+
+    def record_script(self, script: str, args: tuple, result: Any) -> None:
+        self.record(script_key(script, args), result, script)
+
+    def save(self, directory: str, key: str) -> None:
+        with open(os.path.join(directory, f"{key}.html"), "w", encoding="utf-8") as f:
+            f.write(self.html)
+        meta = {
+            "url": self.url,
+            "current_url": self.current_url,
+            "title": self.title,
+            "cookies": self.cookies,
+            "calls": self.calls,
+            "scripts": self.scripts,
+        }
+        with open(os.path.join(directory, f"{key}.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+
+    @classmethod
+    def load(cls, meta_path: str) -> "FixturePage":
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(meta_path[:-len(".json")] + ".html", encoding="utf-8") as f:
+            html = f.read()
+        return cls(meta["url"], meta.get("current_url", ""), meta.get("title", ""), html,
+                   meta.get("cookies"), meta.get("calls"), meta.get("scripts"))
+
+
+class FixtureRecorder:
+    """Writes recorded visits into a corpus directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def save(self, page: FixturePage) -> str:
+        base = hashlib.sha1(page.url.encode("utf-8")).hexdigest()[:16]
+        with self._lock:
+            n = 0
+            while os.path.exists(os.path.join(self.directory, f"{base}-{n}.json")):
+                n += 1
+            key = f"{base}-{n}"
+            page.save(self.directory, key)
+        log.debug(f"Captured {page.url} as {key}")
+        return key
+
+
+class FixtureCorpus:
+    """The recorded visits of a corpus directory, by requested URL."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.pages: Dict[str, List[FixturePage]] = {}
+        # Visit numbers follow the recording order
+        for name in sorted(os.listdir(directory), key=self._visit_order):
+            if name.endswith(".json"):
+                page = FixturePage.load(os.path.join(directory, name))
+                self.pages.setdefault(page.url, []).append(page)
+        self._visits: Dict[str, int] = {}
+
+    @staticmethod
+    def _visit_order(name: str):
+        base, _, rest = name.partition("-")
+        number = rest.split(".", 1)[0]
+        return (base, int(number) if number.isdigit() else 0, name)
+
+    def __len__(self) -> int:
+        return sum(len(visits) for visits in self.pages.values())
+
+    def urls(self) -> List[str]:
+        return list(self.pages)
+
+    def visit(self, url: str) -> Optional[FixturePage]:
+        """The next recorded visit of url (the last one repeats)."""
+        visits = self.pages.get(url)
+        if not visits:
+            return None
+        n = self._visits.get(url, 0)
+        self._visits[url] = n + 1
+        return visits[min(n, len(visits) - 1)]
+
+    def rewind(self) -> None:
+        self._visits.clear()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Elements
+# ─────────────────────────────────────────────────────────────────────────────
+_CSS_LOCATORS = {
+    By.ID: lambda v: f"#{v}",
+    By.CLASS_NAME: lambda v: f".{v}",
+    By.NAME: lambda v: f'[name="{v}"]',
+    By.TAG_NAME: lambda v: v,
+    By.CSS_SELECTOR: lambda v: v,
+}
+
+
+def _find_all(root, by: str, value: str) -> List["FixtureElement"]:
+    """Match a Selenium locator below a BeautifulSoup node."""
+    if by == By.XPATH:
+        from bs4 import BeautifulSoup
+        from lxml import html as lxml_html  # XPath needs lxml (requirements.txt)
+
+        tree = lxml_html.document_fromstring(str(root) or "<html></html>")
+        return [
+            FixtureElement(BeautifulSoup(lxml_html.tostring(node, encoding="unicode", with_tail=False),
+                                         "html.parser").find())
+            for node in tree.xpath(value) if isinstance(node, lxml_html.HtmlElement)
+        ]
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        exact = by == By.LINK_TEXT
+        return [FixtureElement(a) for a in root.find_all("a")
+                if (a.get_text(strip=True) == value if exact else value in a.get_text())]
+    convert = _CSS_LOCATORS.get(by)
+    if convert is None:
+        raise ValueError(f"Unsupported locator: {by}")
+    return [FixtureElement(node) for node in root.select(convert(value))]
+
+
+class FixtureElement:
+    """A recorded element with the WebElement basics."""
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.name
+
+    @property
+    def text(self) -> str:
+        return self._node.get_text(" ", strip=True)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        if name in ("innerText", "textContent"):
+            return self._node.get_text()
+        if name == "outerHTML":
+            return str(self._node)
+        value = self._node.get(name)
+        return " ".join(value) if isinstance(value, list) else value
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def click(self) -> None:
+        pass
+
+    def send_keys(self, *values) -> None:
+        pass
+
+    def find_element(self, by: str, value: str) -> "FixtureElement":
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element for {by}={value!r} in fixture")
+        return found[0]
+
+    def find_elements(self, by: str, value: str) -> List["FixtureElement"]:
+        return _find_all(self._node, by, value)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Replay
+# ─────────────────────────────────────────────────────────────────────────────
+class FixtureDriver(BaseScraper):
+    """
+    BaseScraper over a recorded corpus; no browser, no network.
+
+    Args:
+        corpus: Corpus directory or a loaded FixtureCorpus
+        strict: Raise FixtureMissError for unrecorded URLs (otherwise an
+            empty page is served)
+    """
+
+    def __init__(self, corpus: Union[str, FixtureCorpus], strict: bool = True):
+        self.corpus = corpus if isinstance(corpus, FixtureCorpus) else FixtureCorpus(corpus)
+        self.strict = strict
+        self._page = FixturePage("about:blank")
+        self._cursor: Dict[str, int] = {}
+        self._soup = None
+        self._cookies: List[Dict] = []
+
+    @property
+    def driver(self) -> "FixtureDriver":
+        # Scrapers written for Selenium use .driver as the raw driver
+        return self
+
+    def setup(self, *args, **kwargs) -> None:
+        pass
+
+    def get(self, url: str, *args, **kwargs) -> None:
+        page = self.corpus.visit(url)
+        if page is None:
+            if self.strict:
+                raise FixtureMissError(f"No recording of {url}")
+            page = FixturePage(url)
+        self._page = page
+        self._cursor = {}
+        self._soup = None
+
+    def _replay(self, key: str, default: Any = None) -> Any:
+        results = self._page.calls.get(key)
+        if not results:
+            return default
+        n = self._cursor.get(key, 0)
+        self._cursor[key] = n + 1
+        return results[min(n, len(results) - 1)]
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            from bs4 import BeautifulSoup
+            self._soup = BeautifulSoup(self._page.html, "html.parser")
+        return self._soup
+
+    def find_element(self, by: str, value: str) -> FixtureElement:
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element for {by}={value!r} in fixture")
+        return found[0]
+
+    def find_elements(self, by: str, value: str) -> List[FixtureElement]:
+        return _find_all(self.soup, by, value)
+
+    @property
+    def page_source(self) -> str:
+        return self._page.html
+
+    @property
+    def current_url(self) -> str:
+        return self._page.current_url
+
+    @property
+    def title(self) -> str:
+        return self._page.title
+
+    def execute_script(self, script: str, *args) -> Any:
+        return self._replay(script_key(script, args))
+
+    def get_cookies(self) -> List[Dict]:
+        return list(self._page.cookies) + list(self._cookies)
+
+    def add_cookie(self, cookie: Dict) -> None:
+        self._cookies.append(cookie)
+
+    def delete_all_cookies(self) -> None:
+        self._cookies = []
+
+    def save_screenshot(self, filename: str) -> None:
+        pass
+
+    def set_page_load_timeout(self, timeout: int) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
+    def wait_for_selector(self, selector: str, timeout: Optional[float] = None,
+                          visible: bool = False) -> bool:
+        recorded = self._replay(wait_key("wait_for_selector", selector, visible))
+        if recorded is not None:
+            return recorded
+        try:
+            return bool(self.find_elements(By.XPATH if is_xpath(selector) else By.CSS_SELECTOR, selector))
+        except Exception:
+            return False
+
+    def wait_for_network_idle(self, idle_time: float = 0.5, timeout: Optional[float] = None) -> bool:
+        return self._replay(wait_key("wait_for_network_idle"), True)
+
+    def wait_for_scroll_height_change(self, previous_height: int, timeout: Optional[float] = None) -> int:
+        return self._replay(wait_key("wait_for_scroll_height_change"), previous_height)
+
+    def reset_session(self) -> None:
+        self._page = FixturePage("about:blank")
+        self._cookies = []
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Capture
+# ─────────────────────────────────────────────────────────────────────────────
+class CaptureDriver(BaseScraper):
+    """
+    Records a driver's visits into a corpus while forwarding every call.
+
+    .driver is the capture wrapper itself, so scrapers that work on the
+    raw Selenium driver are recorded too; other driver-specific attributes
+    (.page, .sb, discard, ...) are forwarded. A visit is written when the
+    next get() leaves it or the driver quits, with the page as it was then.
+    """
+
+    def __init__(self, wrapped: BaseScraper, recorder: FixtureRecorder):
+        self._wrapped = wrapped
+        self._recorder = recorder
+        self._page: Optional[FixturePage] = None
+
+    @property
+    def wrapped(self) -> BaseScraper:
+        return self._wrapped
+
+    @property
+    def driver(self) -> "CaptureDriver":
+        return self
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._wrapped, name)
+
+    def _finish_page(self) -> None:
+        page, self._page = self._page, None
+        if page is None:
+            return
+        for attr in ("current_url", "title", "page_source"):
+            try:
+                value = getattr(self._wrapped, attr)
+            except Exception as e:
+                log.debug(f"Capture could not read {attr}: {e}")
+                continue
+            setattr(page, "html" if attr == "page_source" else attr, value or "")
+        try:
+            page.cookies = self._wrapped.get_cookies()
+        except Exception:
+            pass
+        try:
+            self._recorder.save(page)
+        except OSError as e:
+            log.warning(f"Could not save capture of {page.url}: {e}")
+
+    def setup(self, *args, **kwargs) -> None:
+        self._wrapped.setup(*args, **kwargs)
+
+    def get(self, url: str, *args, **kwargs) -> None:
+        self._finish_page()
+        self._page = FixturePage(url)
+        return self._wrapped.get(url, *args, **kwargs)
+
+    def find_element(self, by: str, value: str) -> Any:
+        return self._wrapped.find_element(by, value)
+
+    def find_elements(self, by: str, value: str) -> List[Any]:
+        return self._wrapped.find_elements(by, value)
+
+    @property
+    def page_source(self) -> str:
+        return self._wrapped.page_source
+
+    @property
+    def current_url(self) -> str:
+        return self._wrapped.current_url
+
+    @property
+    def title(self) -> str:
+        return self._wrapped.title
+
+    def execute_script(self, script: str, *args) -> Any:
+        result = self._wrapped.execute_script(script, *args)
+        if self._page is not None:
+            self._page.record_script(script, args, result)
+        return result
+
+    def get_cookies(self) -> List[Dict]:
+        return self._wrapped.get_cookies()
+
+    def add_cookie(self, cookie: Dict) -> None:
+        self._wrapped.add_cookie(cookie)
+
+    def save_screenshot(self, filename: str) -> None:
+        self._wrapped.save_screenshot(filename)
+
+    def set_page_load_timeout(self, timeout: int) -> None:
+        self._wrapped.set_page_load_timeout(timeout)
+
+    def _record_wait(self, key: str, result: Any) -> Any:
+        if self._page is not None:
+            self._page.record(key, result)
+        return result
+
+    def wait_for_selector(self, selector: str, timeout: Optional[float] = None,
+                          visible: bool = False) -> bool:
+        return self._record_wait(wait_key("wait_for_selector", selector, visible),
+                                 self._wrapped.wait_for_selector(selector, timeout, visible))
+
+    def wait_for_network_idle(self, idle_time: float = 0.5, timeout: Optional[float] = None) -> bool:
+        return self._record_wait(wait_key("wait_for_network_idle"),
+                                 self._wrapped.wait_for_network_idle(idle_time, timeout))
+
+    def wait_for_scroll_height_change(self, previous_height: int, timeout: Optional[float] = None) -> int:
+        return self._record_wait(wait_key("wait_for_scroll_height_change"),
+                                 self._wrapped.wait_for_scroll_height_change(previous_height, timeout))
+
+    def network_stats(self):
+        return self._wrapped.network_stats()
+
+    def is_bot_detected(self) -> bool:
+        return self._wrapped.is_bot_detected()
+
+    def reset_session(self) -> None:
+        self._finish_page()
+        self._wrapped.reset_session()
+
+    def quit(self) -> None:
+        self._finish_page()
+        self._wrapped.quit()
+
+    def discard(self) -> None:
+        self._finish_page()
+        if hasattr(self._wrapped, "discard"):
+            self._wrapped.discard()
+        else:
+            self._wrapped.quit()
+
+
+def capture(driver: BaseScraper, directory: Optional[str] = None) -> BaseScraper:
+    """Wrap a driver in a CaptureDriver when a capture directory is set."""
+    directory = directory or SCRAPE_CAPTURE_DIR
+    if not directory:
+        return driver
+    log.info(f"Capturing visited pages into {directory}")
+    return CaptureDriver(driver, FixtureRecorder(directory))
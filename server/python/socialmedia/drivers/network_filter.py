@@ -0,0 +1,264 @@
+"""
+Network Filter
+==============
+
+Request blocking and per-page network accounting for the scraper
+drivers.
+
+The scrapers only read text, counts and media URLs, yet every profile,
+post and hashtag page downloaded all of its images, videos, fonts and
+analytics scripts. ResourcePolicy decides what to block, and all three
+drivers apply it inside the browser with the DevTools command
+Network.setBlockedURLs:
+
+    - PlaywrightStealthDriver / SeleniumBaseDriver: on a CDP session of
+      their page
+    - UndetectedChromeDriver: through execute_cdp_cmd
+
+Resource types map to URL patterns (file extensions, TikTok's
+mime_type=video query) plus the tracker domains. Playwright's
+context.route() could match real resource types, but with the sync API a
+route handler only runs while the scraper thread is inside a Playwright
+call, so every request made during the scrapers' sleeps would stall.
+Media URLs stay readable from the DOM (src attributes are not touched).
+
+NetworkAccountant turns Chrome DevTools events into per-page metrics:
+requests, blocked requests, encoded (wire) bytes and load latency
+(document request to load event). Playwright drivers feed it from their
+CDP session. Undetected Chrome feeds it from chromedriver's performance
+log, which also covers navigations made on the raw Selenium driver.
+
+Configuration (environment):
+    SCRAPE_BLOCK_RESOURCES   Resource types to block (default "image,media,font";
+                             empty or "none" disables)
+    SCRAPE_BLOCK_TRACKERS    Block known analytics/tracker domains (default 1)
+    SCRAPE_NETWORK_STATS     Collect per-page accounting (default 1)
+
+Usage:
+    driver.get(url)
+    ...
+    stats = driver.network_stats()      # NetworkAccountant
+    log.info(stats.summary())
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BLOCKED_TYPES = "image,media,font"
+
+# Third-party analytics and ad domains seen on Instagram/TikTok pages
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "connect.facebook.net",
+    "analytics.tiktok.com",
+    "analytics-sg.tiktok.com",
+    "mon.tiktokv.com",
+    "mcs.tiktokv.com",
+    "hotjar.com",
+    "sentry.io",
+)
+
+# URL patterns per resource type, for Network.setBlockedURLs
+_TYPE_URL_PATTERNS = {
+    "image": ("*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.heic*", "*.ico*"),
+    "media": ("*.mp4*", "*.webm*", "*.m4a*", "*.mp3*", "*.m3u8*", "*mime_type=video*"),
+    "font": ("*.woff*", "*.ttf*", "*.otf*", "*.eot*"),
+}
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in ("0", "false", "no", "")
+
+
+def network_stats_enabled() -> bool:
+    return _env_flag("SCRAPE_NETWORK_STATS", "1")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Blocking policy
+# ─────────────────────────────────────────────────────────────────────────────
+class ResourcePolicy:
+    """
+    What the drivers block.
+
+    Args:
+        blocked_types: Resource types with URL patterns ("image", "media", "font")
+        blocked_domains: Domains blocked with all their subdomains
+    """
+
+    def __init__(self, blocked_types: Iterable[str] = (), blocked_domains: Iterable[str] = ()):
+        self.blocked_types: FrozenSet[str] = frozenset(t.strip().lower() for t in blocked_types if t.strip())
+        self.blocked_domains = tuple(d.lower() for d in blocked_domains)
+
+    @classmethod
+    def from_env(cls) -> "ResourcePolicy":
+        types = os.getenv("SCRAPE_BLOCK_RESOURCES", DEFAULT_BLOCKED_TYPES)
+        if types.strip().lower() == "none":
+            types = ""
+        domains = TRACKER_DOMAINS if _env_flag("SCRAPE_BLOCK_TRACKERS", "1") else ()
+        return cls(types.split(","), domains)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.blocked_types or self.blocked_domains)
+
+    def url_patterns(self) -> List[str]:
+        """Equivalent wildcard patterns for Network.setBlockedURLs."""
+        patterns = [p for t in sorted(self.blocked_types) for p in _TYPE_URL_PATTERNS.get(t, ())]
+        patterns += [f"*{domain}/*" for domain in self.blocked_domains]
+        return patterns
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Accounting
+# ─────────────────────────────────────────────────────────────────────────────
+class PageMetrics:
+    """Network totals of one main-frame navigation."""
+
+    __slots__ = ("url", "requests", "blocked", "bytes", "load_ms", "_started")
+
+    def __init__(self, url: str, started: Optional[float] = None):
+        self.url = url
+        self.requests = 0
+        self.blocked = 0
+        self.bytes = 0
+        self.load_ms: Optional[float] = None
+        self._started = started
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "bytes": self.bytes,
+            "load_ms": self.load_ms,
+        }
+
+
+class NetworkAccountant:
+    """
+    Builds PageMetrics from Chrome DevTools Network/Page events.
+
+    A Document request in the main frame starts a new page; its timestamp
+    and Page.loadEventFired give the load latency. Timestamps are the
+    CDP monotonic clock, so they are only compared with each other.
+    """
+
+    def __init__(self):
+        self.pages: List[PageMetrics] = []
+        self._main_frame: Optional[str] = None
+
+    @property
+    def current(self) -> Optional[PageMetrics]:
+        return self.pages[-1] if self.pages else None
+
+    def _page(self) -> PageMetrics:
+        # Traffic before the first navigation (e.g. a blank start page)
+        if not self.pages:
+            self.pages.append(PageMetrics("about:blank"))
+        return self.pages[-1]
+
+    def feed(self, method: str, params: Dict[str, Any]) -> None:
+        """Account one CDP event."""
+        if method == "Network.requestWillBeSent":
+            if params.get("type") != "Document":
+                return
+            frame = params.get("frameId")
+            if self._main_frame is None:
+                self._main_frame = frame
+            if frame == self._main_frame:
+                self.pages.append(PageMetrics(params.get("documentURL", ""), params.get("timestamp")))
+        elif method == "Page.frameNavigated":
+            frame = params.get("frame", {})
+            if not frame.get("parentId"):
+                self._main_frame = frame.get("id")
+        elif method == "Network.loadingFinished":
+            page = self._page()
+            page.requests += 1
+            page.bytes += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed":
+            if params.get("blockedReason"):
+                self._page().blocked += 1
+        elif method == "Page.loadEventFired":
+            page = self.current
+            if page is not None and page._started is not None and page.load_ms is None:
+                page.load_ms = round((params["timestamp"] - page._started) * 1000, 1)
+
+    def feed_performance_log(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Account chromedriver performance log entries (goog:loggingPrefs)."""
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.feed(message.get("method", ""), message.get("params", {}))
+
+    def summary(self) -> Dict[str, Any]:
+        loads = [p.load_ms for p in self.pages if p.load_ms is not None]
+        return {
+            "pages": len(self.pages),
+            "requests": sum(p.requests for p in self.pages),
+            "blocked": sum(p.blocked for p in self.pages),
+            "bytes": sum(p.bytes for p in self.pages),
+            "avg_load_ms": round(sum(loads) / len(loads), 1) if loads else None,
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Driver hookups
+# ─────────────────────────────────────────────────────────────────────────────
+_ACCOUNTED_EVENTS = (
+    "Network.requestWillBeSent",
+    "Network.loadingFinished",
+    "Network.loadingFailed",
+    "Page.frameNavigated",
+    "Page.loadEventFired",
+)
+
+
+def attach_playwright(context, page, policy: ResourcePolicy,
+                      accountant: Optional[NetworkAccountant]):
+    """
+    Apply the policy and accounting to a Playwright page through a CDP
+    session (returned, or None when the browser does not support one).
+    """
+    if not policy.enabled and accountant is None:
+        return None
+    try:
+        session = context.new_cdp_session(page)
+        session.send("Network.enable")
+        if policy.enabled:
+            _block_urls(session.send, policy)
+        if accountant is not None:
+            session.send("Page.enable")
+            for method in _ACCOUNTED_EVENTS:
+                session.on(method, lambda params, method=method: accountant.feed(method, params))
+        return session
+    except Exception as e:
+        log.warning(f"Resource blocking/accounting unavailable: {e}")
+        return None
+
+
+def enable_chrome_blocking(driver, policy: ResourcePolicy) -> None:
+    """Apply the policy to a Selenium Chrome driver."""
+    if not policy.enabled:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    _block_urls(driver.execute_cdp_cmd, policy)
+
+
+def _block_urls(send, policy: ResourcePolicy) -> None:
+    patterns = policy.url_patterns()
+    send("Network.setBlockedURLs", {"urls": patterns})
+    log.info(f"Blocking {len(patterns)} URL patterns "
+             f"(types {sorted(policy.blocked_types)}, {len(policy.blocked_domains)} tracker domains)")
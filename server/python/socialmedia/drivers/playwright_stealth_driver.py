@@ -6,26 +6,56 @@ Used when SeleniumBase triggers bot detection.
 
 import logging
 from typing import List, Any, Dict, Optional
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, is_xpath
+from .network_filter import NetworkAccountant, ResourcePolicy, attach_playwright, network_stats_enabled
 
 log = logging.getLogger(__name__)
 
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-infobars',
+    '--window-size=1920,1080',
+    '--disable-extensions',
+]
+
+
+def playwright_proxy(proxy: Optional[str]) -> Optional[Dict[str, str]]:
+    """Convert a proxy string ('protocol://server:port' or 'server:port') to Playwright's format."""
+    if not proxy:
+        return None
+    if '://' in proxy:
+        scheme, server = proxy.split('://', 1)
+    else:
+        scheme, server = 'http', proxy
+    # Playwright expects {server: "scheme://ip:port"}; it handles socks5:// natively
+    return {"server": f"{scheme}://{server}"}
+
 
 class PlaywrightStealthDriver(BaseScraper):
     """
     Fallback scraper driver using Playwright with stealth mode.
     Provides a different browser fingerprint when Selenium-based drivers are detected.
+    
+    With a cdp_endpoint, setup() opens an isolated context in an already
+    running browser instead of launching one (see context_pool). An
+    optional PolitenessLimiter paces get() per domain.
     """
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, limiter=None):
         self.headless = headless
+        self.limiter = limiter
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
+        self._network = None
+        self._cdp = None
         self._is_setup = False
     
-    def setup(self, proxy: Optional[str] = None) -> None:
+    def setup(self, proxy: Optional[str] = None, cdp_endpoint: Optional[str] = None) -> None:
         """Initialize Playwright with stealth mode."""
         try:
             from playwright.sync_api import sync_playwright
@@ -34,37 +64,17 @@ class PlaywrightStealthDriver(BaseScraper):
             
             self.playwright = sync_playwright().start()
             
-            launch_args = [
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-infobars',
-                '--window-size=1920,1080',
-                '--disable-extensions',
-            ]
-            
-            # Convert proxy string to Playwright dictionary format if present
-            # Format: 'protocol://server:port'
-            pw_proxy = None
-            if proxy:
-               if '://' in proxy:
-                   scheme, rest = proxy.split('://', 1)
-                   server = rest
-               else:
-                   scheme = 'http'
-                   server = proxy
-                   
-               # Playwright expects {server: "ip:port"} or {server: "scheme://ip:port"}
-               # It handles socks5:// prefix natively
-               pw_proxy = {"server": f"{scheme}://{server}"}
-
-            # Launch Chromium with stealth-friendly options
-            self.browser = self.playwright.chromium.launch(
-                headless=self.headless,
-                proxy=pw_proxy,
-                args=launch_args
-            )
+            if cdp_endpoint:
+                # Shared browser process; the context below is this driver's own.
+                # browser.close() on a connected browser only disconnects.
+                self.browser = self.playwright.chromium.connect_over_cdp(cdp_endpoint)
+            else:
+                # Launch Chromium with stealth-friendly options
+                self.browser = self.playwright.chromium.launch(
+                    headless=self.headless,
+                    proxy=playwright_proxy(proxy),
+                    args=LAUNCH_ARGS
+                )
             
             # Create context with realistic viewport and user agent
             self.context = self.browser.new_context(
@@ -76,6 +86,10 @@ class PlaywrightStealthDriver(BaseScraper):
             
             self.page = self.context.new_page()
             
+            # Block heavy resources/trackers and account per-page traffic
+            self._network = NetworkAccountant() if network_stats_enabled() else None
+            self._cdp = attach_playwright(self.context, self.page, ResourcePolicy.from_env(), self._network)
+            
             # Apply stealth mode - handle both old and new API versions
             # Apply stealth mode - verified API for v2.0+
             try:
@@ -135,7 +149,11 @@ class PlaywrightStealthDriver(BaseScraper):
         if not self._is_setup:
             raise RuntimeError("Driver not setup. Call setup() first.")
         try:
-            self.page.goto(url, wait_until='commit', timeout=timeout)
+            if self.limiter is not None:
+                with self.limiter.slot(url):
+                    self.page.goto(url, wait_until='commit', timeout=timeout)
+            else:
+                self.page.goto(url, wait_until='commit', timeout=timeout)
         except Exception as e:
             log.warning(f"Navigation timeout/error for {url}: {e}")
     
@@ -259,13 +277,53 @@ class PlaywrightStealthDriver(BaseScraper):
             raise RuntimeError("Driver not setup. Call setup() first.")
         self.page.set_default_timeout(timeout * 1000)  # Playwright uses ms
     
-    def wait_for_selector(self, selector: str, timeout: int = 10000) -> Any:
-        """Wait for a selector to appear."""
+    def wait_for_selector(self, selector: str, timeout: Optional[float] = None,
+                          visible: bool = False) -> bool:
+        """Wait for a CSS or XPath selector (Playwright's own waiting)."""
+        if not self._is_setup:
+            raise RuntimeError("Driver not setup. Call setup() first.")
+        try:
+            self.page.wait_for_selector(
+                f"xpath={selector}" if is_xpath(selector) else selector,
+                state="visible" if visible else "attached",
+                timeout=self._wait_timeout(timeout) * 1000,
+            )
+            return True
+        except Exception:
+            return False
+    
+    def wait_for_network_idle(self, idle_time: float = 0.5, timeout: Optional[float] = None) -> bool:
+        """Wait for Playwright's networkidle state (no connections for 500ms)."""
+        if not self._is_setup:
+            raise RuntimeError("Driver not setup. Call setup() first.")
+        try:
+            self.page.wait_for_load_state("networkidle", timeout=self._wait_timeout(timeout) * 1000)
+            return True
+        except Exception:
+            return False
+    
+    def wait_for_scroll_height_change(self, previous_height: int, timeout: Optional[float] = None) -> int:
+        """Wait in the page for document.body.scrollHeight to change."""
+        if not self._is_setup:
+            raise RuntimeError("Driver not setup. Call setup() first.")
+        try:
+            return self.page.wait_for_function(
+                "h => document.body.scrollHeight !== h && document.body.scrollHeight",
+                arg=previous_height,
+                timeout=self._wait_timeout(timeout) * 1000,
+            ).json_value()
+        except Exception:
+            return previous_height
+    
+    def reset_session(self) -> None:
+        """Navigate to a blank page and clear the context's cookies."""
         if not self._is_setup:
             raise RuntimeError("Driver not setup. Call setup() first.")
-        return self.page.wait_for_selector(selector, timeout=timeout)
+        self.page.goto("about:blank")
+        self.context.clear_cookies()
     
     def quit(self) -> None:
         """Clean up and close the driver."""
+        self._log_network_summary()
         self._cleanup()
         log.info("Playwright stealth driver closed")
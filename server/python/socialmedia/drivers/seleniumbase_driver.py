@@ -7,7 +7,8 @@ This approach doesn't require chromedriver and is more reliable for anti-bot sit
 import logging
 import platform
 from typing import List, Any, Dict, Optional
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, is_xpath
+from .network_filter import NetworkAccountant, ResourcePolicy, attach_playwright, network_stats_enabled
 
 log = logging.getLogger(__name__)
 
@@ -72,6 +73,8 @@ class SeleniumBaseDriver(BaseScraper):
         self.browser = None
         self.playwright = None
         self.context = None
+        self._network = None
+        self._cdp = None
         self._is_setup = False
         self._virtual_display = None  # For xvfb on Linux
     
@@ -133,6 +136,10 @@ class SeleniumBaseDriver(BaseScraper):
             # Apply fingerprint obfuscation
             self._apply_fingerprint_obfuscation()
             
+            # Block heavy resources/trackers and account per-page traffic
+            self._network = NetworkAccountant() if network_stats_enabled() else None
+            self._cdp = attach_playwright(self.context, self.page, ResourcePolicy.from_env(), self._network)
+            
             self._is_setup = True
             log.info("SeleniumBase CDP + Playwright driver initialized successfully")
 
@@ -390,11 +397,43 @@ class SeleniumBaseDriver(BaseScraper):
             raise RuntimeError("Driver not setup. Call setup() first.")
         self.page.set_viewport_size({"width": width, "height": height})
     
-    def wait_for_selector(self, selector: str, timeout: int = 10000) -> Any:
-        """Wait for a selector to appear."""
+    def wait_for_selector(self, selector: str, timeout: Optional[float] = None,
+                          visible: bool = False) -> bool:
+        """Wait for a CSS or XPath selector (Playwright's own waiting)."""
+        if not self._is_setup:
+            raise RuntimeError("Driver not setup. Call setup() first.")
+        try:
+            self.page.wait_for_selector(
+                f"xpath={selector}" if is_xpath(selector) else selector,
+                state="visible" if visible else "attached",
+                timeout=self._wait_timeout(timeout) * 1000,
+            )
+            return True
+        except Exception:
+            return False
+    
+    def wait_for_network_idle(self, idle_time: float = 0.5, timeout: Optional[float] = None) -> bool:
+        """Wait for Playwright's networkidle state (no connections for 500ms)."""
+        if not self._is_setup:
+            raise RuntimeError("Driver not setup. Call setup() first.")
+        try:
+            self.page.wait_for_load_state("networkidle", timeout=self._wait_timeout(timeout) * 1000)
+            return True
+        except Exception:
+            return False
+    
+    def wait_for_scroll_height_change(self, previous_height: int, timeout: Optional[float] = None) -> int:
+        """Wait in the page for document.body.scrollHeight to change."""
         if not self._is_setup:
             raise RuntimeError("Driver not setup. Call setup() first.")
-        return self.page.wait_for_selector(selector, timeout=timeout)
+        try:
+            return self.page.wait_for_function(
+                "h => document.body.scrollHeight !== h && document.body.scrollHeight",
+                arg=previous_height,
+                timeout=self._wait_timeout(timeout) * 1000,
+            ).json_value()
+        except Exception:
+            return previous_height
     
     def is_bot_detected(self) -> bool:
         """Check if bot detection has been triggered."""
@@ -434,6 +473,13 @@ class SeleniumBaseDriver(BaseScraper):
             log.warning(f"Captcha solving failed: {e}")
             return False
     
+    def reset_session(self) -> None:
+        """Navigate to a blank page and clear the context's cookies."""
+        if not self._is_setup:
+            raise RuntimeError("Driver not setup. Call setup() first.")
+        self.page.goto("about:blank")
+        self.context.clear_cookies()
+    
     def sleep(self, seconds: float) -> None:
         """Sleep using SeleniumBase's sleep (more resistant to detection)."""
         if self.sb:
@@ -444,5 +490,6 @@ class SeleniumBaseDriver(BaseScraper):
     
     def quit(self) -> None:
         """Clean up and close the driver."""
+        self._log_network_summary()
         self._cleanup()
         log.info("SeleniumBase CDP driver closed")
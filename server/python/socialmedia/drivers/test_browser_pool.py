@@ -0,0 +1,230 @@
+"""
+Browser Pool Tests
+==================
+
+Tests for the per-process browser pool with fake drivers (no browser is
+launched).
+
+Run with:
+    python -m pytest socialmedia/drivers/test_browser_pool.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import pytest
+
+from socialmedia.drivers.base_scraper import BaseScraper
+from socialmedia.drivers.browser_pool import BrowserPool, PooledDriver
+from socialmedia.drivers.driver_factory import switch_to_fallback
+
+
+class FakeDriver(BaseScraper):
+    def __init__(self):
+        self.alive = True
+        self.quit_calls = 0
+        self.resets = 0
+        self.urls = []
+        self.marker = "fake"
+
+    def setup(self):
+        pass
+
+    def get(self, url, timeout=30):
+        self.urls.append(url)
+
+    def find_element(self, by, value):
+        return None
+
+    def find_elements(self, by, value):
+        return []
+
+    @property
+    def page_source(self):
+        return ""
+
+    @property
+    def current_url(self):
+        return self.urls[-1] if self.urls else ""
+
+    @property
+    def title(self):
+        return ""
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        return 1
+
+    def get_cookies(self):
+        return []
+
+    def add_cookie(self, cookie):
+        pass
+
+    def save_screenshot(self, filename):
+        pass
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def reset_session(self):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        self.resets += 1
+
+    def quit(self):
+        self.quit_calls += 1
+        self.alive = False
+
+
+@pytest.fixture
+def launched():
+    return []
+
+
+@pytest.fixture
+def pool(launched):
+    def factory(headless, force_playwright, force_undetected, proxy):
+        driver = FakeDriver()
+        launched.append(driver)
+        return driver, "playwright" if force_playwright else "undetected"
+
+    return BrowserPool(factory, max_idle=1, max_age=3600, max_pages=10)
+
+
+class TestLeaseAndReturn:
+    def test_quit_returns_browser_for_reuse(self, pool, launched):
+        first, driver_type = pool.acquire(force_undetected=True)
+        first.get("https://example.com/")
+        first.quit()
+        second, _ = pool.acquire(force_undetected=True)
+
+        assert driver_type == "undetected"
+        assert isinstance(first, PooledDriver)
+        assert len(launched) == 1
+        assert second.wrapped is launched[0]
+        assert launched[0].resets == 1
+        assert launched[0].quit_calls == 0
+        assert pool.stats["reused"] == 1
+
+    def test_forwards_driver_specific_attributes(self, pool):
+        driver, _ = pool.acquire()
+        assert driver.marker == "fake"
+        assert driver.driver_type == "undetected"
+
+    def test_returned_lease_cannot_be_used(self, pool):
+        driver, _ = pool.acquire()
+        driver.quit()
+        driver.quit()  # second call is a no-op
+
+        with pytest.raises(RuntimeError):
+            driver.get("https://example.com/")
+        assert pool.idle_count() == 1
+
+    def test_configurations_do_not_share_browsers(self, pool, launched):
+        driver, _ = pool.acquire(proxy="http://1.2.3.4:8080")
+        driver.quit()
+        other, _ = pool.acquire(proxy=None)
+
+        assert other.wrapped is launched[1]
+
+    def test_extra_returns_beyond_max_idle_are_closed(self, pool, launched):
+        a, _ = pool.acquire()
+        b, _ = pool.acquire()
+        a.quit()
+        b.quit()
+
+        assert pool.idle_count() == 1
+        assert launched[1].quit_calls == 1
+
+
+class TestRecycling:
+    def test_max_pages(self, pool, launched):
+        driver, _ = pool.acquire()
+        for i in range(10):
+            driver.get(f"https://example.com/{i}")
+        driver.quit()
+
+        assert pool.idle_count() == 0
+        assert launched[0].quit_calls == 1
+        assert pool.stats["recycled"] == 1
+
+    def test_lease_without_get_counts_one_page(self, pool, launched):
+        pool.max_pages = 2
+        for _ in range(2):
+            driver, _ = pool.acquire()
+            driver.quit()
+
+        assert launched[0].quit_calls == 1
+
+    def test_max_age(self, pool, launched):
+        driver, _ = pool.acquire()
+        driver.quit()
+        pool.max_age = 0
+        pool.acquire()
+
+        assert len(launched) == 2
+        assert launched[0].quit_calls == 1
+
+
+class TestCrashRecovery:
+    def test_dead_idle_browser_is_replaced(self, pool, launched):
+        driver, _ = pool.acquire()
+        driver.quit()
+        launched[0].alive = False  # browser crashed while idle
+
+        replacement, _ = pool.acquire()
+
+        assert replacement.wrapped is launched[1]
+        assert pool.stats["crashed"] == 1
+
+    def test_browser_that_fails_reset_is_closed(self, pool, launched):
+        driver, _ = pool.acquire()
+        launched[0].alive = False
+        driver.quit()
+
+        assert pool.idle_count() == 0
+
+    def test_lease_block_error_discards_browser(self, pool, launched):
+        with pytest.raises(ValueError):
+            with pool.lease():
+                raise ValueError("scrape failed")
+
+        assert pool.idle_count() == 0
+        assert launched[0].quit_calls == 1
+
+    def test_browsers_inherited_through_fork_are_forgotten(self, pool, launched):
+        driver, _ = pool.acquire()
+        driver.quit()
+        pool._pid = -1  # as seen from a forked child
+
+        pool.acquire()
+
+        assert len(launched) == 2
+        assert launched[0].quit_calls == 0  # parent's browser is left alone
+
+
+def test_switch_to_fallback_discards_pooled_driver(pool, launched, monkeypatch):
+    import socialmedia.drivers.driver_factory as driver_factory
+    monkeypatch.setattr(driver_factory, "get_browser_pool", lambda: pool)
+
+    driver, _ = pool.acquire(force_undetected=True)
+    fallback, driver_type = switch_to_fallback(driver, headless=True)
+
+    assert driver_type == "playwright"
+    assert launched[0].quit_calls == 1
+    assert fallback.wrapped is launched[1]
+
+
+def test_shutdown_closes_idle_browsers(pool, launched):
+    driver, _ = pool.acquire()
+    driver.quit()
+    pool.shutdown()
+
+    assert launched[0].quit_calls == 1
+    assert pool.idle_count() == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,164 @@
+"""
+Context Pool Tests
+==================
+
+Tests for the per-domain PolitenessLimiter and the shared work queue of
+PlaywrightContextPool (fake contexts, no browser is started).
+
+Run with:
+    python -m pytest socialmedia/drivers/test_context_pool.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from socialmedia.drivers import context_pool
+from socialmedia.drivers.context_pool import PlaywrightContextPool, PolitenessLimiter
+
+
+class TestPolitenessLimiter:
+    def test_domain_ignores_www_and_case(self):
+        assert PolitenessLimiter.domain("https://WWW.TikTok.com/@a") == "tiktok.com"
+        assert PolitenessLimiter.domain("https://m.tiktok.com/") == "m.tiktok.com"
+
+    def test_max_in_flight_per_domain(self):
+        limiter = PolitenessLimiter(max_in_flight=2)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def navigate():
+            with limiter.slot("https://www.instagram.com/nike/"):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=navigate) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak[0] == 2
+
+    def test_min_interval_between_starts(self):
+        limiter = PolitenessLimiter(max_in_flight=5, min_interval=0.05)
+        starts = []
+
+        for _ in range(3):
+            with limiter.slot("https://www.tiktok.com/@a"):
+                starts.append(time.monotonic())
+
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert all(gap >= 0.045 for gap in gaps)
+
+    def test_domains_do_not_wait_for_each_other(self):
+        limiter = PolitenessLimiter(max_in_flight=1, min_interval=10)
+        with limiter.slot("https://www.tiktok.com/"):
+            started = time.monotonic()
+            with limiter.slot("https://www.instagram.com/"):
+                pass
+        assert time.monotonic() - started < 1
+
+
+class FakeContextDriver:
+    instances = []
+
+    def __init__(self, headless=True, limiter=None):
+        self.limiter = limiter
+        self.endpoint = None
+        self.closed = False
+        FakeContextDriver.instances.append(self)
+
+    def setup(self, proxy=None, cdp_endpoint=None):
+        self.endpoint = cdp_endpoint
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_browser(monkeypatch):
+    FakeContextDriver.instances = []
+
+    @contextmanager
+    def shared_browser(self):
+        yield "http://127.0.0.1:9222"
+
+    monkeypatch.setattr(context_pool, "PlaywrightStealthDriver", FakeContextDriver)
+    monkeypatch.setattr(PlaywrightContextPool, "_shared_browser", shared_browser)
+    return FakeContextDriver
+
+
+class TestContextPool:
+    def test_shared_queue_results_in_item_order(self, fake_browser):
+        pool = PlaywrightContextPool(workers=3)
+        seen = set()
+
+        def handler(driver, item):
+            seen.add(id(driver))
+            time.sleep(0.01)
+            return item * 2
+
+        results = pool.run(list(range(10)), handler)
+
+        assert results == [i * 2 for i in range(10)]
+        assert len(fake_browser.instances) == 3
+        assert all(d.endpoint == "http://127.0.0.1:9222" for d in fake_browser.instances)
+        assert all(d.limiter is pool.limiter for d in fake_browser.instances)
+        assert all(d.closed for d in fake_browser.instances)
+        assert len(seen) > 1
+
+    def test_failed_item_yields_none(self, fake_browser):
+        def handler(driver, item):
+            if item == "bad":
+                raise ValueError("scrape failed")
+            return item
+
+        results = PlaywrightContextPool(workers=2).run(["a", "bad", "c"], handler)
+
+        assert results == ["a", None, "c"]
+
+    def test_init_state_is_closed_per_context(self, fake_browser):
+        states = []
+
+        class Scraper:
+            def __init__(self, driver):
+                self.driver = driver
+                self.closed = False
+                states.append(self)
+
+            def close(self):
+                self.closed = True
+
+        results = PlaywrightContextPool(workers=2).run(
+            [1, 2, 3], handler=lambda scraper, item: scraper.driver is not None, init=Scraper
+        )
+
+        assert results == [True, True, True]
+        assert len(states) == 2 and all(s.closed for s in states)
+
+    def test_items_left_when_no_context_starts(self, fake_browser):
+        def broken_init(driver):
+            raise RuntimeError("guest mode failed")
+
+        results = PlaywrightContextPool(workers=2).run([1, 2], lambda s, i: i, init=broken_init)
+
+        assert results == [None, None]
+        assert all(d.closed for d in fake_browser.instances)
+
+    def test_never_more_contexts_than_items(self, fake_browser):
+        PlaywrightContextPool(workers=8).run([1], lambda driver, item: item)
+        assert len(fake_browser.instances) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
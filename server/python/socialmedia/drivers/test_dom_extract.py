@@ -0,0 +1,105 @@
+"""
+DOM Extract Tests
+=================
+
+Tests for spec compilation and the single execute_script round trip of
+extract_page (fake drivers, the page script itself needs a browser).
+
+Run with:
+    python -m pytest socialmedia/drivers/test_dom_extract.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+
+import pytest
+
+from socialmedia.drivers.dom_extract import build_script, compile_spec, extract_page
+
+SPEC = {
+    "fields": {
+        "author": ["//span[@data-e2e='browse-username']", "//h1//span"],
+        "likes": [("strong[data-e2e='like-count']", "aria-label")],
+        "post_date": {"candidates": ["//span[contains(text(), 'ago')]"], "match": r"\d+\s*d\s+ago"},
+    },
+    "links": {"videos": {"query": "//div[@data-e2e='user-post-item']//a", "contains": ["/video/"]}},
+    "lists": {
+        "comments": {
+            "containers": ["//div[@data-e2e='comment-item']"],
+            "fields": {"text": [".//p"]},
+            "require": "text",
+        },
+    },
+}
+
+
+class ScriptDriver:
+    """Records scripts and answers with a canned page result."""
+
+    def __init__(self, result):
+        self.result = result
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class TestCompileSpec:
+    def test_candidates_and_defaults(self):
+        compiled = compile_spec(SPEC)
+
+        assert compiled["fields"]["author"]["candidates"][1] == {"query": "//h1//span", "attr": None}
+        assert compiled["fields"]["likes"]["candidates"][0]["attr"] == "aria-label"
+        assert compiled["fields"]["post_date"]["match"] == r"\d+\s*d\s+ago"
+        assert compiled["links"]["videos"] == {
+            "queries": ["//div[@data-e2e='user-post-item']//a"], "attr": "href", "contains": ["/video/"],
+        }
+        comments = compiled["lists"]["comments"]
+        assert (comments["limit"], comments["min_matches"], comments["require"]) == (20, 1, "text")
+
+    def test_script_embeds_spec_and_returns(self):
+        script = build_script(SPEC)
+
+        # "return" lets Selenium run it and the Playwright drivers wrap it as () => ...
+        assert script.startswith("return (function (spec)")
+        assert json.dumps(compile_spec(SPEC)) in script
+        assert "__SPEC__" not in script
+
+
+class TestExtractPage:
+    def test_one_round_trip(self):
+        driver = ScriptDriver(json.dumps({
+            "author": "nike", "likes": "1.2M likes", "post_date": "",
+            "videos": ["https://www.tiktok.com/@nike/video/1"],
+            "comments": [{"text": "great"}], "height": 4200, "script_ms": 1.5,
+        }))
+
+        page = extract_page(driver, SPEC)
+
+        assert len(driver.scripts) == 1
+        assert page["author"] == "nike"
+        assert page["videos"] == ["https://www.tiktok.com/@nike/video/1"]
+        assert page["comments"] == [{"text": "great"}]
+        assert page["height"] == 4200
+
+    def test_failure_returns_empty_values(self):
+        page = extract_page(ScriptDriver(RuntimeError("no such window")), SPEC)
+
+        assert page == {
+            "author": "", "likes": "", "post_date": "", "videos": [], "comments": [], "height": 0,
+        }
+
+    def test_missing_keys_keep_defaults(self):
+        page = extract_page(ScriptDriver({"author": "nike"}), SPEC)
+
+        assert page["author"] == "nike"
+        assert page["videos"] == [] and page["likes"] == ""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
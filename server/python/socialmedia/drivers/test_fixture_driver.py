@@ -0,0 +1,224 @@
+"""
+Fixture Driver Tests
+====================
+
+Tests for recording pages with CaptureDriver, replaying them with
+FixtureDriver, and the scrapers' post parsers on the synthetic corpus of
+the parsing benchmark (no browser, no network).
+
+Run with:
+    python -m pytest socialmedia/drivers/test_fixture_driver.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+import os
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from socialmedia.drivers.base_scraper import BaseScraper
+from socialmedia.drivers.dom_extract import extract_page
+from socialmedia.drivers.fixture_driver import (
+    CaptureDriver,
+    FixtureCorpus,
+    FixtureDriver,
+    FixtureMissError,
+    FixturePage,
+    FixtureRecorder,
+    capture,
+    script_key,
+)
+
+PAGE_HTML = """<html><head><title>Post</title></head><body>
+<article><span class="caption">Hello <b>world</b></span>
+<a href="/p/abc/">post</a><img src="https://cdn.example/1.jpg"></article></body></html>"""
+
+
+class FakeBrowser(BaseScraper):
+    """A live driver stand-in: pages by URL and scripts answered in order."""
+
+    def __init__(self, pages, answers=None):
+        self.pages = pages
+        self.answers = list(answers or [])
+        self.url = "about:blank"
+        self.quit_called = False
+
+    def setup(self):
+        pass
+
+    def get(self, url, *args, **kwargs):
+        self.url = url
+
+    def find_element(self, by, value):
+        return None
+
+    def find_elements(self, by, value):
+        return []
+
+    @property
+    def page_source(self):
+        return self.pages.get(self.url, "")
+
+    @property
+    def current_url(self):
+        return self.url
+
+    @property
+    def title(self):
+        return "Post"
+
+    def execute_script(self, script, *args):
+        return self.answers.pop(0) if self.answers else None
+
+    def get_cookies(self):
+        return [{"name": "sessionid", "value": "x"}]
+
+    def add_cookie(self, cookie):
+        pass
+
+    def save_screenshot(self, filename):
+        pass
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def wait_for_scroll_height_change(self, previous_height, timeout=None):
+        return previous_height + 500
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def corpus_dir(tmp_path):
+    recorder = FixtureRecorder(str(tmp_path))
+    page = FixturePage("https://www.instagram.com/p/abc/", html=PAGE_HTML, title="Post")
+    page.record_script("return document.body.scrollHeight", (), 1000)
+    page.record_script("return document.body.scrollHeight", (), 1800)
+    recorder.save(page)
+    recorder.save(FixturePage("https://www.instagram.com/p/abc/", html="<html><body>second</body></html>"))
+    return str(tmp_path)
+
+
+class TestFixtureDriver:
+    def test_replays_page_and_elements(self, corpus_dir):
+        driver = FixtureDriver(corpus_dir)
+        driver.get("https://www.instagram.com/p/abc/")
+
+        assert driver.title == "Post"
+        assert driver.find_element(By.CSS_SELECTOR, "span.caption").text == "Hello world"
+        assert driver.find_element(By.TAG_NAME, "img").get_attribute("src") == "https://cdn.example/1.jpg"
+        assert driver.find_element(By.TAG_NAME, "article").find_elements(By.TAG_NAME, "a")[0].text == "post"
+        with pytest.raises(NoSuchElementException):
+            driver.find_element(By.ID, "missing")
+
+    def test_scripts_replay_in_order_and_last_repeats(self, corpus_dir):
+        driver = FixtureDriver(corpus_dir)
+        driver.get("https://www.instagram.com/p/abc/")
+        heights = [driver.execute_script("return document.body.scrollHeight") for _ in range(3)]
+
+        assert heights == [1000, 1800, 1800]
+        assert driver.execute_script("return 1") is None
+
+    def test_repeated_visits_and_misses(self, corpus_dir):
+        driver = FixtureDriver(corpus_dir)
+        driver.get("https://www.instagram.com/p/abc/")
+        driver.get("https://www.instagram.com/p/abc/")
+        assert "second" in driver.page_source
+
+        with pytest.raises(FixtureMissError):
+            driver.get("https://www.instagram.com/p/zzz/")
+        lenient = FixtureDriver(corpus_dir, strict=False)
+        lenient.get("https://www.instagram.com/p/zzz/")
+        assert lenient.page_source == ""
+
+    def test_waits_read_the_recorded_page(self, corpus_dir):
+        driver = FixtureDriver(corpus_dir)
+        driver.get("https://www.instagram.com/p/abc/")
+
+        assert driver.wait_for_selector("article span")
+        assert not driver.wait_for_selector("video")
+        assert driver.wait_for_network_idle()
+        assert driver.wait_for_scroll_height_change(1000) == 1000
+
+
+class TestCaptureDriver:
+    def test_round_trip(self, tmp_path):
+        spec = {"fields": {"caption": ["span.caption"]}}
+        extracted = json.dumps({"caption": "Hello world", "height": 900})
+        browser = FakeBrowser({"https://www.instagram.com/p/abc/": PAGE_HTML}, answers=[extracted, object()])
+        captured = CaptureDriver(browser, FixtureRecorder(str(tmp_path)))
+
+        assert captured.driver is captured
+        captured.get("https://www.instagram.com/p/abc/")
+        assert extract_page(captured, spec)["caption"] == "Hello world"
+        captured.execute_script("return document.querySelector('a')")  # element handle, not recorded
+        assert captured.wait_for_scroll_height_change(900) == 1400
+        captured.quit()
+
+        assert browser.quit_called
+        assert len(os.listdir(tmp_path)) == 2  # one .json and one .html
+
+        replay = FixtureDriver(str(tmp_path))
+        replay.get("https://www.instagram.com/p/abc/")
+        assert replay.page_source == PAGE_HTML
+        assert replay.get_cookies() == [{"name": "sessionid", "value": "x"}]
+        assert extract_page(replay, spec)["caption"] == "Hello world"
+        assert replay.wait_for_scroll_height_change(900) == 1400
+        assert len(FixtureCorpus(str(tmp_path)).pages["https://www.instagram.com/p/abc/"][0].calls) == 2
+
+    def test_capture_is_off_without_directory(self):
+        browser = FakeBrowser({})
+        assert capture(browser, directory="") is browser
+
+    def test_script_key_includes_arguments(self):
+        assert script_key("return arguments[0]", (1,)) != script_key("return arguments[0]", (2,))
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    from socialmedia.benchmark_parsing import build_synthetic_corpus
+    return build_synthetic_corpus(str(tmp_path_factory.mktemp("corpus")), posts=2, seed=7)
+
+
+class TestScrapersOnSyntheticCorpus:
+    def test_instagram_json_endpoint_and_html(self, corpus):
+        from socialmedia.benchmark_parsing import TARGET_URLS, make_scraper
+
+        scraper = make_scraper("instagram", FixtureDriver(corpus))
+        urls = [u for u in corpus.urls() if TARGET_URLS["instagram"].match(u)]
+        records = [scraper.scrape_post(url) for url in urls]
+
+        assert len(records) == 2 and all(records)
+        # One post is read from the JSON endpoint, the other from its HTML
+        # and the recorded comment list
+        for record in records:
+            assert record.caption and record.likes > 0 and record.hashtags
+            assert len(record.comment_items) == 20
+
+    def test_tiktok_video_with_author_stats(self, corpus):
+        from socialmedia.benchmark_parsing import TARGET_URLS, make_scraper
+
+        scraper = make_scraper("tiktok", FixtureDriver(corpus))
+        url = next(u for u in corpus.urls() if TARGET_URLS["tiktok"].match(u))
+        record = scraper.scrape_video(url, retries=0)
+
+        assert record.username == url.split("@")[1].split("/")[0]
+        assert record.likes > 0 and record.caption
+        assert record.author_stats.followers > 0
+
+    def test_benchmark_reports_every_target(self, corpus):
+        from socialmedia.benchmark_parsing import run_benchmark
+
+        results = run_benchmark(corpus, ["instagram", "tiktok"], repeats=1)
+        assert [r["target"] for r in results] == [
+            "instagram.scrape_post", "instagram.post_json", "tiktok.scrape_video"]
+        assert all(r["records"] == r["pages"] == 2 and r["peak_kib"] > 0 for r in results)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,155 @@
+"""
+Network Filter Tests
+====================
+
+Tests for the resource blocking policy and the CDP-based per-page
+network accounting.
+
+Run with:
+    python -m pytest socialmedia/drivers/test_network_filter.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+
+import pytest
+
+from socialmedia.drivers.network_filter import (
+    NetworkAccountant,
+    ResourcePolicy,
+    TRACKER_DOMAINS,
+    attach_playwright,
+)
+
+
+class TestResourcePolicy:
+    def test_defaults_from_env(self, monkeypatch):
+        monkeypatch.delenv("SCRAPE_BLOCK_RESOURCES", raising=False)
+        monkeypatch.delenv("SCRAPE_BLOCK_TRACKERS", raising=False)
+        policy = ResourcePolicy.from_env()
+
+        assert policy.blocked_types == {"image", "media", "font"}
+        assert policy.blocked_domains == TRACKER_DOMAINS
+
+    def test_disabled_from_env(self, monkeypatch):
+        monkeypatch.setenv("SCRAPE_BLOCK_RESOURCES", "none")
+        monkeypatch.setenv("SCRAPE_BLOCK_TRACKERS", "0")
+        assert not ResourcePolicy.from_env().enabled
+
+    def test_url_patterns(self):
+        patterns = ResourcePolicy(["font", "media"], ["hotjar.com"]).url_patterns()
+        assert "*.woff*" in patterns
+        assert "*mime_type=video*" in patterns  # TikTok video URLs have no extension
+        assert "*hotjar.com/*" in patterns
+        assert not any("jpg" in p for p in patterns)
+
+
+def _navigate(accountant, url, request_id, frame="F1", ts=100.0):
+    accountant.feed("Network.requestWillBeSent", {
+        "requestId": request_id, "type": "Document", "frameId": frame,
+        "documentURL": url, "timestamp": ts,
+    })
+    accountant.feed("Page.frameNavigated", {"frame": {"id": frame, "url": url}})
+
+
+class TestNetworkAccountant:
+    def test_per_page_bytes_requests_and_latency(self):
+        accountant = NetworkAccountant()
+        _navigate(accountant, "https://www.tiktok.com/@a", "1", ts=100.0)
+        accountant.feed("Network.loadingFinished", {"requestId": "1", "encodedDataLength": 5000})
+        accountant.feed("Network.loadingFinished", {"requestId": "2", "encodedDataLength": 1500})
+        accountant.feed("Network.loadingFailed", {"requestId": "3", "blockedReason": "inspector"})
+        accountant.feed("Page.loadEventFired", {"timestamp": 101.25})
+        _navigate(accountant, "https://www.tiktok.com/@a/video/9", "4", ts=110.0)
+        accountant.feed("Network.loadingFinished", {"requestId": "4", "encodedDataLength": 700})
+
+        first, second = accountant.pages
+        assert first.to_dict() == {
+            "url": "https://www.tiktok.com/@a", "requests": 2, "blocked": 1,
+            "bytes": 6500, "load_ms": 1250.0,
+        }
+        assert (second.bytes, second.load_ms) == (700, None)
+        assert accountant.summary() == {
+            "pages": 2, "requests": 3, "blocked": 1, "bytes": 7200, "avg_load_ms": 1250.0,
+        }
+
+    def test_iframe_documents_stay_on_the_page(self):
+        accountant = NetworkAccountant()
+        _navigate(accountant, "https://www.instagram.com/nike/", "1", frame="MAIN")
+        accountant.feed("Network.requestWillBeSent", {
+            "requestId": "2", "type": "Document", "frameId": "IFRAME",
+            "documentURL": "https://ads.example/frame", "timestamp": 100.5,
+        })
+        accountant.feed("Page.frameNavigated", {"frame": {"id": "IFRAME", "parentId": "MAIN"}})
+
+        assert len(accountant.pages) == 1
+
+    def test_traffic_before_first_navigation(self):
+        accountant = NetworkAccountant()
+        accountant.feed("Network.loadingFailed", {"blockedReason": "inspector"})
+        accountant.feed("Network.loadingFailed", {"errorText": "net::ERR_ABORTED"})
+        accountant.feed("Network.loadingFinished", {"encodedDataLength": 10})
+
+        assert accountant.pages[0].url == "about:blank"
+        assert (accountant.pages[0].blocked, accountant.pages[0].bytes) == (1, 10)
+
+    def test_feed_performance_log(self):
+        def entry(method, params):
+            return {"message": json.dumps({"message": {"method": method, "params": params}, "webview": "X"})}
+
+        accountant = NetworkAccountant()
+        accountant.feed_performance_log([
+            entry("Network.requestWillBeSent", {"type": "Document", "frameId": "F",
+                                                "documentURL": "https://www.instagram.com/", "timestamp": 5.0}),
+            entry("Network.loadingFinished", {"encodedDataLength": 321}),
+            {"message": "not json"},
+            entry("Page.loadEventFired", {"timestamp": 5.5}),
+        ])
+
+        assert accountant.summary()["bytes"] == 321
+        assert accountant.pages[0].load_ms == 500.0
+
+
+class FakeSession:
+    def __init__(self):
+        self.sent = []
+        self.listeners = {}
+
+    def send(self, method, params=None):
+        self.sent.append((method, params))
+
+    def on(self, method, handler):
+        self.listeners[method] = handler
+
+
+class FakeContext:
+    def __init__(self):
+        self.session = FakeSession()
+
+    def new_cdp_session(self, page):
+        return self.session
+
+
+def test_attach_playwright_blocks_in_browser_and_feeds_accountant():
+    context = FakeContext()
+    accountant = NetworkAccountant()
+    session = attach_playwright(context, page=None, policy=ResourcePolicy(["image"]), accountant=accountant)
+
+    blocked = dict(session.sent)["Network.setBlockedURLs"]["urls"]
+    assert "*.webp*" in blocked
+    session.listeners["Network.loadingFinished"]({"encodedDataLength": 42})
+    assert accountant.summary()["bytes"] == 42
+
+
+def test_attach_playwright_without_cdp_support():
+    class NoCdpContext:
+        def new_cdp_session(self, page):
+            raise RuntimeError("not chromium")
+
+    assert attach_playwright(NoCdpContext(), None, ResourcePolicy(["image"]), NetworkAccountant()) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
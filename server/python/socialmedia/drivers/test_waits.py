@@ -0,0 +1,152 @@
+"""
+Wait Toolkit Tests
+==================
+
+Tests for the bounded load waits on BaseScraper and the separately
+configured politeness delay (scripted fake page, no browser).
+
+Run with:
+    python -m pytest socialmedia/drivers/test_waits.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import time
+
+import pytest
+
+from socialmedia.drivers import base_scraper
+from socialmedia.drivers.base_scraper import BaseScraper, is_xpath, polite_delay
+
+
+class ScriptedPage(BaseScraper):
+    """Answers execute_script from a list of canned values (last one repeats)."""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        answer = self.answers.pop(0) if len(self.answers) > 1 else self.answers[0]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    def setup(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, value):
+        return None
+
+    def find_elements(self, by, value):
+        return []
+
+    @property
+    def page_source(self):
+        return ""
+
+    @property
+    def current_url(self):
+        return ""
+
+    @property
+    def title(self):
+        return ""
+
+    def get_cookies(self):
+        return []
+
+    def add_cookie(self, cookie):
+        pass
+
+    def save_screenshot(self, filename):
+        pass
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(base_scraper, "WAIT_POLL_INTERVAL", 0.01)
+
+
+class TestWaitForSelector:
+    def test_returns_as_soon_as_it_matches(self):
+        page = ScriptedPage([False, RuntimeError("navigating"), True])
+        started = time.monotonic()
+
+        assert page.wait_for_selector("//div[@data-e2e='challenge-item']", timeout=5)
+        assert time.monotonic() - started < 1
+        assert len(page.scripts) == 3
+        assert "document.evaluate" in page.scripts[0]
+        assert '"//div[@data-e2e=\'challenge-item\']", true, false' in page.scripts[0]
+
+    def test_bounded_timeout(self):
+        page = ScriptedPage([False])
+        started = time.monotonic()
+
+        assert page.wait_for_selector("article", timeout=0.1, visible=True) is False
+        assert time.monotonic() - started < 1
+
+    def test_xpath_detection(self):
+        assert is_xpath("//a") and is_xpath("./span") and is_xpath("(//a)[1]")
+        assert not is_xpath("div[data-e2e='user-post-item']")
+
+
+class TestNetworkIdle:
+    def test_idle_after_quiet_period(self):
+        page = ScriptedPage(["interactive:3", "complete:8", "complete:12", "complete:12"])
+
+        assert page.wait_for_network_idle(idle_time=0.05, timeout=2)
+
+    def test_busy_page_times_out(self):
+        counter = iter(range(10_000))
+        page = ScriptedPage([None])
+        page.execute_script = lambda script: f"complete:{next(counter)}"
+
+        assert page.wait_for_network_idle(idle_time=0.05, timeout=0.2) is False
+
+
+class TestScrollHeight:
+    def test_returns_new_height(self):
+        page = ScriptedPage([2000, 2000, 3400])
+        assert page.wait_for_scroll_height_change(2000, timeout=2) == 3400
+
+    def test_unchanged_height_after_timeout(self):
+        page = ScriptedPage([2000])
+        assert page.wait_for_scroll_height_change(2000, timeout=0.05) == 2000
+
+
+class TestPoliteDelay:
+    def test_scaled(self, monkeypatch):
+        slept = []
+        monkeypatch.setattr(base_scraper.time, "sleep", slept.append)
+        monkeypatch.setattr(base_scraper, "SCRAPE_POLITENESS_SCALE", 0.5)
+
+        polite_delay(2)
+        polite_delay(1, 3)
+
+        assert slept[0] == 1.0
+        assert 0.5 <= slept[1] <= 1.5
+
+    def test_disabled(self, monkeypatch):
+        slept = []
+        monkeypatch.setattr(base_scraper.time, "sleep", slept.append)
+        monkeypatch.setattr(base_scraper, "SCRAPE_POLITENESS_SCALE", 0)
+
+        polite_delay(5, 10)
+
+        assert slept == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
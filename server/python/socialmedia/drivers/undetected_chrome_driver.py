@@ -9,6 +9,7 @@ import platform
 import random
 from typing import List, Any, Dict, Optional
 from .base_scraper import BaseScraper
+from .network_filter import NetworkAccountant, ResourcePolicy, enable_chrome_blocking, network_stats_enabled
 
 log = logging.getLogger(__name__)
 
@@ -22,6 +23,7 @@ class UndetectedChromeDriver(BaseScraper):
     def __init__(self, headless: bool = True):
         self.headless = headless
         self.driver = None
+        self._network = None
         self._is_setup = False
         self._virtual_display = None
     
@@ -97,6 +99,12 @@ class UndetectedChromeDriver(BaseScraper):
                 # On Windows/Mac with headless, use the headless option
                 options.add_argument("--headless=new")
             
+            # chromedriver's performance log carries the Network/Page events
+            # for accounting, including navigations made on self.driver directly
+            if network_stats_enabled():
+                options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+                self._network = NetworkAccountant()
+            
             # Create the undetected Chrome driver
             self.driver = uc.Chrome(
                 options=options,
@@ -111,6 +119,12 @@ class UndetectedChromeDriver(BaseScraper):
             # Apply additional fingerprint obfuscation
             self._apply_fingerprint_obfuscation()
             
+            # Block heavy resources/trackers
+            try:
+                enable_chrome_blocking(self.driver, ResourcePolicy.from_env())
+            except Exception as e:
+                log.warning(f"Failed to enable resource blocking: {e}")
+            
             self._is_setup = True
             log.info(f"Undetected Chrome driver initialized (viewport: {width}x{height})")
             
@@ -170,6 +184,8 @@ class UndetectedChromeDriver(BaseScraper):
         """Navigate to a URL."""
         if not self._is_setup:
             raise RuntimeError("Driver not setup. Call setup() first.")
+        # Drain the performance log now and then so it cannot pile up
+        self.network_stats()
         self.driver.get(url)
     
     def find_element(self, by: str, value: str) -> Any:
@@ -277,6 +293,23 @@ class UndetectedChromeDriver(BaseScraper):
         except:
             return False
     
+    def network_stats(self) -> Optional[NetworkAccountant]:
+        """Per-page accounting, updated from the performance log."""
+        if self._network is not None and self._is_setup:
+            try:
+                self._network.feed_performance_log(self.driver.get_log("performance"))
+            except Exception as e:
+                log.debug(f"Could not read performance log: {e}")
+        return self._network
+    
+    def reset_session(self) -> None:
+        """Navigate to a blank page and clear cookies for every domain."""
+        if not self._is_setup:
+            raise RuntimeError("Driver not setup. Call setup() first.")
+        self.driver.get("about:blank")
+        # delete_all_cookies() only covers the current page's domain
+        self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    
     def sleep(self, seconds: float) -> None:
         """Human-like sleep."""
         import time
@@ -286,5 +319,6 @@ class UndetectedChromeDriver(BaseScraper):
     
     def quit(self) -> None:
         """Clean up and close the driver."""
+        self._log_network_summary()
         self._cleanup()
         log.info("Undetected Chrome driver closed")
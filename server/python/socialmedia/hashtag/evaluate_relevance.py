@@ -0,0 +1,221 @@
+"""
+Hashtag Ranking Evaluation
+==========================
+
+Offline comparison of the orders discovery could scrape hashtags in,
+replayed on stored posts.
+
+The posts scraped before a cutoff are what a ranking may know: they
+build the co-occurrence graph (the way the bulk loader does) and the
+competitor seed hashtags. The hashtags first scraped after the cutoff
+are the candidates, and what their scrapes returned is the outcome: a
+post is useful when it shares a competitor hashtag other than the one
+it was scraped for.
+
+Strategies:
+
+    frequency     posts carrying the hashtag before the cutoff (the old
+                  discovery order)
+    cooccurrence  pair counts with the seed hashtags
+    pagerank      hub-penalized personalized PageRank from the seeds on
+                  the association-weighted graph (hashtag_relevance)
+
+Per strategy and k it reports, over the top k candidates:
+
+    useful@k      mean useful posts per scrape
+    utility@k     share of the scraped posts that were useful
+    ndcg@k        NDCG with the useful post count as gain
+
+Usage:
+    python -m socialmedia.hashtag.evaluate_relevance --platform tiktok
+    python -m socialmedia.hashtag.evaluate_relevance --user-id 1 --cutoff-days 14 --k 5 10 20 --json
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import argparse
+import json
+import math
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .hashtag_relevance import (
+    MAX_SEEDS,
+    MIN_PAIR_WEIGHT,
+    CooccurrenceGraph,
+    hashtag_key,
+    penalize_hubs,
+    personalized_pagerank,
+)
+
+STRATEGIES = ("frequency", "cooccurrence", "pagerank")
+
+# Post hashtag arrays scraped in [since, cutoff), both post tables
+HISTORY_SQL = """
+    SELECT hashtags FROM competitor_posts
+    WHERE platform = %(platform)s AND scraped_at >= %(since)s AND scraped_at < %(cutoff)s
+    UNION ALL
+    SELECT hashtags FROM hashtag_posts
+    WHERE platform = %(platform)s AND scraped_at >= %(since)s AND scraped_at < %(cutoff)s
+"""
+
+SEEDS_SQL = """
+    SELECT LOWER(LTRIM(BTRIM(tag), '#')) AS hashtag, COUNT(*) AS frequency
+    FROM competitor_posts cp
+    CROSS JOIN LATERAL UNNEST(cp.hashtags) AS tag
+    WHERE cp.platform = %(platform)s
+      AND cp.scraped_at >= %(since)s AND cp.scraped_at < %(cutoff)s
+      AND (%(user_id)s::int IS NULL OR cp.competitor_id IN (
+          SELECT competitor_id FROM user_competitors
+          WHERE user_id = %(user_id)s AND (group_id = %(group_id)s OR group_id IS NULL)))
+    GROUP BY 1
+    ORDER BY frequency DESC
+    LIMIT %(limit)s
+"""
+
+SCRAPED_BEFORE_SQL = """
+    SELECT DISTINCT LOWER(LTRIM(BTRIM(hashtag), '#'))
+    FROM hashtag_posts
+    WHERE platform = %(platform)s AND scraped_at < %(cutoff)s
+"""
+
+SCRAPED_AFTER_SQL = """
+    SELECT LOWER(LTRIM(BTRIM(hashtag), '#')), hashtags
+    FROM hashtag_posts
+    WHERE platform = %(platform)s AND scraped_at >= %(cutoff)s
+"""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Rankings and metrics
+# ─────────────────────────────────────────────────────────────────────────────
+def build_outcomes(scraped: Iterable[Tuple[str, Sequence[str]]], seeds: Set[str],
+                   exclude: Set[str] = frozenset()) -> Dict[str, Tuple[int, int]]:
+    """
+    (posts, useful posts) per scraped hashtag, from (hashtag, post
+    hashtags) rows; hashtags in exclude are left out.
+    """
+    outcomes: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for hashtag, tags in scraped:
+        if not hashtag or hashtag in exclude:
+            continue
+        outcome = outcomes[hashtag]
+        outcome[0] += 1
+        if {hashtag_key(tag) for tag in tags or []} & (seeds - {hashtag}):
+            outcome[1] += 1
+    return {hashtag: (posts, useful) for hashtag, (posts, useful) in outcomes.items()}
+
+
+def rank_strategies(graph: CooccurrenceGraph, seeds: Dict[str, float],
+                    candidates: Iterable[str]) -> Dict[str, List[str]]:
+    """The candidates in each strategy's order, best first (ties by name)."""
+    candidates = sorted(candidates)
+    association = graph.association(MIN_PAIR_WEIGHT)
+    pagerank = penalize_hubs(association, personalized_pagerank(association, seeds))
+    scores = {
+        "frequency": {c: graph.frequency.get(c, 0) for c in candidates},
+        "cooccurrence": {c: sum(w for s, w in graph.adjacency.get(c, {}).items() if s in seeds)
+                         for c in candidates},
+        "pagerank": {c: pagerank.get(c, 0.0) for c in candidates},
+    }
+    return {name: sorted(candidates, key=lambda c: -scores[name][c]) for name in STRATEGIES}
+
+
+def _dcg(gains: Sequence[float]) -> float:
+    return sum(gain / math.log2(rank + 2) for rank, gain in enumerate(gains))
+
+
+def evaluate_rankings(rankings: Dict[str, List[str]], outcomes: Dict[str, Tuple[int, int]],
+                      ks: Sequence[int]) -> List[Dict[str, Any]]:
+    """useful@k, utility@k and ndcg@k of each ranking against the outcomes."""
+    ideal = sorted((useful for _, useful in outcomes.values()), reverse=True)
+    results = []
+    for name, ranking in rankings.items():
+        for k in ks:
+            top = [outcomes.get(hashtag, (0, 0)) for hashtag in ranking[:k]]
+            posts = sum(p for p, _ in top)
+            useful = [u for _, u in top]
+            best = _dcg(ideal[:k])
+            results.append({
+                "strategy": name,
+                "k": k,
+                "useful_at_k": round(sum(useful) / len(top), 2) if top else 0.0,
+                "utility_at_k": round(sum(useful) / posts, 3) if posts else 0.0,
+                "ndcg_at_k": round(_dcg(useful) / best, 3) if best else 0.0,
+            })
+    return results
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Database
+# ─────────────────────────────────────────────────────────────────────────────
+def run_evaluation(conn, platform: str, cutoff: datetime, history_days: int, ks: Sequence[int],
+                   user_id: Optional[int] = None, group_id: Optional[int] = None) -> Dict[str, Any]:
+    params = {
+        "platform": platform,
+        "cutoff": cutoff,
+        "since": cutoff - timedelta(days=history_days),
+        "user_id": user_id,
+        "group_id": group_id,
+        "limit": MAX_SEEDS,
+    }
+    with conn.cursor() as cur:
+        graph = CooccurrenceGraph()
+        cur.execute(HISTORY_SQL, params)
+        graph.add_posts(tags for tags, in cur.fetchall())
+
+        cur.execute(SEEDS_SQL, params)
+        seeds = {tag: float(frequency) for tag, frequency in cur.fetchall() if tag}
+
+        cur.execute(SCRAPED_BEFORE_SQL, params)
+        scraped_before = {tag for tag, in cur.fetchall()}
+
+        cur.execute(SCRAPED_AFTER_SQL, params)
+        outcomes = build_outcomes(cur.fetchall(), set(seeds), exclude=scraped_before)
+
+    rankings = rank_strategies(graph, seeds, outcomes)
+    return {
+        "platform": platform,
+        "cutoff": cutoff.isoformat(),
+        "graph_nodes": len(graph),
+        "seeds": len(seeds),
+        "candidates": len(outcomes),
+        "results": evaluate_rankings(rankings, outcomes, ks),
+    }
+
+
+def main() -> None:
+    import psycopg
+
+    parser = argparse.ArgumentParser(description="Compare hashtag discovery rankings on stored posts")
+    parser.add_argument("--platform", default="tiktok")
+    parser.add_argument("--user-id", type=int, help="Tenant whose competitors are the seeds (default: all)")
+    parser.add_argument("--group-id", type=int)
+    parser.add_argument("--cutoff-days", type=int, default=7, help="Candidates are hashtags scraped in the last N days")
+    parser.add_argument("--history-days", type=int, default=90, help="Posts before the cutoff that build the graph")
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    cutoff = datetime.now() - timedelta(days=args.cutoff_days)
+    with psycopg.connect(os.environ["DATABASE_URL"]) as conn:
+        report = run_evaluation(conn, args.platform, cutoff, args.history_days, args.k,
+                                args.user_id, args.group_id)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n{report['platform']} since {report['cutoff']}: {report['candidates']} candidates, "
+          f"{report['seeds']} seeds, {report['graph_nodes']} graph nodes")
+    print(f"\n{'strategy':<14} {'k':>4} {'useful@k':>9} {'utility@k':>10} {'ndcg@k':>7}")
+    for r in report["results"]:
+        print(f"{r['strategy']:<14} {r['k']:>4} {r['useful_at_k']:>9.2f} {r['utility_at_k']:>10.3f} "
+              f"{r['ndcg_at_k']:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Hashtag Relevance
+=================
+
+Ranks candidate hashtags by how related they are to a tenant's
+competitors, instead of by raw frequency.
+
+Frequency favours generic tags (#fyp, #viral, #love) whose posts are
+mostly unrelated to the competitors, so discovery spent its browser
+time on them. Relevance is personalized PageRank on the hashtag
+co-occurrence graph (table hashtag_cooccurrence, kept current by the
+bulk loader):
+
+    - the restart distribution is the tenant's competitor hashtags,
+      weighted by how often the competitors use them (all competitors'
+      when there is no tenant)
+    - the graph is loaded around them: the strongest MAX_NEIGHBOURS
+      edges of each seed, of their neighbours (HOPS) and of the
+      candidates
+    - edge weights are association strengths, pair count divided by
+      sqrt(frequency_a * frequency_b), so a hub that co-occurs with
+      everything passes little of a seed's score on
+    - PageRank still pools mass in well-connected nodes, so each score
+      is divided by the node's total edge weight to the power HUB_PENALTY
+
+score_candidates() returns the scores; rank_candidates() orders
+HashtagDiscovery candidates by them. evaluate_relevance.py compares
+the rankings on stored posts.
+
+Usage:
+    from socialmedia.hashtag.hashtag_relevance import rank_candidates
+    with psycopg.connect(DATABASE_URL) as conn:
+        ranked = rank_candidates(conn, "tiktok", candidates, user_id=1)
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import math
+import os
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+# 'relevance' (personalized PageRank) or 'frequency' (the old order)
+HASHTAG_RANKING = os.getenv("HASHTAG_RANKING", "relevance").lower()
+
+# Probability of following an edge rather than restarting at a seed
+DAMPING = float(os.getenv("HASHTAG_RELEVANCE_DAMPING", "0.85"))
+
+# Competitor hashtags in the restart distribution
+MAX_SEEDS = int(os.getenv("HASHTAG_RELEVANCE_SEEDS", "50"))
+
+# Graph neighbourhood loaded around the seeds
+HOPS = int(os.getenv("HASHTAG_RELEVANCE_HOPS", "2"))
+MAX_NEIGHBOURS = int(os.getenv("HASHTAG_RELEVANCE_NEIGHBOURS", "50"))
+
+# Exponent of the edge weight total that scores are divided by (0: none,
+# 1: full degree normalization, which favours nodes with a single edge)
+HUB_PENALTY = 0.5
+
+# Pairs seen fewer times are noise
+MIN_PAIR_WEIGHT = 2
+
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-9
+
+# Scores are stored as hashtag_frontier.priority (BIGINT)
+PRIORITY_SCALE = 10 ** 9
+
+# Matches HashtagDiscovery's tenant query and window
+TENANT_SEEDS_SQL = """
+    SELECT LOWER(LTRIM(BTRIM(tag), '#')) AS hashtag, COUNT(*) AS frequency
+    FROM competitor_posts cp
+    JOIN user_competitors uc ON uc.competitor_id = cp.competitor_id
+    CROSS JOIN LATERAL UNNEST(cp.hashtags) AS tag
+    WHERE uc.user_id = %(user_id)s
+      AND (uc.group_id = %(group_id)s OR uc.group_id IS NULL)
+      AND cp.posted_at >= NOW() - INTERVAL '28 days'
+      AND cp.platform = %(platform)s
+    GROUP BY 1
+    ORDER BY frequency DESC
+    LIMIT %(limit)s
+"""
+
+GLOBAL_SEEDS_SQL = """
+    SELECT hashtag, competitor_frequency
+    FROM hashtag_stats
+    WHERE platform = %(platform)s
+      AND competitor_frequency > 0
+      AND last_seen_at >= NOW() - INTERVAL '28 days'
+    ORDER BY competitor_frequency DESC
+    LIMIT %(limit)s
+"""
+
+# The strongest edges of each node, in both pair directions
+NEIGHBOURS_SQL = """
+    SELECT src, dst, weight FROM (
+        SELECT e.src, e.dst, e.weight,
+               ROW_NUMBER() OVER (PARTITION BY e.src ORDER BY e.weight DESC) AS rank
+        FROM (
+            SELECT hashtag_a AS src, hashtag_b AS dst, weight
+            FROM hashtag_cooccurrence
+            WHERE platform = %(platform)s AND hashtag_a = ANY(%(nodes)s)
+            UNION ALL
+            SELECT hashtag_b, hashtag_a, weight
+            FROM hashtag_cooccurrence
+            WHERE platform = %(platform)s AND hashtag_b = ANY(%(nodes)s)
+        ) e
+        WHERE e.weight >= %(min_weight)s
+    ) ranked
+    WHERE rank <= %(max_neighbours)s
+"""
+
+FREQUENCIES_SQL = """
+    SELECT hashtag, competitor_frequency + hashtag_post_frequency
+    FROM hashtag_stats
+    WHERE platform = %(platform)s AND hashtag = ANY(%(nodes)s)
+"""
+
+
+def hashtag_key(tag: str) -> str:
+    """Key of a hashtag in hashtag_stats / hashtag_cooccurrence."""
+    return (tag or "").strip().lstrip("#").lower()
+
+
+class CooccurrenceGraph:
+    """Undirected weighted hashtag graph with per-hashtag post counts."""
+
+    def __init__(self):
+        self.adjacency: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.frequency: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.adjacency)
+
+    def add_edge(self, a: str, b: str, weight: float) -> None:
+        if a == b:
+            return
+        self.adjacency[a][b] = weight
+        self.adjacency[b][a] = weight
+
+    def add_posts(self, posts: Iterable[Sequence[str]], max_tags: int = 30) -> None:
+        """
+        Count frequencies and pairs of post hashtag arrays, the way the
+        bulk loader does (first max_tags hashtags, each once per post).
+        """
+        pairs: Dict[tuple, int] = defaultdict(int)
+        for tags in posts:
+            unique = sorted({hashtag_key(tag) for tag in list(tags or [])[:max_tags]} - {""})
+            for tag in unique:
+                self.frequency[tag] = self.frequency.get(tag, 0) + 1
+            for i, a in enumerate(unique):
+                for b in unique[i + 1:]:
+                    pairs[(a, b)] += 1
+        for (a, b), weight in pairs.items():
+            self.add_edge(a, b, self.adjacency.get(a, {}).get(b, 0) + weight)
+
+    def association(self, min_weight: int = 1) -> "CooccurrenceGraph":
+        """
+        Copy with pair counts turned into association strengths
+        (count / sqrt(frequency_a * frequency_b)); pairs below min_weight
+        are dropped. Nodes without a known frequency keep the raw count.
+        """
+        graph = CooccurrenceGraph()
+        graph.frequency = dict(self.frequency)
+        for a, neighbours in self.adjacency.items():
+            for b, weight in neighbours.items():
+                if a >= b or weight < min_weight:
+                    continue
+                fa, fb = self.frequency.get(a), self.frequency.get(b)
+                graph.add_edge(a, b, weight / math.sqrt(fa * fb) if fa and fb else weight)
+        return graph
+
+
+def personalized_pagerank(
+    graph: CooccurrenceGraph,
+    personalization: Dict[str, float],
+    damping: float = DAMPING,
+    max_iterations: int = MAX_ITERATIONS,
+    tolerance: float = TOLERANCE,
+) -> Dict[str, float]:
+    """
+    PageRank with restarts at the personalization hashtags (power
+    iteration over the sparse graph). Mass at nodes without edges returns
+    to the seeds. Scores sum to 1; nodes never reached are absent.
+    """
+    total = sum(w for w in personalization.values() if w > 0)
+    if not total:
+        return {}
+    restart = {node: w / total for node, w in personalization.items() if w > 0}
+    out_weight = {node: sum(neighbours.values()) for node, neighbours in graph.adjacency.items()}
+
+    scores = dict(restart)
+    for _ in range(max_iterations):
+        following = {node: (1 - damping) * w for node, w in restart.items()}
+        dangling = 0.0
+        for node, score in scores.items():
+            weight = out_weight.get(node, 0)
+            if not weight:
+                dangling += score
+                continue
+            share = damping * score / weight
+            for neighbour, edge in graph.adjacency[node].items():
+                following[neighbour] = following.get(neighbour, 0.0) + share * edge
+        if dangling:
+            for node, w in restart.items():
+                following[node] += damping * dangling * w
+
+        delta = sum(abs(following.get(n, 0.0) - scores.get(n, 0.0)) for n in following.keys() | scores.keys())
+        scores = following
+        if delta < tolerance:
+            break
+    return scores
+
+
+def penalize_hubs(graph: CooccurrenceGraph, scores: Dict[str, float],
+                  exponent: float = HUB_PENALTY) -> Dict[str, float]:
+    """Scores divided by each node's total edge weight ** exponent."""
+    penalized = {}
+    for node, score in scores.items():
+        strength = sum(graph.adjacency.get(node, {}).values())
+        penalized[node] = score / strength ** exponent if strength else score
+    return penalized
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Database
+# ─────────────────────────────────────────────────────────────────────────────
+def load_seeds(conn, platform: str, user_id: Optional[int] = None,
+               group_id: Optional[int] = None, limit: int = MAX_SEEDS) -> Dict[str, float]:
+    """The tenant's (or all) competitor hashtags with their frequencies."""
+    params = {"platform": platform, "user_id": user_id, "group_id": group_id, "limit": limit}
+    with conn.cursor() as cur:
+        cur.execute(TENANT_SEEDS_SQL if user_id else GLOBAL_SEEDS_SQL, params)
+        return {tag: float(frequency) for tag, frequency in cur.fetchall() if tag}
+
+
+def _load_edges(cur, graph: CooccurrenceGraph, platform: str, nodes: Set[str],
+                max_neighbours: int) -> Set[str]:
+    """Add the strongest edges of nodes to graph; returns the nodes reached."""
+    if not nodes:
+        return set()
+    cur.execute(NEIGHBOURS_SQL, {
+        "platform": platform,
+        "nodes": sorted(nodes),
+        "min_weight": MIN_PAIR_WEIGHT,
+        "max_neighbours": max_neighbours,
+    })
+    reached = set()
+    for src, dst, weight in cur.fetchall():
+        graph.add_edge(src, dst, weight)
+        reached.add(dst)
+    return reached
+
+
+def load_neighbourhood(conn, platform: str, seeds: Iterable[str], extra: Iterable[str] = (),
+                       hops: int = HOPS, max_neighbours: int = MAX_NEIGHBOURS) -> CooccurrenceGraph:
+    """
+    The co-occurrence graph around the seeds (hops deep) plus the edges of
+    extra nodes, with hashtag_stats frequencies.
+    """
+    graph = CooccurrenceGraph()
+    loaded: Set[str] = set()
+    layer = set(seeds)
+    with conn.cursor() as cur:
+        for _ in range(hops):
+            reached = _load_edges(cur, graph, platform, layer - loaded, max_neighbours)
+            loaded |= layer
+            layer = reached
+        _load_edges(cur, graph, platform, set(extra) - loaded, max_neighbours)
+
+        nodes = sorted(graph.adjacency)
+        if nodes:
+            cur.execute(FREQUENCIES_SQL, {"platform": platform, "nodes": nodes})
+            graph.frequency = {tag: int(frequency) for tag, frequency in cur.fetchall() if frequency}
+    return graph
+
+
+def score_candidates(conn, platform: str, candidates: Iterable[str],
+                     user_id: Optional[int] = None, group_id: Optional[int] = None) -> Dict[str, float]:
+    """
+    Relevance of each candidate hashtag to the tenant's competitors
+    (hub-penalized personalized PageRank score; 0 when unconnected).
+    """
+    keys = {hashtag_key(tag) for tag in candidates} - {""}
+    seeds = load_seeds(conn, platform, user_id, group_id)
+    if not keys or not seeds:
+        return {key: 0.0 for key in keys}
+    graph = load_neighbourhood(conn, platform, seeds, extra=keys).association()
+    scores = penalize_hubs(graph, personalized_pagerank(graph, seeds))
+    return {key: scores.get(key, 0.0) for key in keys}
+
+
+def rank_candidates(conn, platform: str, candidates: List[Dict[str, Any]],
+                    user_id: Optional[int] = None, group_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Candidates ({'hashtag', 'frequency', 'seed'} dicts) ordered by
+    relevance, then frequency, each with a 'relevance' score. Seed
+    hashtags (flagged 'seed' by HashtagDiscovery) stay first.
+    """
+    scores = score_candidates(conn, platform, [c["hashtag"] for c in candidates], user_id, group_id)
+    ranked = [dict(c, relevance=scores.get(hashtag_key(c["hashtag"]), 0.0)) for c in candidates]
+    ranked.sort(key=lambda c: (bool(c.get("seed")), c["relevance"], c["frequency"]), reverse=True)
+    return ranked
+
+
+def relevance_priority(score: float) -> int:
+    """hashtag_frontier.priority of a relevance score, below the seeds'."""
+    return min(int(round(score * PRIORITY_SCALE)), PRIORITY_SCALE - 1)
+
+
+def candidate_priority(candidate: Dict[str, Any]) -> int:
+    """
+    hashtag_frontier.priority of a discovery candidate: seeds above any
+    score, then the relevance score, or the frequency when the candidate
+    was ranked by frequency.
+    """
+    if candidate.get("seed"):
+        return PRIORITY_SCALE
+    if "relevance" in candidate:
+        return relevance_priority(candidate["relevance"])
+    return int(candidate.get("frequency") or 0)
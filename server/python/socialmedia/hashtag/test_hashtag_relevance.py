@@ -0,0 +1,131 @@
+"""
+Hashtag Relevance Tests
+=======================
+
+Tests for the co-occurrence ranking in hashtag_relevance.py and the
+offline metrics in evaluate_relevance.py (no database).
+
+Run with:
+    python -m pytest socialmedia/hashtag/test_hashtag_relevance.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import pytest
+
+from socialmedia.hashtag import hashtag_relevance
+from socialmedia.hashtag.evaluate_relevance import build_outcomes, evaluate_rankings, rank_strategies
+from socialmedia.hashtag.hashtag_relevance import (
+    PRIORITY_SCALE,
+    CooccurrenceGraph,
+    candidate_priority,
+    penalize_hubs,
+    personalized_pagerank,
+    rank_candidates,
+)
+
+
+def hub_graph():
+    """
+    Competitors post #espresso with #latteart; #fyp is on every post,
+    including many unrelated ones.
+    """
+    graph = CooccurrenceGraph()
+    graph.add_posts([["#espresso", "#latteart", "#fyp"]] * 6)
+    graph.add_posts([["#espresso", "#fyp"]] * 4)
+    graph.add_posts([["#fyp", "#dance"]] * 40 + [["#fyp", "#prank"]] * 40)
+    return graph
+
+
+class TestCooccurrenceGraph:
+    def test_add_posts_counts_pairs_once_per_post(self):
+        graph = CooccurrenceGraph()
+        graph.add_posts([["#Gym", "gym", "#fitness"], ["#fitness", "#gym"]])
+        assert graph.adjacency["fitness"]["gym"] == 2
+        assert graph.frequency == {"fitness": 2, "gym": 2}
+
+    def test_add_posts_caps_tags_per_post(self):
+        graph = CooccurrenceGraph()
+        graph.add_posts([["a", "b", "c", "d"]], max_tags=2)
+        assert set(graph.adjacency) == {"a", "b"}
+
+    def test_association_demotes_hubs(self):
+        graph = hub_graph().association()
+        assert graph.adjacency["espresso"]["latteart"] > graph.adjacency["espresso"]["fyp"]
+
+    def test_association_drops_weak_pairs(self):
+        graph = CooccurrenceGraph()
+        graph.add_posts([["a", "b"], ["a", "b"], ["a", "c"]])
+        assert set(graph.association(min_weight=2).adjacency) == {"a", "b"}
+
+
+class TestPersonalizedPagerank:
+    def test_scores_sum_to_one(self):
+        scores = personalized_pagerank(hub_graph().association(), {"espresso": 1.0})
+        assert sum(scores.values()) == pytest.approx(1.0)
+        assert scores["fyp"] > scores["dance"]
+
+    def test_penalized_seed_specific_neighbour_beats_the_hub(self):
+        graph = hub_graph().association()
+        scores = penalize_hubs(graph, personalized_pagerank(graph, {"espresso": 1.0}))
+        assert scores["latteart"] > scores["fyp"] > scores["dance"]
+
+    def test_isolated_seeds_keep_the_mass(self):
+        assert personalized_pagerank(CooccurrenceGraph(), {"a": 3.0, "b": 1.0}) == pytest.approx({"a": 0.75, "b": 0.25})
+        assert personalized_pagerank(CooccurrenceGraph(), {}) == {}
+
+
+class TestRankCandidates:
+    def test_seeds_stay_first_then_relevance(self, monkeypatch):
+        monkeypatch.setattr(hashtag_relevance, "score_candidates",
+                            lambda conn, platform, tags, user_id, group_id: {"fyp": 0.01, "latteart": 0.2})
+        ranked = rank_candidates(None, "tiktok", [
+            {"hashtag": "fyp", "frequency": 5000, "seed": False},
+            {"hashtag": "latteart", "frequency": 8, "seed": False},
+            {"hashtag": "coffee", "frequency": 3, "seed": True},
+        ])
+        assert [c["hashtag"] for c in ranked] == ["coffee", "latteart", "fyp"]
+        assert ranked[1]["relevance"] == 0.2
+
+    @pytest.mark.parametrize("candidate,priority", [
+        ({"hashtag": "coffee", "frequency": 5, "seed": True}, PRIORITY_SCALE),
+        # A popular hashtag's summed stats don't make it a seed
+        ({"hashtag": "fyp", "frequency": 5000, "seed": False}, 5000),
+        ({"hashtag": "latteart", "frequency": 8, "relevance": 0.25}, PRIORITY_SCALE // 4),
+        ({"hashtag": "gym", "frequency": 8}, 8),
+        ({"hashtag": "espresso", "frequency": 8, "relevance": 1.7}, PRIORITY_SCALE - 1),
+    ])
+    def test_candidate_priority(self, candidate, priority):
+        assert candidate_priority(candidate) == priority
+
+
+class TestEvaluation:
+    def test_outcomes_count_posts_sharing_another_seed(self):
+        outcomes = build_outcomes([
+            ("latteart", ["#latteart", "#espresso"]),
+            ("latteart", ["#latteart"]),
+            ("espresso", ["#espresso"]),
+            ("old", ["#espresso"]),
+        ], seeds={"espresso"}, exclude={"old"})
+        assert outcomes == {"latteart": (2, 1), "espresso": (1, 0)}
+
+    def test_pagerank_beats_frequency_on_hub_graph(self):
+        rankings = rank_strategies(hub_graph(), {"espresso": 1.0}, ["fyp", "latteart", "dance"])
+        assert rankings["frequency"][0] == "fyp"
+        assert rankings["pagerank"][0] == "latteart"
+
+    def test_metrics(self):
+        outcomes = {"a": (10, 8), "b": (10, 2), "c": (10, 0)}
+        results = evaluate_rankings({"best": ["a", "b", "c"], "worst": ["c", "b", "a"]}, outcomes, ks=[1, 3])
+        by_key = {(r["strategy"], r["k"]): r for r in results}
+
+        assert by_key["best", 1] == {"strategy": "best", "k": 1, "useful_at_k": 8.0,
+                                     "utility_at_k": 0.8, "ndcg_at_k": 1.0}
+        assert by_key["worst", 1]["useful_at_k"] == 0.0 and by_key["worst", 1]["ndcg_at_k"] == 0.0
+        assert by_key["worst", 3]["utility_at_k"] == by_key["best", 3]["utility_at_k"] == pytest.approx(0.333)
+        assert by_key["worst", 3]["ndcg_at_k"] < by_key["best", 3]["ndcg_at_k"] == 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,95 @@
+"""
+Hashtag Stats Discovery Tests
+=============================
+
+Tests for the hashtag_stats discovery query of
+HashtagDiscovery.get_unscraped_hashtags (no database).
+
+Run with:
+    python -m pytest socialmedia/hashtag/test_hashtag_stats.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from socialmedia.hashtag import hashtag_discovery
+from socialmedia.hashtag.hashtag_discovery import HashtagDiscovery, unscraped_hashtags_sql
+
+
+@pytest.fixture
+def cursor(monkeypatch):
+    conn = MagicMock()
+    cur = conn.__enter__.return_value.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [("fitness", 5, True), ("gym", 1200, False)]
+    monkeypatch.setattr(hashtag_discovery.psycopg, "connect", lambda url: conn)
+    return cur
+
+
+class TestUnscrapedHashtagsSql:
+    def test_global_reads_the_partial_index_order(self):
+        text = unscraped_hashtags_sql()
+        assert "FROM hashtag_stats" in text
+        assert "last_scraped_at IS NULL" in text
+        assert "ORDER BY competitor_frequency + hashtag_post_frequency DESC" in text
+        assert "UNNEST(hashtags)" not in text and "competitor_posts" not in text
+
+    def test_competitor_only(self):
+        text = unscraped_hashtags_sql(include_hashtag_posts=False)
+        assert "ORDER BY competitor_frequency DESC" in text
+        assert "competitor_frequency > 0" in text
+
+    def test_tenant_counts_the_users_competitors(self):
+        text = unscraped_hashtags_sql(tenant=True)
+        assert "uc.user_id = %(user_id)s" in text
+        assert "COALESCE(s.hashtag_post_frequency, 0)" in text
+        assert "s.last_scraped_at IS NOT NULL" in text
+
+
+class TestGetUnscrapedHashtags:
+    def test_one_query_with_normalized_seeds(self, cursor, monkeypatch):
+        monkeypatch.setattr(hashtag_discovery, "HASHTAG_RANKING", "frequency")
+        discovery = HashtagDiscovery(platform="TikTok", seed_hashtags=["#Fitness"])
+        result = discovery.get_unscraped_hashtags(limit=5)
+
+        assert result == [
+            {"hashtag": "fitness", "frequency": 5, "seed": True},
+            {"hashtag": "gym", "frequency": 1200, "seed": False},
+        ]
+        assert cursor.execute.call_count == 1
+        params = cursor.execute.call_args[0][1]
+        assert params["seeds"] == ["fitness"]
+        assert (params["platform"], params["limit"]) == ("tiktok", 5)
+
+    def test_relevance_reranks_a_larger_pool(self, cursor, monkeypatch):
+        def rank(conn, platform, candidates, user_id=None, group_id=None):
+            return [dict(c, relevance=0.5) for c in reversed(candidates)]
+        monkeypatch.setattr(hashtag_discovery, "HASHTAG_RANKING", "relevance")
+        monkeypatch.setattr(hashtag_discovery, "rank_candidates", rank)
+
+        result = HashtagDiscovery(platform="tiktok").get_unscraped_hashtags(limit=1)
+
+        assert cursor.execute.call_args[0][1]["limit"] == hashtag_discovery.RELEVANCE_POOL
+        assert result == [{"hashtag": "gym", "frequency": 1200, "seed": False, "relevance": 0.5}]
+
+    def test_ranking_error_keeps_frequency_order(self, cursor, monkeypatch):
+        def fail(*args, **kwargs):
+            raise RuntimeError("relation hashtag_cooccurrence does not exist")
+        monkeypatch.setattr(hashtag_discovery, "HASHTAG_RANKING", "relevance")
+        monkeypatch.setattr(hashtag_discovery, "rank_candidates", fail)
+
+        result = HashtagDiscovery(platform="tiktok").get_unscraped_hashtags(limit=1)
+        assert result == [{"hashtag": "fitness", "frequency": 5, "seed": True}]
+
+    def test_database_error_returns_nothing(self, monkeypatch):
+        def fail(url):
+            raise RuntimeError("connection refused")
+        monkeypatch.setattr(hashtag_discovery.psycopg, "connect", fail)
+        assert HashtagDiscovery().get_unscraped_hashtags() == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
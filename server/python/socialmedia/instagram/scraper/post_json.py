@@ -0,0 +1,178 @@
+"""
+Instagram Post JSON
+===================
+
+Reads a post from the JSON Instagram embeds in its pages, for
+InstagramScraper.scrape_post.
+
+Two shapes carry a post:
+
+    - media items ("xdt_api__v1__media__shortcode__web_info" in the post
+      page's preloaded query results, and the "items" of the ?__a=1
+      endpoint): caption.text, like_count, comment_count, image_versions2,
+      carousel_media, video_versions; the comments come from a separate
+      "xdt_api__v1__media__media_id__comments__connection" blob
+    - legacy GraphQL nodes ("shortcode_media", also inside
+      window._sharedData): edge_media_to_caption, edge_media_preview_like,
+      edge_media_to_parent_comment, edge_sidecar_to_children
+
+Both are located and decoded with shared/embedded_json (one value per
+blob, no HTML parsing) and read by the key paths below. The functions
+return the post_data dict scrape_post builds a PostRecord from, or None
+when the page has no usable blob and the scraper has to read the DOM.
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ...shared.embedded_json import extract_fields, find_value, get_path
+
+# Keys that locate a post's blobs in the page HTML
+MEDIA_INFO_KEY = "xdt_api__v1__media__shortcode__web_info"
+COMMENTS_KEY = "xdt_api__v1__media__media_id__comments__connection"
+GRAPHQL_KEY = "shortcode_media"
+
+MAX_COMMENTS = 20
+
+HASHTAG_RE = re.compile(r"(?u)#([\w\-]+)")
+
+# Field key paths, candidates in order of preference
+ITEM_FIELDS = {
+    "username": (("user", "username"), ("owner", "username")),
+    "caption": (("caption", "text"),),
+    "post_date": (("taken_at",),),
+    "likes": (("like_count",),),
+    "comments_count": (("comment_count",),),
+    "views": (("play_count",), ("view_count",), ("ig_play_count",)),
+}
+
+NODE_FIELDS = {
+    "username": (("owner", "username"),),
+    "caption": (("edge_media_to_caption", "edges", 0, "node", "text"),),
+    "post_date": (("taken_at_timestamp",), ("timestamp",)),
+    "likes": (("edge_media_preview_like", "count"), ("edge_liked_by", "count")),
+    "comments_count": (("edge_media_to_parent_comment", "count"), ("edge_media_to_comment", "count")),
+    "views": (("video_view_count",), ("video_play_count",)),
+}
+
+ITEM_COMMENT_FIELDS = {
+    "username": (("user", "username"), ("owner", "username")),
+    "text": (("text",),),
+    "likes": (("comment_like_count",), ("like_count",)),
+    "timestamp": (("created_at",),),
+}
+
+NODE_COMMENT_FIELDS = {
+    "username": (("owner", "username"),),
+    "text": (("text",),),
+    "likes": (("edge_liked_by", "count"),),
+    "timestamp": (("created_at",),),
+}
+
+ITEM_IMAGE_PATH = ("image_versions2", "candidates", 0, "url")
+ITEM_VIDEO_PATH = ("video_versions", 0, "url")
+
+
+def _post_data(post_url: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+    caption = fields.get("caption") or ""
+    return {
+        "url": post_url,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "username": fields.get("username", ""),
+        "post_date": fields.get("post_date", ""),
+        "caption": caption,
+        "hashtags": HASHTAG_RE.findall(caption),
+        "likes": str(fields["likes"]) if "likes" in fields else "",
+        "comments_count": str(fields["comments_count"]) if "comments_count" in fields else "",
+        "views": fields.get("views"),
+        "media_urls": [],
+        "comments": [],
+    }
+
+
+def _comments(edges: Any, paths: Dict[str, Any]) -> List[Dict[str, str]]:
+    comments = []
+    for edge in edges if isinstance(edges, list) else ():
+        fields = extract_fields(get_path(edge, ("node",), edge), paths)
+        if not fields.get("text"):
+            continue
+        comments.append({
+            "username": fields.get("username", ""),
+            "text": fields["text"],
+            "likes": str(fields.get("likes", "")),
+            "timestamp": fields.get("timestamp", ""),
+        })
+        if len(comments) >= MAX_COMMENTS:
+            break
+    return comments
+
+
+def _add_media(media_urls: List[str], url: Optional[str]) -> None:
+    if url and url not in media_urls:
+        media_urls.append(url)
+
+
+def from_item(item: Dict[str, Any], post_url: str,
+              comment_edges: Any = None) -> Dict[str, Any]:
+    """post_data from a media item (web_info / ?__a=1 "items" shape)."""
+    post_data = _post_data(post_url, extract_fields(item, ITEM_FIELDS))
+    for media in item.get("carousel_media") or [item]:
+        _add_media(post_data["media_urls"], get_path(media, ITEM_VIDEO_PATH) or get_path(media, ITEM_IMAGE_PATH))
+    if comment_edges is not None:
+        post_data["comments"] = _comments(comment_edges, ITEM_COMMENT_FIELDS)
+    return post_data
+
+
+def from_node(node: Dict[str, Any], post_url: str) -> Dict[str, Any]:
+    """post_data from a legacy GraphQL shortcode_media node."""
+    post_data = _post_data(post_url, extract_fields(node, NODE_FIELDS))
+    children = get_path(node, ("edge_sidecar_to_children", "edges"), [])
+    media = [get_path(child, ("node",), {}) for child in children] if children else [node]
+    for entry in media:
+        video = entry.get("video_url") if entry.get("is_video") else None
+        _add_media(post_data["media_urls"], video or entry.get("display_url"))
+    post_data["comments"] = _comments(get_path(node, ("edge_media_to_parent_comment", "edges"), []),
+                                      NODE_COMMENT_FIELDS)
+    return post_data
+
+
+def parse_api_response(data: Any, post_url: str) -> Optional[Dict[str, Any]]:
+    """post_data from a decoded ?__a=1&__d=dis response, or None."""
+    if not isinstance(data, dict):
+        return None
+    item = get_path(data, ("items", 0))
+    if isinstance(item, dict):
+        return from_item(item, post_url)
+    # Nested under graphql, bare, or the node itself in older responses
+    node = get_path(data, ("graphql", GRAPHQL_KEY)) or data.get(GRAPHQL_KEY)
+    if node is None and "edge_media_to_caption" in data:
+        node = data
+    if isinstance(node, dict):
+        return from_node(node, post_url)
+    return None
+
+
+def parse_post_html(html: str, post_url: str) -> Optional[Dict[str, Any]]:
+    """
+    post_data from the blobs embedded in a post page, or None when the
+    page has none with a caption or counts. Comments are left empty when
+    the page has no comments blob; the scraper then reads the rendered
+    list.
+    """
+    info = find_value(html, MEDIA_INFO_KEY)
+    item = get_path(info, ("items", 0))
+    if isinstance(item, dict):
+        post_data = from_item(item, post_url, get_path(find_value(html, COMMENTS_KEY), ("edges",)))
+    else:
+        node = find_value(html, GRAPHQL_KEY)
+        if not isinstance(node, dict):
+            return None
+        post_data = from_node(node, post_url)
+
+    if not (post_data["caption"] or post_data["likes"]):
+        return None
+    return post_data
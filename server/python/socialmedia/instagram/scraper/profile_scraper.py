@@ -16,29 +16,41 @@ import logging
 
 # Import the new driver factory
 from ...drivers import get_driver, switch_to_fallback, BotDetectedError
+from ...drivers.base_scraper import polite_delay
+from ...drivers.dom_extract import extract_page
+from ...shared import embedded_json
+from ...shared.post_record import PostRecord, ProfileSnapshot, parse_count
+from ...shared.scrape_journal import ScrapeJournal, read_scrape_file
+from . import post_json
 
 log = logging.getLogger(__name__)
 
 
-def parse_shorthand(value: str) -> str:
-    # Convert notation (K, M, B) full numbers
-    val = value.strip().upper().replace(",", "")
-    if val.endswith("K"):
-        try:
-            return str(int(float(val[:-1]) * 1_000))
-        except ValueError:
-            return val
-    if val.endswith("M"):
-        try:
-            return str(int(float(val[:-1]) * 1_000_000))
-        except ValueError:
-            return val
-    if val.endswith("B"):
-        try:
-            return str(int(float(val[:-1]) * 1_000_000_000))
-        except ValueError:
-            return val
-    return val  # No suffix
+POST_LINK_XPATH = "//a[contains(@href, '/p/') or contains(@href, '/reel/')]"
+
+# Seconds to wait for lazy-loaded posts after each scroll
+SCROLL_WAIT_TIMEOUT = float(os.getenv("SCRAPE_SCROLL_WAIT", "4"))
+
+# Page extraction specs (one injected script per page, see drivers/dom_extract)
+POST_LINKS_SPEC = {
+    "links": {"posts": {"query": POST_LINK_XPATH}},
+}
+
+# Comment containers in order of preference; all three are read in one
+# call and the first that yields comments is used
+POST_COMMENT_CONTAINERS = (
+    ("nested", "ul ul li"),  # Nested list comments
+    ("spans", "div[class*='Comment'] span"),  # Comment text spans
+    ("article", "article ul > li"),  # Comments in article
+)
+
+POST_COMMENTS_SPEC = {
+    "lists": {
+        name: {"containers": [selector], "limit": 20, "min_matches": 2, "fields": {"full_text": ["."]}}
+        for name, selector in POST_COMMENT_CONTAINERS  # min_matches: skip if just header
+    },
+}
+
 
 def prefix_words_with_hash(caption: str) -> str:
     # Prefix every word in the caption with "#"
@@ -46,7 +58,7 @@ def prefix_words_with_hash(caption: str) -> str:
     return " ".join(f"{tok}" for tok in tokens if tok.strip())
 
 class InstagramScraper:
-    def __init__(self, username=None, password=None, cookies_path="cookies/instagram_cookies.pkl", use_cookies=True, headless=None, proxy=None, driver_type='undetected'):
+    def __init__(self, username=None, password=None, cookies_path="cookies/instagram_cookies.pkl", use_cookies=True, headless=None, proxy=None, driver_type='undetected', driver=None):
         """
         Initialize Instagram scraper.
         
@@ -58,6 +70,9 @@ class InstagramScraper:
             headless: Deprecated - kept for backward compatibility. Use HEADLESS env var instead.
             proxy: Optional proxy string (e.g. "http://1.2.3.4:8080")
             driver_type: Driver to use - 'undetected', 'seleniumbase', or 'playwright'
+            driver: Already set-up driver to use instead of launching one (e.g. a
+                PlaywrightContextPool context); driver_type must describe it and
+                close() leaves it to its owner
         """
         self.username = username
         self.password = password
@@ -68,11 +83,17 @@ class InstagramScraper:
         self.driver_type = None  # Will be set by setup_driver
         self.preferred_driver = driver_type.lower()  # 'undetected', 'seleniumbase' or 'playwright'
         self._raw_driver = None  # The underlying driver object for direct access
-        self.setup_driver()
+        self._owns_driver = driver is None
+        if driver is not None:
+            self._raw_driver, self.driver_type = driver, self.preferred_driver
+            self.driver = driver.driver if self.driver_type in ('undetected', 'seleniumbase') else driver
+        else:
+            self.setup_driver()
 
     def setup_driver(self):
         """Initialize scraper using the preferred driver type."""
         driver_name = self.preferred_driver
+        self._owns_driver = True
         print(f"Setting up scraper driver (requested: {driver_name})... Proxy: {self.proxy if self.proxy else 'None'}")
         
         try:
@@ -111,6 +132,7 @@ class InstagramScraper:
         
         try:
             self._raw_driver, self.driver_type = switch_to_fallback(self._raw_driver, headless=True, proxy=self.proxy)
+            self._owns_driver = True  # the fallback browser is ours to close
             
             if self.driver_type == 'seleniumbase':
                 self.driver = self._raw_driver.driver
@@ -182,7 +204,7 @@ class InstagramScraper:
                 return False
             
             self.driver.get("https://www.instagram.com")
-            time.sleep(2)
+            self._raw_driver.wait_for_network_idle()
             for cookie in cookies:
                 try:
                     cookie.pop("sameSite", None)
@@ -212,7 +234,7 @@ class InstagramScraper:
             print("Cookies disabled. Running in GUEST MODE (Public Access).")
             try:
                 self.driver.get("https://www.instagram.com")
-                time.sleep(2)
+                self._raw_driver.wait_for_network_idle()
                 return True
             except Exception as e:
                 print(f"Guest mode init failed: {e}")
@@ -229,7 +251,7 @@ class InstagramScraper:
             # In guest mode, we just try to visit the homepage and then proceed
             try:
                 self.driver.get("https://www.instagram.com")
-                time.sleep(2)
+                self._raw_driver.wait_for_network_idle()
                 # Dismiss potential login popups if key ones appear immediately
                 return True
             except Exception as e:
@@ -248,11 +270,8 @@ class InstagramScraper:
             )
             print("Page loaded")
             
-            # Step 2: Give JavaScript time to render (CRITICAL for Instagram)
-            print("Waiting for content to render...")
-            time.sleep(5)  # Instagram needs time to render with JavaScript
-            
-            # Step 3: Wait for username field to be VISIBLE (not just present in DOM)
+            # Step 2: Wait for username field to be VISIBLE (not just present in DOM);
+            # Instagram renders the form with JavaScript after the load event
             print("Waiting for login form to appear...")
             username_field = WebDriverWait(self.driver, 20).until(
                 EC.visibility_of_element_located((By.NAME, "username"))
@@ -321,16 +340,19 @@ class InstagramScraper:
         # Wait for successful login
         print("Waiting for login to complete...")
         try:
-            # # Wait for a post-login element (nav/explore link) to appear
-            # WebDriverWait(self.driver, 30).until(
-            #     EC.presence_of_element_located((By.XPATH, "//nav//a[contains(@href, '/explore')]"))
-            # )
-            time.sleep(30)
+            # Logged in: the nav (home feed) or a "Save login info" /
+            # notifications prompt appears; bounded instead of a fixed 30s
+            logged_in = self._raw_driver.wait_for_selector(
+                "//nav//a[contains(@href, '/explore')] | //button[contains(text(), 'Not Now')]"
+                " | //button[contains(text(), 'Not now')]",
+                timeout=30,
+            )
+            if not logged_in and "/accounts/login" in self.driver.current_url:
+                raise TimeoutException("Login form still shown")
             print("Login successful!")
             
             # Dismiss "Save Login Info" and "Turn on Notifications" popups
             print("Dismissing popups...")
-            time.sleep(2)
             not_now_buttons = [
                 "//button[contains(text(), 'Not Now')]",
                 "//button[contains(text(), 'Not now')]",
@@ -366,14 +388,20 @@ class InstagramScraper:
                 print(f"Current URL: {self.driver.current_url}")
             return False
     
-    def scrape_profile(self, profile_url, max_posts=None):
+    def scrape_profile(self, profile_url, max_posts=None, known=None):
+        """
+        Scrape an Instagram profile's stats and newest posts.
+        
+        With known (the profile's KnownPosts), scrolling stops at the
+        known-post watermark and only new or due posts are opened.
+        """
         if not profile_url.startswith("https://www.instagram.com/"):
             profile_url = profile_url.lstrip("@")
             profile_url = f"https://www.instagram.com/{profile_url.strip('/')}/"
             
         print(f"Navigating to profile: {profile_url}")
         self.driver.get(profile_url)
-        time.sleep(3)
+        self._raw_driver.wait_for_selector("//meta[@property='og:description']")
         
         try:
             try:
@@ -382,7 +410,6 @@ class InstagramScraper:
                 profile_name = "instagram_profile"
 
             # Extract profile stats
-            time.sleep(2)
             meta_desc = self.driver.find_element(By.XPATH, "//meta[@property='og:description']").get_attribute("content")
             print(f"Profile meta description: {meta_desc}")
             
@@ -396,17 +423,17 @@ class InstagramScraper:
                 # Extract Followers
                 m_fol = re.search(r"([\d,.]+K?M?B?)\s+Followers", meta_desc, re.IGNORECASE)
                 if m_fol:
-                    followers = parse_shorthand(m_fol.group(1))
+                    followers = parse_count(m_fol.group(1))
                     
                 # Extract Following
                 m_fng = re.search(r"([\d,.]+K?M?B?)\s+Following", meta_desc, re.IGNORECASE)
                 if m_fng:
-                    following = parse_shorthand(m_fng.group(1))
+                    following = parse_count(m_fng.group(1))
                     
                 # Extract Posts
                 m_posts = re.search(r"([\d,.]+K?M?B?)\s+Posts", meta_desc, re.IGNORECASE)
                 if m_posts:
-                    posts_count = parse_shorthand(m_posts.group(1))
+                    posts_count = parse_count(m_posts.group(1))
 
             print(f"Scraped Stats - Followers: {followers}, Following: {following}, Posts: {posts_count}")
             
@@ -416,8 +443,8 @@ class InstagramScraper:
             following = 0
             posts_count = 0
 
-        posts_data = []
-        post_links = set()
+        # Grid order (newest first) matters for the known-post watermark
+        post_links = {}
         
         target_count = max_posts if max_posts else "all"
         print(f"Finding posts (target: {target_count} posts)...")
@@ -425,35 +452,32 @@ class InstagramScraper:
         
         while True:
             try:
-                post_elements = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_all_elements_located((By.XPATH, "//a[contains(@href, '/p/') or contains(@href, '/reel/')]"))
-                )
-                for el in post_elements:
-                    href = el.get_attribute("href")
-                    if href:
-                        # Ensure absolute URL
-                        if href.startswith("/"):
-                            href = f"https://www.instagram.com{href}"
-                        post_links.add(href)
+                if not self._raw_driver.wait_for_selector(POST_LINK_XPATH, timeout=10):
+                    print("No post links found")
+                    break
+                # All post links of the grid in one round trip
+                for href in extract_page(self.driver, POST_LINKS_SPEC)["posts"]:
+                    # Ensure absolute URL
+                    if href.startswith("/"):
+                        href = f"https://www.instagram.com{href}"
+                    if href not in post_links:
+                        post_links[href] = None
+                        if known is not None:
+                            known.observe(href)
                         
                 print(f"Found {len(post_links)} posts so far...")
                 
+                if known is not None and known.watermark_reached:
+                    print("Reached already scraped posts, stopping scroll")
+                    break
                 if max_posts and len(post_links) >= max_posts:
                     break
                     
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
+                new_height = self._raw_driver.wait_for_scroll_height_change(last_height, SCROLL_WAIT_TIMEOUT)
                 if new_height == last_height:
-                    time.sleep(2)
-                    new_height2 = self.driver.execute_script("return document.body.scrollHeight")
-                    if new_height2 == last_height:
-                        break
-                    else:
-                        last_height = new_height2
-                else:
-                    last_height = new_height
+                    break
+                last_height = new_height
             except Exception as e:
                 print(f"Error while scrolling: {e}")
                 break
@@ -462,66 +486,109 @@ class InstagramScraper:
         if max_posts:
             post_links = post_links[:max_posts]
         print(f"Found {len(post_links)} posts in total.")
+        if known is not None:
+            post_links = known.select(post_links)
+            print(f"Incremental scrape: {known.summary()}")
         
-        for idx, post_url in enumerate(post_links, start=1):
-            try:
-                print(f"Processing post {idx}/{len(post_links)}: {post_url}")
-                data = self.scrape_post(post_url)
-                if data:
-                    posts_data.append(data)
-                time.sleep(1)
-            except Exception as e:
-                print(f"Error processing {post_url}: {e}")
-                
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        # Save to scrape_result folder in the same directory as this script
-        scrape_result_dir = os.path.join(os.path.dirname(__file__), "scrape_result")
-        os.makedirs(scrape_result_dir, exist_ok=True)
-        json_filename = os.path.join(scrape_result_dir, f"{profile_name}_posts_{timestamp}.json")
         
-        # Structure the payload
-        export_data = {
-            "profile_info": {
-                "username": profile_name,
-                "followers": followers,
-                "following": following,
-                "posts_count": posts_count,
-                "scraped_at": timestamp
-            },
-            "posts": posts_data
-        }
+        profile = ProfileSnapshot(
+            "instagram", profile_name,
+            followers=followers, following=following, posts_count=posts_count,
+            scraped_at=timestamp,
+        )
         
-        with open(json_filename, "w", encoding="utf-8") as jf:
-            json.dump(export_data, jf, ensure_ascii=False, indent=4)
-        print(f"Saved all posts to {json_filename}\n")
+        # Each post is on disk as soon as it is scraped, so a crash loses
+        # nothing; the upload reads the posts back from the journal
+        scrape_result_dir = os.path.join(os.path.dirname(__file__), "scrape_result")
+        journal = ScrapeJournal(
+            os.path.join(scrape_result_dir, f"{profile_name}_posts_{timestamp}"),
+            meta={"profile_info": profile.to_dict()},
+        )
         
+        try:
+            for idx, post_url in enumerate(post_links, start=1):
+                try:
+                    print(f"Processing post {idx}/{len(post_links)}: {post_url}")
+                    data = self.scrape_post(post_url)
+                    if data:
+                        journal.append(data)
+                        if known is not None:
+                            known.record(data)
+                    polite_delay(1)
+                except Exception as e:
+                    print(f"Error processing {post_url}: {e}")
+        finally:
+            journal.close()
+            print(f"Saved {journal.count} posts to {journal.path}\n")
+
+        _, lines = read_scrape_file(journal.path)
+        posts_data = [PostRecord.coerce(post, 'instagram') for post in lines]
 
+        # None when auto-upload is off; the weekly scheduler reads it
+        self.last_upload_ok = None
         try:
             if os.getenv("UPLOAD_AFTER_SCRAPE", "1") in ("1", "true", "True"):
-                group_id = os.getenv("UPLOAD_GROUP_ID", "1")
-                # If DATABASE_URL is provided in env, pass it to the uploader process environment
-                env = os.environ.copy()
-                dburl = os.getenv("DATABASE_URL")
-                if dburl:
-                    env["DATABASE_URL"] = dburl
+                from ...shared.ingestion_service import get_ingestion_service
 
-                uploader = os.path.join(os.path.dirname(__file__), "..", "..", "shared", "upload_to_db.py")
-                if not os.path.exists(uploader):
-                    print(f"Uploader script not found at {uploader}; skipping auto-upload")
+                print(f"Auto-upload enabled — ingesting {len(posts_data)} posts for @{profile_name}")
+                self.last_upload_ok = bool(get_ingestion_service().ingest_instagram_profile(profile, posts_data))
+                if self.last_upload_ok:
+                    print("Auto-upload completed successfully")
                 else:
-                    print(f"Auto-upload enabled — running uploader for {json_filename}")
-                    cmd = [sys.executable, uploader, json_filename]
-                    # Run uploader and stream output
-                    proc = subprocess.run(cmd, env=env)
-                    if proc.returncode == 0:
-                        print("Auto-upload completed successfully")
-                    else:
-                        print(f"Auto-upload failed with exit code {proc.returncode}")
+                    print("Auto-upload failed")
         except Exception as e:
+            self.last_upload_ok = False
             print(f"Error during optional auto-upload: {e}")
 
+        # An uploaded journal is only kept for debugging; one that wasn't
+        # uploaded stays for upload_to_db
+        if self.last_upload_ok and os.getenv("SCRAPE_DEBUG_JSON", "0") not in ("1", "true", "True"):
+            os.remove(journal.path)
+
         return posts_data
     
+    def _read_rendered_comments(self):
+        """Comments from the rendered comment list (one dom_extract call)."""
+        comments = []
+        try:
+            # Wait a bit for comments to load
+            self._raw_driver.wait_for_network_idle(timeout=3)
+            page = extract_page(self.driver, POST_COMMENTS_SPEC)
+        except Exception as e:
+            print(f"  → Comment extraction failed: {e}")
+            return comments
+
+        for name, _ in POST_COMMENT_CONTAINERS:
+            for item in page[name]:
+                full_text = item["full_text"]
+                if len(full_text) < 3:
+                    continue
+
+                # Try to split username from comment
+                parts = full_text.split('\n')
+                username = ""
+                if len(parts) >= 2:
+                    username = parts[0].strip()
+                    text = ' '.join(parts[1:]).strip()
+                else:
+                    text = full_text.strip()
+
+                # Skip if looks like UI text
+                if any(skip in text.lower() for skip in ['reply', 'view replies', 'like', 'hide']):
+                    continue
+
+                if len(text) > 2:
+                    comments.append({
+                        "username": username,
+                        "text": text,
+                        "likes": "",
+                        "timestamp": ""
+                    })
+            if comments:
+                break  # Found comments, stop trying other selectors
+        return comments
+
     def scrape_post(self, post_url):
         # First try the JSON endpoint for the post (more reliable)
         # Handle both regular posts (/p/) and reels (/reel/)
@@ -533,113 +600,28 @@ class InstagramScraper:
             api_url = f"https://www.instagram.com/{'reel' if is_reel else 'p'}/{shortcode}/?__a=1&__d=dis"
             try:
                 self.driver.get(api_url)
-                time.sleep(1.0)
+                self._raw_driver.wait_for_selector("body", timeout=5)
                 body_txt = self.driver.find_element(By.TAG_NAME, "body").text
-                data = json.loads(body_txt)
-                # navigate to shortcode_media
-                node = None
-                if isinstance(data, dict):
-                    # some responses nest under graphql
-                    node = data.get("graphql", {}).get("shortcode_media") or data.get("shortcode_media")
-                if not node:
-                    # older or alternate structure
-                    try:
-                        node = data
-                    except Exception:
-                        node = None
-
-                if node and isinstance(node, dict):
-                    post_data = {
-                        "url": post_url,
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "post_date": node.get("taken_at_timestamp") or node.get("timestamp") or "",
-                        "caption": "",
-                        "hashtags": [],
-                        "likes": "",
-                        "comments_count": "",
-                        "media_urls": [],
-                        "comments": []  # List of comment objects
-                    }
-
-                    # caption
-                    try:
-                        edges = node.get("edge_media_to_caption", {}).get("edges", [])
-                        if edges:
-                            cap = edges[0].get("node", {}).get("text", "")
-                            post_data["caption"] = cap
-                            post_data["hashtags"] = re.findall(r"#([A-Za-z0-9_]+)", cap)
-                    except Exception:
-                        pass
-
-                    # likes and comments
-                    try:
-                        likes = node.get("edge_media_preview_like", {}) or node.get("edge_media_preview_like")
-                        if isinstance(likes, dict):
-                            count = likes.get("count")
-                            if count is not None:
-                                post_data["likes"] = str(count)
-                    except Exception:
-                        pass
-                    try:
-                        comments = node.get("edge_media_to_parent_comment", {}) or node.get("edge_media_to_parent_comment")
-                        if isinstance(comments, dict):
-                            count = comments.get("count")
-                            if count is not None:
-                                post_data["comments_count"] = str(count)
-                            
-                            # Extract actual comments
-                            comment_edges = comments.get("edges", [])
-                            for edge in comment_edges[:20]:  # Max 20 comments
-                                try:
-                                    comment_node = edge.get("node", {})
-                                    comment_data = {
-                                        "username": comment_node.get("owner", {}).get("username", ""),
-                                        "text": comment_node.get("text", ""),
-                                        "likes": str(comment_node.get("edge_liked_by", {}).get("count", "")),
-                                        "timestamp": comment_node.get("created_at", "")
-                                    }
-                                    if comment_data["text"]:
-                                        post_data["comments"].append(comment_data)
-                                except Exception:
-                                    continue
-                    except Exception:
-                        pass
-
-                    # media urls: single, sidecar, or video
-                    try:
-                        if node.get("__typename") == "GraphSidecar":
-                            children = node.get("edge_sidecar_to_children", {}).get("edges", [])
-                            for c in children:
-                                n = c.get("node", {})
-                                if n.get("is_video"):
-                                    url = n.get("video_url") or n.get("display_url")
-                                else:
-                                    url = n.get("display_url")
-                                if url and url not in post_data["media_urls"]:
-                                    post_data["media_urls"].append(url)
-                        else:
-                            if node.get("is_video"):
-                                url = node.get("video_url") or node.get("display_url")
-                                if url:
-                                    post_data["media_urls"].append(url)
-                            else:
-                                url = node.get("display_url")
-                                if url:
-                                    post_data["media_urls"].append(url)
-                    except Exception:
-                        pass
-
-                    return post_data
+                post_data = post_json.parse_api_response(embedded_json.loads(body_txt), post_url)
+                if post_data:
+                    return PostRecord.from_instagram(post_data)
             except Exception:
-                # JSON endpoint failed - fall back to HTML parsing below
+                # JSON endpoint failed - fall back to the post page below
                 pass
 
-        # Prefer parsing the page HTML with BeautifulSoup to avoid many direct Selenium calls
+        # Read the post page's embedded JSON; parse its HTML with BeautifulSoup
+        # only when the page has none
         for attempt in range(2):
             try:
                 self.driver.get(post_url)
-                time.sleep(1.5)
+                self._raw_driver.wait_for_selector("article", timeout=5)
                 html = self.driver.page_source
+                post_data = post_json.parse_post_html(html, post_url)
+                if post_data:
+                    if not post_data["comments"]:
+                        post_data["comments"] = self._read_rendered_comments()
+                    return PostRecord.from_instagram(post_data)
+
                 soup = BeautifulSoup(html, "html.parser")
 
                 post_data = {
@@ -790,10 +772,10 @@ class InstagramScraper:
                     desc = og_desc.get("content")
                     m_likes = re.search(r"([\d,]+[KMB]?)\s+likes", desc)
                     if m_likes:
-                        post_data["likes"] = parse_shorthand(m_likes.group(1))
+                        post_data["likes"] = parse_count(m_likes.group(1))
                     m_comments = re.search(r"([\d,]+[KMB]?)\s+comments", desc)
                     if m_comments:
-                        post_data["comments_count"] = parse_shorthand(m_comments.group(1))
+                        post_data["comments_count"] = parse_count(m_comments.group(1))
 
                 # media urls
                 imgs = soup.select("article img")
@@ -839,69 +821,16 @@ class InstagramScraper:
                         except:
                             continue
                     
-                    # If no comments from JSON, try DOM extraction using Playwright
-                    if not post_data["comments"] and hasattr(self.driver, 'page'):
-                        try:
-                            page = self.driver.page
-                            # Wait a bit for comments to load
-                            time.sleep(1)
-                            
-                            # Instagram comment selectors
-                            comment_selectors = [
-                                "ul ul li",  # Nested list comments
-                                "div[class*='Comment'] span",  # Comment text spans
-                                "article ul > li",  # Comments in article
-                            ]
-                            
-                            for selector in comment_selectors:
-                                try:
-                                    elements = page.query_selector_all(selector)
-                                    if elements and len(elements) > 1:  # Skip if just header
-                                        for elem in elements[:20]:
-                                            try:
-                                                # Get all text from the element
-                                                full_text = elem.inner_text()
-                                                if not full_text or len(full_text) < 3:
-                                                    continue
-                                                
-                                                # Try to split username from comment
-                                                parts = full_text.split('\n')
-                                                username = ""
-                                                text = ""
-                                                
-                                                if len(parts) >= 2:
-                                                    username = parts[0].strip()
-                                                    text = ' '.join(parts[1:]).strip()
-                                                else:
-                                                    text = full_text.strip()
-                                                
-                                                # Skip if looks like UI text
-                                                if any(skip in text.lower() for skip in ['reply', 'view replies', 'like', 'hide']):
-                                                    continue
-                                                
-                                                if text and len(text) > 2:
-                                                    comment_data = {
-                                                        "username": username,
-                                                        "text": text,
-                                                        "likes": "",
-                                                        "timestamp": ""
-                                                    }
-                                                    post_data["comments"].append(comment_data)
-                                            except:
-                                                continue
-                                        if post_data["comments"]:
-                                            break  # Found comments, stop trying other selectors
-                                except:
-                                    continue
-                        except Exception as e:
-                            print(f"  → DOM comment extraction error: {e}")
+                    # If no comments from JSON, read the rendered comment list
+                    if not post_data["comments"]:
+                        post_data["comments"] = self._read_rendered_comments()
                     
                     if post_data["comments"]:
                         print(f"  → Found {len(post_data['comments'])} comments")
                 except Exception as e:
                     print(f"  → Comment extraction failed: {e}")
 
-                return post_data
+                return PostRecord.from_instagram(post_data)
 
             except (StaleElementReferenceException, WebDriverException) as e:
                 # chromedriver sometimes throws low-level errors; retry once after small sleep
@@ -925,7 +854,7 @@ class InstagramScraper:
         
         print(f"Navigating to hashtag page: {hashtag_url}")
         self.driver.get(hashtag_url)
-        time.sleep(5)
+        self._raw_driver.wait_for_selector(POST_LINK_XPATH)
         
         # Take a screenshot to verify page state
         try:
@@ -936,7 +865,8 @@ class InstagramScraper:
 
         
         posts_data = []
-        post_links = set()
+        # Grid order (newest first) matters for the known-post watermark
+        post_links = {}
         
         target_count = max_posts if max_posts else "all"
         print(f"Finding posts for #{hashtag} (target: {target_count} posts)...")
@@ -946,34 +876,22 @@ class InstagramScraper:
         while True:
             try:
                 # Find post links (both /p/ and /reel/)
-                post_elements = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_all_elements_located((By.XPATH, "//a[contains(@href, '/p/') or contains(@href, '/reel/')]"))
-                )
-                for el in post_elements:
-                    href = el.get_attribute("href")
-                    if href:
-                        post_links.add(href)
+                if not self._raw_driver.wait_for_selector(POST_LINK_XPATH, timeout=10):
+                    print("No post links found")
+                    break
+                post_links.update(extract_page(self.driver, POST_LINKS_SPEC)["posts"])
                         
                 print(f"Found {len(post_links)} posts so far...")
                 
                 if max_posts and len(post_links) >= max_posts:
                     break
                     
-                # Scroll down
+                # Scroll down and wait for the next batch to grow the page
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
+                new_height = self._raw_driver.wait_for_scroll_height_change(last_height, SCROLL_WAIT_TIMEOUT)
                 if new_height == last_height:
-                    # Try scrolling again after a delay
-                    time.sleep(2)
-                    new_height2 = self.driver.execute_script("return document.body.scrollHeight")
-                    if new_height2 == last_height:
-                        break
-                    else:
-                        last_height = new_height2
-                else:
-                    last_height = new_height
+                    break
+                last_height = new_height
             except Exception as e:
                 print(f"Error while scrolling hashtag page: {e}")
                 break
@@ -983,37 +901,27 @@ class InstagramScraper:
             post_links = post_links[:max_posts]
         print(f"Found {len(post_links)} posts for #{hashtag}.")
         
-        # Scrape each post
-        for idx, post_url in enumerate(post_links, start=1):
-            try:
-                print(f"Processing post {idx}/{len(post_links)}: {post_url}")
-                data = self.scrape_post(post_url)
-                if data:
-                    # Add hashtag metadata to the post data
-                    data['source_hashtag'] = hashtag
-                    posts_data.append(data)
-                time.sleep(1)  # Be respectful with rate limiting
-            except Exception as e:
-                print(f"Error processing {post_url}: {e}")
-                
-        # Save to JSON file (similar to scrape_profile)
+        # Scrape each post, appending it to the journal as soon as it is parsed
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         scrape_result_dir = os.path.join(os.path.dirname(__file__), "scrape_result")
-        os.makedirs(scrape_result_dir, exist_ok=True)
-        json_filename = os.path.join(scrape_result_dir, f"{hashtag}_hashtag_posts_{timestamp}.json")
-        
-        export_data = {
-            "hashtag_info": {
-                "hashtag": hashtag,
-                "posts_count": len(posts_data),
-                "scraped_at": timestamp
-            },
-            "posts": posts_data
-        }
-        
-        with open(json_filename, "w", encoding="utf-8") as jf:
-            json.dump(export_data, jf, ensure_ascii=False, indent=4)
-        print(f"Saved all posts to {json_filename}\n")
+        with ScrapeJournal(
+            os.path.join(scrape_result_dir, f"{hashtag}_hashtag_posts_{timestamp}"),
+            meta={"hashtag_info": {"hashtag": hashtag, "platform": "instagram", "scraped_at": timestamp}},
+        ) as journal:
+            for idx, post_url in enumerate(post_links, start=1):
+                try:
+                    print(f"Processing post {idx}/{len(post_links)}: {post_url}")
+                    data = self.scrape_post(post_url)
+                    if data:
+                        # Add hashtag metadata to the post data
+                        data.source_hashtag = hashtag
+                        journal.append(data)
+                        posts_data.append(data)
+                    polite_delay(1)  # Be respectful with rate limiting
+                except Exception as e:
+                    print(f"Error processing {post_url}: {e}")
+        json_filename = journal.path
+        print(f"Saved {journal.count} posts to {json_filename}\n")
         
         # Auto-upload if enabled (similar to scrape_profile)
         try:
@@ -1041,7 +949,8 @@ class InstagramScraper:
     
     def close(self):
         if self._raw_driver:
-            self._raw_driver.quit()
+            if self._owns_driver:
+                self._raw_driver.quit()
             self._raw_driver = None
             self.driver = None
 
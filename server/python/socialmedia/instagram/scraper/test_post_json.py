@@ -0,0 +1,112 @@
+"""
+Instagram Post JSON Tests
+=========================
+
+Tests for reading posts from the media items, comment connections and
+legacy GraphQL nodes Instagram embeds in post pages and the ?__a=1
+endpoint.
+
+Run with:
+    python -m pytest socialmedia/instagram/scraper/test_post_json.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+
+import pytest
+
+from socialmedia.instagram.scraper import post_json
+from socialmedia.shared.post_record import PostRecord
+
+URL = "https://www.instagram.com/p/Cabc/"
+
+ITEM = {
+    "code": "Cabc",
+    "taken_at": 1760000000,
+    "user": {"username": "brand"},
+    "caption": {"text": "Summer drop #launch #café"},
+    "like_count": 1520,
+    "comment_count": 31,
+    "media_type": 8,
+    "image_versions2": {"candidates": [{"url": "https://cdn/cover.jpg"}]},
+    "carousel_media": [
+        {"image_versions2": {"candidates": [{"url": "https://cdn/1.jpg"}, {"url": "https://cdn/1s.jpg"}]}},
+        {"video_versions": [{"url": "https://cdn/2.mp4"}], "image_versions2": {"candidates": [{"url": "https://cdn/2.jpg"}]}},
+    ],
+}
+
+COMMENTS = {"edges": [
+    {"node": {"text": "love it", "created_at": 1760000100, "comment_like_count": 4, "user": {"username": "fan"}}},
+    {"node": {"text": "", "user": {"username": "empty"}}},
+]}
+
+NODE = {
+    "__typename": "GraphImage",
+    "taken_at_timestamp": 1760000000,
+    "display_url": "https://cdn/node.jpg",
+    "edge_media_to_caption": {"edges": [{"node": {"text": "Old style #tbt"}}]},
+    "edge_media_preview_like": {"count": 88},
+    "edge_media_to_parent_comment": {"count": 1, "edges": [
+        {"node": {"text": "nice", "owner": {"username": "pal"}, "edge_liked_by": {"count": 2}}}]},
+    "edge_sidecar_to_children": {"edges": []},
+}
+
+
+def page(*blobs):
+    scripts = "".join(f'<script type="application/json">{json.dumps(b)}</script>' for b in blobs)
+    return f"<html><head>{scripts}</head><body><article></article></body></html>"
+
+
+class TestParsePostHtml:
+    def test_media_item_and_comments(self):
+        html = page(
+            {"require": [["Bundle", {"define": list(range(50))}]]},
+            {"data": {post_json.MEDIA_INFO_KEY: {"items": [ITEM]}}},
+            {"data": {post_json.COMMENTS_KEY: COMMENTS}},
+        )
+        post_data = post_json.parse_post_html(html, URL)
+
+        assert post_data["caption"] == "Summer drop #launch #café"
+        assert post_data["hashtags"] == ["launch", "café"]
+        assert (post_data["likes"], post_data["comments_count"]) == ("1520", "31")
+        assert post_data["media_urls"] == ["https://cdn/1.jpg", "https://cdn/2.mp4"]
+        assert post_data["comments"] == [
+            {"username": "fan", "text": "love it", "likes": "4", "timestamp": 1760000100}]
+
+        record = PostRecord.from_instagram(post_data)
+        assert record.username == "brand" and record.likes == 1520
+        assert record.posted_at.year == 2025
+
+    def test_without_comments_blob_leaves_comments_to_the_dom(self):
+        post_data = post_json.parse_post_html(page({"data": {post_json.MEDIA_INFO_KEY: {"items": [ITEM]}}}), URL)
+        assert post_data["likes"] == "1520" and post_data["comments"] == []
+
+    def test_legacy_shared_data(self):
+        html = f"<script>window._sharedData = {json.dumps({'entry_data': {'PostPage': [{'graphql': {'shortcode_media': NODE}}]}})};</script>"
+        post_data = post_json.parse_post_html(html, URL)
+
+        assert post_data["caption"] == "Old style #tbt" and post_data["likes"] == "88"
+        assert post_data["media_urls"] == ["https://cdn/node.jpg"]
+        assert post_data["comments"][0]["username"] == "pal"
+
+    def test_pages_without_post_data(self):
+        assert post_json.parse_post_html(page({"data": {"viewer": None}}), URL) is None
+        empty_item = {"items": [{"code": "Cabc"}]}
+        assert post_json.parse_post_html(page({"data": {post_json.MEDIA_INFO_KEY: empty_item}}), URL) is None
+
+
+class TestParseApiResponse:
+    def test_items_graphql_and_bare_node(self):
+        assert post_json.parse_api_response({"items": [ITEM]}, URL)["likes"] == "1520"
+        assert post_json.parse_api_response({"graphql": {"shortcode_media": NODE}}, URL)["likes"] == "88"
+        assert post_json.parse_api_response(NODE, URL)["caption"] == "Old style #tbt"
+
+    def test_unusable_responses(self):
+        assert post_json.parse_api_response([], URL) is None
+        assert post_json.parse_api_response({"status": "fail"}, URL) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
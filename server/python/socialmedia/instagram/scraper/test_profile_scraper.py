@@ -0,0 +1,112 @@
+"""
+Instagram Profile Scraper Tests
+===============================
+
+Tests for InstagramScraper.scrape_profile on a fixture profile page:
+every post goes to a journal as it is scraped, the upload reads the posts
+back from it, and the file is kept unless the upload went through.
+
+Run with:
+    python -m pytest socialmedia/instagram/scraper/test_profile_scraper.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+import os
+
+import pytest
+
+from socialmedia.drivers import base_scraper
+from socialmedia.drivers.dom_extract import build_script
+from socialmedia.drivers.fixture_driver import FixtureDriver, FixturePage, FixtureRecorder, wait_key
+from socialmedia.instagram.scraper import profile_scraper
+from socialmedia.instagram.scraper.profile_scraper import InstagramScraper
+from socialmedia.shared import ingestion_service
+from socialmedia.shared.post_record import PostRecord
+from socialmedia.shared.scrape_journal import ScrapeJournal, read_scrape_file
+
+PROFILE = "https://www.instagram.com/brand/"
+LINKS = ["https://www.instagram.com/p/C1/", "https://www.instagram.com/p/C2/"]
+
+
+class FakeIngestion:
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.uploads = []
+
+    def ingest_instagram_profile(self, profile, posts):
+        self.uploads.append((profile, posts))
+        return self.ok
+
+
+@pytest.fixture
+def scrape(tmp_path, monkeypatch):
+    """Scrape a recorded two-post profile; returns (posts, scraper, journal path, uploads)."""
+    html = ('<html><head><meta property="og:description" '
+            'content="1,200 Followers, 10 Following, 2 Posts"></head>'
+            '<body><a href="/p/C1/">1</a><a href="/p/C2/">2</a></body></html>')
+    page = FixturePage(PROFILE, html=html)
+    page.record_script(build_script(profile_scraper.POST_LINKS_SPEC), (), json.dumps({"posts": LINKS}))
+    page.record(wait_key("wait_for_selector", profile_scraper.POST_LINK_XPATH, False), True)
+    FixtureRecorder(str(tmp_path / "corpus")).save(page)
+
+    monkeypatch.setattr(base_scraper, "SCRAPE_POLITENESS_SCALE", 0)
+    monkeypatch.setattr(profile_scraper, "ScrapeJournal",
+                        lambda path, meta=None: ScrapeJournal(str(tmp_path / "journal"), meta=meta))
+    monkeypatch.delenv("SCRAPE_DEBUG_JSON", raising=False)
+
+    def run(ok=True, fail_on=None):
+        ingestion = FakeIngestion(ok)
+        monkeypatch.setattr(ingestion_service, "get_ingestion_service", lambda: ingestion)
+        scraper = InstagramScraper(driver_type="fixture", driver=FixtureDriver(str(tmp_path / "corpus")))
+
+        def scrape_post(url):
+            if url == fail_on:
+                raise RuntimeError("bot check")
+            return PostRecord.from_instagram({"url": url, "username": "brand", "likes": 10, "comments_count": 2})
+        monkeypatch.setattr(scraper, "scrape_post", scrape_post)
+
+        posts = scraper.scrape_profile(PROFILE)
+        return posts, scraper, str(tmp_path / "journal.jsonl"), ingestion.uploads
+    return run
+
+
+class TestJournaledScrape:
+    def test_uploads_the_journaled_posts_and_removes_the_file(self, scrape):
+        posts, scraper, path, uploads = scrape()
+
+        assert [p.url for p in posts] == LINKS
+        assert len(uploads) == 1
+        profile, uploaded = uploads[0]
+        assert profile.username == "brand"
+        assert [p.likes for p in uploaded] == [10, 10]
+        assert scraper.last_upload_ok is True
+        assert not os.path.exists(path)
+
+    def test_failed_upload_keeps_the_journal(self, scrape):
+        posts, scraper, path, _ = scrape(ok=False)
+
+        assert scraper.last_upload_ok is False
+        meta, lines = read_scrape_file(path)
+        assert meta["profile_info"]["username"] == "brand"
+        assert [line["url"] for line in lines] == LINKS
+
+    def test_debug_keeps_the_uploaded_journal(self, scrape, monkeypatch):
+        monkeypatch.setenv("SCRAPE_DEBUG_JSON", "1")
+        _, scraper, path, _ = scrape()
+
+        assert scraper.last_upload_ok is True
+        _, lines = read_scrape_file(path)
+        assert len(list(lines)) == 2
+
+    def test_failed_post_is_skipped(self, scrape):
+        posts, _, _, uploads = scrape(fail_on=LINKS[0])
+
+        assert [p.url for p in posts] == LINKS[1:]
+        assert [p.url for p in uploads[0][1]] == LINKS[1:]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
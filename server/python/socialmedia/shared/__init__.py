@@ -1,4 +1,14 @@
 # Shared Utilities Module
-from .upload_to_db import upload_posts_to_db
+from .post_record import PostRecord, ProfileSnapshot, parse_count
+from .upload_to_db import upload_posts_to_db, upload_instagram_payload
+from .ingestion_service import PostIngestionService, get_ingestion_service
+from .scrape_journal import ScrapeJournal, read_scrape_file
+from .known_posts import KnownPosts, load_known_posts
 
-__all__ = ['upload_posts_to_db']
+__all__ = [
+    'PostRecord', 'ProfileSnapshot', 'parse_count',
+    'upload_posts_to_db', 'upload_instagram_payload',
+    'PostIngestionService', 'get_ingestion_service',
+    'ScrapeJournal', 'read_scrape_file',
+    'KnownPosts', 'load_known_posts',
+]
@@ -14,6 +14,9 @@ from typing import Dict, Any, List
 from datetime import datetime, timedelta
 import logging
 
+# Re-exported: the single count parser lives with the post records
+from .post_record import PostRecord, parse_count, parse_timestamp
+
 log = logging.getLogger(__name__)
 
 
@@ -75,7 +78,7 @@ def calculate_posting_frequency(
     Calculate average posts per week.
     
     Args:
-        posts: List of posts with timestamps
+        posts: PostRecords, or dicts with timestamps
         days: Period to analyze
         
     Returns:
@@ -88,15 +91,17 @@ def calculate_posting_frequency(
     recent_posts = []
     
     for post in posts:
-        post_date = post.get('post_date') or post.get('timestamp') or post.get('created_at')
+        if isinstance(post, PostRecord):
+            post_date = post.posted_at
+        else:
+            post_date = post.get('post_date') or post.get('timestamp') or post.get('created_at')
         if not post_date:
             continue
         
         try:
-            if isinstance(post_date, str):
-                dt = datetime.fromisoformat(post_date.replace('Z', '+00:00'))
-            else:
-                dt = post_date
+            dt = parse_timestamp(post_date)
+            if dt is None:
+                continue
             
             if dt.replace(tzinfo=None) >= cutoff:
                 recent_posts.append(dt)
@@ -110,42 +115,6 @@ def calculate_posting_frequency(
     return round(len(recent_posts) / weeks, 2)
 
 
-def parse_count(value: Any) -> int:
-    """
-    Parse a count value that might be string, int, or formatted.
-    
-    Handles: "1.2K", "5M", "1,234", 1234, "1234"
-    
-    Args:
-        value: Count value in various formats
-        
-    Returns:
-        int: Parsed count
-    """
-    if value is None:
-        return 0
-    
-    if isinstance(value, (int, float)):
-        return int(value)
-    
-    if not isinstance(value, str):
-        return 0
-    
-    value = value.strip().upper().replace(',', '')
-    
-    try:
-        if value.endswith('K'):
-            return int(float(value[:-1]) * 1_000)
-        elif value.endswith('M'):
-            return int(float(value[:-1]) * 1_000_000)
-        elif value.endswith('B'):
-            return int(float(value[:-1]) * 1_000_000_000)
-        else:
-            return int(float(value))
-    except (ValueError, TypeError):
-        return 0
-
-
 def extract_hashtags(text: str) -> List[str]:
     """
     Extract hashtags from text.
@@ -0,0 +1,484 @@
+"""
+Bulk Post Loader
+================
+
+Shared set-based loader for competitor_posts and hashtag_posts.
+
+Instead of one INSERT ... ON CONFLICT per post (where any failure rolled
+back the whole transaction, earlier rows included), a batch is:
+
+    1. validated row by row in Python; bad rows are reported in
+       LoadResult.errors and left out, so they can't poison the batch
+    2. streamed with COPY into a temp staging table (ON COMMIT DROP)
+    3. reconciled with posts stored under another posted_at (moved_posts_sql):
+       a post re-scraped without a date keeps its stored date, and a
+       stored post whose date changed is moved by UPDATE, keeping its id
+    4. merged with a single INSERT ... SELECT ... ON CONFLICT
+       (platform, post_id, posted_at) DO UPDATE ... WHERE ... IS DISTINCT
+       FROM ..., so re-scraped posts whose content and metrics didn't move
+       are not rewritten (no new tuple version, no index churn)
+    5. in the same statement, the hashtags of the inserted posts are
+       counted into hashtag_stats and their pairs into
+       hashtag_cooccurrence (hashtag_stats_sql)
+
+Rows are plain dicts keyed by column name; media/engagement are dicts and
+hashtags a list. Duplicate posts within a batch are collapsed (last one
+wins), since ON CONFLICT can't touch the same row twice in one statement.
+
+Usage:
+    from socialmedia.shared.bulk_loader import COMPETITOR_POSTS, bulk_upsert_posts
+
+    with conn.cursor() as cur:
+        result = bulk_upsert_posts(cur, COMPETITOR_POSTS, rows)
+    conn.commit()
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import io
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Limits of the target columns (000003_partition_post_tables)
+POST_ID_MAX_LENGTH = 100
+PLATFORM_MAX_LENGTH = 50
+BIGINT_MAX = 2 ** 63 - 1
+
+
+@dataclass(frozen=True)
+class PostTable:
+    """A post table the loader can merge into."""
+    name: str
+    # (column, staging type); jsonb/timestamptz are cast on merge
+    columns: Tuple[Tuple[str, str], ...]
+    # Columns refreshed when the post already exists; a change in any of
+    # them except scraped_at is what makes an update worth writing
+    update_columns: Tuple[str, ...]
+    # Integer columns range-checked during validation
+    count_columns: Tuple[str, ...] = ()
+    # hashtag_stats counter the hashtags of newly inserted posts add to
+    hashtag_frequency_column: Optional[str] = None
+    # Column naming the hashtag a row was scraped for (sets last_scraped_at)
+    scraped_hashtag_column: Optional[str] = None
+
+
+COMPETITOR_POSTS = PostTable(
+    name="competitor_posts",
+    columns=(
+        ("competitor_id", "uuid"),
+        ("profile_id", "uuid"),
+        ("username", "text"),
+        ("platform", "text"),
+        ("post_id", "text"),
+        ("content", "text"),
+        ("media", "jsonb"),
+        ("posted_at", "timestamptz"),
+        ("engagement", "jsonb"),
+        ("hashtags", "jsonb"),
+        ("scraped_at", "timestamptz"),
+        ("caption_hash", "text"),
+    ),
+    update_columns=(
+        "competitor_id", "profile_id", "content", "media",
+        "engagement", "hashtags", "scraped_at",
+    ),
+    hashtag_frequency_column="competitor_frequency",
+)
+
+HASHTAG_POSTS = PostTable(
+    name="hashtag_posts",
+    columns=(
+        ("hashtag", "text"),
+        ("platform", "text"),
+        ("post_id", "text"),
+        ("username", "text"),
+        ("content", "text"),
+        ("media", "jsonb"),
+        ("posted_at", "timestamptz"),
+        ("likes", "bigint"),
+        ("comments_count", "bigint"),
+        ("hashtags", "jsonb"),
+        ("scraped_at", "timestamptz"),
+        ("caption_hash", "text"),
+    ),
+    update_columns=(
+        "hashtag", "username", "content", "media",
+        "likes", "comments_count", "hashtags", "scraped_at",
+    ),
+    count_columns=("likes", "comments_count"),
+    hashtag_frequency_column="hashtag_post_frequency",
+    scraped_hashtag_column="hashtag",
+)
+
+
+@dataclass
+class RowError:
+    """A row rejected before loading."""
+    index: int
+    source: str
+    reason: str
+
+    def __str__(self) -> str:
+        return f"row {self.index} ({self.source}): {self.reason}"
+
+
+@dataclass
+class LoadResult:
+    """Outcome of one bulk load."""
+    loaded: int = 0
+    inserted: int = 0
+    updated: int = 0
+    # Stored posts moved to a new posted_at (also counted in updated)
+    moved: int = 0
+    duplicates: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    # Indexes (into the input) of the rows that were merged
+    loaded_indexes: List[int] = field(default_factory=list)
+    # Indexes of the merged rows that were inserted or actually updated
+    changed_indexes: List[int] = field(default_factory=list)
+    # posted_at each changed row was stored under, by index; differs from
+    # the row's own when a re-scrape without a date kept the stored one
+    posted_at: Dict[int, Optional[datetime]] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated
+
+    @property
+    def unchanged(self) -> int:
+        return self.loaded - self.changed
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Validation
+# ─────────────────────────────────────────────────────────────────────────────
+def _has_nul(value: Any) -> bool:
+    if isinstance(value, str):
+        return "\x00" in value
+    if isinstance(value, dict):
+        return any(_has_nul(k) or _has_nul(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return any(_has_nul(v) for v in value)
+    return False
+
+
+def validate_row(table: PostTable, row: Dict[str, Any]) -> Optional[str]:
+    """
+    Check a row against the target table.
+
+    Returns:
+        str: Why the row can't be loaded, or None if it is fine.
+    """
+    post_id = row.get("post_id")
+    if not post_id:
+        return "missing post_id"
+    if len(str(post_id)) > POST_ID_MAX_LENGTH:
+        return f"post_id longer than {POST_ID_MAX_LENGTH} characters"
+
+    platform = row.get("platform")
+    if not platform:
+        return "missing platform"
+    if len(platform) > PLATFORM_MAX_LENGTH:
+        return f"platform longer than {PLATFORM_MAX_LENGTH} characters"
+
+    if table is HASHTAG_POSTS and not row.get("hashtag"):
+        return "missing hashtag"
+
+    for column in ("posted_at", "scraped_at"):
+        value = row.get(column)
+        if value is not None and not isinstance(value, datetime):
+            return f"{column} is not a datetime"
+
+    for column in table.count_columns:
+        value = row.get(column)
+        if value is None:
+            continue
+        if not isinstance(value, int) or isinstance(value, bool):
+            return f"{column} is not an integer"
+        if not 0 <= value <= BIGINT_MAX:
+            return f"{column} out of range: {value}"
+
+    for column, _ in table.columns:
+        if _has_nul(row.get(column)):
+            return f"{column} contains a NUL character"
+
+    return None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# COPY
+# ─────────────────────────────────────────────────────────────────────────────
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def copy_value(value: Any, staging_type: str) -> str:
+    """One field in COPY text format."""
+    if value is None:
+        return "\\N"
+    if staging_type == "jsonb":
+        text = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, datetime):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return text.translate(_COPY_ESCAPES)
+
+
+def copy_buffer(table: PostTable, rows: Iterable[Dict[str, Any]]) -> io.StringIO:
+    """Rows rendered as a COPY text-format stream."""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(copy_value(row.get(col), typ) for col, typ in table.columns))
+        buf.write("\n")
+    buf.seek(0)
+    return buf
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Merge
+# ─────────────────────────────────────────────────────────────────────────────
+def staging_name(table: PostTable) -> str:
+    return f"_stage_{table.name}"
+
+
+def staging_ddl(table: PostTable) -> str:
+    columns = ", ".join(f"{col} {typ}" for col, typ in table.columns)
+    return f"CREATE TEMP TABLE {staging_name(table)} ({columns}) ON COMMIT DROP"
+
+
+def _select_expr(column: str, staging_type: str) -> str:
+    if column == "hashtags":
+        return "ARRAY(SELECT jsonb_array_elements_text(COALESCE(s.hashtags, '[]'::jsonb)))"
+    if staging_type == "timestamptz":
+        return f"s.{column}::timestamp"
+    return f"s.{column}"
+
+
+# hashtag_stats key of a tag as scraped ('#Travel' -> 'travel')
+HASHTAG_KEY_SQL = "LOWER(LTRIM(BTRIM({}), '#'))"
+
+# Hashtags per post paired into hashtag_cooccurrence (n * (n - 1) / 2 pairs)
+MAX_COOCCURRENCE_TAGS = 30
+
+
+def hashtag_stats_sql(table: PostTable) -> str:
+    """
+    CTEs keeping hashtag_stats (migration 000008_hashtag_stats) and
+    hashtag_cooccurrence (000009_hashtag_cooccurrence) current, appended
+    to the merge of a table with hashtag_frequency_column set.
+
+    Only inserted posts count towards the frequencies and pairs, so a
+    re-scrape does not count a post twice (hashtags edited into an
+    existing post are not counted). first/last seen are the posts' dates;
+    the hashtags the batch was scraped for get last_scraped_at, changed
+    posts or not.
+    """
+    seen_key = HASHTAG_KEY_SQL.format("tag")
+    if table.scraped_hashtag_column:
+        scraped_key = HASHTAG_KEY_SQL.format(f"s.{table.scraped_hashtag_column}")
+        scraped = f"""
+        scraped AS (
+            SELECT DISTINCT s.platform, {scraped_key} AS hashtag
+            FROM {staging_name(table)} s
+        ),"""
+        source = """
+            SELECT COALESCE(se.platform, sc.platform), COALESCE(se.hashtag, sc.hashtag),
+                   COALESCE(se.frequency, 0), se.first_seen, se.last_seen,
+                   CASE WHEN sc.hashtag IS NOT NULL THEN NOW() END
+            FROM seen se
+            FULL JOIN scraped sc ON sc.platform = se.platform AND sc.hashtag = se.hashtag
+            WHERE COALESCE(se.hashtag, sc.hashtag) <> ''"""
+    else:
+        scraped = ""
+        source = """
+            SELECT se.platform, se.hashtag, se.frequency, se.first_seen, se.last_seen,
+                   NULL::timestamp
+            FROM seen se
+            WHERE se.hashtag <> ''"""
+    frequency = table.hashtag_frequency_column
+    return f"""
+        seen AS (
+            SELECT m.platform, {seen_key} AS hashtag, COUNT(*) AS frequency,
+                   MIN(COALESCE(m.posted_at, NOW()::timestamp)) AS first_seen,
+                   MAX(COALESCE(m.posted_at, NOW()::timestamp)) AS last_seen
+            FROM merged m
+            CROSS JOIN LATERAL UNNEST(m.hashtags) AS tag
+            WHERE m.inserted
+            GROUP BY 1, 2
+        ),{scraped}
+        stats AS (
+            INSERT INTO hashtag_stats AS h
+                (platform, hashtag, {frequency}, first_seen_at, last_seen_at, last_scraped_at){source}
+            -- Same lock order in concurrent uploads
+            ORDER BY 1, 2
+            ON CONFLICT (platform, hashtag) DO UPDATE SET
+                {frequency} = h.{frequency} + EXCLUDED.{frequency},
+                first_seen_at = LEAST(h.first_seen_at, EXCLUDED.first_seen_at),
+                last_seen_at = GREATEST(h.last_seen_at, EXCLUDED.last_seen_at),
+                last_scraped_at = COALESCE(EXCLUDED.last_scraped_at, h.last_scraped_at),
+                updated_at = NOW()
+        ),
+        post_tags AS (
+            SELECT DISTINCT m.platform, m.post_id, {seen_key} AS hashtag
+            FROM merged m
+            CROSS JOIN LATERAL UNNEST(m.hashtags[1:{MAX_COOCCURRENCE_TAGS}]) AS tag
+            WHERE m.inserted
+        ),
+        pairs AS (
+            INSERT INTO hashtag_cooccurrence AS c (platform, hashtag_a, hashtag_b, weight)
+            SELECT a.platform, a.hashtag, b.hashtag, COUNT(*)
+            FROM post_tags a
+            JOIN post_tags b
+              ON b.platform = a.platform AND b.post_id = a.post_id AND a.hashtag < b.hashtag
+            WHERE a.hashtag <> ''
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+            ON CONFLICT (platform, hashtag_a, hashtag_b) DO UPDATE SET
+                weight = c.weight + EXCLUDED.weight,
+                updated_at = NOW()
+        )
+    """
+
+
+def moved_posts_sql(table: PostTable) -> Tuple[str, str]:
+    """
+    Statements run before the merge for posts stored under another
+    posted_at, since the upsert key (platform, post_id, posted_at)
+    doesn't match them.
+
+    The first fills in the stored date of staged posts scraped without
+    one; the second moves stored posts to the staged date (a partition
+    move when the month changes) and returns (platform, post_id,
+    posted_at) of each.
+    Both join on (platform, post_id), which every partition indexes.
+    """
+    stage = staging_name(table)
+    fill = f"""
+        UPDATE {stage} s SET posted_at = t.posted_at
+        FROM {table.name} t
+        WHERE s.posted_at IS NULL AND t.posted_at IS NOT NULL
+          AND t.platform = s.platform AND t.post_id = s.post_id
+    """
+    move = f"""
+        UPDATE {table.name} t SET posted_at = s.posted_at::timestamp
+        FROM {stage} s
+        WHERE s.posted_at IS NOT NULL
+          AND t.platform = s.platform AND t.post_id = s.post_id
+          AND t.posted_at IS DISTINCT FROM s.posted_at::timestamp
+          AND NOT EXISTS (
+              SELECT 1 FROM {table.name} x
+              WHERE x.platform = s.platform AND x.post_id = s.post_id
+                AND x.posted_at = s.posted_at::timestamp
+          )
+        RETURNING t.platform, t.post_id, t.posted_at
+    """
+    return fill, move
+
+
+def merge_sql(table: PostTable) -> str:
+    """
+    INSERT ... SELECT from the staging table with the upsert.
+
+    Existing rows are only updated when a compared column differs, and
+    RETURNING yields (platform, post_id, inserted, posted_at) for every
+    written row,
+    so skipped no-op updates are simply absent from the result. Tables
+    with a hashtag_frequency_column update hashtag_stats in the same
+    statement.
+    """
+    columns = ", ".join(col for col, _ in table.columns)
+    select = ",\n            ".join(_select_expr(col, typ) for col, typ in table.columns)
+    updates = ",\n            ".join(f"{col} = EXCLUDED.{col}" for col in table.update_columns)
+    compared = [col for col in table.update_columns if col != "scraped_at"]
+    current = ", ".join(f"t.{col}" for col in compared)
+    incoming = ", ".join(f"EXCLUDED.{col}" for col in compared)
+    upsert = f"""
+        INSERT INTO {table.name} AS t ({columns})
+        SELECT
+            {select}
+        FROM {staging_name(table)} s
+        ON CONFLICT (platform, post_id, posted_at) DO UPDATE SET
+            {updates}
+        WHERE ({current}) IS DISTINCT FROM ({incoming})
+        RETURNING t.platform, t.post_id, (t.xmax = 0) AS inserted, t.posted_at"""
+    if not table.hashtag_frequency_column:
+        return upsert + "\n    "
+    return f"""
+        WITH merged AS ({upsert}, t.hashtags
+        ),
+        {hashtag_stats_sql(table).strip()}
+        SELECT platform, post_id, inserted, posted_at FROM merged
+    """
+
+
+def _dedupe(indexed_rows: Sequence[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Keep the last occurrence of each (platform, post_id)."""
+    latest: Dict[Tuple[str, str], Tuple[int, Dict[str, Any]]] = {}
+    for index, row in indexed_rows:
+        key = (row["platform"], str(row["post_id"]))
+        latest.pop(key, None)
+        latest[key] = (index, row)
+    return list(latest.values())
+
+
+def bulk_upsert_posts(cur, table: PostTable, rows: Sequence[Dict[str, Any]],
+                      source_key: str = "url") -> LoadResult:
+    """
+    Validate, COPY and merge a batch of posts in the cursor's transaction.
+
+    The caller commits. Database errors (e.g. connection loss) propagate;
+    rows failing validation are returned in LoadResult.errors instead.
+
+    Args:
+        cur: psycopg2 cursor
+        table: COMPETITOR_POSTS or HASHTAG_POSTS
+        rows: Row dicts keyed by column name
+        source_key: Row key identifying the row in error reports
+
+    Returns:
+        LoadResult
+    """
+    result = LoadResult()
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    for index, row in enumerate(rows):
+        reason = validate_row(table, row)
+        if reason:
+            result.errors.append(RowError(index, str(row.get(source_key) or row.get("post_id") or "?"), reason))
+        else:
+            valid.append((index, row))
+
+    batch = _dedupe(valid)
+    result.duplicates = len(valid) - len(batch)
+    if not batch:
+        return result
+
+    cur.execute(staging_ddl(table))
+    cur.copy_expert(
+        f"COPY {staging_name(table)} ({', '.join(col for col, _ in table.columns)}) FROM STDIN",
+        copy_buffer(table, (row for _, row in batch)),
+    )
+    fill, move = moved_posts_sql(table)
+    cur.execute(fill)
+    cur.execute(move)
+    moved = {(platform, post_id): posted_at for platform, post_id, posted_at in cur.fetchall()}
+    cur.execute(merge_sql(table))
+    written = {(platform, post_id): (inserted, posted_at)
+               for platform, post_id, inserted, posted_at in cur.fetchall()}
+    cur.execute(f"DROP TABLE {staging_name(table)}")
+    for key, posted_at in moved.items():
+        written.setdefault(key, (False, posted_at))
+
+    result.loaded = len(batch)
+    result.loaded_indexes = sorted(index for index, _ in batch)
+    result.moved = len(moved)
+    result.inserted = sum(1 for inserted, _ in written.values() if inserted)
+    result.updated = len(written) - result.inserted
+    for index, row in batch:
+        key = (row["platform"], str(row["post_id"]))
+        if key in written:
+            result.posted_at[index] = written[key][1]
+    result.changed_indexes = sorted(result.posted_at)
+    return result
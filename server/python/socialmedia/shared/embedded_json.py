@@ -0,0 +1,137 @@
+"""
+Embedded JSON
+=============
+
+Pulls the data blobs pages embed in their <script> tags without parsing
+the page or decoding every script.
+
+Post pages carry their data as JSON in a few of dozens of script tags,
+most of them module bundles. Parsing the HTML into a tree and trying
+each script with a greedy regex costs more than the data itself, so
+instead:
+
+    - find_value() looks up a known key ("shortcode_media", ...) with a
+      plain substring search, and finds the end of that key's value with
+      a bracket scan that skips over strings. The scan only reads from
+      the key onwards and gives up after max_chars.
+    - Only that value is decoded, with orjson when it is installed (the
+      stdlib json module otherwise).
+    - get_path() / extract_fields() read fields by precomputed key paths
+      instead of walking the decoded tree.
+
+Usage:
+    from socialmedia.shared.embedded_json import extract_fields, find_value
+
+    info = find_value(html, "xdt_api__v1__media__shortcode__web_info")
+    fields = extract_fields(info, {"caption": (("items", 0, "caption", "text"),)})
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+# Largest value find_value scans for (live post blobs are ~100-300 KB)
+DEFAULT_MAX_CHARS = 4_000_000
+
+# A JSON string (escapes included) or a bracket
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+_VALUE_START_RE = re.compile(r'\s*:\s*')
+
+Path = Sequence[Any]
+
+
+def loads(text: str) -> Any:
+    """Decode JSON with the fastest available backend."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def value_end(text: str, start: int, max_chars: int = DEFAULT_MAX_CHARS) -> int:
+    """
+    End offset of the JSON object, array or string starting at text[start],
+    or -1 when it does not close within max_chars.
+    """
+    opening = text[start:start + 1]
+    if opening == '"':
+        match = _TOKEN_RE.match(text, start, min(len(text), start + max_chars))
+        return match.end() if match else -1
+    if opening not in ("{", "["):
+        return -1
+
+    depth = 0
+    for match in _TOKEN_RE.finditer(text, start, min(len(text), start + max_chars)):
+        char = text[match.start()]
+        if char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return -1
+
+
+def iter_values(text: str, key: str, max_chars: int = DEFAULT_MAX_CHARS) -> Iterator[Any]:
+    """
+    Decode the value of every '"key": {...}' (or [...] / "...") in text, in
+    document order. Occurrences that do not decode are skipped.
+    """
+    needle = f'"{key}"'
+    pos = text.find(needle)
+    while pos != -1:
+        after = pos + len(needle)
+        colon = _VALUE_START_RE.match(text, after)
+        if colon:
+            start = colon.end()
+            end = value_end(text, start, max_chars)
+            if end != -1:
+                try:
+                    yield loads(text[start:end])
+                except ValueError:
+                    pass
+                else:
+                    after = end
+        pos = text.find(needle, after)
+
+
+def find_value(text: str, key: str, max_chars: int = DEFAULT_MAX_CHARS) -> Any:
+    """The first decodable value of key in text, or None."""
+    return next(iter_values(text, key, max_chars), None)
+
+
+def get_path(obj: Any, path: Path, default: Any = None) -> Any:
+    """
+    Follow a key path of dict keys and list indexes; default when any step
+    is missing or of the wrong type.
+    """
+    for step in path:
+        try:
+            obj = obj[step]
+        except (KeyError, IndexError, TypeError):
+            return default
+    return default if obj is None else obj
+
+
+def extract_fields(obj: Any, paths: Dict[str, Tuple[Path, ...]]) -> Dict[str, Any]:
+    """
+    Read fields by key path. Each field lists candidate paths; the first
+    that resolves wins, and fields none resolve are left out.
+    """
+    fields = {}
+    for name, candidates in paths.items():
+        for path in candidates:
+            value = get_path(obj, path)
+            if value is not None:
+                fields[name] = value
+                break
+    return fields
@@ -0,0 +1,292 @@
+"""
+Known Posts
+===========
+
+Incremental profile scraping against what competitor_posts already holds.
+
+Every weekly run used to scroll a profile's grid and open every post up
+to WEEKLY_MAX_POSTS, even posts scraped the week before whose numbers had
+long stopped moving. KnownPosts is the profile's watermark instead: the
+post IDs already stored with their posted_at, scraped_at and last
+engagement snapshot. scrape_profile(..., known=known) uses it to
+
+    - stop scrolling once STOP_RUN known posts appear in a row (grids are
+      newest first, so everything below is known too; the run is longer
+      than the three pinned posts a grid can start with)
+    - open new posts, and known posts only when RefreshSchedule says
+      their engagement is due for a refresh
+    - count refreshed posts whose engagement matches the stored snapshot,
+      to tell whether the schedule refreshes too often
+
+RefreshSchedule is age based: young posts still gain engagement and are
+refreshed often, older ones rarely, the oldest never. The interval is
+measured from scraped_at. The bulk loader leaves scraped_at alone when a
+re-scraped post did not change, so the schedulers stamp refreshed posts
+with mark_refreshed() after uploading them.
+
+Configuration (environment):
+    SCRAPE_REFRESH_SCHEDULE     "max_age:interval" tiers, youngest first
+                                (default "2d:6h,7d:1d,30d:6d,180d:27d";
+                                posts older than the last tier are never
+                                refreshed)
+    SCRAPE_KNOWN_STOP_RUN       Known posts in a row that stop the scroll (default 6)
+    SCRAPE_KNOWN_POSTS_LIMIT    Newest known posts loaded per profile (default 500)
+
+Usage:
+    from socialmedia.shared.known_posts import load_known_posts, mark_refreshed
+
+    with conn.cursor() as cur:
+        known = load_known_posts(cur, profile_id, "tiktok")
+    posts = scraper.scrape_profile(profile_url, max_posts=10, known=known)
+    ...
+    with conn.cursor() as cur:
+        mark_refreshed(cur, "tiktok", known.refreshed)
+    conn.commit()
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .post_record import extract_post_id
+
+log = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_SCHEDULE = "2d:6h,7d:1d,30d:6d,180d:27d"
+
+_DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([mhdw]?)$")
+_DURATION_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks", "": "days"}
+
+
+def parse_duration(text: str) -> timedelta:
+    """Parse "45m", "6h", "7d", "2w" (a bare number is days)."""
+    match = _DURATION_RE.match(text.strip().lower())
+    if not match:
+        raise ValueError(f"invalid duration: {text!r}")
+    return timedelta(**{_DURATION_UNITS[match.group(2)]: float(match.group(1))})
+
+
+def _naive(value: Optional[datetime]) -> Optional[datetime]:
+    # competitor_posts stores TIMESTAMP (local time, no zone)
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Refresh schedule
+# ─────────────────────────────────────────────────────────────────────────────
+class RefreshSchedule:
+    """
+    How often a known post is re-opened, by post age.
+
+    Args:
+        tiers: (max_age, interval) pairs, youngest first; a post is in the
+            first tier whose max_age it is under
+    """
+
+    def __init__(self, tiers: Sequence[Tuple[timedelta, timedelta]]):
+        self.tiers = tuple(sorted(tiers, key=lambda tier: tier[0]))
+
+    @classmethod
+    def parse(cls, spec: str) -> "RefreshSchedule":
+        tiers = []
+        for part in spec.split(","):
+            if not part.strip():
+                continue
+            max_age, _, interval = part.partition(":")
+            if not interval:
+                raise ValueError(f"refresh tier needs max_age:interval, got {part!r}")
+            tiers.append((parse_duration(max_age), parse_duration(interval)))
+        return cls(tiers)
+
+    @classmethod
+    def from_env(cls) -> "RefreshSchedule":
+        spec = os.getenv("SCRAPE_REFRESH_SCHEDULE", DEFAULT_REFRESH_SCHEDULE)
+        try:
+            return cls.parse(spec)
+        except ValueError as e:
+            log.warning(f"Bad SCRAPE_REFRESH_SCHEDULE ({e}), using {DEFAULT_REFRESH_SCHEDULE}")
+            return cls.parse(DEFAULT_REFRESH_SCHEDULE)
+
+    def interval(self, age: Optional[timedelta]) -> Optional[timedelta]:
+        """
+        Refresh interval for a post of this age; None means never. Posts
+        of unknown age get the slowest interval that still refreshes.
+        """
+        if not self.tiers:
+            return None
+        if age is None:
+            return self.tiers[-1][1]
+        for max_age, interval in self.tiers:
+            if age < max_age:
+                return interval
+        return None
+
+    def is_due(self, posted_at: Optional[datetime], scraped_at: Optional[datetime],
+               now: datetime) -> bool:
+        if scraped_at is None:
+            return True
+        posted_at, scraped_at = _naive(posted_at), _naive(scraped_at)
+        interval = self.interval(now - posted_at if posted_at else None)
+        return interval is not None and now - scraped_at >= interval
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Watermark
+# ─────────────────────────────────────────────────────────────────────────────
+@dataclass
+class KnownPost:
+    """A stored post as the incremental scrape sees it."""
+    post_id: str
+    posted_at: Optional[datetime] = None
+    scraped_at: Optional[datetime] = None
+    engagement: Dict[str, Any] = field(default_factory=dict)
+
+
+class KnownPosts:
+    """
+    One profile's stored posts, and the bookkeeping of one scrape of it.
+
+    The scraper feeds grid links in order to observe() and stops scrolling
+    once watermark_reached; select() then picks the links worth opening.
+    """
+
+    def __init__(self, platform: str, posts: Iterable[KnownPost] = (),
+                 schedule: Optional[RefreshSchedule] = None,
+                 stop_run: Optional[int] = None, now: Optional[datetime] = None):
+        self.platform = platform
+        self.posts: Dict[str, KnownPost] = {p.post_id: p for p in posts}
+        self.schedule = schedule or RefreshSchedule.from_env()
+        self.stop_run = stop_run if stop_run is not None else int(os.getenv("SCRAPE_KNOWN_STOP_RUN", "6"))
+        self.now = now or datetime.now()
+
+        self.seen = 0
+        self._run = 0
+        self.new: List[str] = []
+        self.refreshed: List[str] = []
+        self.skipped: List[str] = []
+        self.unchanged: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    def __contains__(self, post_id: str) -> bool:
+        return post_id in self.posts
+
+    def post_id(self, url: str) -> Optional[str]:
+        return extract_post_id(url, self.platform)
+
+    def observe(self, url: str) -> None:
+        """Account the next grid link (in grid order, each link once)."""
+        self.seen += 1
+        if self.post_id(url) in self.posts:
+            self._run += 1
+        else:
+            self._run = 0
+
+    @property
+    def watermark_reached(self) -> bool:
+        return bool(self.posts) and self.stop_run > 0 and self._run >= self.stop_run
+
+    @property
+    def up_to_date(self) -> bool:
+        """The grid loaded and select() found nothing new or due to open."""
+        return self.seen > 0 and not self.new and not self.refreshed
+
+    def is_due(self, post_id: str) -> bool:
+        post = self.posts[post_id]
+        return self.schedule.is_due(post.posted_at, post.scraped_at, self.now)
+
+    def select(self, urls: Iterable[str]) -> List[str]:
+        """
+        The links to open: new posts, and known posts due for a refresh.
+        Links without a recognizable post ID are kept.
+        """
+        selected = []
+        for url in urls:
+            post_id = self.post_id(url)
+            if post_id not in self.posts:
+                self.new.append(post_id or url)
+            elif self.is_due(post_id):
+                self.refreshed.append(post_id)
+            else:
+                self.skipped.append(post_id)
+                continue
+            selected.append(url)
+        return selected
+
+    def record(self, post) -> None:
+        """
+        Account a scraped PostRecord; refreshed posts whose engagement
+        matches the stored snapshot are counted as unchanged (a high share
+        means the schedule refreshes too eagerly).
+        """
+        known = self.posts.get(post.post_id)
+        if known is not None and known.engagement and post.engagement() == known.engagement:
+            self.unchanged.append(post.post_id)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "known": len(self.posts),
+            "seen": self.seen,
+            "new": len(self.new),
+            "refreshed": len(self.refreshed),
+            "skipped": len(self.skipped),
+            "unchanged": len(self.unchanged),
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Database
+# ─────────────────────────────────────────────────────────────────────────────
+def load_known_posts(cur, profile_id: str, platform: str,
+                     limit: Optional[int] = None, **kwargs) -> KnownPosts:
+    """
+    Load a profile's newest stored posts from competitor_posts.
+
+    Args:
+        cur: psycopg or psycopg2 cursor
+        profile_id: competitor_profiles.id
+        platform: "instagram" or "tiktok"
+        limit: Newest posts to load (default SCRAPE_KNOWN_POSTS_LIMIT)
+        **kwargs: Passed on to KnownPosts (schedule, stop_run, now)
+    """
+    if limit is None:
+        limit = int(os.getenv("SCRAPE_KNOWN_POSTS_LIMIT", "500"))
+    cur.execute("""
+        SELECT post_id, posted_at, scraped_at, engagement
+        FROM competitor_posts
+        WHERE profile_id = %s AND platform = %s
+        ORDER BY posted_at DESC NULLS LAST
+        LIMIT %s
+    """, (profile_id, platform, limit))
+    posts = [
+        KnownPost(str(post_id), posted_at, scraped_at, engagement or {})
+        for post_id, posted_at, scraped_at, engagement in cur.fetchall()
+    ]
+    return KnownPosts(platform, posts, **kwargs)
+
+
+def mark_refreshed(cur, platform: str, post_ids: Sequence[str]) -> int:
+    """
+    Stamp re-opened posts as scraped now, so the schedule counts from this
+    refresh even when nothing changed. Rows the upload just rewrote are
+    already current and are left alone. Returns the rows stamped.
+    """
+    if not post_ids:
+        return 0
+    cur.execute("""
+        UPDATE competitor_posts
+        SET scraped_at = NOW()
+        WHERE platform = %s
+          AND post_id = ANY(%s)
+          AND (scraped_at IS NULL OR scraped_at < NOW() - INTERVAL '1 hour')
+    """, (platform, list(post_ids)))
+    return cur.rowcount
@@ -0,0 +1,317 @@
+"""
+Post Records
+============
+
+Typed, compact models for what the scrapers emit:
+
+    - PostRecord: one Instagram post or TikTok video
+    - ProfileSnapshot: an account's counters at scrape time
+
+Counts ("1.2K", "1,234", 1234) and dates (ISO strings, epoch seconds)
+are parsed once, when a record is built at the scraper edge, so loaders
+and analytics read ints and datetimes instead of re-parsing strings.
+Both classes use __slots__, which keeps a scraped batch well below the
+size of the equivalent dicts.
+
+Records still serialize to the legacy per-platform JSON layout
+(to_dict), so debug files and the file-based uploaders keep working,
+and coerce() accepts either a record or such a dict.
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+
+_COUNT_RE = re.compile(r"^([0-9]*\.?[0-9]+)\s*([KMB])?")
+_MULTIPLIERS = {None: 1, "K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+
+_POST_ID_PATTERNS = {
+    "instagram": re.compile(r"/(?:p|reel)/([^/?#]+)"),
+    "tiktok": re.compile(r"/video/(\d+)"),
+}
+
+
+def parse_count(value: Any) -> int:
+    """
+    Parse a count that might be an int, a float or formatted text.
+
+    Handles: "1.2K", "5M", "1,234", "10.5K likes", 1234, "1234".
+    Anything unparseable counts as 0.
+    """
+    if value is None or isinstance(value, bool):
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str):
+        return 0
+
+    match = _COUNT_RE.match(value.strip().upper().replace(",", ""))
+    if not match:
+        return 0
+    return int(float(match.group(1)) * _MULTIPLIERS[match.group(2)])
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse ISO strings (with or without Z), 'YYYY-MM-DD HH:MM:SS' and epoch seconds."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    if not isinstance(value, str):
+        return None
+
+    text = value.strip()
+    if text.isdigit():
+        return datetime.fromtimestamp(int(text), tz=timezone.utc)
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(text, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+
+
+def extract_post_id(url: str, platform: str) -> Optional[str]:
+    """Shortcode (Instagram) or video ID (TikTok) from a post URL."""
+    pattern = _POST_ID_PATTERNS.get(platform)
+    match = pattern.search(url or "") if pattern else None
+    return match.group(1) if match else None
+
+
+def _isoformat(value: Optional[datetime]) -> str:
+    return value.isoformat() if value else ""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Profile snapshot
+# ─────────────────────────────────────────────────────────────────────────────
+class ProfileSnapshot:
+    """An account's public counters at scrape time."""
+
+    __slots__ = ("platform", "username", "followers", "following", "posts_count", "likes", "scraped_at")
+
+    def __init__(
+        self,
+        platform: str,
+        username: str,
+        followers: Any = 0,
+        following: Any = 0,
+        posts_count: Any = 0,
+        likes: Any = 0,
+        scraped_at: Any = None,
+    ):
+        self.platform = platform
+        self.username = username or ""
+        self.followers = parse_count(followers)
+        self.following = parse_count(following)
+        self.posts_count = parse_count(posts_count)
+        self.likes = parse_count(likes)
+        self.scraped_at = scraped_at
+
+    @classmethod
+    def coerce(cls, data: Union["ProfileSnapshot", Dict[str, Any], None], platform: str) -> "ProfileSnapshot":
+        """Build from a legacy profile_info dict (or pass a snapshot through)."""
+        if isinstance(data, cls):
+            return data
+        data = data or {}
+        return cls(
+            platform,
+            data.get("username", ""),
+            followers=data.get("followers"),
+            following=data.get("following"),
+            posts_count=data.get("posts_count"),
+            likes=data.get("likes"),
+            scraped_at=data.get("scraped_at"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Legacy profile_info layout."""
+        data = {
+            "username": self.username,
+            "followers": self.followers,
+            "following": self.following,
+        }
+        if self.platform == "tiktok":
+            data["likes"] = self.likes
+        else:
+            data["posts_count"] = self.posts_count
+        if self.scraped_at is not None:
+            data["scraped_at"] = self.scraped_at
+        return data
+
+    def __repr__(self) -> str:
+        return f"ProfileSnapshot({self.platform!r}, {self.username!r}, followers={self.followers})"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Post record
+# ─────────────────────────────────────────────────────────────────────────────
+class PostRecord:
+    """One scraped post (Instagram) or video (TikTok)."""
+
+    __slots__ = (
+        "platform", "url", "post_id", "username", "caption", "posted_at",
+        "likes", "comments", "shares", "saves", "views",
+        "hashtags", "media_urls", "video_url", "source_hashtag",
+        "comment_items", "author_stats", "scraped_at",
+    )
+
+    def __init__(
+        self,
+        platform: str,
+        url: str,
+        username: str = "",
+        caption: str = "",
+        posted_at: Any = None,
+        likes: Any = 0,
+        comments: Any = 0,
+        shares: Any = 0,
+        saves: Any = 0,
+        views: Any = None,
+        hashtags: Optional[List[str]] = None,
+        media_urls: Optional[List[str]] = None,
+        video_url: str = "",
+        source_hashtag: Optional[str] = None,
+        comment_items: Optional[List[Dict[str, Any]]] = None,
+        author_stats: Optional[ProfileSnapshot] = None,
+        scraped_at: Any = None,
+        post_id: Optional[str] = None,
+    ):
+        self.platform = platform
+        self.url = url or ""
+        self.post_id = post_id or extract_post_id(self.url, platform)
+        self.username = username or ""
+        self.caption = caption or ""
+        self.posted_at = parse_timestamp(posted_at)
+        self.likes = parse_count(likes)
+        self.comments = parse_count(comments)
+        self.shares = parse_count(shares)
+        self.saves = parse_count(saves)
+        self.views = None if views in (None, "") else parse_count(views)
+        self.hashtags = list(hashtags or [])
+        self.media_urls = list(media_urls or [])
+        self.video_url = video_url or ""
+        self.source_hashtag = source_hashtag
+        self.comment_items = list(comment_items or [])
+        self.author_stats = author_stats
+        self.scraped_at = parse_timestamp(scraped_at) or datetime.now()
+
+    @classmethod
+    def from_instagram(cls, data: Dict[str, Any]) -> "PostRecord":
+        """Build from the dict InstagramScraper.scrape_post assembles."""
+        return cls(
+            "instagram",
+            data.get("url", ""),
+            username=data.get("username", ""),
+            caption=data.get("caption", ""),
+            posted_at=data.get("post_date"),
+            likes=data.get("likes"),
+            comments=data.get("comments_count"),
+            views=data.get("views"),
+            hashtags=data.get("hashtags"),
+            media_urls=data.get("media_urls"),
+            source_hashtag=data.get("source_hashtag"),
+            comment_items=data.get("comments"),
+            scraped_at=data.get("timestamp"),
+        )
+
+    @classmethod
+    def from_tiktok(cls, data: Dict[str, Any]) -> "PostRecord":
+        """Build from the dict TikTokScraper.scrape_video assembles."""
+        author_stats = data.get("author_stats")
+        return cls(
+            "tiktok",
+            data.get("url", ""),
+            username=data.get("author") or data.get("username", ""),
+            caption=data.get("description", ""),
+            posted_at=data.get("post_date"),
+            likes=data.get("likes_count"),
+            comments=data.get("comments_count"),
+            shares=data.get("shared_count"),
+            saves=data.get("saved_count"),
+            views=data.get("views"),
+            hashtags=data.get("hashtags"),
+            video_url=data.get("video_url", ""),
+            source_hashtag=data.get("source_hashtag"),
+            comment_items=data.get("comments"),
+            author_stats=ProfileSnapshot.coerce(author_stats, "tiktok") if author_stats else None,
+            scraped_at=data.get("timestamp"),
+        )
+
+    @classmethod
+    def coerce(cls, data: Union["PostRecord", Dict[str, Any]], platform: str) -> "PostRecord":
+        """Pass a record through, or build one from a legacy dict of the given platform."""
+        if isinstance(data, cls):
+            return data
+        if platform == "tiktok":
+            return cls.from_tiktok(data)
+        return cls.from_instagram(data)
+
+    @property
+    def total_engagement(self) -> int:
+        return self.likes + self.comments + self.shares + self.saves
+
+    def engagement(self) -> Dict[str, int]:
+        """The competitor_posts.engagement JSON for this platform."""
+        if self.platform == "tiktok":
+            return {
+                "likes": self.likes,
+                "comments": self.comments,
+                "shares": self.shares,
+                "saves": self.saves,
+                "total_engagement": self.total_engagement,
+            }
+        return {
+            "likes": self.likes,
+            "comments": self.comments,
+            "total_engagement": self.likes + self.comments,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Legacy per-platform JSON layout, with parsed counts."""
+        if self.platform == "tiktok":
+            data = {
+                "url": self.url,
+                "timestamp": self.scraped_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "post_date": _isoformat(self.posted_at),
+                "description": self.caption,
+                "hashtags": self.hashtags,
+                "likes_count": self.likes,
+                "comments_count": self.comments,
+                "shared_count": self.shares,
+                "saved_count": self.saves,
+                "author": self.username,
+                "video_url": self.video_url,
+                "comments": self.comment_items,
+            }
+            if self.author_stats is not None:
+                data["author_stats"] = self.author_stats.to_dict()
+        else:
+            data = {
+                "url": self.url,
+                "timestamp": self.scraped_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "post_date": _isoformat(self.posted_at),
+                "caption": self.caption,
+                "hashtags": self.hashtags,
+                "likes": self.likes,
+                "comments_count": self.comments,
+                "media_urls": self.media_urls,
+                "comments": self.comment_items,
+            }
+            if self.username:
+                data["username"] = self.username
+        if self.views is not None:
+            data["views"] = self.views
+        if self.source_hashtag:
+            data["source_hashtag"] = self.source_hashtag
+        return data
+
+    def __repr__(self) -> str:
+        return f"PostRecord({self.platform!r}, {self.post_id!r}, likes={self.likes}, comments={self.comments})"
@@ -4,6 +4,7 @@ import json
 import logging
 import psycopg
 import hashlib
+import re
 from datetime import datetime
 
 # Configure logging
@@ -12,6 +13,11 @@ log = logging.getLogger(__name__)
 # Database connection URL
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://root:secret@db:5432/project_monopoly?sslmode=disable")
 
+# Report documents are named {REPORT_PREFIX}{username}_{YYYYMMDD}.txt
+REPORT_PREFIX = "competitor_analysis_"
+GENERATED_ON_PREFIX = "Generated on:"
+CHUNK_SIZE = 3000
+
 def generate_competitor_report(competitor_data):
     """
     Generates a text report from competitor data.
@@ -24,7 +30,7 @@ def generate_competitor_report(competitor_data):
     last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     report = f"COMPETITOR ANALYSIS REPORT\n"
-    report += f"Generated on: {last_updated}\n"
+    report += f"{GENERATED_ON_PREFIX} {last_updated}\n"
     report += f"Target Competitor: @{username}\n"
     report += f"Platform: Instagram\n\n"
     report += f"--- KEY METRICS ---\n"
@@ -50,43 +56,117 @@ def generate_competitor_report(competitor_data):
 
     return report
 
-def ingest_competitor_report(username, report_text, user_id, group_id=None):
+def report_sha256(report_text):
+    """
+    Content address of a report.
+
+    The "Generated on:" line changes on every run, so it is left out;
+    re-running a scrape over unchanged data yields the same hash.
+    """
+    stable = "\n".join(
+        line for line in report_text.splitlines() if not line.startswith(GENERATED_ON_PREFIX)
+    )
+    return hashlib.sha256(stable.encode("utf-8")).hexdigest()
+
+def split_report_chunks(report_text):
+    """Chunk a report as (chunk_index, content, token_count, content_sha) rows."""
+    chunks = [report_text[i:i + CHUNK_SIZE] for i in range(0, len(report_text), CHUNK_SIZE)]
+    return [
+        (index, chunk, len(chunk.split()), hashlib.sha1(chunk.encode("utf-8", "ignore")).hexdigest())
+        for index, chunk in enumerate(chunks)
+    ]
+
+def report_filename_pattern(username):
+    """Regex matching every daily report file name of one competitor."""
+    return f"^{re.escape(REPORT_PREFIX + username)}_[0-9]{{8}}\\.txt$"
+
+def _store_report(cur, username, report_text, user_id, group_id):
+    # Serialize concurrent ingests of the same competitor's report
+    cur.execute(
+        "SELECT pg_advisory_xact_lock(hashtext(%s))",
+        (f"competitor_report:{user_id}:{group_id}:{username}",),
+    )
+
+    content_sha256 = report_sha256(report_text)
+    pattern = report_filename_pattern(username)
+
+    # 1. Latest report for this competitor; identical content is not re-ingested
+    cur.execute("""
+        SELECT id, sha256 FROM workshop_documents
+        WHERE user_id = %s AND group_id = %s AND filename ~ %s
+        ORDER BY created_at DESC
+        LIMIT 1
+    """, (user_id, group_id, pattern))
+    latest = cur.fetchone()
+    if latest and latest[1] == content_sha256:
+        return latest[0], False
+
+    # 2. Insert the new document
+    filename = f"{REPORT_PREFIX}{username}_{datetime.now().strftime('%Y%m%d')}.txt"
+    cur.execute("""
+        INSERT INTO workshop_documents
+        (user_id, group_id, filename, mime, size_bytes, sha256, storage_url, status, created_at, updated_at)
+        VALUES (%s, %s, %s, 'text/plain', %s, %s, '', 'ready', NOW(), NOW())
+        ON CONFLICT (user_id, group_id, sha256) DO UPDATE SET
+            filename = EXCLUDED.filename,
+            size_bytes = EXCLUDED.size_bytes
+        RETURNING id, (xmax = 0) AS inserted
+    """, (user_id, group_id, filename, len(report_text), content_sha256))
+    doc_id, inserted = cur.fetchone()
+
+    # 3. All chunks in one statement (only for a new document; a matching
+    #    older report already has them)
+    rows = split_report_chunks(report_text)
+    if inserted and rows:
+        cur.execute("""
+            INSERT INTO workshop_chunks
+            (document_id, group_id, page, chunk_index, content, token_count, content_sha)
+            SELECT %s::uuid, %s, 1, c.chunk_index, c.content, c.token_count, c.content_sha
+            FROM unnest(%s::int[], %s::text[], %s::int[], %s::text[])
+                AS c(chunk_index, content, token_count, content_sha)
+        """, (str(doc_id), group_id, *(list(column) for column in zip(*rows))))
+
+    # 4. Supersede: older reports of this competitor would only compete
+    #    with the current one in full-text ranking (chunks cascade)
+    cur.execute("""
+        DELETE FROM workshop_documents
+        WHERE user_id = %s AND group_id = %s AND filename ~ %s AND id <> %s::uuid
+    """, (user_id, group_id, pattern, str(doc_id)))
+
+    return doc_id, True
+
+def ingest_competitor_report(username, report_text, user_id, group_id=None, conn=None):
     """
     Ingests the generated report into the workshop_documents table for RAG.
+
+    Reports are content-addressed: when the latest report of this
+    competitor has the same sha256, nothing is written. Otherwise the new
+    report replaces the older ones.
+
+    Args:
+        conn: Open connection to reuse (psycopg or psycopg2); committed or
+            rolled back here. A new connection is opened when omitted.
+
+    Returns:
+        The document ID of the current report.
     """
     log.info(f"📄 Ingesting competitor report for @{username} into RAG...")
-    
-    filename = f"competitor_analysis_{username}_{datetime.now().strftime('%Y%m%d')}.txt"
-    
-    content_sha256 = hashlib.sha256(report_text.encode("utf-8")).hexdigest()
     group_id = group_id or 1
-    
-    with psycopg.connect(DATABASE_URL) as conn:
+
+    if conn is None:
+        with psycopg.connect(DATABASE_URL) as own_conn:
+            return ingest_competitor_report(username, report_text, user_id, group_id, conn=own_conn)
+
+    try:
         with conn.cursor() as cur:
-            # 1. Insert into workshop_documents
-            cur.execute("""
-                INSERT INTO workshop_documents
-                (user_id, group_id, filename, mime, size_bytes, sha256, storage_url, status, created_at, updated_at)
-                VALUES (%s, %s, %s, 'text/plain', %s, %s, '', 'ready', NOW(), NOW())
-                RETURNING id
-            """, (user_id, group_id, filename, len(report_text), content_sha256))
-            
-            doc_id = cur.fetchone()[0]
-            
-            # 2. Insert chunks
-            chunk_size = 3000
-            chunks = [report_text[i:i+chunk_size] for i in range(0, len(report_text), chunk_size)]
-            
-            for index, chunk in enumerate(chunks):
-                token_count = len(chunk.split())
-                content_sha = hashlib.sha1(chunk.encode("utf-8", "ignore")).hexdigest()
-                
-                cur.execute("""
-                    INSERT INTO workshop_chunks
-                    (document_id, group_id, page, chunk_index, content, token_count, content_sha)
-                    VALUES (%s, %s, 1, %s, %s, %s, %s)
-                """, (doc_id, group_id, index, chunk, token_count, content_sha))
-            
-            conn.commit()
-            log.info(f"✅ Report ingested successfully. Document ID: {doc_id}")
-            return doc_id
+            doc_id, written = _store_report(cur, username, report_text, user_id, group_id)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if written:
+        log.info(f"✅ Report ingested successfully. Document ID: {doc_id}")
+    else:
+        log.info(f"⏭️ Report for @{username} unchanged; keeping document {doc_id}")
+    return doc_id
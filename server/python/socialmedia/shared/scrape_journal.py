@@ -0,0 +1,229 @@
+"""
+Scrape Journal
+==============
+
+Append-only JSON Lines output for scrape runs, plus a streaming reader
+for the uploaders.
+
+The scrapers used to keep every post in memory and write one indented
+JSON document when the run finished, so a crash or a bot-detection abort
+halfway through lost everything and the uploaders had to json.load the
+whole file. A journal instead writes each post as one line the moment it
+is scraped (flushed and fsynced), so:
+
+    - a killed run leaves every completed post on disk
+    - the uploaders read the file line by line, in batches
+    - a half-written last line is skipped instead of failing the file
+
+File layout: metadata lines first ({"profile_info": {...}} or
+{"hashtag_info": {...}}, same keys as the old JSON documents), then one
+post dict per line in the legacy PostRecord.to_dict() layout.
+
+Compression: set SCRAPE_OUTPUT_ZSTD=1 to write .jsonl.zst files. Every
+line is its own zstd frame, so a truncated file still decodes up to the
+last complete post. zstandard is optional; without it the journal falls
+back to plain .jsonl.
+
+Usage:
+    from socialmedia.shared.scrape_journal import ScrapeJournal, read_scrape_file
+
+    with ScrapeJournal(base_path, meta={"hashtag_info": {"hashtag": "coffee"}}) as journal:
+        for url in links:
+            journal.append(scraper.scrape_post(url))
+
+    meta, posts = read_scrape_file(journal.path)
+    for batch in batched(posts, 500):
+        ...
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import io
+import json
+import logging
+import os
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+log = logging.getLogger(__name__)
+
+JSONL_SUFFIX = ".jsonl"
+ZSTD_SUFFIX = ".jsonl.zst"
+# Every file a scraper may leave in scrape_result (legacy documents included)
+SCRAPE_FILE_PATTERNS = ("*.json", "*.jsonl", "*.jsonl.zst")
+
+# Top-level keys of metadata lines
+META_KEYS = ("profile_info", "hashtag_info")
+
+
+def compression_enabled() -> bool:
+    """True when SCRAPE_OUTPUT_ZSTD is set and zstandard is importable."""
+    if os.getenv("SCRAPE_OUTPUT_ZSTD", "0") not in ("1", "true", "True"):
+        return False
+    if zstandard is None:
+        log.warning("SCRAPE_OUTPUT_ZSTD is set but zstandard is not installed; writing plain JSONL")
+        return False
+    return True
+
+
+def _to_json_line(record: Any) -> str:
+    if hasattr(record, "to_dict"):
+        record = record.to_dict()
+    return json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+
+def _is_meta(line: Dict[str, Any]) -> bool:
+    return len(line) == 1 and next(iter(line)) in META_KEYS
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Writer
+# ─────────────────────────────────────────────────────────────────────────────
+class ScrapeJournal:
+    """
+    Crash-safe, append-only writer for one scrape run.
+
+    Args:
+        base_path: Output path without suffix; .jsonl or .jsonl.zst is added
+        meta: Metadata lines written first, e.g. {"profile_info": {...}}
+        compress: Force zstd on/off (default: SCRAPE_OUTPUT_ZSTD)
+        sync: fsync after every record (default True)
+    """
+
+    def __init__(self, base_path: str, meta: Optional[Dict[str, Any]] = None,
+                 compress: Optional[bool] = None, sync: bool = True):
+        if compress is None:
+            compress = compression_enabled()
+        elif compress and zstandard is None:
+            raise RuntimeError("zstd output requested but zstandard is not installed")
+
+        self.compressed = compress
+        self.path = base_path + (ZSTD_SUFFIX if compress else JSONL_SUFFIX)
+        self.sync = sync
+        self.count = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._compressor = zstandard.ZstdCompressor() if compress else None
+
+        for key, value in (meta or {}).items():
+            self._write(_to_json_line({key: value}))
+
+    def _write(self, line: str) -> None:
+        data = line.encode("utf-8")
+        if self._compressor is not None:
+            # One frame per line: everything before a crash stays decodable
+            data = self._compressor.compress(data)
+        self._file.write(data)
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+    def append(self, record: Any) -> None:
+        """Write one post (PostRecord or dict) and make it durable."""
+        self._write(_to_json_line(record))
+        self.count += 1
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "ScrapeJournal":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Reader
+# ─────────────────────────────────────────────────────────────────────────────
+def _iter_text_lines(path: str) -> Iterator[str]:
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed but zstandard is not installed")
+        with open(path, "rb") as raw:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            text = io.TextIOWrapper(reader, encoding="utf-8")
+            try:
+                yield from text
+            except zstandard.ZstdError as e:
+                # Truncated last frame of an interrupted run
+                log.warning(f"{path}: stopped at damaged zstd frame ({e})")
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        yield from f
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield each JSON line of a journal.
+
+    A final line without a newline is what an interrupted write leaves
+    behind; it is skipped with a warning, as are corrupt lines.
+    """
+    for number, line in enumerate(_iter_text_lines(path), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            if line.endswith("\n"):
+                log.warning(f"{path}:{number}: skipping corrupt line ({e})")
+            else:
+                log.warning(f"{path}:{number}: skipping truncated last line")
+
+
+def read_scrape_file(path: str) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Open a scrape result for streaming.
+
+    Handles journals (.jsonl, .jsonl.zst) and legacy JSON documents
+    (a list of posts, or a dict with "posts" and metadata keys). Legacy
+    documents are necessarily loaded whole.
+
+    Returns:
+        (meta, posts): Metadata keyed like the old documents, and an
+        iterator over the post dicts
+
+    Raises:
+        FileNotFoundError, json.JSONDecodeError (legacy documents only)
+    """
+    if not path.endswith((JSONL_SUFFIX, ZSTD_SUFFIX)):
+        with open(path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        if isinstance(document, list):
+            return {}, iter(document)
+        if isinstance(document, dict):
+            meta = {key: document[key] for key in META_KEYS if key in document}
+            return meta, iter(document.get("posts", []))
+        raise ValueError("JSON content is neither list nor dict")
+
+    lines = iter_jsonl(path)
+    meta: Dict[str, Any] = {}
+    for line in lines:
+        if isinstance(line, dict) and _is_meta(line):
+            meta.update(line)
+            continue
+        # First post: put it back in front of the rest
+        return meta, chain([line], lines)
+    return meta, iter(())
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most size items."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
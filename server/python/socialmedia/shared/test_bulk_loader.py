@@ -0,0 +1,215 @@
+"""
+Bulk Post Loader Tests
+======================
+
+Tests for validation, COPY rendering and the staged merge.
+
+Run with:
+    python -m pytest socialmedia/shared/test_bulk_loader.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from socialmedia.shared.bulk_loader import (
+    COMPETITOR_POSTS,
+    HASHTAG_POSTS,
+    bulk_upsert_posts,
+    copy_buffer,
+    copy_value,
+    hashtag_stats_sql,
+    merge_sql,
+    moved_posts_sql,
+    validate_row,
+)
+
+
+def hashtag_row(post_id="abc", **overrides):
+    row = {
+        "url": f"https://www.instagram.com/p/{post_id}/",
+        "hashtag": "coffee",
+        "platform": "instagram",
+        "post_id": post_id,
+        "username": "roaster",
+        "content": "Fresh beans",
+        "media": {"urls": [], "type": "unknown"},
+        "posted_at": datetime(2026, 10, 1, 12, tzinfo=timezone.utc),
+        "likes": 120,
+        "comments_count": 4,
+        "hashtags": ["#coffee"],
+        "scraped_at": datetime(2026, 10, 18, 9),
+        "caption_hash": "h",
+    }
+    row.update(overrides)
+    return row
+
+
+class TestValidation:
+    def test_valid_row(self):
+        assert validate_row(HASHTAG_POSTS, hashtag_row()) is None
+
+    @pytest.mark.parametrize("overrides, reason", [
+        ({"post_id": None}, "missing post_id"),
+        ({"post_id": "x" * 101}, "post_id longer"),
+        ({"hashtag": ""}, "missing hashtag"),
+        ({"likes": -1}, "likes out of range"),
+        ({"likes": "1.2K"}, "likes is not an integer"),
+        ({"posted_at": "yesterday"}, "posted_at is not a datetime"),
+        ({"content": "bad\x00byte"}, "content contains a NUL"),
+        ({"hashtags": ["ok", "n\x00"]}, "hashtags contains a NUL"),
+    ])
+    def test_rejects(self, overrides, reason):
+        assert validate_row(HASHTAG_POSTS, hashtag_row(**overrides)).startswith(reason)
+
+
+class TestCopyRendering:
+    def test_escapes_copy_specials_and_nulls(self):
+        assert copy_value(None, "text") == "\\N"
+        assert copy_value("a\tb\nc\\d", "text") == "a\\tb\\nc\\\\d"
+        assert copy_value({"k": "v\n"}, "jsonb") == '{"k": "v\\\\n"}'
+
+    def test_one_line_per_row_in_column_order(self):
+        lines = copy_buffer(HASHTAG_POSTS, [hashtag_row(), hashtag_row("def")]).read().splitlines()
+        assert len(lines) == 2
+        fields = lines[0].split("\t")
+        assert len(fields) == len(HASHTAG_POSTS.columns)
+        assert fields[2] == "abc"
+        assert fields[6] == "2026-10-01T12:00:00+00:00"
+
+
+class TestBulkUpsert:
+    def test_bad_rows_are_reported_not_loaded(self):
+        cur = MagicMock()
+        rows = [hashtag_row("a"), hashtag_row(None, url="https://x/broken"), hashtag_row("c")]
+
+        result = bulk_upsert_posts(cur, HASHTAG_POSTS, rows)
+
+        assert result.loaded == 2
+        assert result.loaded_indexes == [0, 2]
+        assert [(e.index, e.source) for e in result.errors] == [(1, "https://x/broken")]
+        copied = cur.copy_expert.call_args.args[1].read()
+        assert copied.count("\n") == 2
+
+    def test_duplicates_collapse_to_last_occurrence(self):
+        cur = MagicMock()
+        rows = [hashtag_row("a", likes=1), hashtag_row("a", likes=2)]
+
+        result = bulk_upsert_posts(cur, HASHTAG_POSTS, rows)
+
+        assert (result.loaded, result.duplicates, result.loaded_indexes) == (1, 1, [1])
+
+    def test_single_merge_statement(self):
+        cur = MagicMock()
+        bulk_upsert_posts(cur, HASHTAG_POSTS, [hashtag_row("a"), hashtag_row("b")])
+
+        statements = [c.args[0] for c in cur.execute.call_args_list]
+        assert sum("INSERT INTO hashtag_posts" in s for s in statements) == 1
+        assert "ON COMMIT DROP" in statements[0]
+
+    def test_nothing_valid_touches_nothing(self):
+        cur = MagicMock()
+        result = bulk_upsert_posts(cur, HASHTAG_POSTS, [hashtag_row(None)])
+
+        assert result.loaded == 0
+        cur.execute.assert_not_called()
+
+    def test_counts_changed_and_unchanged_rows(self):
+        """Rows the guarded update skipped are absent from RETURNING."""
+        cur = MagicMock()
+        cur.fetchall.side_effect = [[], [("instagram", "a", True, None), ("instagram", "c", False, None)]]
+        rows = [hashtag_row("a"), hashtag_row("b"), hashtag_row("c"), hashtag_row("d")]
+
+        result = bulk_upsert_posts(cur, HASHTAG_POSTS, rows)
+
+        assert (result.inserted, result.updated, result.unchanged) == (1, 1, 2)
+        assert result.changed_indexes == [0, 2]
+
+    def test_update_is_guarded_by_is_distinct_from(self):
+        text = merge_sql(HASHTAG_POSTS)
+        guard = text.split("WHERE", 1)[1]
+        assert "IS DISTINCT FROM" in guard
+        assert "EXCLUDED.likes" in guard
+        # scraped_at always differs, so it must not count as a change
+        assert "scraped_at" not in guard.split("RETURNING")[0]
+        assert "xmax = 0" in text
+
+    def test_moved_posts_count_as_updated(self):
+        cur = MagicMock()
+        moved_to = datetime(2026, 10, 2)
+        cur.fetchall.side_effect = [[("instagram", "b", moved_to)], [("instagram", "a", True, None)]]
+
+        result = bulk_upsert_posts(cur, HASHTAG_POSTS, [hashtag_row("a"), hashtag_row("b"), hashtag_row("c")])
+
+        assert (result.inserted, result.updated, result.moved, result.unchanged) == (1, 1, 1, 1)
+        assert result.changed_indexes == [0, 1]
+        assert result.posted_at[1] == moved_to
+
+    def test_reports_the_stored_date_of_undated_rescrapes(self):
+        """The fill step kept the stored posted_at; callers bucket by it."""
+        stored = datetime(2026, 9, 30, 8)
+        cur = MagicMock()
+        cur.fetchall.side_effect = [[], [("instagram", "a", False, stored)]]
+
+        result = bulk_upsert_posts(cur, HASHTAG_POSTS, [hashtag_row("a", posted_at=None, likes=500)])
+
+        assert result.posted_at == {0: stored}
+
+    def test_moves_run_before_the_merge(self):
+        cur = MagicMock()
+        bulk_upsert_posts(cur, COMPETITOR_POSTS, [hashtag_row("a")])
+
+        statements = [c.args[0] for c in cur.execute.call_args_list]
+        fill, move = moved_posts_sql(COMPETITOR_POSTS)
+        assert statements.index(fill) < statements.index(move) < statements.index(merge_sql(COMPETITOR_POSTS))
+
+    def test_moves_keep_the_row_instead_of_reinserting(self):
+        fill, move = moved_posts_sql(HASHTAG_POSTS)
+        assert "UPDATE _stage_hashtag_posts s SET posted_at = t.posted_at" in fill
+        assert "s.posted_at IS NULL" in fill
+        assert move.strip().startswith("UPDATE hashtag_posts t SET posted_at")
+        assert "DELETE" not in fill + move
+
+    def test_merge_targets_partitioned_key(self):
+        text = merge_sql(COMPETITOR_POSTS)
+        assert "ON CONFLICT (platform, post_id, posted_at)" in text
+        assert "s.posted_at::timestamp" in text
+        assert "jsonb_array_elements_text" in text
+
+
+class TestHashtagStats:
+    def test_merge_updates_stats_in_the_same_statement(self):
+        text = merge_sql(HASHTAG_POSTS)
+        assert text.strip().startswith("WITH merged AS (")
+        assert "INSERT INTO hashtag_stats" in text
+        assert text.rstrip().endswith("SELECT platform, post_id, inserted, posted_at FROM merged")
+
+    def test_only_inserted_posts_are_counted(self):
+        text = hashtag_stats_sql(COMPETITOR_POSTS)
+        assert "WHERE m.inserted" in text
+        assert "competitor_frequency = h.competitor_frequency + EXCLUDED.competitor_frequency" in text
+        assert "LOWER(LTRIM(BTRIM(tag), '#'))" in text
+        # Competitor posts are not scraped for a hashtag
+        assert "scraped AS" not in text
+
+    def test_hashtag_posts_mark_their_hashtag_scraped(self):
+        text = hashtag_stats_sql(HASHTAG_POSTS)
+        assert "hashtag_post_frequency = h.hashtag_post_frequency + EXCLUDED.hashtag_post_frequency" in text
+        assert "LOWER(LTRIM(BTRIM(s.hashtag), '#'))" in text
+        assert "FULL JOIN scraped sc" in text
+        assert "last_scraped_at = COALESCE(EXCLUDED.last_scraped_at, h.last_scraped_at)" in text
+
+    def test_inserted_posts_add_their_hashtag_pairs(self):
+        text = hashtag_stats_sql(COMPETITOR_POSTS)
+        assert "INSERT INTO hashtag_cooccurrence" in text
+        assert "UNNEST(m.hashtags[1:30])" in text
+        assert "a.hashtag < b.hashtag" in text
+        assert "weight = c.weight + EXCLUDED.weight" in text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+"""
+Embedded JSON Tests
+===================
+
+Tests for locating and decoding JSON values embedded in page HTML, and
+for reading fields by key path.
+
+Run with:
+    python -m pytest socialmedia/shared/test_embedded_json.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+
+import pytest
+
+from socialmedia.shared import embedded_json
+from socialmedia.shared.embedded_json import extract_fields, find_value, get_path, iter_values, value_end
+
+DATA = {"media": {"items": [{"caption": {"text": 'say "hi" {not a brace} ]'}, "like_count": 12}]}}
+PAGE = f"""<html><head>
+<script>var config = {{"name": "media", "flags": [1, 2]}};</script>
+<script type="application/json">{{"require": [["Cache", {json.dumps(DATA)}]]}}</script>
+</head><body></body></html>"""
+
+
+class TestFindValue:
+    def test_decodes_only_the_keyed_value(self):
+        # "media" as a string value is skipped; the key's object is decoded
+        assert find_value(PAGE, "media") == DATA["media"]
+
+    def test_strings_with_brackets_and_escapes(self):
+        text = 'x = {"a": ["}", "\\"]", {"b": "{"}], "c": 1}'
+        start = text.index("{")
+        assert json.loads(text[start:value_end(text, start)]) == {"a": ["}", '"]', {"b": "{"}], "c": 1}
+
+    def test_scalars_truncation_and_missing_keys(self):
+        assert find_value('{"title": "Hello"}', "title") == "Hello"
+        # Numbers and literals are not located
+        assert find_value('{"count": 5}', "count") is None
+        assert find_value(PAGE, "media", max_chars=20) is None
+        assert find_value(PAGE, "absent") is None
+
+    def test_iter_values_skips_broken_occurrences(self):
+        text = '{"node": {"id": 1,}} {"node": {"id": 2}} {"node": [3]}'
+        assert list(iter_values(text, "node")) == [{"id": 2}, [3]]
+
+    def test_stdlib_fallback(self, monkeypatch):
+        monkeypatch.setattr(embedded_json, "orjson", None)
+        assert find_value(PAGE, "media") == DATA["media"]
+        with pytest.raises(ValueError):
+            embedded_json.loads("{broken")
+
+
+class TestKeyPaths:
+    def test_get_path(self):
+        assert get_path(DATA, ("media", "items", 0, "like_count")) == 12
+        assert get_path(DATA, ("media", "items", 3, "like_count")) is None
+        assert get_path(DATA, ("media", "items", "x"), default=[]) == []
+        assert get_path({"a": None}, ("a",), default="") == ""
+
+    def test_extract_fields_prefers_first_candidate(self):
+        item = DATA["media"]["items"][0]
+        fields = extract_fields(item, {
+            "caption": (("caption", "text"),),
+            "likes": (("likes", "count"), ("like_count",)),
+            "views": (("play_count",),),
+        })
+        assert fields == {"caption": 'say "hi" {not a brace} ]', "likes": 12}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,65 @@
+"""
+Post Ingestion Service Tests
+============================
+
+Tests for the in-process scraper-to-database handoff.
+
+Run with:
+    python -m pytest socialmedia/shared/test_ingestion_service.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+import pytest
+
+from socialmedia.shared import ingestion_service
+from socialmedia.shared.ingestion_service import PostIngestionService
+
+
+def make_conn():
+    conn = MagicMock()
+    conn.closed = 0
+    return conn
+
+
+class TestPostIngestionService:
+    def test_reuses_one_connection_across_profiles(self):
+        conn = make_conn()
+        with patch.object(ingestion_service.psycopg2, "connect", return_value=conn) as connect, \
+             patch.object(ingestion_service, "upload_instagram_payload", return_value=True) as upload:
+            service = PostIngestionService("postgresql://test")
+            assert service.ingest_instagram_profile({"username": "a"}, [{"url": "x"}])
+            assert service.ingest_instagram_profile({"username": "b"}, [])
+
+        assert connect.call_count == 1
+        payload = upload.call_args_list[0].args[0]
+        assert payload == {"profile_info": {"username": "a"}, "posts": [{"url": "x"}]}
+        assert upload.call_args_list[0].kwargs["conn"] is conn
+
+    def test_reconnects_after_connection_closed(self):
+        first, second = make_conn(), make_conn()
+        with patch.object(ingestion_service.psycopg2, "connect", side_effect=[first, second]) as connect, \
+             patch.object(ingestion_service, "upload_instagram_payload", return_value=True):
+            service = PostIngestionService("postgresql://test")
+            service.ingest_instagram_profile({"username": "a"}, [])
+            first.closed = 2
+            service.ingest_instagram_profile({"username": "a"}, [])
+
+        assert connect.call_count == 2
+
+    def test_connection_failure_returns_false_instead_of_exiting(self):
+        with patch.object(ingestion_service.psycopg2, "connect",
+                          side_effect=psycopg2.OperationalError("down")), \
+             patch.object(ingestion_service, "upload_instagram_payload") as upload:
+            service = PostIngestionService("postgresql://test")
+            assert service.ingest_instagram_profile({"username": "a"}, []) is False
+
+        upload.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
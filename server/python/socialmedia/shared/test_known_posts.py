@@ -0,0 +1,162 @@
+"""
+Known Posts Tests
+=================
+
+Tests for the age-based refresh schedule, the known-post watermark and
+the competitor_posts lookups of the incremental profile scrape.
+
+Run with:
+    python -m pytest socialmedia/shared/test_known_posts.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from socialmedia.shared.known_posts import (
+    KnownPost,
+    KnownPosts,
+    RefreshSchedule,
+    load_known_posts,
+    mark_refreshed,
+    parse_duration,
+)
+from socialmedia.shared.post_record import PostRecord
+
+NOW = datetime(2026, 10, 18, 12, 0)
+SCHEDULE = RefreshSchedule.parse("2d:6h,7d:1d,30d:6d,180d:27d")
+
+
+def video(video_id):
+    return f"https://www.tiktok.com/@brand/video/{video_id}"
+
+
+def known_post(video_id, posted_days_ago, scraped_days_ago, engagement=None):
+    return KnownPost(
+        str(video_id),
+        posted_at=NOW - timedelta(days=posted_days_ago),
+        scraped_at=NOW - timedelta(days=scraped_days_ago),
+        engagement=engagement or {},
+    )
+
+
+class TestRefreshSchedule:
+    def test_parse_duration(self):
+        assert parse_duration("45m") == timedelta(minutes=45)
+        assert parse_duration("6h") == timedelta(hours=6)
+        assert parse_duration("2w") == timedelta(weeks=2)
+        assert parse_duration("1.5") == timedelta(days=1.5)
+        with pytest.raises(ValueError):
+            parse_duration("soon")
+
+    def test_interval_by_age(self):
+        assert SCHEDULE.interval(timedelta(hours=12)) == timedelta(hours=6)
+        assert SCHEDULE.interval(timedelta(days=20)) == timedelta(days=6)
+        assert SCHEDULE.interval(timedelta(days=365)) is None
+        # Unknown age: slowest interval that still refreshes
+        assert SCHEDULE.interval(None) == timedelta(days=27)
+
+    def test_is_due(self):
+        week_old = NOW - timedelta(days=10)
+        assert SCHEDULE.is_due(week_old, NOW - timedelta(days=7), NOW)
+        assert not SCHEDULE.is_due(week_old, NOW - timedelta(days=2), NOW)
+        assert not SCHEDULE.is_due(NOW - timedelta(days=400), NOW - timedelta(days=300), NOW)
+        assert SCHEDULE.is_due(week_old, None, NOW)
+
+    def test_aware_timestamps(self):
+        scraped = (NOW - timedelta(days=7)).astimezone(timezone.utc)
+        assert SCHEDULE.is_due(NOW - timedelta(days=10), scraped, NOW)
+
+    def test_bad_env_falls_back_to_default(self, monkeypatch):
+        monkeypatch.setenv("SCRAPE_REFRESH_SCHEDULE", "7d")
+        assert RefreshSchedule.from_env().interval(timedelta(days=3)) == timedelta(days=1)
+
+
+class TestKnownPosts:
+    def make(self, posts, stop_run=3):
+        return KnownPosts("tiktok", posts, schedule=SCHEDULE, stop_run=stop_run, now=NOW)
+
+    def test_watermark_needs_a_contiguous_run(self):
+        known = self.make([known_post(i, 50, 7) for i in (1, 2, 3, 5, 6, 7)])
+        # A pinned known post, then new posts, then the known tail
+        for video_id in (1, 10, 11, 2, 3):
+            known.observe(video(video_id))
+        assert not known.watermark_reached
+        known.observe(video(5))
+        assert known.watermark_reached
+        assert known.seen == 6
+
+    def test_empty_history_never_stops(self):
+        known = self.make([])
+        for video_id in range(5):
+            known.observe(video(video_id))
+        assert not known.watermark_reached
+
+    def test_select_opens_new_and_due_posts(self):
+        known = self.make([
+            known_post(1, posted_days_ago=3, scraped_days_ago=7),     # young, due
+            known_post(2, posted_days_ago=20, scraped_days_ago=3),    # refreshed recently
+            known_post(3, posted_days_ago=400, scraped_days_ago=60),  # too old to refresh
+        ])
+        urls = [video(9), video(1), video(2), video(3), "https://www.tiktok.com/@brand/photo/x"]
+
+        assert known.select(urls) == [video(9), video(1), urls[-1]]
+        assert known.summary() == {
+            "known": 3, "seen": 0, "new": 2, "refreshed": 1, "skipped": 2, "unchanged": 0,
+        }
+        assert known.refreshed == ["1"]
+
+    def test_up_to_date_only_when_nothing_was_selected(self):
+        known = self.make([known_post(2, posted_days_ago=20, scraped_days_ago=3)])
+        assert not known.up_to_date  # grid never loaded
+        known.observe(video(2))
+        known.select([video(2)])
+        assert known.up_to_date
+
+        # Selected posts that failed to scrape are not "up to date"
+        known = self.make([known_post(2, posted_days_ago=20, scraped_days_ago=3)])
+        known.observe(video(9))
+        known.select([video(9)])
+        assert not known.up_to_date
+
+    def test_record_counts_unchanged_refreshes(self):
+        engagement = PostRecord("tiktok", video(1), likes=5, comments=1).engagement()
+        known = self.make([known_post(1, 3, 7, engagement), known_post(2, 3, 7, engagement)])
+        known.record(PostRecord("tiktok", video(1), likes=5, comments=1))
+        known.record(PostRecord("tiktok", video(2), likes=9, comments=1))
+        known.record(PostRecord("tiktok", video(3)))
+
+        assert known.unchanged == ["1"]
+
+
+def test_load_known_posts():
+    cur = MagicMock()
+    posted = NOW - timedelta(days=3)
+    cur.fetchall.return_value = [(123, posted, NOW, {"likes": 4}), ("456", None, None, None)]
+
+    known = load_known_posts(cur, "profile-1", "tiktok", limit=50, schedule=SCHEDULE, now=NOW)
+
+    sql, params = cur.execute.call_args[0]
+    assert "FROM competitor_posts" in sql and "LIMIT %s" in sql
+    assert params == ("profile-1", "tiktok", 50)
+    assert "123" in known and known.posts["123"].engagement == {"likes": 4}
+    assert known.posts["456"].engagement == {}
+    assert known.is_due("456")
+
+
+def test_mark_refreshed():
+    cur = MagicMock(rowcount=2)
+    assert mark_refreshed(cur, "tiktok", ["1", "2"]) == 2
+    assert cur.execute.call_args[0][1] == ("tiktok", ["1", "2"])
+
+    cur.reset_mock()
+    assert mark_refreshed(cur, "tiktok", []) == 0
+    cur.execute.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,153 @@
+"""
+Post Record Tests
+=================
+
+Tests for the shared PostRecord/ProfileSnapshot model and its parsers.
+
+Run with:
+    python -m pytest socialmedia/shared/test_post_record.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+from socialmedia.shared.post_record import (
+    PostRecord,
+    ProfileSnapshot,
+    extract_post_id,
+    parse_count,
+    parse_timestamp,
+)
+
+
+class TestParseCount:
+    @pytest.mark.parametrize("value, expected", [
+        ("1.2K", 1200),
+        ("5M", 5_000_000),
+        ("2b", 2_000_000_000),
+        ("1,234", 1234),
+        (" 10.5K ", 10500),
+        ("10.5K likes", 10500),
+        (1234, 1234),
+        (12.0, 12),
+        ("", 0),
+        (None, 0),
+        ("n/a", 0),
+        (True, 0),
+    ])
+    def test_formats(self, value, expected):
+        assert parse_count(value) == expected
+
+    def test_analytics_base_reexports_the_same_parser(self):
+        from socialmedia.shared import analytics_base
+        assert analytics_base.parse_count is parse_count
+
+
+class TestParseTimestamp:
+    def test_iso_with_z(self):
+        assert parse_timestamp("2025-09-15T17:35:15.000Z") == datetime(
+            2025, 9, 15, 17, 35, 15, tzinfo=timezone.utc
+        )
+
+    def test_epoch_seconds(self):
+        assert parse_timestamp(1760745600) == datetime(2025, 10, 18, tzinfo=timezone.utc)
+        assert parse_timestamp("1760745600") == datetime(2025, 10, 18, tzinfo=timezone.utc)
+
+    def test_plain_format_and_garbage(self):
+        assert parse_timestamp("2026-10-01 08:30:00") == datetime(2026, 10, 1, 8, 30)
+        assert parse_timestamp("6d ago") is None
+        assert parse_timestamp("") is None
+
+
+class TestPostRecord:
+    def test_from_instagram_parses_once(self):
+        record = PostRecord.from_instagram({
+            "url": "https://www.instagram.com/p/Cx1_ab/",
+            "timestamp": "2026-10-18 09:00:00",
+            "post_date": "2026-10-01T12:00:00Z",
+            "caption": "Hello #coffee",
+            "hashtags": ["coffee"],
+            "likes": "1.2K",
+            "comments_count": "1,024",
+            "media_urls": ["https://cdn/x.jpg"],
+            "comments": [],
+        })
+
+        assert record.post_id == "Cx1_ab"
+        assert (record.likes, record.comments) == (1200, 1024)
+        assert record.posted_at.tzinfo is not None
+        assert record.engagement() == {"likes": 1200, "comments": 1024, "total_engagement": 2224}
+
+    def test_from_tiktok_maps_legacy_keys(self):
+        record = PostRecord.from_tiktok({
+            "url": "https://www.tiktok.com/@cafe/video/7581306068471516446",
+            "description": "brew",
+            "likes_count": "3.4M",
+            "comments_count": "12K",
+            "shared_count": "900",
+            "saved_count": "",
+            "author": "cafe",
+            "author_stats": {"username": "cafe", "followers": "1.1M"},
+        })
+
+        assert record.post_id == "7581306068471516446"
+        assert record.username == "cafe"
+        assert (record.likes, record.comments, record.shares, record.saves) == (3_400_000, 12_000, 900, 0)
+        assert record.author_stats.followers == 1_100_000
+        assert record.engagement()["total_engagement"] == 3_412_900
+
+    def test_to_dict_round_trips_through_coerce(self):
+        original = PostRecord(
+            "tiktok", "https://www.tiktok.com/@a/video/1", username="a",
+            caption="c", posted_at="2026-10-01 08:30:00", likes="2K", source_hashtag="fyp",
+        )
+
+        data = original.to_dict()
+        again = PostRecord.coerce(data, "tiktok")
+
+        assert data["likes_count"] == 2000
+        assert data["source_hashtag"] == "fyp"
+        assert (again.post_id, again.likes, again.posted_at) == ("1", 2000, original.posted_at)
+
+    def test_coerce_passes_records_through(self):
+        record = PostRecord("instagram", "https://www.instagram.com/p/x/")
+        assert PostRecord.coerce(record, "instagram") is record
+
+    def test_slots_keep_records_small(self):
+        record = PostRecord("instagram", "https://www.instagram.com/p/x/")
+        legacy = record.to_dict()
+
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.unknown_field = 1
+        assert sys.getsizeof(record) < sys.getsizeof(legacy)
+
+
+class TestProfileSnapshot:
+    def test_coerce_from_scraper_strings(self):
+        snapshot = ProfileSnapshot.coerce(
+            {"username": "nike", "followers": "302M", "following": "150", "posts_count": "1,234"},
+            "instagram",
+        )
+
+        assert (snapshot.followers, snapshot.following, snapshot.posts_count) == (302_000_000, 150, 1234)
+        assert snapshot.to_dict()["posts_count"] == 1234
+
+    def test_tiktok_layout_reports_likes(self):
+        snapshot = ProfileSnapshot("tiktok", "cafe", followers=10, likes="5K")
+        assert snapshot.to_dict() == {"username": "cafe", "followers": 10, "following": 0, "likes": 5000}
+
+
+def test_extract_post_id_handles_reels_and_queries():
+    assert extract_post_id("https://www.instagram.com/reel/AbC/?igsh=1", "instagram") == "AbC"
+    assert extract_post_id("https://example.com/", "instagram") is None
+    assert extract_post_id("", "tiktok") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+RAG Report Ingestion Tests
+==========================
+
+Tests for content-addressed competitor report ingestion.
+
+Run with:
+    python -m pytest socialmedia/shared/test_rag_ingest.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import re
+
+import pytest
+
+from socialmedia.shared.rag_ingest import (
+    CHUNK_SIZE,
+    generate_competitor_report,
+    ingest_competitor_report,
+    report_filename_pattern,
+    report_sha256,
+    split_report_chunks,
+)
+
+REPORT_DATA = {"username": "nike", "followers": 1000, "posts_count": 3, "posts": []}
+
+
+# What fetchone returns for the inserted document (after the latest report)
+INSERTED = ("doc-new", True)
+
+
+def statements(cur):
+    return [" ".join(c.args[0].split()) for c in cur.execute.call_args_list]
+
+
+class TestReportHash:
+    def test_generation_time_does_not_change_the_hash(self):
+        first = generate_competitor_report(REPORT_DATA)
+        later = first.replace(first.splitlines()[1], "Generated on: 2099-01-01 00:00:00")
+        assert first != later
+        assert report_sha256(first) == report_sha256(later)
+
+    def test_metric_change_changes_the_hash(self):
+        changed = dict(REPORT_DATA, followers=1001)
+        assert report_sha256(generate_competitor_report(REPORT_DATA)) != report_sha256(
+            generate_competitor_report(changed)
+        )
+
+    def test_filename_pattern_is_per_competitor(self):
+        pattern = report_filename_pattern("nike.run")
+        assert re.match(pattern, "competitor_analysis_nike.run_20261018.txt")
+        assert not re.match(pattern, "competitor_analysis_nike_run_20261018.txt")
+        assert not re.match(pattern, "competitor_analysis_nike.run_fans_20261018.txt")
+
+    def test_chunks(self):
+        rows = split_report_chunks("word " * (CHUNK_SIZE // 5 * 2))
+        assert [index for index, *_ in rows] == [0, 1]
+        assert rows[0][2] == CHUNK_SIZE // 5
+
+
+class TestIngest:
+    def test_identical_latest_report_is_skipped(self, fake_conn):
+        report = generate_competitor_report(REPORT_DATA)
+        conn, cur = fake_conn(rows_in_turn=[("doc-1", report_sha256(report)), INSERTED])
+
+        assert ingest_competitor_report("nike", report, 7, 2, conn=conn) == "doc-1"
+
+        assert not any(s.startswith("INSERT") for s in statements(cur))
+        conn.commit.assert_called_once()
+
+    def test_new_report_inserts_chunks_once_and_supersedes(self, fake_conn):
+        report = generate_competitor_report(REPORT_DATA) + "x" * CHUNK_SIZE
+        conn, cur = fake_conn(rows_in_turn=[("doc-1", "0" * 64), INSERTED])
+
+        assert ingest_competitor_report("nike", report, 7, 2, conn=conn) == "doc-new"
+
+        executed = statements(cur)
+        chunk_inserts = [s for s in executed if s.startswith("INSERT INTO workshop_chunks")]
+        assert len(chunk_inserts) == 1 and "unnest(" in chunk_inserts[0]
+        chunk_params = cur.execute.call_args_list[3].args[1]
+        assert chunk_params[2] == [0, 1]
+        assert executed[-1].startswith("DELETE FROM workshop_documents")
+        assert cur.execute.call_args_list[-1].args[1][-1] == "doc-new"
+
+    def test_failure_rolls_back_the_callers_connection(self, fake_conn):
+        conn, cur = fake_conn(rows_in_turn=[None, INSERTED])
+        cur.execute.side_effect = [None, RuntimeError("boom")]
+
+        with pytest.raises(RuntimeError):
+            ingest_competitor_report("nike", "report", 7, 2, conn=conn)
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,200 @@
+"""
+Scrape Journal Tests
+====================
+
+Tests for the append-only JSONL writer and the streaming reader.
+
+Run with:
+    python -m pytest socialmedia/shared/test_scrape_journal.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+import os
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from socialmedia.shared import scrape_journal
+from socialmedia.shared.post_record import PostRecord
+from socialmedia.shared.scrape_journal import (
+    ScrapeJournal,
+    batched,
+    iter_jsonl,
+    read_scrape_file,
+)
+
+
+def tiktok_post(video_id):
+    return PostRecord("tiktok", f"https://www.tiktok.com/@cafe/video/{video_id}", username="cafe", likes="1K")
+
+
+class TestScrapeJournal:
+    def test_each_post_is_on_disk_before_close(self, tmp_path):
+        journal = ScrapeJournal(str(tmp_path / "cafe_tiktoks_1"), meta={"profile_info": {"username": "cafe"}})
+        journal.append(tiktok_post(1))
+        journal.append({"url": "https://www.tiktok.com/@cafe/video/2"})
+
+        # Readable while the writer is still open, i.e. as after a crash
+        lines = (tmp_path / "cafe_tiktoks_1.jsonl").read_text(encoding="utf-8").splitlines()
+        journal.close()
+
+        assert journal.count == 2
+        assert json.loads(lines[0]) == {"profile_info": {"username": "cafe"}}
+        assert json.loads(lines[1])["likes_count"] == 1000
+
+    def test_plain_jsonl_without_zstd_setting(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("SCRAPE_OUTPUT_ZSTD", raising=False)
+        with ScrapeJournal(str(tmp_path / "x")) as journal:
+            pass
+        assert journal.path.endswith(".jsonl") and not journal.compressed
+
+    def test_zstd_requested_without_library_falls_back(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SCRAPE_OUTPUT_ZSTD", "1")
+        monkeypatch.setattr(scrape_journal, "zstandard", None)
+        with ScrapeJournal(str(tmp_path / "x")) as journal:
+            pass
+        assert journal.path.endswith(".jsonl")
+
+    def test_zstd_round_trip(self, tmp_path):
+        pytest.importorskip("zstandard")
+        with ScrapeJournal(str(tmp_path / "x"), meta={"hashtag_info": {"hashtag": "fyp"}}, compress=True) as journal:
+            journal.append(tiktok_post(1))
+            journal.append(tiktok_post(2))
+
+        meta, posts = read_scrape_file(journal.path)
+        assert meta == {"hashtag_info": {"hashtag": "fyp"}}
+        assert [p["url"][-1] for p in posts] == ["1", "2"]
+
+
+class TestReader:
+    def test_truncated_last_line_is_skipped(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        path.write_text('{"hashtag_info": {"hashtag": "coffee"}}\n{"url": "a"}\n{"url": "b", "cap', encoding="utf-8")
+
+        meta, posts = read_scrape_file(str(path))
+
+        assert meta["hashtag_info"]["hashtag"] == "coffee"
+        assert list(posts) == [{"url": "a"}]
+
+    def test_corrupt_middle_line_does_not_stop_the_file(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        path.write_text('{"url": "a"}\nnot json\n{"url": "c"}\n', encoding="utf-8")
+        assert [line["url"] for line in iter_jsonl(str(path))] == ["a", "c"]
+
+    def test_reads_legacy_documents(self, tmp_path):
+        document = tmp_path / "cafe_tiktoks_1.json"
+        document.write_text(json.dumps({"profile_info": {"username": "cafe"}, "posts": [{"url": "a"}]}))
+        bare = tmp_path / "fyp_tiktoks_1.json"
+        bare.write_text(json.dumps([{"url": "b"}]))
+
+        meta, posts = read_scrape_file(str(document))
+        assert (meta, list(posts)) == ({"profile_info": {"username": "cafe"}}, [{"url": "a"}])
+        meta, posts = read_scrape_file(str(bare))
+        assert (meta, list(posts)) == ({}, [{"url": "b"}])
+
+    def test_header_only_journal_has_no_posts(self, tmp_path):
+        with ScrapeJournal(str(tmp_path / "empty"), meta={"profile_info": {"username": "x"}}) as journal:
+            pass
+        meta, posts = read_scrape_file(journal.path)
+        assert meta and list(posts) == []
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            read_scrape_file(os.path.join(str(tmp_path), "missing.jsonl"))
+
+
+def test_hashtag_upload_streams_a_partial_journal_in_batches(tmp_path, monkeypatch):
+    from socialmedia.hashtag import upload_hashtag_posts_to_db as uploader
+
+    conn = MagicMock()
+    monkeypatch.setattr(uploader, "get_database_connection", lambda: conn)
+    monkeypatch.setattr(uploader, "UPLOAD_BATCH_SIZE", 2)
+    with ScrapeJournal(str(tmp_path / "fyp_tiktoks_1_1"), meta={"hashtag_info": {"hashtag": "fyp"}}) as journal:
+        for video_id in range(5):
+            journal.append(tiktok_post(video_id))
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"url": "interrupted')
+
+    assert uploader.upload_hashtag_posts_to_db(journal.path)
+
+    cur = conn.cursor.return_value.__enter__.return_value
+    assert cur.copy_expert.call_count == 3
+    conn.commit.assert_called_once()
+
+
+def test_failed_metrics_read_keeps_earlier_batches(tmp_path, monkeypatch):
+    from socialmedia.hashtag import upload_hashtag_posts_to_db as uploader
+
+    class FailingSketchStore:
+        @staticmethod
+        def fetch_existing_metrics(cur, source_table, platform, post_ids):
+            raise RuntimeError("statement timeout")
+
+        def record_changes(self, cur, added, removed):
+            return True
+
+    conn = MagicMock()
+    monkeypatch.setattr(uploader, "get_database_connection", lambda: conn)
+    monkeypatch.setattr(uploader, "UPLOAD_BATCH_SIZE", 2)
+    monkeypatch.setattr(uploader, "AccountSketchStore", FailingSketchStore)
+    with ScrapeJournal(str(tmp_path / "fyp_tiktoks_1_1"), meta={"hashtag_info": {"hashtag": "fyp"}}) as journal:
+        for video_id in range(3):
+            journal.append(tiktok_post(video_id))
+
+    assert uploader.upload_hashtag_posts_to_db(journal.path)
+
+    cur = conn.cursor.return_value.__enter__.return_value
+    statements = [c.args[0] for c in cur.execute.call_args_list]
+    assert statements.count("ROLLBACK TO SAVEPOINT previous_metrics") == 2
+    assert cur.copy_expert.call_count == 2
+    conn.rollback.assert_not_called()
+    conn.commit.assert_called_once()
+
+
+def test_undated_rescrape_stays_in_its_sketch_bucket(monkeypatch):
+    """A re-scrape without a date replaces the post in the bucket of its stored date."""
+    from socialmedia.hashtag import upload_hashtag_posts_to_db as uploader
+    from viral.sketch_store import AccountSketchStore, PostMetrics
+
+    stored = datetime(2026, 10, 1, 9)
+    changes = []
+
+    class RecordingSketchStore(AccountSketchStore):
+        @staticmethod
+        def fetch_existing_metrics(cur, source_table, platform, post_ids):
+            return {post_ids[0]: PostMetrics("cafe", "tiktok", stored, 1000, 3, None)}
+
+        def record_changes(self, cur, added, removed=()):
+            changes.append(self._group_by_bucket(added, removed))
+            return True
+
+    monkeypatch.setattr(uploader, "AccountSketchStore", RecordingSketchStore)
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    record = tiktok_post(7)
+    record.views = 5000
+    # Nothing moved; the merge updated the likes of the row kept at its stored date
+    cur.fetchall.side_effect = [[], [("tiktok", record.post_id, False, stored)]]
+
+    uploader._upload_batch(conn, [record], "tiktok", "coffee", datetime(2026, 10, 18))
+
+    assert record.posted_at is None
+    (deltas,) = changes
+    adds, removes = deltas[("cafe", "tiktok", stored.date())]
+    assert len(adds) == len(removes) == 1
+    assert list(deltas) == [("cafe", "tiktok", stored.date())]
+    # hashtag_posts stores no views, so none are sketched
+    assert adds[0].views is None
+
+
+def test_batched_splits_lazily():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 3)) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
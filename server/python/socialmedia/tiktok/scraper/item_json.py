@@ -0,0 +1,161 @@
+"""
+TikTok Item JSON
+================
+
+Video metadata read in bulk from a profile page, for
+TikTokScraper.scrape_profile.
+
+A profile grid already has every video's stats client side: the first
+batch in the page's hydration JSON (the "itemList" of the user detail, or
+"ItemModule" in the older SIGI_STATE layout), the rest in the
+/api/post/item_list/ responses the grid fetches while scrolling. The
+scraper installs LISTING_HOOK_SCRIPT after the profile loads, which keeps
+the bodies of those responses in the page, and reads them back with
+LISTING_DRAIN_SCRIPT once the scroll is done.
+
+ItemListing collects the items of both sources by video ID.
+item_to_video_data() turns one into the dict scrape_video assembles, so
+a listed video needs no page load; only its comments still do.
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from ...shared.embedded_json import extract_fields, get_path, iter_values, loads
+
+# Keys of the item lists in the profile page's hydration JSON
+HYDRATION_LIST_KEYS = ("itemList", "ItemModule")
+
+LISTING_URL_MARKER = "/api/post/item_list"
+
+_VIDEO_ID_RE = re.compile(r"/video/(\d+)")
+
+# Field key paths, candidates in order of preference. statsV2 carries the
+# counts as strings, which do not overflow for the biggest videos.
+ITEM_FIELDS = {
+    "description": (("desc",),),
+    "post_date": (("createTime",),),
+    "likes_count": (("statsV2", "diggCount"), ("stats", "diggCount")),
+    "comments_count": (("statsV2", "commentCount"), ("stats", "commentCount")),
+    "shared_count": (("statsV2", "shareCount"), ("stats", "shareCount")),
+    "saved_count": (("statsV2", "collectCount"), ("stats", "collectCount")),
+    "views": (("statsV2", "playCount"), ("stats", "playCount")),
+    "video_url": (("video", "playAddr"), ("video", "downloadAddr")),
+}
+
+# Keeps the bodies of item_list responses in window.__pmItemLists; safe to
+# run twice. Both scripts are a single "return <expression>" so the
+# Playwright driver can evaluate them as well as Selenium.
+LISTING_HOOK_SCRIPT = r"""return (function (marker) {
+  if (window.__pmItemLists) return true;
+  window.__pmItemLists = [];
+  var keep = function (url, body) {
+    if (url && String(url).indexOf(marker) !== -1 && body) window.__pmItemLists.push(body);
+  };
+  var fetch = window.fetch;
+  window.fetch = function () {
+    return fetch.apply(this, arguments).then(function (response) {
+      try {
+        if (response.url.indexOf(marker) !== -1) {
+          response.clone().text().then(function (body) { keep(response.url, body); }, function () {});
+        }
+      } catch (e) {}
+      return response;
+    });
+  };
+  var open = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    var xhr = this;
+    xhr.addEventListener("load", function () {
+      try { keep(url, xhr.responseText); } catch (e) {}
+    });
+    return open.apply(this, arguments);
+  };
+  return true;
+})(__MARKER__)""".replace("__MARKER__", json.dumps(LISTING_URL_MARKER))
+
+# The kept response bodies as one JSON array of strings; empties the buffer
+LISTING_DRAIN_SCRIPT = r"""return (function () {
+  var bodies = window.__pmItemLists || [];
+  window.__pmItemLists = [];
+  return JSON.stringify(bodies);
+})()"""
+
+
+def video_id(url: str) -> Optional[str]:
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def item_author(item: Dict[str, Any]) -> str:
+    # ItemModule items carry the author as a plain uniqueId string
+    author = item.get("author")
+    if isinstance(author, str):
+        return author
+    return get_path(author, ("uniqueId",), "")
+
+
+def item_to_video_data(item: Dict[str, Any], video_url: str) -> Dict[str, Any]:
+    """The scrape_video dict for a listed item (without comments)."""
+    fields = extract_fields(item, ITEM_FIELDS)
+    description = fields.get("description", "")
+    return {
+        "url": video_url,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "post_date": fields.get("post_date", ""),
+        "description": description,
+        "hashtags": re.findall(r"#\w+", description),
+        "likes_count": fields.get("likes_count", ""),
+        "comments_count": fields.get("comments_count", ""),
+        "shared_count": fields.get("shared_count", ""),
+        "saved_count": fields.get("saved_count", ""),
+        "views": fields.get("views"),
+        "author": item_author(item),
+        "video_url": fields.get("video_url", ""),
+        "comments": [],
+    }
+
+
+class ItemListing:
+    """A profile's listed videos by ID, from hydration JSON and item_list responses."""
+
+    def __init__(self):
+        self.items: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _add(self, value: Any) -> None:
+        # Lists of items, or ItemModule's mapping of ID to item
+        entries = value.values() if isinstance(value, dict) else value
+        for item in entries if isinstance(entries, Iterable) else ():
+            if isinstance(item, dict) and item.get("id"):
+                self.items[str(item["id"])] = item
+
+    def add_html(self, html: str) -> None:
+        """Add the items embedded in a profile page."""
+        for key in HYDRATION_LIST_KEYS:
+            for value in iter_values(html, key):
+                self._add(value)
+
+    def add_responses(self, drained: Optional[str]) -> None:
+        """Add the items of LISTING_DRAIN_SCRIPT's result."""
+        if not drained:
+            return
+        try:
+            bodies = loads(drained)
+        except ValueError:
+            return
+        for body in bodies if isinstance(bodies, list) else ():
+            try:
+                self._add(get_path(loads(body), ("itemList",), []))
+            except (TypeError, ValueError):
+                continue
+
+    def get(self, video_url: str) -> Optional[Dict[str, Any]]:
+        return self.items.get(video_id(video_url) or "")
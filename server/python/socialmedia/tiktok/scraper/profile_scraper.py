@@ -9,36 +9,19 @@ import pickle
 import re
 from datetime import datetime, timedelta
 import datetime as dt
-import random
 import logging
 
 # Import the driver factory for SeleniumBase + Playwright fallback
 from ...drivers import get_driver, switch_to_fallback, BotDetectedError
+from ...drivers.base_scraper import polite_delay
+from ...drivers.dom_extract import extract_page
+from ...shared.post_record import PostRecord, ProfileSnapshot, parse_count
+from ...shared.scrape_journal import ScrapeJournal
+from . import item_json
 
 log = logging.getLogger(__name__)
 
 
-def parse_shorthand(value: str) -> str:
-    """Convert notation (K, M, B) to full numbers"""
-    val = value.strip().upper().replace(",", "")
-    if val.endswith("K"):
-        try:
-            return str(int(float(val[:-1]) * 1_000))
-        except ValueError:
-            return val
-    if val.endswith("M"):
-        try:
-            return str(int(float(val[:-1]) * 1_000_000))
-        except ValueError:
-            return val
-    if val.endswith("B"):
-        try:
-            return str(int(float(val[:-1]) * 1_000_000_000))
-        except ValueError:
-            return val
-    return val
-
-
 def calculate_post_date(relative_time_str: str) -> str:
     if not relative_time_str or "ago" not in relative_time_str.lower():
         return ""
@@ -90,13 +73,109 @@ def calculate_post_date(relative_time_str: str) -> str:
     # If we can't parse it, return empty string
     return ""
 
-# Random delay function to avoid detection
+# Seconds to wait for lazy-loaded videos after each scroll
+SCROLL_WAIT_TIMEOUT = float(os.getenv("SCRAPE_SCROLL_WAIT", "4"))
+
+# Read grid videos' stats from the profile page's item listing instead of
+# opening each video (see item_json); videos missing from the listing are
+# still opened
+PROFILE_BULK = os.getenv("TIKTOK_PROFILE_BULK", "1").lower() not in ("0", "false", "no")
+# Open listed videos anyway, for their comments
+BULK_COMMENTS = os.getenv("TIKTOK_BULK_COMMENTS", "0").lower() not in ("0", "false", "no")
+
+
+# Random politeness delay between requests (scaled by SCRAPE_POLITENESS_SCALE);
+# page loads use the driver's wait_for_* methods instead
 def random_delay(min_seconds=1, max_seconds=3):
-    time.sleep(random.uniform(min_seconds, max_seconds))
+    polite_delay(min_seconds, max_seconds)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Page extraction specs (one injected script per page, see drivers/dom_extract)
+# ─────────────────────────────────────────────────────────────────────────────
+PROFILE_STATS_SPEC = {
+    "fields": {
+        "followers": ["[data-e2e='followers-count']"],
+        "following": ["[data-e2e='following-count']"],
+        "likes": ["[data-e2e='likes-count']"],
+    },
+}
+
+PROFILE_LINKS_SPEC = {
+    "links": {"videos": {"query": "//div[@data-e2e='user-post-item']//a", "contains": ["/video/"]}},
+}
+
+HASHTAG_LINKS_SPEC = {
+    "links": {"videos": {"query": "//div[@data-e2e='challenge-item']//a", "contains": ["/video/"]}},
+}
+
+VIDEO_COMMENTS_LIST = {
+    "containers": [
+        "//div[@data-e2e='comment-item']",
+        "//div[contains(@class, 'CommentItemContainer')]",
+        "//div[contains(@class, 'comment-item')]",
+    ],
+    "limit": 20,
+    "fields": {
+        "username": [".//span[contains(@data-e2e, 'comment-username')] | .//a[contains(@href, '/@')]//span"],
+        "text": [".//span[contains(@data-e2e, 'comment-text')] | .//p | .//span[contains(@class, 'comment-text')]"],
+        "likes": [".//span[contains(@data-e2e, 'comment-like-count')] | .//span[contains(@class, 'like-count')]"],
+    },
+    "require": "text",
+}
+
+VIDEO_SPEC = {
+    "fields": {
+        "author": [
+            "//span[@data-e2e='browse-username']",
+            "//h2[@data-e2e='browse-username']",
+            "//span[contains(@class, 'username')]",
+            "//h1//span",
+        ],
+        "description": [
+            "//div[@data-e2e='browse-video-desc']",
+            "//div[contains(@class, 'video-meta-caption')]",
+            "//span[contains(@class, 'desc')]",
+            "//div[contains(@class, 'caption')]",
+        ],
+        # Fallback description: "Watch more videos from user ..."
+        "search_link_label": [("//a[@data-e2e='search-common-link']", "aria-label")],
+        # Relative time ("6d ago", "2 hours ago"), turned into a date by calculate_post_date
+        "post_date": {
+            "candidates": [
+                "//span[contains(@class, 'TUXText') and contains(text(), 'ago')]",
+                "//span[contains(text(), 'ago')]",
+                "//span[contains(text(), 'd ago') or contains(text(), 'h ago') or contains(text(), 'm ago')]",
+                "//*[contains(text(), 'ago')]",
+            ],
+            "match": r"\d+\s*(d|h|m|day|hour|minute)s?\s+ago",
+        },
+        "likes_label": [("//strong[@data-e2e='like-count']", "aria-label")],
+        "likes": ["//strong[@data-e2e='like-count']"],
+        "comments_count": ["//strong[@data-e2e='comment-count']"],
+        "shared_count": ["//strong[@data-e2e='shared_count']"],
+        "saved_count": [
+            "//strong[@data-e2e='undefined-count']",
+            "//span[@data-e2e='undefined-icon']/following-sibling::strong",
+            "//strong[contains(@class, 'undefined-count')]",
+        ],
+        "video_url": [("//video/source", "src")],
+    },
+    "lists": {
+        "comments": VIDEO_COMMENTS_LIST,
+    },
+}
+
+# Comments only, for videos whose stats came from the profile listing
+VIDEO_COMMENTS_SPEC = {
+    "lists": {
+        "comments": VIDEO_COMMENTS_LIST,
+    },
+}
 
 
 class TikTokScraper:
-    def __init__(self, cookies_path="cookies/tiktok_cookies.pkl", use_cookies=False, headless=True, proxy=None, driver_type='undetected'):
+    def __init__(self, cookies_path="cookies/tiktok_cookies.pkl", use_cookies=False, headless=True, proxy=None, driver_type='undetected', driver=None):
         """
         Initialize TikTok scraper.
         
@@ -106,6 +185,9 @@ class TikTokScraper:
             headless: Run browser in headless mode (recommended for server)
             proxy: Optional proxy string (e.g. "http://1.2.3.4:8080")
             driver_type: Driver to use - 'undetected', 'seleniumbase', or 'playwright'
+            driver: Already set-up driver to use instead of launching one (e.g. a
+                PlaywrightContextPool context); driver_type must describe it and
+                close() leaves it to its owner
         """
         self.cookies_path = cookies_path
         self.use_cookies = use_cookies
@@ -115,11 +197,17 @@ class TikTokScraper:
         self.driver_type = None  # Will be set by setup_driver
         self.preferred_driver = driver_type.lower()  # 'undetected', 'seleniumbase' or 'playwright'
         self._raw_driver = None  # The underlying driver object
-        self.setup_driver()
+        self._owns_driver = driver is None
+        if driver is not None:
+            self._raw_driver, self.driver_type = driver, self.preferred_driver
+            self.driver = driver
+        else:
+            self.setup_driver()
         
     def setup_driver(self):
         """Initialize scraper using the preferred driver type."""
         driver_name = self.preferred_driver
+        self._owns_driver = True
         print(f"Setting up TikTok scraper driver (requested: {driver_name})... Proxy: {self.proxy if self.proxy else 'None'}")
         
         try:
@@ -151,6 +239,7 @@ class TikTokScraper:
         
         try:
             self._raw_driver, self.driver_type = switch_to_fallback(self._raw_driver, headless=self.headless, proxy=self.proxy)
+            self._owns_driver = True  # the fallback browser is ours to close
             
             if self.driver_type == 'seleniumbase':
                 self.driver = self._raw_driver.driver
@@ -212,7 +301,7 @@ class TikTokScraper:
         if os.path.exists(self.cookies_path):
             cookies = pickle.load(open(self.cookies_path, "rb"))
             self.driver.get("https://www.tiktok.com")
-            time.sleep(3)
+            self._raw_driver.wait_for_network_idle()
             for cookie in cookies:
                 try:
                     cookie.pop("sameSite", None)
@@ -221,7 +310,7 @@ class TikTokScraper:
                     print(f"Error adding cookie: {e}")
             print("Cookies loaded successfully!")
             self.driver.refresh()
-            time.sleep(3)
+            self._raw_driver.wait_for_network_idle()
             return True
         return False
         
@@ -234,7 +323,7 @@ class TikTokScraper:
         if not self._navigate_with_retry("https://www.tiktok.com"):
             raise Exception("Failed to navigate to TikTok home page after retries")
         
-        time.sleep(2)
+        self._raw_driver.wait_for_network_idle()
         
         # Use different method based on driver type
         if self.driver_type == 'playwright':
@@ -260,8 +349,6 @@ class TikTokScraper:
         else:
             # Selenium-compatible approach (for undetected-chromedriver and seleniumbase)
             from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
             
             accept_xpaths = [
                 "//button[contains(text(), 'Accept')]",
@@ -375,11 +462,21 @@ class TikTokScraper:
                 except Exception:
                     pass
     
-    def scrape_profile(self, profile_url, max_posts=None):
+    def scrape_profile(self, profile_url, max_posts=None, known=None, bulk=None, comments=None):
         """Scrape TikTok profile posts (public access, no login required).
         
+        Args:
+            profile_url: Profile URL or @handle
+            max_posts: Newest grid posts to consider
+            known: Optional KnownPosts of the profile; scrolling stops at the
+                known-post watermark and only new or due posts are opened
+            bulk: Read video stats from the profile's item listing instead of
+                opening each video (default TIKTOK_PROFILE_BULK)
+            comments: In bulk mode, still open listed videos for their
+                comments (default TIKTOK_BULK_COMMENTS)
+        
         Returns:
-            list: List of post dictionaries with profile_info added as first element metadata
+            list: PostRecords; the ProfileSnapshot is kept in self.last_profile_info
         """
         if not profile_url.startswith("https://www.tiktok.com/"):
             profile_url = profile_url.lstrip("@")
@@ -396,7 +493,8 @@ class TikTokScraper:
             self.accept_cookies_and_setup()
             
         self.driver.get(profile_url)
-        random_delay(5, 8)  # Longer wait for headless mode
+        # Stats render with the profile header
+        self._raw_driver.wait_for_selector("[data-e2e='followers-count']")
         
         try:
             profile_name = re.search(r"tiktok\.com/@([^/?]+)", profile_url).group(1)
@@ -415,19 +513,34 @@ class TikTokScraper:
             if refresh_locator.count() > 0 and refresh_locator.first.is_visible():
                 print("Refresh button found, clicking it...")
                 refresh_locator.first.click()
-                random_delay(2, 3)
+                self._raw_driver.wait_for_network_idle()
         except Exception as e:
             print(f"No refresh button found, proceeding... ({e})")
         
         # Wait for video container to appear (important for headless mode)
-        try:
-            self.driver.page.wait_for_selector("[data-e2e='user-post-item']", timeout=15000)
+        if self._raw_driver.wait_for_selector("[data-e2e='user-post-item']"):
             print("Video container found, starting extraction...")
-        except Exception:
+        else:
             print("Video container not found, trying anyway...")
+        
+        bulk = PROFILE_BULK if bulk is None else bulk
+        comments = BULK_COMMENTS if comments is None else comments
+        listing = item_json.ItemListing() if bulk else None
+        if listing is not None:
+            # First batch from the hydration JSON, the rest from the
+            # item_list responses the scroll triggers
+            try:
+                listing.add_html(self.driver.page_source)
+            except Exception as e:
+                print(f"Could not read the video listing: {e}")
+            try:
+                self.driver.execute_script(item_json.LISTING_HOOK_SCRIPT)
+            except Exception as e:
+                print(f"Could not hook the item_list responses, unlisted videos will be opened: {e}")
             
         posts_data = []
-        video_links = set()
+        # Grid order (newest first) matters for the known-post watermark
+        video_links = {}
         
         print("Finding videos...")
         
@@ -438,24 +551,24 @@ class TikTokScraper:
         
         while scroll_attempts < max_scroll_attempts:
             try:
-                # Find video elements - TikTok uses different selectors
-                video_elements = self.driver.find_elements(By.XPATH, "//div[@data-e2e='user-post-item']//a")
-                
-                for el in video_elements:
-                    href = el.get_attribute("href")
-                    if href and "/video/" in href:
-                        video_links.add(href)
+                # All video links of the grid in one round trip
+                for link in extract_page(self.driver, PROFILE_LINKS_SPEC)["videos"]:
+                    if link not in video_links:
+                        video_links[link] = None
+                        if known is not None:
+                            known.observe(link)
                         
                 print(f"Found {len(video_links)} videos so far...")
                 
+                if known is not None and known.watermark_reached:
+                    print("Reached already scraped videos, stopping scroll")
+                    break
                 if max_posts and len(video_links) >= max_posts:
                     break
                     
-                # Scroll down
+                # Scroll down and wait for the next batch to grow the page
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                random_delay(2, 4)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
+                new_height = self._raw_driver.wait_for_scroll_height_change(last_height, SCROLL_WAIT_TIMEOUT)
                 if new_height == last_height:
                     scroll_attempts += 1
                     # If no new content after 3 attempts
@@ -473,109 +586,89 @@ class TikTokScraper:
         if max_posts:
             video_links = video_links[:max_posts]
         print(f"Found {len(video_links)} videos in total.")
-        
-        for idx, video_url in enumerate(video_links, start=1):
+        if listing is not None:
             try:
-                print(f"Processing video {idx}/{len(video_links)}: {video_url}")
-                data = self.scrape_video(video_url, retries=2)
-                if data:
-                    posts_data.append(data)
-                else:
-                    print(f"Skipping video {idx} due to scraping failure")
-                
-                # Longer delay between videos to avoid rate limiting
-                if idx < len(video_links):  # Don't delay after the last video
-                    random_delay(5, 10)
-                    
+                listing.add_responses(self.driver.execute_script(item_json.LISTING_DRAIN_SCRIPT))
             except Exception as e:
-                print(f"Error processing {video_url}: {e}")
-                # Try to continue with next video
-                continue
+                print(f"Could not read the listing responses: {e}")
+            listed = sum(1 for link in video_links if listing.get(link))
+            print(f"Video listing covers {listed}/{len(video_links)} videos")
+        if known is not None:
+            video_links = known.select(video_links)
+            print(f"Incremental scrape: {known.summary()}")
         
         # Store profile_info as attribute for access by weekly scraper
         self.last_profile_info = profile_info
                 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Ensure output directory exists
         output_dir = os.path.join(os.path.dirname(__file__), "scrape_result")
-        os.makedirs(output_dir, exist_ok=True)
         
-        json_filename = os.path.join(output_dir, f"{profile_name}_tiktoks_{timestamp}.json")
-        
-        # Save with profile info
-        output_data = {
-            "profile_info": profile_info,
-            "posts": posts_data
-        }
-        with open(json_filename, "w", encoding="utf-8") as jf:
-            json.dump(output_data, jf, ensure_ascii=False, indent=4)
-        print(f"Saved all videos to {json_filename}")
+        # Each video is on disk as soon as it is scraped, profile info first
+        with ScrapeJournal(
+            os.path.join(output_dir, f"{profile_name}_tiktoks_{timestamp}"),
+            meta={"profile_info": profile_info.to_dict()},
+        ) as journal:
+            for idx, video_url in enumerate(video_links, start=1):
+                try:
+                    print(f"Processing video {idx}/{len(video_links)}: {video_url}")
+                    item = listing.get(video_url) if listing is not None else None
+                    navigated = item is None or comments
+                    if item is not None:
+                        data = self._listed_video(item, video_url, profile_info, comments)
+                    else:
+                        data = self.scrape_video(video_url, retries=2)
+                    if data:
+                        journal.append(data)
+                        posts_data.append(data)
+                        if known is not None:
+                            known.record(data)
+                    else:
+                        print(f"Skipping video {idx} due to scraping failure")
+                    
+                    # Longer delay between video page loads to avoid rate limiting
+                    if navigated and idx < len(video_links):  # Don't delay after the last video
+                        random_delay(5, 10)
+                        
+                except Exception as e:
+                    print(f"Error processing {video_url}: {e}")
+                    # Try to continue with next video
+                    continue
+        print(f"Saved {journal.count} videos to {journal.path}")
         
         return posts_data
     
-    def _extract_profile_stats(self, username):
-        """Extract follower, following, and likes counts from profile page."""
-        profile_info = {
-            "username": username,
-            "followers": 0,
-            "following": 0,
-            "likes": 0
-        }
-        
+    def _listed_video(self, item, video_url, profile_info, comments=False):
+        """PostRecord of a video from the profile listing; opens it only for comments."""
+        video_data = item_json.item_to_video_data(item, video_url)
+        if not video_data["author"]:
+            video_data["author"] = profile_info.username
+        # The listing is the author's own grid; their stats were just read
+        video_data["author_stats"] = profile_info
+        if comments:
+            video_data["comments"] = self.scrape_comments(video_url)
+        return PostRecord.from_tiktok(video_data)
+    
+    def scrape_comments(self, video_url):
+        """The rendered comments of a video (one page load, one injected script)."""
         try:
-            # Check if using Playwright (has .page attribute)
-            is_playwright = hasattr(self.driver, 'page')
-            
-            selectors = {
-                "followers": "[data-e2e='followers-count']",
-                "following": "[data-e2e='following-count']", 
-                "likes": "[data-e2e='likes-count']"
-            }
-            
-            for key, selector in selectors.items():
-                try:
-                    text_value = None
-                    if is_playwright:
-                        locator = self.driver.page.locator(selector)
-                        if locator.count() > 0:
-                            text_value = locator.first.text_content()
-                    else:
-                        # Selenium
-                        from selenium.webdriver.common.by import By
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        if elements:
-                            text_value = elements[0].text
-                            
-                    if text_value:
-                        profile_info[key] = self._parse_count_text(text_value)
-                        # print(f"  → {key.capitalize()}: {profile_info[key]}")  # Verbose
-                except Exception as e:
-                    pass  # Silently continue on extraction errors
-            
-            # print(f"Profile stats for @{username}: {profile_info['followers']} followers, {profile_info['following']} following, {profile_info['likes']} likes")  # Verbose
-            
+            self.driver.get(video_url, timeout=20000)
+            self._raw_driver.wait_for_selector("[data-e2e='comment-item']")
+            page = extract_page(self.driver, VIDEO_COMMENTS_SPEC)
         except Exception as e:
-            pass  # Silently continue on profile stat errors
-        
-        return profile_info
+            print(f"  → Comment extraction failed: {e}")
+            return []
+        return [dict(comment, timestamp="") for comment in page["comments"]]
     
-    def _parse_count_text(self, text):
-        """Parse TikTok count text (e.g., '1.2M', '500K', '10.5K') to integer."""
-        if not text:
-            return 0
+    def _extract_profile_stats(self, username):
+        """Extract follower, following, and likes counts from profile page."""
+        profile_info = ProfileSnapshot("tiktok", username)
         
-        text = text.strip().upper().replace(",", "")
+        stats = extract_page(self.driver, PROFILE_STATS_SPEC)
+        for key in ("followers", "following", "likes"):
+            if stats[key]:
+                setattr(profile_info, key, parse_count(stats[key]))
         
-        try:
-            if "M" in text:
-                return int(float(text.replace("M", "")) * 1_000_000)
-            elif "K" in text:
-                return int(float(text.replace("K", "")) * 1_000)
-            else:
-                return int(text)
-        except (ValueError, TypeError):
-            return 0
+        return profile_info
     
     def scrape_video(self, video_url, retries=2):
         """
@@ -597,9 +690,10 @@ class TikTokScraper:
                         continue
                     return None
                 
-                # Wait for page to load (reduced delay since we now have proper timeout)
-                # print(f"  → Waiting for content...")  # Verbose
-                random_delay(2, 4)
+                # Wait for the video metadata to render
+                self._raw_driver.wait_for_selector(
+                    "[data-e2e='browse-video-desc'], [data-e2e='browse-username'], [data-e2e='like-count']"
+                )
                 
                 video_data = {
                     "url": video_url,
@@ -615,244 +709,43 @@ class TikTokScraper:
                     "comments": [],  # List of comment objects
                 }
                 
-                success = False
-                
                 try:
-                    # print(f"  → Extracting video data...")  # Verbose
+                    # Every field, selector fallback and comment in one injected script
+                    page = extract_page(self.driver, VIDEO_SPEC)
                     
-                    # Extract author
-                    author_selectors = [
-                        "//span[@data-e2e='browse-username']",
-                        "//h2[@data-e2e='browse-username']",
-                        "//span[contains(@class, 'username')]",
-                        "//h1//span"
-                    ]
-                    for sel in author_selectors:
-                        try:
-                            elem = self.driver.find_element(By.XPATH, sel)
-                            video_data["author"] = elem.text.strip()
-                            if video_data["author"]:
-                                log.info(f"  → Found author: {video_data['author']}")
-                                break
-                        except Exception:
-                            continue
-                            
-                    if not video_data["author"]:
-                        log.warning(f"  → WARNING: Cloud not extract author from video. Selectors tried: {len(author_selectors)}")
+                    video_data["author"] = page["author"]
+                    if video_data["author"]:
+                        log.info(f"  → Found author: {video_data['author']}")
+                    else:
+                        log.warning(f"  → WARNING: Cloud not extract author from video. Selectors tried: {len(VIDEO_SPEC['fields']['author'])}")
                         # Fallback: try getting from URL if possible
-                        try:
-                            if "/@" in video_url:
-                                match = re.search(r"@([^/?&]+)", video_url)
-                                if match:
-                                    video_data["author"] = match.group(1)
-                                    log.info(f"  → Extracted author from URL: {video_data['author']}")
-                        except:
-                            pass
-                    
-                    # Extract description
-                    desc_selectors = [
-                        "//div[@data-e2e='browse-video-desc']",
-                        "//div[contains(@class, 'video-meta-caption')]",
-                        "//span[contains(@class, 'desc')]",
-                        "//div[contains(@class, 'caption')]"
-                    ]
-                    for sel in desc_selectors:
-                        try:
-                            elem = self.driver.find_element(By.XPATH, sel)
-                            desc = elem.text.strip()
-                            if desc:
-                                video_data["description"] = desc
-                                video_data["hashtags"] = re.findall(r"#\w+", desc)
-                                break
-                        except NoSuchElementException:
-                            continue
-
-                    #Fallback: description from aria-label of search-common-link
-                    if not video_data["description"]:
-                        try:
-                            a_tag = self.driver.find_element(By.XPATH, "//a[@data-e2e='search-common-link']")
-                            aria_label = a_tag.get_attribute("aria-label")
-                            match = re.search(r"Watch more videos from user (.+)", aria_label)
-                            if match:
-                                video_data["description"] = match.group(1).strip()
-                                # print(f"Extracted description from aria-label: {video_data['description']}")  # Verbose
-                        except NoSuchElementException:
-                            pass
-
-                    # Extract post date (relative time: "x minutes/hours/days ago") and calculate actual date
-                    post_date_selectors = [
-                        "//span[contains(@class, 'TUXText') and contains(text(), 'ago')]",
-                        "//span[contains(text(), 'ago')]",
-                        "//span[contains(text(), 'd ago') or contains(text(), 'h ago') or contains(text(), 'm ago')]",
-                        "//*[contains(text(), 'ago')]"
-                    ]
-                    for sel in post_date_selectors:
-                        try:
-                            elem = self.driver.find_element(By.XPATH, sel)
-                            post_date_text = elem.text.strip()
-                            # Extract the relative time part (e.g., "6d ago", "2h ago", "30m ago")
-                            if "ago" in post_date_text:
-                                # Calculate actual post date from relative time
-                                calculated_date = calculate_post_date(post_date_text)
-                                if calculated_date:
-                                    video_data["post_date"] = calculated_date
-                                    break
-                        except NoSuchElementException:
-                            continue
-
-                    # Likes
-                    try:
-                        like_btn = self.driver.find_element(By.XPATH, "//strong[@data-e2e='like-count']")
-                        aria_label = like_btn.get_attribute("aria-label")
-                        if aria_label:
-                             likes_text = aria_label.split()[0]
-                        else:
-                             likes_text = like_btn.text
-                        video_data["likes_count"] = parse_shorthand(likes_text)
-                    except NoSuchElementException:
-                        video_data["likes_count"] = ""
-
-                    # Comments
-                    try:
-                        comm = self.driver.find_element(By.XPATH, "//strong[@data-e2e='comment-count']")
-                        video_data["comments_count"] = parse_shorthand(comm.text)
-                    except NoSuchElementException:
-                        video_data["comments_count"] = ""
-
-                    # Shared count
-                    try:
-                        saved = self.driver.find_element(By.XPATH, "//strong[@data-e2e='shared_count']")
-                        video_data["shared_count"] = parse_shorthand(saved.text)
-                    except NoSuchElementException:
-                        video_data["shared_count"] = ""
+                        match = re.search(r"@([^/?&]+)", video_url)
+                        if match:
+                            video_data["author"] = match.group(1)
+                            log.info(f"  → Extracted author from URL: {video_data['author']}")
                     
-                    # Saved count - use direct element finding (not WebDriverWait)
-                    saved_count_selectors = [
-                        "//strong[@data-e2e='undefined-count']",
-                        "//span[@data-e2e='undefined-icon']/following-sibling::strong",
-                        "//strong[contains(@class, 'undefined-count')]",
-                    ]
-                    saved_count_found = False
-                    for sel in saved_count_selectors:
-                        try:
-                            saved_elem = self.driver.find_element(By.XPATH, sel)
-                            saved_text = saved_elem.text.strip()
-                            if saved_text:
-                                video_data["saved_count"] = parse_shorthand(saved_text)
-                                saved_count_found = True
-                                break
-                        except (NoSuchElementException, Exception):
-                            continue
-                    
-                    if not saved_count_found:
-                        video_data["saved_count"] = ""
-
-                    # Video URL
-                    try:
-                        source = self.driver.find_element(By.XPATH, "//video/source")
-                        video_data["video_url"] = source.get_attribute("src")
-                    except NoSuchElementException:
-                        video_data["video_url"] = ""
-                    
-                    # --- NEW: Scrape Author Account Data ---
-                    if video_data.get("author"):
-                        try:
-                            # print(f"  → Scraping account data for @{video_data['author']}...")  # Verbose
-                            
-                            # Navigate to profile in SAME tab to avoid driver crashes
-                            author_name = video_data['author'].lstrip('@')
-                            profile_url = f"https://www.tiktok.com/@{author_name}"
-                            
-                            # Use navigate with retry logic if available, otherwise standard get
-                            if hasattr(self, '_navigate_with_retry'):
-                                self._navigate_with_retry(profile_url)
-                            else:
-                                self.driver.get(profile_url)
-                                
-                            random_delay(2, 4)
-                            
-                            # Extract stats
-                            account_stats = self._extract_profile_stats(video_data['author'])
-                            video_data["author_stats"] = account_stats
-                            
-                            # print(f"  → Account scraping complete")  # Verbose
-                            
-                            # Navigate BACK to video page for comments extraction
-                            # print(f"  → Returning to video page...")  # Verbose
-                            self.driver.get(video_url)
-                            random_delay(1, 2)
-                            
-                        except Exception as acc_err:
-                            print(f"  → Failed to scrape account data: {acc_err}")
-                            # Try to navigate back to video on error as well
-                            try:
-                                self.driver.get(video_url)
-                                random_delay(1, 2)
-                            except:
-                                pass
+                    if page["description"]:
+                        video_data["description"] = page["description"]
+                        video_data["hashtags"] = re.findall(r"#\w+", page["description"])
+                    else:
+                        # Fallback: description from aria-label of search-common-link
+                        match = re.search(r"Watch more videos from user (.+)", page["search_link_label"])
+                        if match:
+                            video_data["description"] = match.group(1).strip()
                     
-                    # Extract comments (top comments visible on page)
-                    try:
-                        # print(f"  → Extracting comments...")  # Verbose
-                        comments = []
-                        # TikTok comment selectors
-                        comment_container_selectors = [
-                            "//div[@data-e2e='comment-item']",
-                            "//div[contains(@class, 'CommentItemContainer')]",
-                            "//div[contains(@class, 'comment-item')]",
-                        ]
-                        
-                        for container_sel in comment_container_selectors:
-                            try:
-                                comment_elements = self.driver.find_elements(By.XPATH, container_sel)
-                                if comment_elements:
-                                    for idx, elem in enumerate(comment_elements[:20]):  # Max 20 comments
-                                        try:
-                                            comment_data = {
-                                                "username": "",
-                                                "text": "",
-                                                "likes": "",
-                                                "timestamp": ""
-                                            }
-                                            
-                                            # Username
-                                            try:
-                                                user_elem = elem.find_element(By.XPATH, ".//span[contains(@data-e2e, 'comment-username')] | .//a[contains(@href, '/@')]//span")
-                                                comment_data["username"] = user_elem.text.strip()
-                                            except:
-                                                pass
-                                            
-                                            # Comment text
-                                            try:
-                                                text_elem = elem.find_element(By.XPATH, ".//span[contains(@data-e2e, 'comment-text')] | .//p | .//span[contains(@class, 'comment-text')]")
-                                                comment_data["text"] = text_elem.text.strip()
-                                            except:
-                                                pass
-                                            
-                                            # Likes on comment
-                                            try:
-                                                likes_elem = elem.find_element(By.XPATH, ".//span[contains(@data-e2e, 'comment-like-count')] | .//span[contains(@class, 'like-count')]")
-                                                comment_data["likes"] = likes_elem.text.strip()
-                                            except:
-                                                pass
-                                            
-                                            if comment_data["text"]:  # Only add if we got text
-                                                comments.append(comment_data)
-                                        except Exception:
-                                            continue
-                                    break  # Found comments, stop trying other selectors
-                            except Exception:
-                                continue
-                        
-                        video_data["comments"] = comments
-                        # if comments:
-                        #     print(f"  → Found {len(comments)} comments")  # Verbose
-                    except Exception as e:
-                        # print(f"  → Comment extraction failed: {e}")  # Verbose - keep as log.debug if needed
-                        video_data["comments"] = []
+                    # Calculate actual post date from relative time ("6d ago", "2h ago")
+                    if page["post_date"]:
+                        video_data["post_date"] = calculate_post_date(page["post_date"])
                     
-                    success = True
-
+                    likes_text = page["likes_label"].split()[0] if page["likes_label"] else page["likes"]
+                    video_data["likes_count"] = parse_count(likes_text) if likes_text else ""
+                    for key in ("comments_count", "shared_count", "saved_count"):
+                        video_data[key] = parse_count(page[key]) if page[key] else ""
+                    video_data["video_url"] = page["video_url"]
+                    video_data["comments"] = [
+                        dict(comment, timestamp="") for comment in page["comments"]
+                    ]
+                
                 except Exception as e:
                     print(f"Error during standard extraction: {e}")
                 
@@ -924,7 +817,17 @@ class TikTokScraper:
                     print(f"Error parsing fallback JSON: {e}")
                 
                 if video_data["author"] or video_data["description"]:
-                    return video_data
+                    # Author account data, after everything was read from the
+                    # video page (no navigation back needed)
+                    if video_data["author"]:
+                        try:
+                            author_name = video_data['author'].lstrip('@')
+                            self._navigate_with_retry(f"https://www.tiktok.com/@{author_name}")
+                            self._raw_driver.wait_for_selector("[data-e2e='followers-count']")
+                            video_data["author_stats"] = self._extract_profile_stats(video_data['author'])
+                        except Exception as acc_err:
+                            print(f"  → Failed to scrape account data: {acc_err}")
+                    return PostRecord.from_tiktok(video_data)
                 else:
                     print(f"No data extracted on attempt {attempt + 1}")
                     if attempt < retries:
@@ -940,7 +843,8 @@ class TikTokScraper:
                     except:
                         print("Driver crashed; reinitializing...")
                         try:
-                            self.driver.quit()
+                            # Returns the lease; the pool drops the dead browser
+                            self._raw_driver.quit()
                         except:
                             pass
                         self.setup_driver()
@@ -985,8 +889,7 @@ class TikTokScraper:
             log.error(f"Failed to navigate to hashtag {hashtag}")
             return False
             
-        # log.info("DEBUG: Navigation completed, now running random_delay(3,5)...")  # Verbose
-        random_delay(3, 5)
+        self._raw_driver.wait_for_selector("[data-e2e='challenge-item']")
         # log.info("DEBUG: random_delay completed, taking screenshot...")  # Verbose
         
         # IMMEDIATELY take a screenshot for debugging (before any error detection)
@@ -1104,6 +1007,7 @@ class TikTokScraper:
                             headless=os.getenv("HEADLESS", "true").lower() not in ("false", "0", "no"),
                             proxy=self.proxy
                         )
+                        self._owns_driver = True
                         
                         # Update driver reference
                         if self.driver_type == 'seleniumbase':
@@ -1115,7 +1019,7 @@ class TikTokScraper:
                         
                         # Retry navigation with new driver
                         self.driver.get(hashtag_url)
-                        random_delay(3, 5)
+                        self._raw_driver.wait_for_selector("[data-e2e='challenge-item']")
                         
                         # Check one last time
                         page_source = self.driver.page_source.lower() if hasattr(self.driver, 'page_source') else ""
@@ -1137,8 +1041,6 @@ class TikTokScraper:
             
             # Wait briefly for the element
             from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
             
             try:
                 post_count_el = WebDriverWait(self.driver, 10).until(
@@ -1178,13 +1080,8 @@ class TikTokScraper:
         
         while scroll_attempts < max_scroll_attempts:
             try:
-                # Find video elements in hashtag page
-                video_elements = self.driver.find_elements(By.XPATH, "//div[@data-e2e='challenge-item']//a")
-                
-                for el in video_elements:
-                    href = el.get_attribute("href")
-                    if href and "/video/" in href:
-                        video_links.add(href)
+                # All video links of the hashtag grid in one round trip
+                video_links.update(extract_page(self.driver, HASHTAG_LINKS_SPEC)["videos"])
                         
                 print(f"Found {len(video_links)} videos so far...")
                 
@@ -1192,9 +1089,7 @@ class TikTokScraper:
                     break
                     
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                random_delay(2, 4)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
+                new_height = self._raw_driver.wait_for_scroll_height_change(last_height, SCROLL_WAIT_TIMEOUT)
                 if new_height == last_height:
                     scroll_attempts += 1
                     if scroll_attempts >= 3:
@@ -1212,25 +1107,25 @@ class TikTokScraper:
             video_links = video_links[:max_posts]
         print(f"Found {len(video_links)} videos in total.")
         
-        for idx, video_url in enumerate(video_links, start=1):
-            try:
-                print(f"Processing video {idx}/{len(video_links)}: {video_url}")
-                data = self.scrape_video(video_url)
-                if data:
-                    posts_data.append(data)
-                random_delay(2, 4)
-            except Exception as e:
-                print(f"Error processing {video_url}: {e}")
-        
         timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-        # Ensure output directory exists (using same logic as scrape_profile)
+        # Same output directory as scrape_profile
         output_dir = os.path.join(os.path.dirname(__file__), "scrape_result")
-        os.makedirs(output_dir, exist_ok=True)
-        json_filename = os.path.join(output_dir, f"{hashtag[1:]}_tiktoks_{timestamp}.json")
         
-        with open(json_filename, "w", encoding="utf-8") as jf:
-            json.dump(posts_data, jf, ensure_ascii=False, indent=4)
-        print(f"Saved all videos to {json_filename}")
+        with ScrapeJournal(
+            os.path.join(output_dir, f"{hashtag[1:]}_tiktoks_{timestamp}"),
+            meta={"hashtag_info": {"hashtag": hashtag.lstrip("#"), "platform": "tiktok"}},
+        ) as journal:
+            for idx, video_url in enumerate(video_links, start=1):
+                try:
+                    print(f"Processing video {idx}/{len(video_links)}: {video_url}")
+                    data = self.scrape_video(video_url)
+                    if data:
+                        journal.append(data)
+                        posts_data.append(data)
+                    random_delay(2, 4)
+                except Exception as e:
+                    print(f"Error processing {video_url}: {e}")
+        print(f"Saved {journal.count} videos to {journal.path}")
         
         return posts_data
     
@@ -1248,7 +1143,7 @@ class TikTokScraper:
             self.accept_cookies_and_setup()
             
         self.driver.get(explore_url)
-        random_delay(3, 5)
+        self._raw_driver.wait_for_network_idle()
         
         posts_data = []
         video_links = set()
@@ -1301,16 +1196,14 @@ class TikTokScraper:
                     
                 # Scroll down to load more content
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                random_delay(2, 4)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
+                new_height = self._raw_driver.wait_for_scroll_height_change(last_height, SCROLL_WAIT_TIMEOUT)
                 if new_height == last_height:
                     scroll_attempts += 1
                     # Try clicking on "Load more" or similar buttons
                     try:
                         load_more_btn = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Load') or contains(text(), 'More')]")
                         load_more_btn.click()
-                        random_delay(2, 3)
+                        self._raw_driver.wait_for_network_idle()
                         scroll_attempts = 0  # Reset if we found a load more button
                     except NoSuchElementException:
                         pass
@@ -1350,27 +1243,28 @@ class TikTokScraper:
             except Exception as e:
                 print(f"Alternative method failed: {e}")
         
-        for idx, video_url in enumerate(video_links, start=1):
-            try:
-                print(f"Processing video {idx}/{len(video_links)}: {video_url}")
-                data = self.scrape_video(video_url)
-                if data:
-                    posts_data.append(data)
-                random_delay(2, 4)  # Longer delays between videos
-            except Exception as e:
-                print(f"Error processing {video_url}: {e}")
-                
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        json_filename = f"socialmedia/scrape_result/tiktok_explore_{timestamp}.json"
-        with open(json_filename, "w", encoding="utf-8") as jf:
-            json.dump(posts_data, jf, ensure_ascii=False, indent=4)
-        print(f"Saved all explore videos to {json_filename}")
+        with ScrapeJournal(f"socialmedia/scrape_result/tiktok_explore_{timestamp}") as journal:
+            for idx, video_url in enumerate(video_links, start=1):
+                try:
+                    print(f"Processing video {idx}/{len(video_links)}: {video_url}")
+                    data = self.scrape_video(video_url)
+                    if data:
+                        journal.append(data)
+                        posts_data.append(data)
+                    random_delay(2, 4)  # Longer delays between videos
+                except Exception as e:
+                    print(f"Error processing {video_url}: {e}")
+        print(f"Saved {journal.count} explore videos to {journal.path}")
         
         return posts_data
     
     def close(self):
         """Close the scraper and clean up resources."""
-        if self._raw_driver:
+        if self._raw_driver and not self._owns_driver:
+            self._raw_driver = None
+            self.driver = None
+        elif self._raw_driver:
             try:
                 self._raw_driver.quit()
             except Exception as e:
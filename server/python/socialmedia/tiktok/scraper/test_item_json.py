@@ -0,0 +1,184 @@
+"""
+TikTok Item JSON Tests
+======================
+
+Tests for reading video stats from a profile's item listing (hydration
+JSON and captured item_list responses), and for the bulk mode of
+TikTokScraper.scrape_profile on a fixture profile page.
+
+Run with:
+    python -m pytest socialmedia/tiktok/scraper/test_item_json.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from socialmedia.drivers import base_scraper
+from socialmedia.drivers.dom_extract import build_script
+from socialmedia.drivers.fixture_driver import FixtureDriver, FixturePage, FixtureRecorder
+from socialmedia.drivers.playwright_stealth_driver import PlaywrightStealthDriver
+from socialmedia.shared.scrape_journal import ScrapeJournal
+from socialmedia.tiktok.scraper import item_json, profile_scraper
+from socialmedia.tiktok.scraper.profile_scraper import TikTokScraper
+
+PROFILE = "https://www.tiktok.com/@brand"
+
+
+def video(video_id):
+    return f"{PROFILE}/video/{video_id}"
+
+
+def item(video_id, likes, desc="New drop #launch #summer"):
+    return {
+        "id": str(video_id),
+        "desc": desc,
+        "createTime": "1760000000",
+        "author": {"uniqueId": "brand"},
+        "stats": {"diggCount": likes, "commentCount": 4, "shareCount": 2, "collectCount": 1, "playCount": 900},
+        "statsV2": {"diggCount": str(likes), "commentCount": "4", "shareCount": "2",
+                    "collectCount": "1", "playCount": "900"},
+        "video": {"playAddr": f"https://v16.tiktok.com/{video_id}.mp4"},
+    }
+
+
+def hydration_page(value):
+    return (f'<html><head><script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+            f'{json.dumps(value)}</script></head><body></body></html>')
+
+
+class TestItemListing:
+    def test_item_to_video_data(self):
+        data = item_json.item_to_video_data(item(101, 5200), video(101))
+
+        assert data["author"] == "brand"
+        assert data["hashtags"] == ["#launch", "#summer"]
+        assert (data["likes_count"], data["comments_count"], data["views"]) == ("5200", "4", "900")
+        record = profile_scraper.PostRecord.from_tiktok(data)
+        assert record.likes == 5200 and record.saves == 1 and record.posted_at.year == 2025
+
+    def test_hydration_list_and_item_module(self):
+        listing = item_json.ItemListing()
+        listing.add_html(hydration_page({"__DEFAULT_SCOPE__": {"webapp.user-detail": {
+            "userInfo": {"user": {"uniqueId": "brand"}}, "itemList": [item(101, 1), item(102, 2)]}}}))
+        # SIGI_STATE layout: ID -> item, author as a plain string
+        legacy = dict(item(103, 3), author="brand")
+        listing.add_html(hydration_page({"ItemModule": {"103": legacy}}))
+
+        assert len(listing) == 3
+        assert listing.get(video(103) + "?is_from_webapp=1")["author"] == "brand"
+        assert item_json.item_to_video_data(listing.get(video(103)), video(103))["author"] == "brand"
+        assert listing.get(f"{PROFILE}/photo/1") is None
+
+    def test_captured_responses(self):
+        listing = item_json.ItemListing()
+        drained = json.dumps([json.dumps({"itemList": [item(104, 4)], "hasMore": True}), "<html>", "null"])
+        listing.add_responses(drained)
+        listing.add_responses(None)
+        listing.add_responses("not json")
+
+        assert list(listing.items) == ["104"]
+
+    def test_hook_script_marks_listing_requests(self):
+        assert '"/api/post/item_list"' in item_json.LISTING_HOOK_SCRIPT
+        assert "__MARKER__" not in item_json.LISTING_HOOK_SCRIPT
+
+
+class EvaluatingPage:
+    """Playwright page that records what execute_script evaluates."""
+
+    def __init__(self):
+        self.evaluated = []
+
+    def evaluate(self, script, *args):
+        self.evaluated.append(script)
+
+
+def playwright_function(script):
+    """The function PlaywrightStealthDriver.execute_script evaluates for a script."""
+    driver = PlaywrightStealthDriver.__new__(PlaywrightStealthDriver)
+    driver._is_setup, driver.page = True, EvaluatingPage()
+    driver.execute_script(script)
+    return driver.page.evaluated[0]
+
+
+# Minimal page globals for running the listing scripts under node
+NODE_PAGE = """
+var window = globalThis;
+window.fetch = function () { return Promise.resolve({url: ""}); };
+window.XMLHttpRequest = function () {};
+XMLHttpRequest.prototype.open = function () {};
+"""
+
+
+class TestListingScripts:
+    @pytest.mark.parametrize("name", ["LISTING_HOOK_SCRIPT", "LISTING_DRAIN_SCRIPT"])
+    def test_playwright_evaluates_one_expression(self, name):
+        function = playwright_function(getattr(item_json, name))
+        assert function.startswith("() => (function")
+        assert function.endswith(")")
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+    def test_converted_scripts_run(self):
+        hook = playwright_function(item_json.LISTING_HOOK_SCRIPT)
+        drain = playwright_function(item_json.LISTING_DRAIN_SCRIPT)
+        program = NODE_PAGE + f"""
+            var hooked = ({hook})() && ({hook})();
+            window.__pmItemLists.push("body");
+            console.log(JSON.stringify([hooked, ({drain})(), ({drain})()]));
+        """
+        out = subprocess.run(["node", "-e", program], capture_output=True, text=True, check=True).stdout
+        assert json.loads(out) == [True, '["body"]', "[]"]
+
+
+@pytest.fixture
+def bulk_scraper(tmp_path, monkeypatch):
+    """A scraper on a recorded profile: two videos in the hydration JSON,
+    one in a captured item_list response and one in neither."""
+    links = [video(101), video(102), video(103), video(104)]
+    html = hydration_page({"__DEFAULT_SCOPE__": {"webapp.user-detail": {"itemList": [item(101, 10), item(102, 20)]}}})
+    html = html.replace("<body>", "<body><strong data-e2e='followers-count'>12K</strong><div data-e2e='user-post-item'></div>")
+    page = FixturePage(PROFILE, html=html)
+    page.record_script(build_script(profile_scraper.PROFILE_STATS_SPEC), (),
+                       json.dumps({"followers": "12K", "following": "10", "likes": "1M"}))
+    page.record_script(build_script(profile_scraper.PROFILE_LINKS_SPEC), (), json.dumps({"videos": links}))
+    page.record_script(item_json.LISTING_DRAIN_SCRIPT, (), json.dumps([json.dumps({"itemList": [item(103, 30)]})]))
+    FixtureRecorder(str(tmp_path / "corpus")).save(page)
+
+    monkeypatch.setattr(base_scraper, "SCRAPE_POLITENESS_SCALE", 0)
+    monkeypatch.setattr(profile_scraper, "ScrapeJournal",
+                        lambda path, meta=None: ScrapeJournal(str(tmp_path / "journal"), meta=meta))
+    scraper = TikTokScraper(driver_type="fixture", driver=FixtureDriver(str(tmp_path / "corpus")))
+    monkeypatch.setattr(scraper, "accept_cookies_and_setup", lambda: True)
+    opened = []
+    monkeypatch.setattr(scraper, "scrape_video", lambda url, retries=2: opened.append(url))
+    monkeypatch.setattr(scraper, "scrape_comments", lambda url: opened.append(url) or [])
+    return scraper, opened
+
+
+class TestBulkProfileScrape:
+    def test_opens_only_unlisted_videos(self, bulk_scraper):
+        scraper, opened = bulk_scraper
+        posts = scraper.scrape_profile(PROFILE, bulk=True, comments=False)
+
+        assert opened == [video(104)]
+        assert [p.likes for p in posts] == [10, 20, 30]
+        assert all(p.author_stats.followers == 12000 for p in posts)
+
+    def test_comments_and_per_video_mode(self, bulk_scraper):
+        scraper, opened = bulk_scraper
+        scraper.scrape_profile(PROFILE, max_posts=2, bulk=True, comments=True)
+        assert opened == [video(101), video(102)]
+
+        opened.clear()
+        scraper.scrape_profile(PROFILE, max_posts=2, bulk=False)
+        assert opened == [video(101), video(102)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,25 @@
+"""
+Trends Package
+==============
+
+Collectors for platform trend listings, stored as time series.
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+from .hashtag_trends import (
+    TrendingHashtag,
+    hashtag_history,
+    latest_snapshot,
+    scrape_trending_hashtags,
+    store_snapshot,
+)
+
+__all__ = [
+    "TrendingHashtag",
+    "hashtag_history",
+    "latest_snapshot",
+    "scrape_trending_hashtags",
+    "store_snapshot",
+]
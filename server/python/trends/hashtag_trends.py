@@ -0,0 +1,335 @@
+"""
+Hashtag Trends
+==============
+
+Popular hashtags from TikTok Creative Center, stored as a daily time
+series.
+
+collect_trending_hashtags() loads the popular hashtag page on a scraper
+driver (socialmedia/drivers), presses "View More" until the list stops
+growing (or VIEW_MORE_CLICKS times), then reads every hashtag card with
+one extract_page() call. Each card's text is parsed into a
+TrendingHashtag: rank, hashtag, post count and, where the card shows
+one, view count.
+
+store_snapshot() writes a scrape to table hashtag_trends, one row per
+hashtag, region, period and day; the evening scrape updates the
+morning's rows instead of adding new ones. latest_snapshot() and
+hashtag_history() answer trend queries from the table, so nothing has
+to start a browser to read trends.
+
+Usage:
+    from trends.hashtag_trends import scrape_trending_hashtags, store_snapshot
+    trends = scrape_trending_hashtags(region="US")
+    with psycopg.connect(DATABASE_URL) as conn:
+        store_snapshot(conn, trends, region="US")
+
+    python -m trends.hashtag_trends --region US --store
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+from socialmedia.drivers.base_scraper import polite_delay
+from socialmedia.drivers.dom_extract import extract_page
+from socialmedia.shared.post_record import parse_count
+
+log = logging.getLogger(__name__)
+
+SOURCE = "tiktok_creative_center"
+
+TRENDS_URL = "https://ads.tiktok.com/business/creativecenter/inspiration/popular/hashtag/pc/en"
+
+# Site default region ('' keeps the page's own choice) and period in days
+# (the page offers 7, 30 and 120)
+TRENDS_REGION = os.getenv("HASHTAG_TRENDS_REGION", "").upper()
+TRENDS_PERIOD = int(os.getenv("HASHTAG_TRENDS_PERIOD", "7"))
+
+# "View More" presses per scrape; each loads another page of cards
+VIEW_MORE_CLICKS = int(os.getenv("HASHTAG_TRENDS_PAGES", "5"))
+
+MAX_ITEMS = 500
+
+ITEM_SELECTOR = "//*[@id='hashtagItemContainer']"
+
+VIEW_MORE_SELECTORS = (
+    "//*[@id='ccContentContainer']/div[3]/div/div[2]/div/div[1]",
+    "div[class*='ViewMoreBtn']",
+)
+
+# Presses "View More"; returns the page height before the press, or -1
+# when there is no button (the list is complete). One expression after
+# "return", so it also runs through the Playwright drivers' evaluate()
+VIEW_MORE_SCRIPT = r"""return (function (selectors) {
+  for (var i = 0; i < selectors.length; i++) {
+    var s = selectors[i], el = null;
+    try {
+      el = /^(\.?\/|\()/.test(s)
+        ? document.evaluate(s, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(s);
+    } catch (e) {}
+    if (!el) continue;
+    var height = document.body.scrollHeight;
+    el.scrollIntoView(true);
+    el.click();
+    return height;
+  }
+  return -1;
+})(__SELECTORS__)""".replace("__SELECTORS__", json.dumps(list(VIEW_MORE_SELECTORS)))
+
+# Every card's text, in page order
+TRENDS_SPEC = {
+    "lists": {
+        "items": {
+            "containers": [ITEM_SELECTOR, "div[class*='CardPc_container']"],
+            "limit": MAX_ITEMS,
+            "fields": {"text": ["."]},
+            "require": "text",
+        },
+    },
+}
+
+_RANK_RE = re.compile(r"^\d{1,4}$")
+_COUNT_RE = re.compile(r"^\d[\d.,]*\s*[KMB]?$", re.IGNORECASE)
+
+UPSERT_SQL = """
+    INSERT INTO hashtag_trends
+        (source, region, period_days, hashtag, snapshot_date, rank, posts, views)
+    SELECT %(source)s, %(region)s, %(period)s, t.hashtag, %(snapshot_date)s, t.rank, t.posts, t.views
+    FROM UNNEST(%(hashtags)s::text[], %(ranks)s::int[], %(posts)s::bigint[], %(views)s::bigint[])
+        AS t(hashtag, rank, posts, views)
+    ON CONFLICT (source, region, period_days, snapshot_date, hashtag) DO UPDATE
+    SET rank = EXCLUDED.rank,
+        posts = COALESCE(EXCLUDED.posts, hashtag_trends.posts),
+        views = COALESCE(EXCLUDED.views, hashtag_trends.views),
+        scraped_at = NOW()
+"""
+
+# The newest snapshot with each hashtag's row of the snapshot before it
+LATEST_SQL = """
+    WITH days AS (
+        SELECT DISTINCT snapshot_date FROM hashtag_trends
+        WHERE source = %(source)s AND region = %(region)s AND period_days = %(period)s
+        ORDER BY snapshot_date DESC
+        LIMIT 2
+    )
+    SELECT t.hashtag, t.rank, t.posts, t.views, t.snapshot_date, p.rank, p.posts
+    FROM hashtag_trends t
+    LEFT JOIN hashtag_trends p
+        ON p.source = t.source AND p.region = t.region AND p.period_days = t.period_days
+       AND p.hashtag = t.hashtag
+       AND p.snapshot_date = (SELECT MIN(snapshot_date) FROM days)
+       AND p.snapshot_date < t.snapshot_date
+    WHERE t.source = %(source)s AND t.region = %(region)s AND t.period_days = %(period)s
+      AND t.snapshot_date = (SELECT MAX(snapshot_date) FROM days)
+    ORDER BY t.rank NULLS LAST, t.posts DESC NULLS LAST
+    LIMIT %(limit)s
+"""
+
+HISTORY_SQL = """
+    SELECT snapshot_date, rank, posts, views
+    FROM hashtag_trends
+    WHERE source = %(source)s AND region = %(region)s AND period_days = %(period)s
+      AND hashtag = %(hashtag)s
+      AND snapshot_date >= CURRENT_DATE - %(days)s::int
+    ORDER BY snapshot_date
+"""
+
+
+@dataclass
+class TrendingHashtag:
+    """One card of the popular hashtag list."""
+
+    hashtag: str
+    rank: Optional[int] = None
+    posts: Optional[int] = None
+    views: Optional[int] = None
+
+
+def trends_url(region: str = "", period: int = TRENDS_PERIOD) -> str:
+    params = [f"period={period}"]
+    if region:
+        params.append(f"countryCode={region.upper()}")
+    return f"{TRENDS_URL}?{'&'.join(params)}"
+
+
+def normalize_hashtag(tag: str) -> str:
+    return (tag or "").strip().lstrip("#").strip().lower()
+
+
+def parse_card(text: str, position: Optional[int] = None) -> Optional[TrendingHashtag]:
+    """
+    A card's text, one value per line: the rank, the #hashtag, then its
+    counts (posts first, views when shown). position is the rank when
+    the card has none.
+    """
+    lines = [line.strip() for line in (text or "").splitlines() if line.strip()]
+    tag_index = next((i for i, line in enumerate(lines) if line.startswith("#")), None)
+    if tag_index is None:
+        return None
+    hashtag = normalize_hashtag(lines[tag_index])
+    if not hashtag:
+        return None
+
+    rank = next((int(line) for line in lines[:tag_index] if _RANK_RE.match(line)), position)
+    counts = [parse_count(line) for line in lines[tag_index + 1:] if _COUNT_RE.match(line)]
+    return TrendingHashtag(
+        hashtag=hashtag,
+        rank=rank,
+        posts=counts[0] if counts else None,
+        views=counts[1] if len(counts) > 1 else None,
+    )
+
+
+def parse_cards(items: Iterable[Dict[str, Any]]) -> List[TrendingHashtag]:
+    """TrendingHashtags of extracted cards, first card per hashtag."""
+    trends: Dict[str, TrendingHashtag] = {}
+    for position, item in enumerate(items, start=1):
+        card = parse_card(item.get("text", ""), position)
+        if card and card.hashtag not in trends:
+            trends[card.hashtag] = card
+    return list(trends.values())
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Scraping
+# ─────────────────────────────────────────────────────────────────────────────
+def collect_trending_hashtags(driver, region: str = TRENDS_REGION, period: int = TRENDS_PERIOD,
+                              pages: int = VIEW_MORE_CLICKS) -> List[TrendingHashtag]:
+    """
+    The popular hashtags on a BaseScraper driver, in rank order.
+
+    Returns:
+        TrendingHashtags; empty when the list did not load
+    """
+    driver.get(trends_url(region, period))
+    if not driver.wait_for_selector(ITEM_SELECTOR):
+        log.warning("Creative Center hashtag list did not load")
+        return []
+
+    for _ in range(pages):
+        height = driver.execute_script(VIEW_MORE_SCRIPT)
+        if height is None or height < 0:
+            break
+        if driver.wait_for_scroll_height_change(height) == height:
+            # Pressed but nothing loaded: the list is complete
+            break
+        polite_delay(1, 2)
+
+    trends = parse_cards(extract_page(driver, TRENDS_SPEC)["items"])
+    log.info(f"Collected {len(trends)} trending hashtags (region={region or 'default'}, period={period}d)")
+    return trends
+
+
+def scrape_trending_hashtags(region: str = TRENDS_REGION, period: int = TRENDS_PERIOD,
+                             pages: int = VIEW_MORE_CLICKS, driver=None) -> List[TrendingHashtag]:
+    """collect_trending_hashtags on the given driver, or on a new one it quits after."""
+    if driver is not None:
+        return collect_trending_hashtags(driver, region, period, pages)
+
+    from socialmedia.drivers import get_driver
+
+    driver, driver_type = get_driver(headless=True)
+    log.info(f"Scraping hashtag trends with {driver_type}")
+    try:
+        return collect_trending_hashtags(driver, region, period, pages)
+    finally:
+        driver.quit()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Database
+# ─────────────────────────────────────────────────────────────────────────────
+def store_snapshot(conn, trends: List[TrendingHashtag], region: str = TRENDS_REGION,
+                   period: int = TRENDS_PERIOD, snapshot_date: Optional[date] = None) -> int:
+    """
+    Upsert a scrape as the day's snapshot (committed here).
+
+    Returns:
+        Rows inserted or updated
+    """
+    if not trends:
+        return 0
+    with conn.cursor() as cur:
+        cur.execute(UPSERT_SQL, {
+            "source": SOURCE,
+            "region": (region or "").upper(),
+            "period": period,
+            "snapshot_date": snapshot_date or date.today(),
+            "hashtags": [t.hashtag for t in trends],
+            "ranks": [t.rank for t in trends],
+            "posts": [t.posts for t in trends],
+            "views": [t.views for t in trends],
+        })
+        stored = cur.rowcount
+    conn.commit()
+    return stored
+
+
+def latest_snapshot(conn, region: str = TRENDS_REGION, period: int = TRENDS_PERIOD,
+                    limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    The newest stored snapshot in rank order. rank_change is how many
+    places a hashtag rose since the snapshot before (None when it is
+    new), posts_change the growth of its post count.
+    """
+    with conn.cursor() as cur:
+        cur.execute(LATEST_SQL, {"source": SOURCE, "region": (region or "").upper(),
+                                 "period": period, "limit": limit})
+        rows = cur.fetchall()
+    return [
+        {
+            "hashtag": hashtag,
+            "rank": rank,
+            "posts": posts,
+            "views": views,
+            "snapshot_date": snapshot_date.isoformat(),
+            "rank_change": previous_rank - rank if previous_rank is not None and rank is not None else None,
+            "posts_change": posts - previous_posts if previous_posts is not None and posts is not None else None,
+        }
+        for hashtag, rank, posts, views, snapshot_date, previous_rank, previous_posts in rows
+    ]
+
+
+def hashtag_history(conn, hashtag: str, region: str = TRENDS_REGION, period: int = TRENDS_PERIOD,
+                    days: int = 30) -> List[Dict[str, Any]]:
+    """A hashtag's daily rank and counts over the last days, oldest first."""
+    with conn.cursor() as cur:
+        cur.execute(HISTORY_SQL, {"source": SOURCE, "region": (region or "").upper(), "period": period,
+                                  "hashtag": normalize_hashtag(hashtag), "days": days})
+        rows = cur.fetchall()
+    return [
+        {"snapshot_date": day.isoformat(), "rank": rank, "posts": posts, "views": views}
+        for day, rank, posts, views in rows
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scrape TikTok Creative Center popular hashtags")
+    parser.add_argument("--region", default=TRENDS_REGION, help="Country code (default: the page's)")
+    parser.add_argument("--period", type=int, default=TRENDS_PERIOD, choices=[7, 30, 120])
+    parser.add_argument("--pages", type=int, default=VIEW_MORE_CLICKS, help="'View More' presses")
+    parser.add_argument("--store", action="store_true", help="Save the snapshot to hashtag_trends")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    trends = scrape_trending_hashtags(args.region, args.period, args.pages)
+    if args.store:
+        import psycopg
+
+        with psycopg.connect(os.environ["DATABASE_URL"]) as conn:
+            log.info(f"Stored {store_snapshot(conn, trends, args.region, args.period)} trend rows")
+    print(json.dumps([asdict(t) for t in trends], indent=2))
+
+
+if __name__ == "__main__":
+    main()
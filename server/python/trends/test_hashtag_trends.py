@@ -0,0 +1,151 @@
+"""
+Hashtag Trends Tests
+====================
+
+Tests for the Creative Center collector and the hashtag_trends snapshot
+queries in trends/hashtag_trends.py (no browser, no database).
+
+Run with:
+    python -m pytest trends/test_hashtag_trends.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+from datetime import date
+
+import pytest
+
+from trends import hashtag_trends
+from trends.hashtag_trends import (
+    VIEW_MORE_SCRIPT,
+    TrendingHashtag,
+    collect_trending_hashtags,
+    hashtag_history,
+    latest_snapshot,
+    parse_card,
+    parse_cards,
+    store_snapshot,
+    trends_url,
+)
+
+
+class FakeDriver:
+    """Creative Center page with `presses` working "View More" presses."""
+
+    def __init__(self, cards, presses=2, loads=True):
+        self.cards, self.presses, self.loads = cards, presses, loads
+        self.urls, self.scripts = [], []
+
+    def get(self, url):
+        self.urls.append(url)
+
+    def wait_for_selector(self, selector, timeout=None, visible=False):
+        return self.loads
+
+    def wait_for_scroll_height_change(self, previous_height, timeout=None):
+        return previous_height + 1000
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        if script == VIEW_MORE_SCRIPT:
+            if not self.presses:
+                return -1
+            self.presses -= 1
+            return 2000
+        return json.dumps({"items": [{"text": text} for text in self.cards], "height": 5000})
+
+
+class TestParsing:
+    @pytest.mark.parametrize("text,expected", [
+        ("1\n#FYP\n12.5K\nPosts", TrendingHashtag("fyp", 1, 12500)),
+        ("2\n# Halloween \n1,204\nPosts\n3.1M\nViews", TrendingHashtag("halloween", 2, 1204, 3100000)),
+        ("#travel\n800", TrendingHashtag("travel", 7, 800)),
+        ("#new", TrendingHashtag("new", 7)),
+    ])
+    def test_card(self, text, expected):
+        assert parse_card(text, position=7) == expected
+
+    def test_card_without_hashtag(self):
+        assert parse_card("3\nView analytics") is None
+        assert parse_card("") is None
+
+    def test_cards_keep_first_per_hashtag(self):
+        cards = parse_cards([{"text": "1\n#fyp\n10K"}, {"text": "Loading"}, {"text": "#FYP\n9K"},
+                             {"text": "#viral\n5K"}])
+        assert cards == [TrendingHashtag("fyp", 1, 10000), TrendingHashtag("viral", 4, 5000)]
+
+    def test_url(self):
+        assert trends_url("us", 30).endswith("/hashtag/pc/en?period=30&countryCode=US")
+        assert trends_url("", 7).endswith("?period=7")
+
+
+class TestCollect:
+    @pytest.fixture(autouse=True)
+    def no_delays(self, monkeypatch):
+        monkeypatch.setattr(hashtag_trends, "polite_delay", lambda *args: None)
+
+    def test_presses_view_more_then_extracts_once(self):
+        driver = FakeDriver(["1\n#fyp\n10K", "2\n#viral\n8K"], presses=2)
+        trends = collect_trending_hashtags(driver, region="US", period=7, pages=5)
+
+        assert [t.hashtag for t in trends] == ["fyp", "viral"]
+        assert driver.urls == [trends_url("US", 7)]
+        # Two presses, the press that found no button, one extraction
+        assert driver.scripts.count(VIEW_MORE_SCRIPT) == 3
+        assert len(driver.scripts) == 4
+
+    def test_stops_at_the_page_limit(self):
+        driver = FakeDriver(["#fyp"], presses=10)
+        collect_trending_hashtags(driver, pages=3)
+        assert driver.scripts.count(VIEW_MORE_SCRIPT) == 3
+
+    def test_list_that_does_not_load(self):
+        driver = FakeDriver(["#fyp"], loads=False)
+        assert collect_trending_hashtags(driver) == []
+        assert driver.scripts == []
+
+    def test_script_is_one_expression(self):
+        assert VIEW_MORE_SCRIPT.startswith("return (function")
+
+
+class TestSnapshots:
+    def test_store_upserts_the_days_rows(self, fake_conn):
+        conn, cur = fake_conn(rowcount=2)
+        trends = [TrendingHashtag("fyp", 1, 10000), TrendingHashtag("viral", 2, None, 50)]
+        assert store_snapshot(conn, trends, region="us", period=7, snapshot_date=date(2026, 10, 18)) == 2
+
+        sql, params = cur.execute.call_args[0]
+        assert "ON CONFLICT (source, region, period_days, snapshot_date, hashtag) DO UPDATE" in sql
+        assert params["region"] == "US" and params["snapshot_date"] == date(2026, 10, 18)
+        assert params["hashtags"] == ["fyp", "viral"]
+        assert (params["ranks"], params["posts"], params["views"]) == ([1, 2], [10000, None], [None, 50])
+        conn.commit.assert_called_once()
+
+    def test_store_nothing(self, fake_conn):
+        conn, cur = fake_conn()
+        assert store_snapshot(conn, []) == 0
+        cur.execute.assert_not_called()
+
+    def test_latest_reports_changes_since_previous_snapshot(self, fake_conn):
+        conn, _ = fake_conn(rows=[
+            ("fyp", 1, 12000, None, date(2026, 10, 18), 3, 10000),
+            ("newtag", 2, 500, None, date(2026, 10, 18), None, None),
+        ])
+        rows = latest_snapshot(conn, region="", period=7)
+
+        assert rows[0] == {"hashtag": "fyp", "rank": 1, "posts": 12000, "views": None,
+                           "snapshot_date": "2026-10-18", "rank_change": 2, "posts_change": 2000}
+        assert rows[1]["rank_change"] is None and rows[1]["posts_change"] is None
+
+    def test_history_normalizes_the_hashtag(self, fake_conn):
+        conn, cur = fake_conn(rows=[(date(2026, 10, 17), 4, 900, None)])
+        assert hashtag_history(conn, "#FYP", days=7) == [
+            {"snapshot_date": "2026-10-17", "rank": 4, "posts": 900, "views": None}]
+        params = cur.execute.call_args[0][1]
+        assert (params["hashtag"], params["days"]) == ("fyp", 7)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -11,6 +11,9 @@ Created: 2026-01-01
 
 __version__ = "1.0.0"
 
+from .materialized_posts import refresh_unified_posts
 from .outlier_detector import OutlierDetector
+from .quantile_sketch import QuantileSketch
+from .sketch_store import AccountSketchStore
 
-__all__ = ["OutlierDetector"]
+__all__ = ["OutlierDetector", "QuantileSketch", "AccountSketchStore", "refresh_unified_posts"]
@@ -0,0 +1,128 @@
+"""
+Account Sketch Backfill
+=======================
+
+Builds account_metric_sketches (migration 000002_account_metric_sketches)
+from the posts already stored in competitor_posts and hashtag_posts.
+
+The uploaders only update sketches for posts they ingest, so without a
+backfill every account starts empty and the viral scan skips it until
+min_posts new posts arrive. This command streams the stored posts in
+(username, platform, posted_at day) order through a server-side cursor
+and rewrites each day bucket from scratch (AccountSketchStore.replace_bucket),
+committing every --batch-size buckets. Metrics are read the same way
+the uploaders and unified_posts read them.
+
+Buckets are replaced, not added to, so the command can be re-run, e.g.
+after an interrupted run or to repair drift. Run it once after deploying
+the migration; a bucket an upload writes while it runs is corrected by
+the next run.
+
+Usage:
+    python -m viral.backfill_sketches
+    python -m viral.backfill_sketches --days 30 --batch-size 1000
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import argparse
+import json
+import logging
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Any, Dict, Optional, Tuple
+
+import psycopg
+
+from .outlier_detector import DATABASE_URL
+from .sketch_store import AccountSketchStore, PostMetrics
+
+log = logging.getLogger(__name__)
+
+# Stored posts with an author and a date (the ones uploaders sketch), in
+# bucket order; a NULL since selects every post
+POSTS_SQL = """
+    SELECT username, platform, posted_at::date AS bucket_date, likes, comments, views
+    FROM (
+        SELECT username, platform, posted_at,
+               COALESCE((engagement->>'likes')::bigint, 0) AS likes,
+               COALESCE((engagement->>'comments')::bigint, 0) AS comments,
+               CASE WHEN engagement ? 'views' THEN (engagement->>'views')::bigint END AS views
+        FROM competitor_posts
+        WHERE username <> '' AND posted_at IS NOT NULL
+          AND (%(since)s::timestamp IS NULL OR posted_at >= %(since)s)
+        UNION ALL
+        SELECT username, platform, posted_at,
+               COALESCE(likes, 0), COALESCE(comments_count, 0), NULL::bigint
+        FROM hashtag_posts
+        WHERE username <> '' AND posted_at IS NOT NULL
+          AND (%(since)s::timestamp IS NULL OR posted_at >= %(since)s)
+    ) posts
+    ORDER BY 1, 2, 3
+"""
+
+
+def _bucket_key(row: Tuple) -> Tuple:
+    return row[0], row[1], row[2]
+
+
+def backfill_sketches(conn, since: Optional[datetime] = None, batch_size: int = 500,
+                      store: Optional[AccountSketchStore] = None) -> Dict[str, Any]:
+    """
+    Rebuild the sketch buckets of every stored post posted since `since`.
+
+    Args:
+        conn: psycopg connection (not autocommit).
+        since: Oldest posted_at to backfill (None = all posts).
+        batch_size: Buckets written per commit.
+        store: Sketch store (defaults to the configured accuracy).
+
+    Returns:
+        dict: buckets, posts, accounts.
+    """
+    store = store or AccountSketchStore()
+    result = {"buckets": 0, "posts": 0, "accounts": 0}
+    last_account = None
+    # WITH HOLD keeps the server-side cursor open across the batch commits
+    with conn.cursor(name="sketch_backfill", withhold=True) as posts, conn.cursor() as cur:
+        posts.execute(POSTS_SQL, {"since": since})
+        for (username, platform, bucket_date), rows in groupby(posts, key=_bucket_key):
+            result["posts"] += store.replace_bucket(cur, username, platform, bucket_date, (
+                PostMetrics(username, platform, None, likes, comments, views)
+                for _, _, _, likes, comments, views in rows
+            ))
+            result["buckets"] += 1
+            if (username, platform) != last_account:
+                last_account = (username, platform)
+                result["accounts"] += 1
+            if result["buckets"] % batch_size == 0:
+                conn.commit()
+                log.info("Backfilled %d buckets (%d posts)", result["buckets"], result["posts"])
+    conn.commit()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build account metric sketches from stored posts")
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--days", type=int, help="Only posts from the last N days (default: all)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Buckets written per commit")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    since = datetime.utcnow() - timedelta(days=args.days) if args.days else None
+    with psycopg.connect(args.database_url) as conn:
+        result = backfill_sketches(conn, since=since, batch_size=args.batch_size)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"Backfilled {result['buckets']} day buckets for {result['accounts']} accounts "
+          f"({result['posts']} posts)")
+
+
+if __name__ == "__main__":
+    main()
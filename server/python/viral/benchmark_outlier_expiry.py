@@ -0,0 +1,282 @@
+"""
+Viral Outlier Expiry Benchmark
+==============================
+
+Compares scan-plus-cleanup cost of the two viral_outliers layouts over
+a simulated stretch of churn (default 90 days):
+
+    delete       plain table, UNIQUE (source_table, source_id), four
+                 indexes, per-row ON CONFLICT upsert, DELETE expiry
+                 (the layout before migration 000005)
+    partitioned  daily partitions by expires_at, set-based upsert,
+                 expiry by dropping partitions (viral/outlier_partitions.py)
+
+Time is simulated: every scan and cleanup gets an explicit "now", so 90
+days run in minutes. Each variant lives in a scratch schema that is
+dropped afterwards. Requires a PostgreSQL database (DATABASE_URL).
+
+Usage:
+    python -m viral.benchmark_outlier_expiry --days 90 --scans-per-day 24 \\
+        --outliers-per-scan 100
+
+Reports, per variant: total upsert time, total cleanup time, the slowest
+cleanup, final on-disk size (table + indexes) and dead tuples.
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Set, Tuple
+
+import psycopg
+from psycopg import sql
+
+from .outlier_detector import DATABASE_URL, EXPIRY_DAYS, ViralOutlier
+from .outlier_partitions import (
+    PARTITION_DAYS_AHEAD,
+    drop_expired_partitions,
+    ensure_partitions,
+    upsert_params,
+    upsert_sql,
+)
+
+log = logging.getLogger(__name__)
+
+BENCH_SCHEMA = "viral_bench"
+TABLE = "viral_outliers"
+
+_COLUMNS = """
+    source_table VARCHAR(50) NOT NULL,
+    source_id INT NOT NULL,
+    multiplier INT NOT NULL,
+    median_engagement BIGINT NOT NULL,
+    actual_engagement BIGINT NOT NULL,
+    available_count INT NOT NULL,
+    support_count INT NOT NULL,
+    hook TEXT,
+    cta TEXT,
+    platform VARCHAR(50),
+    username TEXT,
+    analyzed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    ai_analysis JSONB DEFAULT '{}'
+"""
+
+_LEGACY_UPSERT = """
+    INSERT INTO {table} (
+        source_table, source_id, multiplier, median_engagement, actual_engagement,
+        available_count, support_count, hook, platform, username, analyzed_at, expires_at
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (source_table, source_id) DO UPDATE SET
+        multiplier = EXCLUDED.multiplier,
+        actual_engagement = EXCLUDED.actual_engagement,
+        available_count = EXCLUDED.available_count,
+        support_count = EXCLUDED.support_count,
+        analyzed_at = EXCLUDED.analyzed_at,
+        expires_at = EXCLUDED.expires_at
+    WHERE {table}.multiplier != EXCLUDED.multiplier
+       OR {table}.actual_engagement != EXCLUDED.actual_engagement
+       OR {table}.support_count != EXCLUDED.support_count
+"""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Schema setup
+# ─────────────────────────────────────────────────────────────────────────────
+def create_schema(cur, variant: str) -> None:
+    """(Re)create the scratch schema with one variant's table layout."""
+    schema = sql.Identifier(BENCH_SCHEMA)
+    table = sql.Identifier(BENCH_SCHEMA, TABLE)
+    cur.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(schema))
+    cur.execute(sql.SQL("CREATE SCHEMA {}").format(schema))
+
+    if variant == "delete":
+        cur.execute(sql.SQL(
+            "CREATE TABLE {} (id SERIAL PRIMARY KEY, " + _COLUMNS + ", UNIQUE (source_table, source_id))"
+        ).format(table))
+        indexes = ["multiplier DESC", "platform", "username", "expires_at"]
+    else:
+        cur.execute(sql.SQL(
+            "CREATE TABLE {} (id SERIAL, " + _COLUMNS + ", PRIMARY KEY (id, expires_at)) "
+            "PARTITION BY RANGE (expires_at)"
+        ).format(table))
+        cur.execute(sql.SQL("CREATE TABLE {} PARTITION OF {} DEFAULT").format(
+            sql.Identifier(BENCH_SCHEMA, f"{TABLE}_default"), table,
+        ))
+        indexes = ["source_table, source_id", "multiplier DESC", "platform", "username"]
+
+    for columns in indexes:
+        cur.execute(sql.SQL("CREATE INDEX ON {} (" + columns + ")").format(table))
+
+
+def storage_stats(cur) -> Tuple[int, int, int]:
+    """(total bytes incl. indexes, live rows, dead tuples) across all partitions."""
+    cur.execute("""
+        SELECT COALESCE(SUM(pg_total_relation_size(c.oid)), 0),
+               COALESCE(SUM(s.n_live_tup), 0),
+               COALESCE(SUM(s.n_dead_tup), 0)
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+        WHERE n.nspname = %s AND c.relkind = 'r'
+    """, (BENCH_SCHEMA,))
+    size, live, dead = cur.fetchone()
+    return int(size), int(live), int(dead)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Simulation
+# ─────────────────────────────────────────────────────────────────────────────
+def simulate_scan(
+    rng: random.Random, live_ids: Set[int], next_id: int, count: int, redetect_ratio: float
+) -> Tuple[List[ViralOutlier], int]:
+    """Outliers found by one scan: some re-detections, the rest new posts."""
+    redetected = rng.sample(sorted(live_ids), min(len(live_ids), int(count * redetect_ratio)))
+    source_ids = redetected + list(range(next_id, next_id + count - len(redetected)))
+    outliers = []
+    for source_id in source_ids:
+        multiplier = rng.choice((5, 10, 50, 100))
+        outliers.append(ViralOutlier(
+            source_table="competitor_posts",
+            source_id=source_id,
+            username=f"user_{source_id % 500}",
+            platform="instagram",
+            content="",
+            hook="Simulated hook " * 10,
+            multiplier=multiplier,
+            median_engagement=1000,
+            actual_engagement=multiplier * 1000 + rng.randint(0, 999),
+            available_count=2,
+            support_count=2,
+            likes=0,
+            comments=0,
+            views=None,
+            likes_outlier=True,
+            comments_outlier=True,
+            views_outlier=False,
+        ))
+    return outliers, next_id + count - len(redetected)
+
+
+def run_variant(conn, variant: str, args) -> Dict[str, Any]:
+    """Simulate args.days of scans and daily cleanups for one layout."""
+    rng = random.Random(args.seed)
+    table_ident = sql.Identifier(BENCH_SCHEMA, TABLE)
+    legacy_upsert = sql.SQL(_LEGACY_UPSERT).format(table=table_ident)
+    expiry = timedelta(days=args.expiry_days)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    with conn.cursor() as cur:
+        create_schema(cur, variant)
+        conn.commit()
+
+        live: Dict[int, datetime] = {}
+        next_id = 1
+        upsert_seconds = 0.0
+        cleanup_seconds = 0.0
+        worst_cleanup = 0.0
+
+        for day in range(args.days):
+            for scan in range(args.scans_per_day):
+                now = start + timedelta(days=day, hours=scan * 24 / args.scans_per_day)
+                live = {k: v for k, v in live.items() if v > now}
+                outliers, next_id = simulate_scan(
+                    rng, set(live), next_id, args.outliers_per_scan, args.redetect_ratio
+                )
+
+                began = time.perf_counter()
+                if variant == "delete":
+                    for o in outliers:
+                        cur.execute(legacy_upsert, (
+                            o.source_table, o.source_id, o.multiplier, o.median_engagement,
+                            o.actual_engagement, o.available_count, o.support_count,
+                            o.hook, o.platform, o.username, now, now + expiry,
+                        ))
+                else:
+                    ensure_partitions(
+                        cur, now.date(), (now + expiry).date() + timedelta(days=PARTITION_DAYS_AHEAD),
+                        table=TABLE, schema=BENCH_SCHEMA,
+                    )
+                    cur.execute(
+                        upsert_sql(TABLE, BENCH_SCHEMA),
+                        upsert_params(outliers, now, args.expiry_days),
+                    )
+                conn.commit()
+                upsert_seconds += time.perf_counter() - began
+
+                for o in outliers:
+                    live.setdefault(o.source_id, now + expiry)
+
+            # Daily cleanup (3 AM in production)
+            now = start + timedelta(days=day + 1)
+            began = time.perf_counter()
+            drop_expired_partitions(cur, now, table=TABLE, schema=BENCH_SCHEMA)
+            conn.commit()
+            elapsed = time.perf_counter() - began
+            cleanup_seconds += elapsed
+            worst_cleanup = max(worst_cleanup, elapsed)
+
+        cur.execute("ANALYZE")
+        conn.commit()
+        size, live_rows, dead = storage_stats(cur)
+
+        if not args.keep:
+            cur.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(BENCH_SCHEMA)))
+            conn.commit()
+
+    return {
+        "variant": variant,
+        "upsert_seconds": round(upsert_seconds, 3),
+        "cleanup_seconds": round(cleanup_seconds, 3),
+        "worst_cleanup_seconds": round(worst_cleanup, 4),
+        "total_seconds": round(upsert_seconds + cleanup_seconds, 3),
+        "size_bytes": size,
+        "live_rows": live_rows,
+        "dead_tuples": dead,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark viral_outliers expiry strategies")
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--scans-per-day", type=int, default=24)
+    parser.add_argument("--outliers-per-scan", type=int, default=100)
+    parser.add_argument("--redetect-ratio", type=float, default=0.5)
+    parser.add_argument("--expiry-days", type=int, default=EXPIRY_DAYS)
+    parser.add_argument("--variants", nargs="+", default=["delete", "partitioned"],
+                        choices=["delete", "partitioned"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema of the last variant")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    results = []
+    with psycopg.connect(args.database_url) as conn:
+        for variant in args.variants:
+            log.info(f"Simulating {args.days} days with layout '{variant}'")
+            results.append(run_variant(conn, variant, args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n{'variant':<12} {'upsert s':>10} {'cleanup s':>10} {'worst cln s':>12} "
+          f"{'size MB':>9} {'live':>8} {'dead':>8}")
+    for r in results:
+        print(f"{r['variant']:<12} {r['upsert_seconds']:>10.2f} {r['cleanup_seconds']:>10.2f} "
+              f"{r['worst_cleanup_seconds']:>12.4f} {r['size_bytes'] / 1e6:>9.2f} "
+              f"{r['live_rows']:>8} {r['dead_tuples']:>8}")
+
+
+if __name__ == "__main__":
+    main()
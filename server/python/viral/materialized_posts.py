@@ -0,0 +1,96 @@
+"""
+Materialized Unified Posts
+==========================
+
+Refresh helpers for unified_posts_mv, the materialized copy of the
+unified_posts view (migration 000004_unified_posts_materialized).
+
+The view re-runs a UNION over competitor_posts/hashtag_posts and
+extracts engagement from JSONB on every reference; the viral scan
+references it twice per scan. Readers use the materialized copy
+instead, which is refreshed:
+
+    - after ingest batches (viral.tasks.refresh_unified_posts)
+    - by the viral scan itself when the last refresh is older than
+      VIRAL_MV_MAX_AGE_SECONDS
+
+Refreshes run CONCURRENTLY so readers are never blocked, and are
+serialized with a transaction-level advisory lock: a caller that finds
+a refresh already running skips instead of queueing behind it.
+
+Works with both psycopg2 and psycopg (v3) connections.
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+UNIFIED_POSTS_VIEW = "unified_posts"
+UNIFIED_POSTS_MV = "unified_posts_mv"
+
+# Read unified_posts_mv instead of the unified_posts view
+USE_MATERIALIZED_POSTS = os.environ.get("VIRAL_USE_MATERIALIZED_POSTS", "true").lower() in ("1", "true", "yes")
+
+# The scan refreshes the materialized view when it is older than this
+MV_MAX_AGE_SECONDS = int(os.environ.get("VIRAL_MV_MAX_AGE_SECONDS", "900"))
+
+
+def materialized_view_exists(conn) -> bool:
+    """True if the unified_posts_mv migration has been applied."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", (UNIFIED_POSTS_MV,))
+        exists = cur.fetchone()[0]
+    conn.commit()
+    return exists
+
+
+def refresh_unified_posts(conn, max_age_seconds: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Refresh unified_posts_mv concurrently.
+
+    Args:
+        conn: Database connection (not autocommit).
+        max_age_seconds: Skip the refresh if the last one is more recent
+            than this. None always refreshes.
+
+    Returns:
+        dict: status ('success' or 'skipped'), plus duration_ms or reason.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_xact_lock(hashtext(%s))", (UNIFIED_POSTS_MV,))
+        if not cur.fetchone()[0]:
+            conn.rollback()
+            return {"status": "skipped", "reason": "refresh_in_progress"}
+
+        if max_age_seconds is not None:
+            cur.execute("""
+                SELECT EXTRACT(EPOCH FROM (NOW() - refreshed_at))
+                FROM materialized_view_refreshes
+                WHERE view_name = %s
+            """, (UNIFIED_POSTS_MV,))
+            row = cur.fetchone()
+            if row and row[0] is not None and row[0] < max_age_seconds:
+                conn.rollback()
+                return {"status": "skipped", "reason": "fresh", "age_seconds": int(row[0])}
+
+        started = time.monotonic()
+        cur.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {UNIFIED_POSTS_MV}")
+        duration_ms = int((time.monotonic() - started) * 1000)
+
+        cur.execute("""
+            INSERT INTO materialized_view_refreshes (view_name, refreshed_at, duration_ms)
+            VALUES (%s, NOW(), %s)
+            ON CONFLICT (view_name) DO UPDATE SET
+                refreshed_at = EXCLUDED.refreshed_at,
+                duration_ms = EXCLUDED.duration_ms
+        """, (UNIFIED_POSTS_MV, duration_ms))
+    conn.commit()
+
+    log.info(f"Refreshed {UNIFIED_POSTS_MV} in {duration_ms} ms")
+    return {"status": "success", "duration_ms": duration_ms}
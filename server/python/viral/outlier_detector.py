@@ -8,7 +8,12 @@ account medians. Implements the robust outlier detection algorithm with:
 - Configurable floors and multipliers
 - Available count / support count logic for missing metrics
 - Task locking to prevent overlapping scans
+- Drop-based expiry of the day-partitioned viral_outliers table
 - UTC timestamps throughout
+- Optional sketch-based medians (VIRAL_USE_SKETCHES) read from
+  account_metric_sketches instead of PERCENTILE_CONT over raw rows
+- Reads the materialized unified_posts_mv (refreshed when stale) instead
+  of the unified_posts view (VIRAL_USE_MATERIALIZED_POSTS)
 
 Author: ProjectMonopoly Team
 Created: 2026-01-01
@@ -16,12 +21,30 @@ Created: 2026-01-01
 
 import os
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 
 import psycopg
 
+from .materialized_posts import (
+    MV_MAX_AGE_SECONDS,
+    UNIFIED_POSTS_MV,
+    UNIFIED_POSTS_VIEW,
+    USE_MATERIALIZED_POSTS,
+    materialized_view_exists,
+    refresh_unified_posts,
+)
+from .outlier_partitions import (
+    PARTITION_DAYS_AHEAD,
+    drop_expired_partitions,
+    ensure_partitions,
+    is_partitioned,
+    upsert_params,
+    upsert_sql,
+)
+from .sketch_store import AccountSketchStore
+
 log = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -37,6 +60,8 @@ VIRAL_WINDOW_DAYS = int(os.environ.get("VIRAL_WINDOW_DAYS", "3"))
 MEDIAN_WINDOW_DAYS = int(os.environ.get("VIRAL_MEDIAN_WINDOW_DAYS", "30"))
 MIN_POSTS_FOR_MEDIAN = int(os.environ.get("VIRAL_MIN_POSTS", "5"))
 EXPIRY_DAYS = int(os.environ.get("VIRAL_EXPIRY_DAYS", "7"))
+SCAN_SHARDS = int(os.environ.get("VIRAL_SCAN_SHARDS", "1"))
+USE_SKETCHES = os.environ.get("VIRAL_USE_SKETCHES", "false").lower() in ("1", "true", "yes")
 
 DATABASE_URL = os.environ.get(
     "DATABASE_URL",
@@ -90,6 +115,8 @@ class OutlierDetector:
         median_window_days: int = MEDIAN_WINDOW_DAYS,
         min_posts: int = MIN_POSTS_FOR_MEDIAN,
         expiry_days: int = EXPIRY_DAYS,
+        use_sketches: bool = USE_SKETCHES,
+        use_materialized_posts: bool = USE_MATERIALIZED_POSTS,
     ):
         self.database_url = database_url
         self.likes_floor = likes_floor
@@ -100,6 +127,8 @@ class OutlierDetector:
         self.median_window_days = median_window_days
         self.min_posts = min_posts
         self.expiry_days = expiry_days
+        self.use_sketches = use_sketches
+        self.use_materialized_posts = use_materialized_posts
     
     def get_connection(self) -> psycopg.Connection:
         """Get a database connection."""
@@ -147,20 +176,116 @@ class OutlierDetector:
         except Exception as e:
             log.error(f"Failed to release lock: {e}")
     
-    def detect_outliers(self) -> List[ViralOutlier]:
+    @staticmethod
+    def shard_predicate(shard_index: int = 0, shard_count: int = 1) -> str:
+        """
+        Build the SQL predicate that restricts a scan to one account shard.
+        
+        Accounts are assigned to shards by hashing (username, platform), so
+        every post of an account lands in the same shard and the per-account
+        medians stay exact.
+        
+        Args:
+            shard_index: Zero-based shard to select.
+            shard_count: Total number of shards (1 = no sharding).
+            
+        Returns:
+            str: SQL boolean expression (empty string when not sharded).
+        """
+        if shard_count <= 1:
+            return ""
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"shard_index {shard_index} out of range for {shard_count} shards")
+        return (
+            f"AND mod(hashtext(COALESCE(username, '') || '|' || platform) & 2147483647, "
+            f"{int(shard_count)}) = {int(shard_index)}"
+        )
+    
+    def refresh_posts(self, max_age_seconds: Optional[int] = MV_MAX_AGE_SECONDS) -> str:
+        """
+        Bring unified_posts_mv up to date and pick the relation to scan.
+        
+        A failed refresh is logged and the existing (stale) materialized
+        data is used; the plain view is only used when the materialized
+        view is disabled or hasn't been migrated yet.
+        
+        Args:
+            max_age_seconds: Skip the refresh if the last one is newer.
+            
+        Returns:
+            str: 'unified_posts_mv' or 'unified_posts'.
+        """
+        if not self.use_materialized_posts:
+            return UNIFIED_POSTS_VIEW
+        
+        try:
+            with self.get_connection() as conn:
+                if not materialized_view_exists(conn):
+                    log.warning(f"{UNIFIED_POSTS_MV} not found, scanning {UNIFIED_POSTS_VIEW} view")
+                    return UNIFIED_POSTS_VIEW
+                refresh_unified_posts(conn, max_age_seconds)
+        except Exception as e:
+            log.warning(f"Failed to refresh {UNIFIED_POSTS_MV}, using existing data: {e}")
+        
+        return UNIFIED_POSTS_MV
+    
+    def _sketch_account_stats(self, shard_filter: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the account_stats CTE body from persisted quantile sketches.
+        
+        Returns:
+            Tuple of (SQL fragment, query params).
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                stats = AccountSketchStore().load_account_stats(
+                    cur, self.median_window_days, self.min_posts, shard_filter
+                )
+        
+        log.info(f"Loaded sketch medians for {len(stats)} accounts")
+        
+        sql = """
+            SELECT *
+            FROM unnest(
+                %(usernames)s::text[], %(platforms)s::text[],
+                %(median_likes)s::float8[], %(median_comments)s::float8[],
+                %(median_views)s::float8[], %(median_engagement)s::float8[],
+                %(post_counts)s::bigint[]
+            ) AS s(username, platform, median_likes, median_comments,
+                   median_views, median_engagement, post_count)
+            """
+        params = {
+            "usernames": [stat.username for stat in stats],
+            "platforms": [stat.platform for stat in stats],
+            "median_likes": [stat.median_likes for stat in stats],
+            "median_comments": [stat.median_comments for stat in stats],
+            "median_views": [stat.median_views for stat in stats],
+            "median_engagement": [stat.median_engagement for stat in stats],
+            "post_counts": [stat.post_count for stat in stats],
+        }
+        return sql, params
+    
+    def detect_outliers(self, shard_index: int = 0, shard_count: int = 1) -> List[ViralOutlier]:
         """
         Detect viral outliers using the production-ready query.
         
+        Args:
+            shard_index: Zero-based account shard to scan.
+            shard_count: Total number of shards (1 = scan every account).
+        
         Returns:
             List[ViralOutlier]: List of detected outliers.
         """
-        query = f"""
-        -- ============================================================
-        -- ROBUST OUTLIER DETECTION - PRODUCTION READY (v2.0)
-        -- ============================================================
-
-        -- Step 1: Calculate account medians PER METRIC (with safeguards)
-        WITH account_stats AS (
+        shard_filter = self.shard_predicate(shard_index, shard_count)
+        params = None
+        posts_source = self.refresh_posts()
+        
+        if self.use_sketches:
+            # Step 1 from streaming sketches: medians are merged in Python
+            # and passed in as arrays instead of being recomputed from rows
+            account_stats_sql, params = self._sketch_account_stats(shard_filter)
+        else:
+            account_stats_sql = f"""
             SELECT 
                 username,
                 platform,
@@ -186,11 +311,22 @@ class OutlierDetector:
                 ) as median_engagement,
                 
                 COUNT(*) as post_count
-            FROM unified_posts
+            FROM {posts_source}
             WHERE posted_at >= (NOW() AT TIME ZONE 'UTC') - INTERVAL '{self.median_window_days} days'
+              {shard_filter}
             GROUP BY username, platform
             HAVING COUNT(*) >= {self.min_posts}
                AND PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY likes + comments) > 0
+            """
+        
+        query = f"""
+        -- ============================================================
+        -- ROBUST OUTLIER DETECTION - PRODUCTION READY (v2.0)
+        -- ============================================================
+
+        -- Step 1: Calculate account medians PER METRIC (with safeguards)
+        WITH account_stats AS (
+            {account_stats_sql}
         ),
 
         -- Step 2: Calculate post metrics
@@ -210,7 +346,7 @@ class OutlierDetector:
                 ast.median_comments,
                 ast.median_views,
                 ast.median_engagement
-            FROM unified_posts up
+            FROM {posts_source} up
             JOIN account_stats ast ON up.username = ast.username AND up.platform = ast.platform
             WHERE up.posted_at >= (NOW() AT TIME ZONE 'UTC') - INTERVAL '{self.viral_window_days} days'
         ),
@@ -292,7 +428,7 @@ class OutlierDetector:
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(query)
+                    cur.execute(query, params)
                     rows = cur.fetchall()
                     
                     for row in rows:
@@ -316,7 +452,10 @@ class OutlierDetector:
                             views_outlier=row[16],
                         ))
                     
-                    log.info(f"Detected {len(outliers)} viral outliers")
+                    if shard_count > 1:
+                        log.info(f"Detected {len(outliers)} viral outliers in shard {shard_index + 1}/{shard_count}")
+                    else:
+                        log.info(f"Detected {len(outliers)} viral outliers")
         except Exception as e:
             log.error(f"Failed to detect outliers: {e}")
             raise
@@ -327,6 +466,9 @@ class OutlierDetector:
         """
         Insert or update outliers in the database.
         
+        Runs as one set-based statement (see outlier_partitions.upsert_sql)
+        after making sure the daily partitions for the new expiry exist.
+        
         Args:
             outliers: List of detected outliers.
             
@@ -336,55 +478,22 @@ class OutlierDetector:
         if not outliers:
             return {"inserted": 0, "updated": 0}
         
-        upsert_query = f"""
-        INSERT INTO viral_outliers (
-            source_table, source_id, multiplier, median_engagement, actual_engagement,
-            available_count, support_count, hook, platform, username, analyzed_at, expires_at
-        )
-        VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-            NOW() AT TIME ZONE 'UTC',
-            (NOW() AT TIME ZONE 'UTC') + INTERVAL '{self.expiry_days} days'
-        )
-        ON CONFLICT (source_table, source_id) DO UPDATE SET
-            multiplier = EXCLUDED.multiplier,
-            actual_engagement = EXCLUDED.actual_engagement,
-            available_count = EXCLUDED.available_count,
-            support_count = EXCLUDED.support_count,
-            analyzed_at = NOW() AT TIME ZONE 'UTC',
-            expires_at = (NOW() AT TIME ZONE 'UTC') + INTERVAL '{self.expiry_days} days'
-        WHERE viral_outliers.multiplier != EXCLUDED.multiplier
-           OR viral_outliers.actual_engagement != EXCLUDED.actual_engagement
-           OR viral_outliers.support_count != EXCLUDED.support_count;
-        """
-        
-        inserted = 0
-        updated = 0
+        now = datetime.now(timezone.utc)
         
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cur:
-                    for outlier in outliers:
-                        cur.execute(upsert_query, (
-                            outlier.source_table,
-                            outlier.source_id,
-                            outlier.multiplier,
-                            outlier.median_engagement,
-                            outlier.actual_engagement,
-                            outlier.available_count,
-                            outlier.support_count,
-                            outlier.hook,
-                            outlier.platform,
-                            outlier.username,
-                        ))
-                        
-                        # rowcount = 1 for insert, 1 for update, 0 for no change
-                        if cur.rowcount > 0:
-                            # Check if it was an insert or update by querying
-                            inserted += 1  # Simplified - count as insert
+                    if is_partitioned(cur):
+                        today = now.date()
+                        ensure_partitions(
+                            cur, today, today + timedelta(days=self.expiry_days + PARTITION_DAYS_AHEAD)
+                        )
+                    
+                    cur.execute(upsert_sql(), upsert_params(outliers, now, self.expiry_days))
+                    inserted, updated = cur.fetchone()
                     
                     conn.commit()
-                    log.info(f"Upserted {len(outliers)} outliers")
+                    log.info(f"Upserted {len(outliers)} outliers ({inserted} new, {updated} updated)")
         except Exception as e:
             log.error(f"Failed to upsert outliers: {e}")
             raise
@@ -393,26 +502,92 @@ class OutlierDetector:
     
     def cleanup_expired(self) -> int:
         """
-        Remove expired outliers from the database.
+        Remove expired outliers by dropping the daily partitions that
+        have fully expired.
         
         Returns:
-            int: Number of deleted records.
+            int: Number of removed records.
         """
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute("""
-                        DELETE FROM viral_outliers 
-                        WHERE expires_at < (NOW() AT TIME ZONE 'UTC')
-                    """)
-                    deleted = cur.rowcount
+                    dropped, removed = drop_expired_partitions(cur)
                     conn.commit()
-                    log.info(f"Cleaned up {deleted} expired outliers")
-                    return deleted
+                    log.info(f"Cleaned up {removed} expired outliers ({dropped} partitions dropped)")
+                    return removed
         except Exception as e:
             log.error(f"Failed to cleanup expired outliers: {e}")
             raise
     
+    @staticmethod
+    def summarize(outliers: List[ViralOutlier], upsert_result: Dict[str, int]) -> Dict[str, Any]:
+        """Build the scan result dict reported by tasks and the CLI."""
+        return {
+            "status": "success",
+            "outliers_found": len(outliers),
+            "inserted": upsert_result["inserted"],
+            "updated": upsert_result["updated"],
+            "by_multiplier": {
+                "100x": sum(1 for o in outliers if o.multiplier == 100),
+                "50x": sum(1 for o in outliers if o.multiplier == 50),
+                "10x": sum(1 for o in outliers if o.multiplier == 10),
+                "5x": sum(1 for o in outliers if o.multiplier == 5),
+            }
+        }
+    
+    @staticmethod
+    def merge_scan_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge per-shard scan results into a single scan result.
+        
+        Args:
+            results: Result dicts returned by scan_shard().
+            
+        Returns:
+            Dict in the same shape as run_scan(), plus shard bookkeeping.
+        """
+        merged = {
+            "status": "success",
+            "outliers_found": 0,
+            "inserted": 0,
+            "updated": 0,
+            "by_multiplier": {"100x": 0, "50x": 0, "10x": 0, "5x": 0},
+            "shards": len(results),
+            "failed_shards": 0,
+        }
+        
+        for result in results:
+            if not result or result.get("status") != "success":
+                merged["failed_shards"] += 1
+                continue
+            merged["outliers_found"] += result["outliers_found"]
+            merged["inserted"] += result["inserted"]
+            merged["updated"] += result["updated"]
+            for tier, count in result["by_multiplier"].items():
+                merged["by_multiplier"][tier] = merged["by_multiplier"].get(tier, 0) + count
+        
+        if merged["failed_shards"] == len(results):
+            merged["status"] = "failed"
+        elif merged["failed_shards"]:
+            merged["status"] = "partial"
+        
+        return merged
+    
+    def scan_shard(self, shard_index: int, shard_count: int) -> Dict[str, Any]:
+        """
+        Detect and upsert outliers for one account shard.
+        
+        No lock is taken here; the coordinator holds the scan lock for the
+        whole fan-out.
+        
+        Returns:
+            Dict with scan results for this shard.
+        """
+        outliers = self.detect_outliers(shard_index, shard_count)
+        result = self.summarize(outliers, self.upsert_outliers(outliers))
+        result["shard_index"] = shard_index
+        return result
+    
     def run_scan(self) -> Dict[str, Any]:
         """
         Run a complete viral content scan with locking.
@@ -432,18 +607,7 @@ class OutlierDetector:
             # Upsert to database
             result = self.upsert_outliers(outliers)
             
-            return {
-                "status": "success",
-                "outliers_found": len(outliers),
-                "inserted": result["inserted"],
-                "updated": result["updated"],
-                "by_multiplier": {
-                    "100x": sum(1 for o in outliers if o.multiplier == 100),
-                    "50x": sum(1 for o in outliers if o.multiplier == 50),
-                    "10x": sum(1 for o in outliers if o.multiplier == 10),
-                    "5x": sum(1 for o in outliers if o.multiplier == 5),
-                }
-            }
+            return self.summarize(outliers, result)
         finally:
             self.release_lock()
 
@@ -0,0 +1,300 @@
+"""
+Viral Outlier Partitions
+========================
+
+Storage helpers for viral_outliers, which is partitioned by expires_at
+with one partition per UTC day (migration 000005_partition_viral_outliers):
+
+    - upsert_sql(): set-based upsert that moves re-detected rows to a
+      later day with a plain UPDATE (ON CONFLICT can't move rows
+      between partitions)
+    - ensure_partitions(): create the daily partitions new expiries
+      will land in, moving rows that already sit in the default
+      partition for those days
+    - drop_expired_partitions(): expiry by dropping whole days instead
+      of DELETE, so the table and its indexes never bloat
+
+Every helper takes the table (and optional schema) so the benchmark in
+viral/benchmark_outlier_expiry.py runs the same code on scratch tables.
+Helpers fall back to row-level behaviour when the table is not
+partitioned (migration not applied yet).
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import logging
+import os
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from psycopg import sql
+
+log = logging.getLogger(__name__)
+
+OUTLIERS_TABLE = "viral_outliers"
+
+# Extra daily partitions created beyond the expiry window
+PARTITION_DAYS_AHEAD = int(os.environ.get("VIRAL_PARTITION_DAYS_AHEAD", "3"))
+
+_PARTITION_RE = re.compile(r"_p(\d{8})$")
+
+
+def _table(table: str, schema: Optional[str]) -> sql.Identifier:
+    return sql.Identifier(schema, table) if schema else sql.Identifier(table)
+
+
+def partition_name(table: str, day: date) -> str:
+    """Daily partition name, e.g. viral_outliers_p20261018."""
+    return f"{table}_p{day:%Y%m%d}"
+
+
+def partition_day(name: str) -> Optional[date]:
+    """Day covered by a daily partition (None for the default partition)."""
+    match = _PARTITION_RE.search(name)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d").date()
+
+
+def utc_midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def is_partitioned(cur, table: str = OUTLIERS_TABLE, schema: Optional[str] = None) -> bool:
+    """True if the table is a partitioned table."""
+    qualified = f"{schema}.{table}" if schema else table
+    cur.execute(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(%s)",
+        (qualified,),
+    )
+    row = cur.fetchone()
+    return bool(row and row[0])
+
+
+def ensure_partitions(
+    cur,
+    from_day: date,
+    to_day: date,
+    table: str = OUTLIERS_TABLE,
+    schema: Optional[str] = None,
+) -> int:
+    """
+    Create the daily partitions covering from_day..to_day (inclusive).
+
+    Rows that landed in the default partition before their day existed
+    (e.g. an expiry beyond the days the migration pre-created) would make
+    CREATE ... PARTITION OF fail, so they are moved out first and
+    re-inserted into the new partition.
+
+    Returns:
+        int: Number of partitions that did not exist yet.
+    """
+    partitions = list_partitions(cur, table, schema)
+    existing = {name for name, _ in partitions}
+    default = next((name for name, day in partitions if day is None), None)
+    if default and not _default_has_rows(cur, default, from_day, to_day, schema):
+        default = None
+
+    created = 0
+    day = from_day
+    while day <= to_day:
+        name = partition_name(table, day)
+        if name not in existing:
+            moved = _move_out_of_default(cur, default, day, table, schema) if default else 0
+            cur.execute(
+                sql.SQL("CREATE TABLE IF NOT EXISTS {} PARTITION OF {} FOR VALUES FROM ({}) TO ({})").format(
+                    _table(name, schema),
+                    _table(table, schema),
+                    sql.Literal(utc_midnight(day)),
+                    sql.Literal(utc_midnight(day + timedelta(days=1))),
+                )
+            )
+            if default:
+                _restore_moved(cur, table, schema)
+            if moved:
+                log.info("Moved %d outliers from %s to %s", moved, default, name)
+            created += 1
+        day += timedelta(days=1)
+    return created
+
+
+# Rows of one day held while their partition is created
+_MOVING_TABLE = "_viral_outliers_moving"
+
+
+def _default_has_rows(cur, default: str, from_day: date, to_day: date, schema: Optional[str]) -> bool:
+    cur.execute(
+        sql.SQL("SELECT EXISTS (SELECT 1 FROM {} WHERE expires_at >= %s AND expires_at < %s)").format(
+            _table(default, schema)
+        ),
+        (utc_midnight(from_day), utc_midnight(to_day + timedelta(days=1))),
+    )
+    return bool(cur.fetchone()[0])
+
+
+def _move_out_of_default(cur, default: str, day: date, table: str, schema: Optional[str]) -> int:
+    """Move the default partition's rows of `day` into a temp table."""
+    cur.execute(sql.SQL("CREATE TEMP TABLE {} (LIKE {}) ON COMMIT DROP").format(
+        sql.Identifier(_MOVING_TABLE), _table(table, schema),
+    ))
+    cur.execute(
+        sql.SQL("""
+            WITH moved AS (
+                DELETE FROM {} WHERE expires_at >= %s AND expires_at < %s RETURNING *
+            )
+            INSERT INTO {} SELECT * FROM moved
+        """).format(_table(default, schema), sql.Identifier(_MOVING_TABLE)),
+        (utc_midnight(day), utc_midnight(day + timedelta(days=1))),
+    )
+    return cur.rowcount
+
+
+def _restore_moved(cur, table: str, schema: Optional[str]) -> None:
+    """Re-insert the moved rows (they route to the new partition)."""
+    cur.execute(sql.SQL("INSERT INTO {} SELECT * FROM {}").format(
+        _table(table, schema), sql.Identifier(_MOVING_TABLE),
+    ))
+    cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(_MOVING_TABLE)))
+
+
+def list_partitions(
+    cur, table: str = OUTLIERS_TABLE, schema: Optional[str] = None
+) -> List[Tuple[str, Optional[date]]]:
+    """List (partition name, day) for every partition; day is None for DEFAULT."""
+    qualified = f"{schema}.{table}" if schema else table
+    cur.execute("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+        ORDER BY c.relname
+    """, (qualified,))
+    return [(row[0], partition_day(row[0])) for row in cur.fetchall()]
+
+
+def drop_expired_partitions(
+    cur,
+    now: Optional[datetime] = None,
+    table: str = OUTLIERS_TABLE,
+    schema: Optional[str] = None,
+) -> Tuple[int, int]:
+    """
+    Expire outliers by dropping every daily partition whose day has passed.
+
+    Rows in the default partition (and, for a table that isn't
+    partitioned, all rows) are expired with a DELETE. Rows of the
+    current day stay until tomorrow; readers filter on expires_at.
+
+    Returns:
+        Tuple of (partitions dropped, rows removed).
+    """
+    now = now or datetime.now(timezone.utc)
+    target = _table(table, schema)
+
+    if not is_partitioned(cur, table, schema):
+        cur.execute(sql.SQL("DELETE FROM {} WHERE expires_at < %s").format(target), (now,))
+        return 0, cur.rowcount
+
+    dropped = 0
+    removed = 0
+    for name, day in list_partitions(cur, table, schema):
+        if day is None:
+            cur.execute(
+                sql.SQL("DELETE FROM {} WHERE expires_at < %s").format(_table(name, schema)),
+                (now,),
+            )
+            removed += cur.rowcount
+        elif utc_midnight(day + timedelta(days=1)) <= now:
+            cur.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(_table(name, schema)))
+            removed += cur.fetchone()[0]
+            cur.execute(sql.SQL("DROP TABLE {}").format(_table(name, schema)))
+            dropped += 1
+
+    return dropped, removed
+
+
+def upsert_sql(table: str = OUTLIERS_TABLE, schema: Optional[str] = None) -> sql.Composed:
+    """
+    Set-based upsert of a scan's outliers.
+
+    Params: source_tables, source_ids, multipliers, median_engagements,
+    actual_engagements, available_counts, support_counts, hooks,
+    platforms, usernames (parallel arrays), now (timestamptz) and
+    expiry_days. Returns one row: (inserted, updated).
+
+    Live rows are only refreshed when their metrics changed, as before.
+    The insert's NOT EXISTS sees the snapshot taken before the update,
+    so an outlier is either updated or inserted, never both.
+    """
+    return sql.SQL("""
+        WITH incoming AS (
+            SELECT *
+            FROM unnest(
+                %(source_tables)s::text[], %(source_ids)s::int[],
+                %(multipliers)s::int[], %(median_engagements)s::bigint[],
+                %(actual_engagements)s::bigint[], %(available_counts)s::int[],
+                %(support_counts)s::int[], %(hooks)s::text[],
+                %(platforms)s::text[], %(usernames)s::text[]
+            ) AS i(source_table, source_id, multiplier, median_engagement,
+                   actual_engagement, available_count, support_count,
+                   hook, platform, username)
+        ),
+        updated AS (
+            UPDATE {table} vo SET
+                multiplier = i.multiplier,
+                actual_engagement = i.actual_engagement,
+                available_count = i.available_count,
+                support_count = i.support_count,
+                analyzed_at = %(now)s,
+                expires_at = %(now)s + make_interval(days => %(expiry_days)s)
+            FROM incoming i
+            WHERE vo.source_table = i.source_table
+              AND vo.source_id = i.source_id
+              AND vo.expires_at > %(now)s
+              AND (vo.multiplier != i.multiplier
+                   OR vo.actual_engagement != i.actual_engagement
+                   OR vo.support_count != i.support_count)
+            RETURNING vo.id
+        ),
+        inserted AS (
+            INSERT INTO {table} (
+                source_table, source_id, multiplier, median_engagement, actual_engagement,
+                available_count, support_count, hook, platform, username,
+                analyzed_at, expires_at
+            )
+            SELECT
+                i.source_table, i.source_id, i.multiplier, i.median_engagement,
+                i.actual_engagement, i.available_count, i.support_count,
+                i.hook, i.platform, i.username,
+                %(now)s, %(now)s + make_interval(days => %(expiry_days)s)
+            FROM incoming i
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {table} vo
+                WHERE vo.source_table = i.source_table
+                  AND vo.source_id = i.source_id
+                  AND vo.expires_at > %(now)s
+            )
+            RETURNING id
+        )
+        SELECT (SELECT COUNT(*) FROM inserted), (SELECT COUNT(*) FROM updated)
+    """).format(table=_table(table, schema))
+
+
+def upsert_params(outliers, now: datetime, expiry_days: int) -> dict:
+    """Parallel-array params for upsert_sql() from ViralOutlier objects."""
+    return {
+        "source_tables": [o.source_table for o in outliers],
+        "source_ids": [o.source_id for o in outliers],
+        "multipliers": [o.multiplier for o in outliers],
+        "median_engagements": [o.median_engagement for o in outliers],
+        "actual_engagements": [o.actual_engagement for o in outliers],
+        "available_counts": [o.available_count for o in outliers],
+        "support_counts": [o.support_count for o in outliers],
+        "hooks": [o.hook for o in outliers],
+        "platforms": [o.platform for o in outliers],
+        "usernames": [o.username for o in outliers],
+        "now": now,
+        "expiry_days": expiry_days,
+    }
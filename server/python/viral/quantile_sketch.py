@@ -0,0 +1,221 @@
+"""
+Streaming Quantile Sketch
+=========================
+
+Compact, mergeable quantile sketch for per-account engagement metrics.
+
+Uses logarithmically sized buckets (the DDSketch scheme): every value x > 0
+is mapped to bucket ceil(log_gamma(x)) with gamma = (1 + a) / (1 - a), so
+any quantile read back from the sketch is within a relative error of ``a``
+of the exact (PERCENTILE_CONT) quantile. Unlike t-digest/KLL the bound is
+deterministic and buckets are plain counters, which means values can also
+be *removed* - needed when a re-scraped post replaces its old metrics.
+
+Sketches serialize to a few hundred bytes and are stored in BYTEA columns
+(see viral/sketch_store.py).
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import math
+import os
+import struct
+from typing import Dict, Iterable, Optional
+
+# Default relative accuracy (1% → every quantile within ±1% of exact)
+SKETCH_RELATIVE_ACCURACY = float(os.environ.get("VIRAL_SKETCH_ACCURACY", "0.01"))
+
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<Bd")
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Append an unsigned LEB128 varint."""
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(data: bytes, pos: int) -> tuple:
+    """Read an unsigned LEB128 varint. Returns (value, new_pos)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) if value >= 0 else ((-value << 1) - 1)
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch over non-negative values.
+
+    Example:
+        sketch = QuantileSketch()
+        for likes in [10, 12, 250, 9]:
+            sketch.add(likes)
+        sketch.quantile(0.5)       # ≈ 10
+        blob = sketch.to_bytes()   # store in BYTEA
+    """
+
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "_bins", "zero_count", "count")
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def add(self, value: Optional[float], count: int = 1) -> None:
+        """Add a value (None is ignored, negatives are treated as 0)."""
+        if value is None or count <= 0:
+            return
+        if value <= 0:
+            self.zero_count += count
+        else:
+            key = self._key(value)
+            self._bins[key] = self._bins.get(key, 0) + count
+        self.count += count
+
+    def remove(self, value: Optional[float], count: int = 1) -> None:
+        """Remove a previously added value. Unknown values are ignored."""
+        if value is None or count <= 0:
+            return
+        if value <= 0:
+            removed = min(count, self.zero_count)
+            self.zero_count -= removed
+        else:
+            key = self._key(value)
+            current = self._bins.get(key, 0)
+            removed = min(count, current)
+            if current - removed:
+                self._bins[key] = current - removed
+            else:
+                self._bins.pop(key, None)
+        self.count -= removed
+
+    def update(self, values: Iterable[Optional[float]]) -> None:
+        """Add every value from an iterable."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merge another sketch (must use the same relative accuracy)."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other._bins.items():
+            self._bins[key] = self._bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Return the approximate q-quantile, or None for an empty sketch.
+
+        Like PERCENTILE_CONT, the result interpolates linearly between the
+        values at ranks floor(q * (count - 1)) and the next one, so an even
+        count's median is the mean of the two middle values. It is within
+        relative_accuracy of the exact PERCENTILE_CONT value.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return None
+
+        position = q * (self.count - 1)
+        lower = int(position)
+        fraction = position - lower
+        low = self._value_at_rank(lower)
+        if not fraction:
+            return low
+        return low + fraction * (self._value_at_rank(lower + 1) - low)
+
+    def _value_at_rank(self, rank: int) -> float:
+        """Approximate value at 0-based rank of the sorted input."""
+        cumulative = self.zero_count
+        if cumulative > rank:
+            return 0.0
+
+        for key in sorted(self._bins):
+            cumulative += self._bins[key]
+            if cumulative > rank:
+                return self._value(key)
+
+        return self._value(max(self._bins))
+
+    def median(self) -> Optional[float]:
+        """Shortcut for quantile(0.5)."""
+        return self.quantile(0.5)
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact binary form (varint-encoded bucket deltas)."""
+        out = bytearray(_HEADER.pack(_FORMAT_VERSION, self.relative_accuracy))
+        _write_varint(out, self.zero_count)
+        _write_varint(out, len(self._bins))
+        previous = 0
+        for key in sorted(self._bins):
+            _write_varint(out, _zigzag(key - previous))
+            _write_varint(out, self._bins[key])
+            previous = key
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "QuantileSketch":
+        """Deserialize a sketch produced by to_bytes() (None → empty sketch)."""
+        if not data:
+            return cls()
+        data = bytes(data)  # psycopg2 returns memoryview for BYTEA
+        version, relative_accuracy = _HEADER.unpack_from(data, 0)
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported sketch format version: {version}")
+
+        sketch = cls(relative_accuracy)
+        pos = _HEADER.size
+        sketch.zero_count, pos = _read_varint(data, pos)
+        num_bins, pos = _read_varint(data, pos)
+        key = 0
+        total = sketch.zero_count
+        for _ in range(num_bins):
+            delta, pos = _read_varint(data, pos)
+            count, pos = _read_varint(data, pos)
+            key += _unzigzag(delta)
+            sketch._bins[key] = count
+            total += count
+        sketch.count = total
+        return sketch
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return (
+            f"QuantileSketch(count={self.count}, bins={len(self._bins)}, "
+            f"relative_accuracy={self.relative_accuracy})"
+        )
@@ -0,0 +1,341 @@
+"""
+Account Metric Sketch Store
+===========================
+
+Persists per-(username, platform) quantile sketches for likes, comments,
+views and engagement (likes + comments) in the account_metric_sketches
+table, one row per account per posted_at day.
+
+Uploaders call record_changes() as posts are ingested; the viral scan
+merges the day buckets inside its window instead of running
+PERCENTILE_CONT over raw posts. Because day buckets fall out of the
+window naturally, no expiry job is needed, and re-scraped posts are handled
+by removing their previous metrics before adding the new ones. Posts stored
+before the sketches existed are loaded with viral/backfill_sketches.py,
+which rebuilds buckets with replace_bucket().
+
+Works with both psycopg2 and psycopg (v3) cursors.
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .quantile_sketch import QuantileSketch, SKETCH_RELATIVE_ACCURACY
+
+log = logging.getLogger(__name__)
+
+METRICS = ("likes", "comments", "views", "engagement")
+
+# Per-table SQL that extracts metrics the same way the unified_posts view does
+_EXISTING_METRICS_SQL = {
+    "competitor_posts": """
+        SELECT post_id, username, platform, posted_at,
+               COALESCE((engagement->>'likes')::bigint, 0),
+               COALESCE((engagement->>'comments')::bigint, 0),
+               CASE WHEN engagement ? 'views' THEN (engagement->>'views')::bigint END
+        FROM competitor_posts
+        WHERE platform = %s AND post_id = ANY(%s)
+    """,
+    "hashtag_posts": """
+        SELECT post_id, username, platform, posted_at,
+               COALESCE(likes, 0),
+               COALESCE(comments_count, 0),
+               NULL::bigint
+        FROM hashtag_posts
+        WHERE platform = %s AND post_id = ANY(%s)
+    """,
+}
+
+
+class PostMetrics(NamedTuple):
+    """Metrics of one post as they contribute to the account sketches."""
+    username: Optional[str]
+    platform: str
+    posted_at: Optional[datetime]
+    likes: int
+    comments: int
+    views: Optional[int]
+
+
+@dataclass
+class AccountStats:
+    """Approximate per-account medians read from sketches."""
+    username: str
+    platform: str
+    median_likes: float
+    median_comments: float
+    median_views: Optional[float]
+    median_engagement: float
+    post_count: int
+
+
+class AccountSketchStore:
+    """
+    Reads and writes account metric sketches.
+
+    Example:
+        store = AccountSketchStore()
+        store.record_changes(cur, added=[PostMetrics(...)], removed=[])
+        stats = store.load_account_stats(cur, window_days=30, min_posts=5)
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Write path
+    # ─────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def fetch_existing_metrics(
+        cur, source_table: str, platform: str, post_ids: Sequence[str]
+    ) -> Dict[str, PostMetrics]:
+        """
+        Load the currently stored metrics of posts about to be upserted.
+
+        Args:
+            cur: Database cursor.
+            source_table: 'competitor_posts' or 'hashtag_posts'.
+            platform: Platform of the posts.
+            post_ids: Post IDs in the upload batch.
+
+        Returns:
+            Dict of post_id -> PostMetrics for posts that already exist.
+        """
+        if not post_ids:
+            return {}
+        cur.execute(_EXISTING_METRICS_SQL[source_table], (platform, list(post_ids)))
+        return {
+            row[0]: PostMetrics(row[1], row[2], row[3], row[4], row[5], row[6])
+            for row in cur.fetchall()
+        }
+
+    def record_changes(
+        self,
+        cur,
+        added: Iterable[PostMetrics],
+        removed: Iterable[PostMetrics] = (),
+    ) -> bool:
+        """
+        Apply ingested posts to the sketches inside a savepoint.
+
+        A failure here is logged and rolled back to the savepoint so it
+        never discards the posts written earlier in the same transaction.
+
+        Args:
+            cur: Cursor in the uploader's open transaction.
+            added: Metrics of posts as just written.
+            removed: Previous metrics of posts that were overwritten.
+
+        Returns:
+            bool: True if the sketches were updated.
+        """
+        deltas = self._group_by_bucket(added, removed)
+        if not deltas:
+            return True
+
+        cur.execute("SAVEPOINT account_sketches")
+        try:
+            for (username, platform, bucket_date), (adds, removes) in deltas.items():
+                self._apply_bucket(cur, username, platform, bucket_date, adds, removes)
+            cur.execute("RELEASE SAVEPOINT account_sketches")
+            return True
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT account_sketches")
+            log.warning("Failed to update account sketches (non-fatal): %s", e)
+            return False
+
+    @staticmethod
+    def _group_by_bucket(
+        added: Iterable[PostMetrics], removed: Iterable[PostMetrics]
+    ) -> Dict[Tuple[str, str, date], Tuple[List[PostMetrics], List[PostMetrics]]]:
+        """Group post metrics by (username, platform, posted_at day)."""
+        deltas = defaultdict(lambda: ([], []))
+        for index, posts in enumerate((added, removed)):
+            for post in posts:
+                # Posts without an author or date never reach unified_posts
+                if not post.username or post.posted_at is None:
+                    continue
+                bucket = (post.username, post.platform, post.posted_at.date())
+                deltas[bucket][index].append(post)
+        return deltas
+
+    def _apply_bucket(
+        self,
+        cur,
+        username: str,
+        platform: str,
+        bucket_date: date,
+        adds: List[PostMetrics],
+        removes: List[PostMetrics],
+    ) -> None:
+        """Read-modify-write one day bucket under a row lock."""
+        cur.execute("""
+            INSERT INTO account_metric_sketches (username, platform, bucket_date)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (username, platform, bucket_date) DO NOTHING
+        """, (username, platform, bucket_date))
+        cur.execute("""
+            SELECT likes, comments, views, engagement
+            FROM account_metric_sketches
+            WHERE username = %s AND platform = %s AND bucket_date = %s
+            FOR UPDATE
+        """, (username, platform, bucket_date))
+        row = cur.fetchone()
+
+        sketches = {
+            metric: self._load(blob) for metric, blob in zip(METRICS, row)
+        }
+        for post in removes:
+            for metric, value in _metric_values(post):
+                sketches[metric].remove(value)
+        for post in adds:
+            for metric, value in _metric_values(post):
+                sketches[metric].add(value)
+
+        cur.execute("""
+            UPDATE account_metric_sketches
+            SET likes = %s,
+                comments = %s,
+                views = %s,
+                engagement = %s,
+                post_count = %s,
+                updated_at = NOW()
+            WHERE username = %s AND platform = %s AND bucket_date = %s
+        """, (
+            sketches["likes"].to_bytes(),
+            sketches["comments"].to_bytes(),
+            sketches["views"].to_bytes(),
+            sketches["engagement"].to_bytes(),
+            sketches["likes"].count,
+            username,
+            platform,
+            bucket_date,
+        ))
+
+    def replace_bucket(
+        self,
+        cur,
+        username: str,
+        platform: str,
+        bucket_date: date,
+        posts: Iterable[PostMetrics],
+    ) -> int:
+        """
+        Overwrite one day bucket with sketches built from scratch.
+
+        Used by the backfill, which reads every post of the day, so the
+        bucket is rebuilt rather than added to and re-running is safe.
+
+        Returns:
+            int: Posts in the bucket.
+        """
+        sketches = {metric: QuantileSketch(self.relative_accuracy) for metric in METRICS}
+        for post in posts:
+            for metric, value in _metric_values(post):
+                sketches[metric].add(value)
+
+        cur.execute("""
+            INSERT INTO account_metric_sketches
+                (username, platform, bucket_date, likes, comments, views, engagement, post_count)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (username, platform, bucket_date) DO UPDATE SET
+                likes = EXCLUDED.likes,
+                comments = EXCLUDED.comments,
+                views = EXCLUDED.views,
+                engagement = EXCLUDED.engagement,
+                post_count = EXCLUDED.post_count,
+                updated_at = NOW()
+        """, (
+            username,
+            platform,
+            bucket_date,
+            sketches["likes"].to_bytes(),
+            sketches["comments"].to_bytes(),
+            sketches["views"].to_bytes(),
+            sketches["engagement"].to_bytes(),
+            sketches["likes"].count,
+        ))
+        return sketches["likes"].count
+
+    def _load(self, blob: Optional[bytes]) -> QuantileSketch:
+        if blob:
+            return QuantileSketch.from_bytes(blob)
+        return QuantileSketch(self.relative_accuracy)
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Read path
+    # ─────────────────────────────────────────────────────────────────────
+    def load_window(
+        self, cur, window_days: int, account_filter: str = ""
+    ) -> Dict[Tuple[str, str], Dict[str, QuantileSketch]]:
+        """
+        Merge day buckets inside the window into one sketch set per account.
+
+        Args:
+            cur: Database cursor.
+            window_days: Number of days back from today (UTC).
+            account_filter: Extra SQL predicate on username/platform
+                (e.g. OutlierDetector.shard_predicate()).
+
+        Returns:
+            Dict of (username, platform) -> {metric: QuantileSketch}.
+        """
+        cur.execute(f"""
+            SELECT username, platform, likes, comments, views, engagement
+            FROM account_metric_sketches
+            WHERE bucket_date >= ((NOW() AT TIME ZONE 'UTC') - INTERVAL '{int(window_days)} days')::date
+              {account_filter}
+        """)
+
+        accounts: Dict[Tuple[str, str], Dict[str, QuantileSketch]] = {}
+        for row in cur.fetchall():
+            merged = accounts.get((row[0], row[1]))
+            if merged is None:
+                merged = {metric: QuantileSketch(self.relative_accuracy) for metric in METRICS}
+                accounts[(row[0], row[1])] = merged
+            for metric, blob in zip(METRICS, row[2:]):
+                if blob:
+                    merged[metric].merge(QuantileSketch.from_bytes(blob))
+        return accounts
+
+    def load_account_stats(
+        self, cur, window_days: int, min_posts: int, account_filter: str = ""
+    ) -> List[AccountStats]:
+        """
+        Per-account medians for the viral scan.
+
+        Applies the same eligibility rules as the exact query: at least
+        min_posts posts and a positive median engagement.
+        """
+        stats = []
+        for (username, platform), sketches in self.load_window(cur, window_days, account_filter).items():
+            post_count = sketches["likes"].count
+            median_engagement = sketches["engagement"].median()
+            if post_count < min_posts or not median_engagement:
+                continue
+            stats.append(AccountStats(
+                username=username,
+                platform=platform,
+                median_likes=sketches["likes"].median(),
+                median_comments=sketches["comments"].median(),
+                median_views=sketches["views"].median(),
+                median_engagement=median_engagement,
+                post_count=post_count,
+            ))
+        return stats
+
+
+def _metric_values(post: PostMetrics):
+    """Yield (metric, value) pairs contributed by one post."""
+    likes = post.likes or 0
+    comments = post.comments or 0
+    yield "likes", likes
+    yield "comments", comments
+    yield "views", post.views
+    yield "engagement", likes + comments
@@ -6,16 +6,29 @@ Celery tasks for viral content scanning and cleanup.
 
 Tasks:
     - scan_viral_content: Run every 15 minutes to detect outliers
+    - scan_viral_shard: Scan one account shard (fan-out from scan_viral_content)
+    - merge_viral_shards: Chord callback that merges shard results
     - cleanup_expired_outliers: Run daily to remove expired records
+    - refresh_unified_posts: Refresh unified_posts_mv after ingest batches
+
+Sharded mode:
+    Set VIRAL_SCAN_SHARDS (or pass shard_count) to a value > 1 and
+    scan_viral_content becomes a coordinator: it takes the scan lock, fans
+    the accounts out as a Celery group of K shard tasks and merges their
+    results in a chord callback, which releases the lock. Chords need a
+    result backend that supports them (e.g. Redis).
 
 Author: ProjectMonopoly Team
 Created: 2026-01-01
 """
 
 import logging
-from celery import shared_task
+from typing import Any, Dict, List, Optional
+
+from celery import shared_task, chord, group
 
-from .outlier_detector import OutlierDetector
+from .materialized_posts import refresh_unified_posts as refresh_materialized_posts
+from .outlier_detector import OutlierDetector, SCAN_SHARDS
 
 log = logging.getLogger(__name__)
 
@@ -28,7 +41,7 @@ log = logging.getLogger(__name__)
     soft_time_limit=600,  # 10 minutes
     time_limit=900,  # 15 minutes hard limit
 )
-def scan_viral_content(self):
+def scan_viral_content(self, shard_count: Optional[int] = None):
     """
     Scan for viral content outliers.
     
@@ -38,11 +51,21 @@ def scan_viral_content(self):
     3. Upserts results to the viral_outliers table
     4. Releases the lock
     
+    With shard_count > 1 the task only coordinates: steps 2-3 run in
+    parallel shard tasks and merge_viral_shards releases the lock.
+    
     Scheduled to run every 15 minutes via Celery Beat.
     
+    Args:
+        shard_count: Number of account shards (default: VIRAL_SCAN_SHARDS).
+    
     Returns:
         dict: Scan results including outlier counts and status.
     """
+    shard_count = shard_count or SCAN_SHARDS
+    if shard_count > 1:
+        return _dispatch_sharded_scan(shard_count)
+    
     log.info("Starting viral content scan")
     
     try:
@@ -52,13 +75,7 @@ def scan_viral_content(self):
         if result["status"] == "skipped":
             log.info(f"Viral scan skipped: {result['reason']}")
         else:
-            log.info(
-                f"Viral scan complete: found {result['outliers_found']} outliers "
-                f"(100x: {result['by_multiplier']['100x']}, "
-                f"50x: {result['by_multiplier']['50x']}, "
-                f"10x: {result['by_multiplier']['10x']}, "
-                f"5x: {result['by_multiplier']['5x']})"
-            )
+            _log_scan_result("Viral scan complete", result)
         
         return result
         
@@ -67,6 +84,98 @@ def scan_viral_content(self):
         raise self.retry(exc=e)
 
 
+def _log_scan_result(prefix: str, result: Dict[str, Any]) -> None:
+    """Log an outlier summary in the standard format."""
+    log.info(
+        f"{prefix}: found {result['outliers_found']} outliers "
+        f"(100x: {result['by_multiplier']['100x']}, "
+        f"50x: {result['by_multiplier']['50x']}, "
+        f"10x: {result['by_multiplier']['10x']}, "
+        f"5x: {result['by_multiplier']['5x']})"
+    )
+
+
+def _dispatch_sharded_scan(shard_count: int) -> Dict[str, Any]:
+    """
+    Take the scan lock and fan the scan out as a chord of shard tasks.
+    
+    Returns:
+        dict: Dispatch status with the chord id, or skip reason.
+    """
+    detector = OutlierDetector()
+    if not detector.acquire_lock():
+        log.info("Viral scanner already running, skipping")
+        return {"status": "skipped", "reason": "already_running"}
+    
+    try:
+        # Refresh once here so shards don't race to refresh the same view
+        detector.refresh_posts()
+        header = group(
+            scan_viral_shard.s(shard_index, shard_count)
+            for shard_index in range(shard_count)
+        )
+        callback = merge_viral_shards.s().on_error(release_viral_scan_lock.si())
+        async_result = chord(header)(callback)
+    except Exception:
+        detector.release_lock()
+        raise
+    
+    log.info(f"Dispatched sharded viral scan across {shard_count} shards")
+    return {"status": "dispatched", "shards": shard_count, "chord_id": async_result.id}
+
+
+@shared_task(
+    name="viral.tasks.scan_viral_shard",
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    soft_time_limit=600,  # 10 minutes
+    time_limit=900,  # 15 minutes hard limit
+)
+def scan_viral_shard(self, shard_index: int, shard_count: int):
+    """
+    Detect and upsert outliers for one (username, platform) hash shard.
+    
+    Args:
+        shard_index: Zero-based shard to scan.
+        shard_count: Total number of shards.
+    
+    Returns:
+        dict: Shard scan results (same shape as a full scan).
+    """
+    log.info(f"Starting viral shard scan {shard_index + 1}/{shard_count}")
+    
+    try:
+        detector = OutlierDetector()
+        return detector.scan_shard(shard_index, shard_count)
+    except Exception as e:
+        log.error(f"Viral shard {shard_index + 1}/{shard_count} failed: {e}")
+        raise self.retry(exc=e)
+
+
+@shared_task(name="viral.tasks.merge_viral_shards")
+def merge_viral_shards(results: List[Dict[str, Any]]):
+    """
+    Chord callback: merge shard results and release the scan lock.
+    
+    Returns:
+        dict: Merged scan results.
+    """
+    try:
+        result = OutlierDetector.merge_scan_results(results)
+        _log_scan_result(f"Sharded viral scan complete ({result['shards']} shards)", result)
+        return result
+    finally:
+        OutlierDetector().release_lock()
+
+
+@shared_task(name="viral.tasks.release_viral_scan_lock")
+def release_viral_scan_lock(*args):
+    """Error callback for sharded scans so a failed chord doesn't hold the lock."""
+    log.warning("Sharded viral scan failed, releasing scan lock")
+    OutlierDetector().release_lock()
+
+
 @shared_task(
     name="viral.tasks.cleanup_expired_outliers",
     bind=True,
@@ -77,6 +186,7 @@ def cleanup_expired_outliers(self):
     """
     Remove expired viral outliers from the database.
     
+    Drops the daily viral_outliers partitions that have fully expired.
     Scheduled to run daily at 3 AM UTC via Celery Beat.
     
     Returns:
@@ -95,3 +205,30 @@ def cleanup_expired_outliers(self):
     except Exception as e:
         log.error(f"Outlier cleanup failed: {e}")
         raise self.retry(exc=e)
+
+
+@shared_task(
+    name="viral.tasks.refresh_unified_posts",
+    bind=True,
+    max_retries=2,
+    default_retry_delay=60,
+    soft_time_limit=600,  # 10 minutes
+)
+def refresh_unified_posts(self):
+    """
+    Refresh unified_posts_mv after an ingest batch.
+    
+    Skips when another refresh is already running; the next scan
+    refreshes again if the view has gone stale by then.
+    
+    Returns:
+        dict: Refresh status and duration.
+    """
+    try:
+        with OutlierDetector().get_connection() as conn:
+            result = refresh_materialized_posts(conn)
+        log.info(f"unified_posts_mv refresh: {result}")
+        return result
+    except Exception as e:
+        log.error(f"unified_posts_mv refresh failed: {e}")
+        raise self.retry(exc=e)
@@ -0,0 +1,106 @@
+"""
+Account Sketch Backfill Tests
+=============================
+
+Tests for rebuilding account_metric_sketches from stored posts in
+viral/backfill_sketches.py (no database).
+
+Run with:
+    python -m pytest viral/test_backfill_sketches.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+from datetime import date
+
+import pytest
+
+from viral.backfill_sketches import backfill_sketches
+from viral.quantile_sketch import QuantileSketch
+
+
+class FakeCursor:
+    def __init__(self, conn, rows=()):
+        self.conn = conn
+        self.rows = list(rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def execute(self, query, params=None):
+        self.conn.statements.append((query, params))
+
+
+class FakeConnection:
+    """Streams `rows` from the named cursor, records the writes."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self, name=None, withhold=False):
+        assert withhold or not name, "batch commits would close the server-side cursor"
+        return FakeCursor(self, self.rows if name else ())
+
+    def commit(self):
+        self.commits += 1
+
+
+ROWS = [
+    ("alice", "instagram", date(2026, 10, 1), 100, 10, None),
+    ("alice", "instagram", date(2026, 10, 1), 300, 30, None),
+    ("alice", "instagram", date(2026, 10, 2), 200, 20, None),
+    ("bob", "tiktok", date(2026, 10, 1), 50, 5, 900),
+]
+
+
+def written_buckets(conn):
+    return [params for query, params in conn.statements if "INSERT INTO account_metric_sketches" in query]
+
+
+def test_rebuilds_one_bucket_per_account_day():
+    conn = FakeConnection(ROWS)
+
+    result = backfill_sketches(conn, batch_size=2)
+
+    assert result == {"buckets": 3, "posts": 4, "accounts": 2}
+    buckets = written_buckets(conn)
+    assert [b[:3] for b in buckets] == [
+        ("alice", "instagram", date(2026, 10, 1)),
+        ("alice", "instagram", date(2026, 10, 2)),
+        ("bob", "tiktok", date(2026, 10, 1)),
+    ]
+    likes = QuantileSketch.from_bytes(buckets[0][3])
+    assert likes.count == 2 and buckets[0][7] == 2
+    assert likes.median() == pytest.approx(200, rel=0.02)
+    # Engagement is likes + comments; views only where the post has them
+    assert QuantileSketch.from_bytes(buckets[0][6]).quantile(1.0) == pytest.approx(330, rel=0.02)
+    assert QuantileSketch.from_bytes(buckets[0][5]).count == 0
+    assert QuantileSketch.from_bytes(buckets[2][5]).count == 1
+    # One commit per batch of two buckets, plus the final one
+    assert conn.commits == 2
+
+
+def test_buckets_are_replaced_not_added_to():
+    conn = FakeConnection(ROWS[:1])
+    backfill_sketches(conn)
+    query = conn.statements[-1][0]
+    assert "likes = EXCLUDED.likes" in query and "post_count = EXCLUDED.post_count" in query
+
+
+def test_since_is_passed_to_the_posts_query():
+    conn = FakeConnection([])
+    assert backfill_sketches(conn, since=None) == {"buckets": 0, "posts": 0, "accounts": 0}
+    assert conn.statements[0][1] == {"since": None}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
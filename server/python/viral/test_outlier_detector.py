@@ -13,6 +13,7 @@ Created: 2026-01-01
 
 import pytest
 from unittest.mock import MagicMock, patch
+from viral.materialized_posts import refresh_unified_posts
 from viral.outlier_detector import OutlierDetector, ViralOutlier
 
 
@@ -218,5 +219,113 @@ class TestConfigurationFromEnv:
         assert detector.expiry_days == 14
 
 
+class TestSharding:
+    """Tests for sharded scan helpers."""
+    
+    def test_unsharded_predicate_is_empty(self):
+        """A single shard must not add any filter to the query."""
+        assert OutlierDetector.shard_predicate(0, 1) == ""
+    
+    def test_sharded_predicate_hashes_account(self):
+        """Shards are selected by hashing (username, platform)."""
+        predicate = OutlierDetector.shard_predicate(2, 4)
+        assert "hashtext" in predicate
+        assert "platform" in predicate
+        assert predicate.endswith("4) = 2")
+    
+    def test_shard_index_out_of_range(self):
+        """Shard index must be within [0, shard_count)."""
+        with pytest.raises(ValueError):
+            OutlierDetector.shard_predicate(4, 4)
+    
+    def test_merge_scan_results(self):
+        """Shard results are summed into one scan result."""
+        shard_a = {
+            "status": "success", "outliers_found": 3, "inserted": 2, "updated": 0,
+            "by_multiplier": {"100x": 1, "50x": 0, "10x": 1, "5x": 1},
+        }
+        shard_b = {
+            "status": "success", "outliers_found": 2, "inserted": 1, "updated": 0,
+            "by_multiplier": {"100x": 0, "50x": 1, "10x": 0, "5x": 1},
+        }
+        
+        merged = OutlierDetector.merge_scan_results([shard_a, shard_b])
+        
+        assert merged["status"] == "success"
+        assert merged["shards"] == 2
+        assert merged["outliers_found"] == 5
+        assert merged["inserted"] == 3
+        assert merged["by_multiplier"] == {"100x": 1, "50x": 1, "10x": 1, "5x": 2}
+    
+    def test_merge_reports_partial_failure(self):
+        """A failed shard marks the merged scan as partial."""
+        ok = {
+            "status": "success", "outliers_found": 1, "inserted": 1, "updated": 0,
+            "by_multiplier": {"100x": 0, "50x": 0, "10x": 0, "5x": 1},
+        }
+        
+        merged = OutlierDetector.merge_scan_results([ok, None])
+        
+        assert merged["status"] == "partial"
+        assert merged["failed_shards"] == 1
+        assert merged["outliers_found"] == 1
+
+
+class TestMaterializedPosts:
+    """Tests for reading and refreshing unified_posts_mv."""
+    
+    @staticmethod
+    def make_conn(fetchone_results):
+        """MagicMock connection whose cursor returns the given rows in order."""
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchone.side_effect = fetchone_results
+        return conn, cur
+    
+    def test_disabled_uses_view(self):
+        """Without the materialized view the plain view is scanned."""
+        detector = OutlierDetector(use_materialized_posts=False)
+        assert detector.refresh_posts() == "unified_posts"
+    
+    def test_missing_view_falls_back(self):
+        """Before the migration runs the scan keeps using the view."""
+        conn, _ = self.make_conn([(False,)])
+        detector = OutlierDetector(use_materialized_posts=True)
+        
+        with patch.object(detector, "get_connection") as get_connection:
+            get_connection.return_value.__enter__.return_value = conn
+            assert detector.refresh_posts() == "unified_posts"
+    
+    def test_refresh_skips_when_locked(self):
+        """A refresh already in progress is not queued behind."""
+        conn, cur = self.make_conn([(False,)])
+        
+        result = refresh_unified_posts(conn)
+        
+        assert result == {"status": "skipped", "reason": "refresh_in_progress"}
+        assert not any("REFRESH" in str(c.args[0]) for c in cur.execute.call_args_list)
+    
+    def test_refresh_skips_when_fresh(self):
+        """A recent refresh satisfies max_age_seconds."""
+        conn, _ = self.make_conn([(True,), (120.0,)])
+        
+        result = refresh_unified_posts(conn, max_age_seconds=900)
+        
+        assert result["status"] == "skipped"
+        assert result["reason"] == "fresh"
+    
+    def test_refresh_runs_concurrently(self):
+        """Stale views are refreshed CONCURRENTLY and the time recorded."""
+        conn, cur = self.make_conn([(True,), (3600.0,)])
+        
+        result = refresh_unified_posts(conn, max_age_seconds=900)
+        
+        statements = [str(c.args[0]) for c in cur.execute.call_args_list]
+        assert result["status"] == "success"
+        assert any("REFRESH MATERIALIZED VIEW CONCURRENTLY unified_posts_mv" in s for s in statements)
+        assert any("materialized_view_refreshes" in s and "INSERT" in s for s in statements)
+        conn.commit.assert_called_once()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,146 @@
+"""
+Viral Outlier Partition Tests
+=============================
+
+Tests for the day-partitioned viral_outliers helpers.
+
+Run with:
+    python -m pytest viral/test_outlier_partitions.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+from datetime import date, datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from viral.outlier_detector import ViralOutlier
+from viral.outlier_partitions import (
+    drop_expired_partitions,
+    ensure_partitions,
+    partition_day,
+    partition_name,
+    upsert_params,
+    upsert_sql,
+)
+
+
+def make_cursor(relnames, partitioned=True, counts=()):
+    """MagicMock cursor answering is_partitioned / list_partitions / COUNT(*)."""
+    cur = MagicMock()
+    cur.fetchone.side_effect = [(partitioned,)] + [(c,) for c in counts]
+    cur.fetchall.return_value = [(name,) for name in relnames]
+    cur.rowcount = 0
+    return cur
+
+
+def executed(cur):
+    return [c.args[0] for c in cur.execute.call_args_list]
+
+
+class TestPartitionNames:
+    def test_roundtrip(self):
+        day = date(2026, 10, 18)
+        assert partition_name("viral_outliers", day) == "viral_outliers_p20261018"
+        assert partition_day("viral_outliers_p20261018") == day
+
+    def test_default_partition_has_no_day(self):
+        assert partition_day("viral_outliers_default") is None
+
+
+class TestDropExpiredPartitions:
+    def test_drops_only_fully_expired_days(self):
+        """Yesterday's partition goes, today's stays until tomorrow."""
+        cur = make_cursor(
+            ["viral_outliers_default", "viral_outliers_p20261016",
+             "viral_outliers_p20261017", "viral_outliers_p20261018"],
+            counts=[40, 25],
+        )
+        now = datetime(2026, 10, 18, 3, 0, tzinfo=timezone.utc)
+
+        dropped, removed = drop_expired_partitions(cur, now)
+
+        statements = [repr(s) for s in executed(cur)]
+        drops = [s for s in statements if "DROP TABLE" in s]
+        assert dropped == 2
+        assert removed == 65
+        assert any("viral_outliers_p20261016" in s for s in drops)
+        assert any("viral_outliers_p20261017" in s for s in drops)
+        assert not any("viral_outliers_p20261018" in s for s in drops)
+
+    def test_unpartitioned_table_falls_back_to_delete(self):
+        cur = make_cursor([], partitioned=False)
+        cur.rowcount = 7
+
+        dropped, removed = drop_expired_partitions(cur, datetime(2026, 10, 18, tzinfo=timezone.utc))
+
+        assert (dropped, removed) == (0, 7)
+        assert "DELETE FROM" in repr(executed(cur)[-1])
+
+
+class TestEnsurePartitions:
+    def test_creates_missing_days_only(self):
+        cur = make_cursor(["viral_outliers_p20261018"])
+
+        created = ensure_partitions(cur, date(2026, 10, 18), date(2026, 10, 20))
+
+        creates = [repr(s) for s in executed(cur) if "PARTITION OF" in repr(s)]
+        assert created == 2
+        assert any("viral_outliers_p20261019" in s for s in creates)
+        assert any("viral_outliers_p20261020" in s for s in creates)
+        assert not any("_viral_outliers_moving" in repr(s) for s in executed(cur))
+
+    def test_moves_default_rows_before_creating_their_day(self):
+        """Expiries past the pre-created days sit in the default partition."""
+        cur = make_cursor(["viral_outliers_default", "viral_outliers_p20261018"])
+        cur.fetchone.side_effect = [(True,)]
+        cur.rowcount = 3
+
+        created = ensure_partitions(cur, date(2026, 10, 18), date(2026, 10, 19))
+
+        statements = [repr(s) for s in executed(cur)]
+        create = next(i for i, s in enumerate(statements) if "viral_outliers_p20261019" in s)
+        moved = next(i for i, s in enumerate(statements) if "DELETE FROM" in s)
+        restored = next(i for i, s in enumerate(statements) if "SELECT * FROM" in s and "DELETE" not in s)
+        assert created == 1
+        assert "viral_outliers_default" in statements[moved]
+        assert moved < create < restored
+
+    def test_empty_default_is_left_alone(self):
+        cur = make_cursor(["viral_outliers_default"])
+        cur.fetchone.side_effect = [(False,)]
+
+        ensure_partitions(cur, date(2026, 10, 18), date(2026, 10, 19))
+
+        assert not any("DELETE FROM" in repr(s) for s in executed(cur))
+
+
+class TestUpsert:
+    def test_params_are_parallel_arrays(self):
+        outlier = ViralOutlier(
+            source_table="hashtag_posts", source_id=9, username="u", platform="tiktok",
+            content="c", hook="h", multiplier=10, median_engagement=100,
+            actual_engagement=1200, available_count=2, support_count=2,
+            likes=1000, comments=200, views=None,
+            likes_outlier=True, comments_outlier=True, views_outlier=False,
+        )
+        now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+        params = upsert_params([outlier, outlier], now, 7)
+
+        assert params["source_ids"] == [9, 9]
+        assert params["multipliers"] == [10, 10]
+        assert params["now"] == now
+        assert params["expiry_days"] == 7
+
+    def test_sql_updates_with_row_movement_instead_of_on_conflict(self):
+        text = repr(upsert_sql())
+        assert "ON CONFLICT" not in text
+        assert "NOT EXISTS" in text
+        assert "viral_outliers" in text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
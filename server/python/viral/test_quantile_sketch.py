@@ -0,0 +1,212 @@
+"""
+Quantile Sketch Tests
+=====================
+
+Tests for the streaming quantile sketches used for per-account medians.
+The error bound is verified against exact PERCENTILE_CONT quantiles.
+
+Run with:
+    python -m pytest viral/test_quantile_sketch.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import random
+import statistics
+from datetime import datetime
+
+import pytest
+
+from viral.quantile_sketch import QuantileSketch
+from viral.sketch_store import AccountSketchStore, PostMetrics
+
+
+def exact_quantile(values, q):
+    """Exact quantile with Postgres PERCENTILE_CONT semantics."""
+    if q == 0.5:
+        return statistics.median(values)
+    # method="inclusive" interpolates at q * (n - 1), as PERCENTILE_CONT does
+    return statistics.quantiles(values, n=100, method="inclusive")[round(q * 100) - 1]
+
+
+def engagement_sample(n, seed=42):
+    """Heavy-tailed, integer engagement counts with some zeros."""
+    rng = random.Random(seed)
+    return [0 if rng.random() < 0.05 else int(rng.lognormvariate(5, 2)) for _ in range(n)]
+
+
+class TestErrorBound:
+    """The sketch must stay within its configured relative error."""
+
+    @pytest.mark.parametrize("accuracy", [0.005, 0.01, 0.05])
+    @pytest.mark.parametrize("q", [0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+    def test_quantiles_within_bound(self, accuracy, q):
+        """Every quantile is within relative_accuracy of the exact value."""
+        values = engagement_sample(5000)
+        sketch = QuantileSketch(accuracy)
+        sketch.update(values)
+
+        exact = exact_quantile(values, q)
+        approx = sketch.quantile(q)
+
+        assert abs(approx - exact) <= accuracy * exact
+
+    def test_median_of_small_account(self):
+        """Typical small account with a handful of posts."""
+        values = [120, 95, 4000, 110, 130, 101, 99]
+        sketch = QuantileSketch(0.01)
+        sketch.update(values)
+
+        assert sketch.median() == pytest.approx(exact_quantile(values, 0.5), rel=0.01)
+
+    def test_median_of_even_count_interpolates(self):
+        """An even count's median is the mean of the two middle values."""
+        values = [90, 95, 100, 10000, 12000, 15000]
+        sketch = QuantileSketch(0.01)
+        sketch.update(values)
+
+        assert sketch.median() == pytest.approx(statistics.median(values), rel=0.01)
+        assert sketch.median() == pytest.approx(5050, rel=0.01)
+
+    def test_extreme_quantiles_are_min_and_max(self):
+        values = [3, 40, 500]
+        sketch = QuantileSketch(0.01)
+        sketch.update(values)
+
+        assert sketch.quantile(0) == pytest.approx(3, rel=0.01)
+        assert sketch.quantile(1) == pytest.approx(500, rel=0.01)
+
+    def test_all_zero_values(self):
+        """Zeros are tracked exactly."""
+        sketch = QuantileSketch()
+        sketch.update([0, 0, 0])
+
+        assert sketch.median() == 0.0
+
+
+class TestSketchOperations:
+    """Tests for add/remove/merge/serialization."""
+
+    def test_empty_sketch(self):
+        sketch = QuantileSketch()
+        assert sketch.count == 0
+        assert sketch.median() is None
+
+    def test_none_is_ignored(self):
+        """Missing metrics (e.g. Instagram views) don't count."""
+        sketch = QuantileSketch()
+        sketch.update([None, 10, None])
+        assert sketch.count == 1
+
+    def test_remove_restores_previous_state(self):
+        """Removing an updated post's old value keeps the sketch exact in bucket space."""
+        base = engagement_sample(200)
+        sketch = QuantileSketch()
+        sketch.update(base)
+        before = sketch.to_bytes()
+
+        sketch.add(123456)
+        sketch.remove(123456)
+
+        assert sketch.to_bytes() == before
+        assert sketch.count == len(base)
+
+    def test_merge_equals_combined(self):
+        """Merging two sketches equals sketching the combined data."""
+        a_values = engagement_sample(1000, seed=1)
+        b_values = engagement_sample(1000, seed=2)
+
+        a = QuantileSketch()
+        a.update(a_values)
+        b = QuantileSketch()
+        b.update(b_values)
+        a.merge(b)
+
+        combined = QuantileSketch()
+        combined.update(a_values + b_values)
+
+        assert a.to_bytes() == combined.to_bytes()
+
+    def test_merge_rejects_different_accuracy(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+    def test_serialization_roundtrip(self):
+        values = engagement_sample(3000)
+        sketch = QuantileSketch()
+        sketch.update(values)
+
+        restored = QuantileSketch.from_bytes(memoryview(sketch.to_bytes()))
+
+        assert restored.count == sketch.count
+        for q in (0.1, 0.5, 0.9):
+            assert restored.quantile(q) == sketch.quantile(q)
+
+    def test_serialized_size_is_compact(self):
+        """Thousands of posts fit in well under a kilobyte."""
+        sketch = QuantileSketch(0.01)
+        sketch.update(engagement_sample(10000))
+        assert len(sketch.to_bytes()) < 2048
+
+
+class FakeCursor:
+    """Minimal cursor returning canned rows for the read path."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def execute(self, query, params=None):
+        self.queries.append((query, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+class TestSketchStore:
+    """Tests for AccountSketchStore."""
+
+    def test_group_by_bucket_skips_undated_posts(self):
+        posted = datetime(2026, 10, 1, 12, 0)
+        added = [
+            PostMetrics("alice", "instagram", posted, 10, 1, None),
+            PostMetrics("alice", "instagram", None, 10, 1, None),
+            PostMetrics(None, "instagram", posted, 10, 1, None),
+        ]
+        removed = [PostMetrics("alice", "instagram", posted, 5, 0, None)]
+
+        deltas = AccountSketchStore._group_by_bucket(added, removed)
+
+        assert list(deltas) == [("alice", "instagram", posted.date())]
+        adds, removes = deltas[("alice", "instagram", posted.date())]
+        assert len(adds) == 1
+        assert len(removes) == 1
+
+    def test_load_account_stats_merges_days(self):
+        """Day buckets are merged per account and eligibility rules apply."""
+        day_one = QuantileSketch()
+        day_one.update([100, 120, 140])
+        day_two = QuantileSketch()
+        day_two.update([110, 130])
+        sparse = QuantileSketch()
+        sparse.update([500])
+
+        empty = QuantileSketch().to_bytes()
+        rows = [
+            ("alice", "instagram", day_one.to_bytes(), day_one.to_bytes(), None, day_one.to_bytes()),
+            ("alice", "instagram", day_two.to_bytes(), day_two.to_bytes(), None, day_two.to_bytes()),
+            ("bob", "tiktok", sparse.to_bytes(), empty, None, sparse.to_bytes()),
+        ]
+
+        stats = AccountSketchStore().load_account_stats(FakeCursor(rows), window_days=30, min_posts=5)
+
+        assert len(stats) == 1
+        assert stats[0].username == "alice"
+        assert stats[0].post_count == 5
+        assert stats[0].median_likes == pytest.approx(120, rel=0.01)
+        assert stats[0].median_views is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -97,6 +97,8 @@ app.conf.update(
 # ─────────────────────────────────────────────────────────────────────────────
 from celery.schedules import crontab
 
+from .config import COMPETITOR_ANALYTICS_INTERVAL, HASHTAG_FRONTIER_RESUME_INTERVAL
+
 app.conf.beat_schedule = {
     # Viral content scan - runs every hour
     'viral-content-scan': {
@@ -109,6 +111,31 @@ app.conf.beat_schedule = {
         'task': 'viral.tasks.cleanup_expired_outliers',
         'schedule': crontab(hour=3, minute=0),  # Daily at 3 AM UTC
     },
+
+    # Post partitions: create upcoming months, archive expired ones - daily at 4 AM UTC
+    'maintain-post-partitions': {
+        'task': 'worker.tasks.maintain_post_partitions',
+        'schedule': crontab(hour=4, minute=0),
+    },
+
+    # Competitor analytics for profiles queued by uploads - every 15 minutes by default
+    'recompute-competitor-analytics': {
+        'task': 'worker.tasks.recompute_competitor_analytics',
+        'schedule': 60.0 * COMPETITOR_ANALYTICS_INTERVAL,
+    },
+
+    # Full competitor analytics pass (growth rates move daily) - daily at 5 AM UTC
+    'recompute-all-competitor-analytics': {
+        'task': 'worker.tasks.recompute_competitor_analytics',
+        'schedule': crontab(hour=5, minute=0),
+        'kwargs': {'full': True},
+    },
+
+    # Hashtag frontier: release lost claims, restart stalled discovery - every 15 minutes by default
+    'resume-hashtag-frontier': {
+        'task': 'worker.tasks.resume_hashtag_frontier',
+        'schedule': 60.0 * HASHTAG_FRONTIER_RESUME_INTERVAL,
+    },
 }
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,173 @@
+"""
+Competitor Analytics
+====================
+
+Set-based recomputation of competitor_profiles.engagement_rate,
+posting_frequency and growth_rate.
+
+The uploaders used to compute these in Python for one competitor at a
+time, with extra competitor_snapshots queries, inside the ingest
+transaction. They now only upsert a dirty flag into
+competitor_analytics_queue (migration 000006_competitor_analytics_queue)
+and this job recomputes every queued profile in one statement:
+
+    - engagement rate: mean total_engagement of the profile's latest
+      COMPETITOR_ANALYTICS_POST_WINDOW posts (ROW_NUMBER window) as a
+      percentage of followers; TikTok profiles without a follower count
+      keep the old scaled raw score
+    - posting frequency: posts per week over the same window
+    - growth rate: followers against the latest snapshot before today
+      (DISTINCT ON per competitor)
+
+Today's competitor_snapshots row gets the new engagement rate. Consumed
+queue rows are deleted in the same statement, so a profile re-queued by
+an upload that commits later is picked up by the next run.
+
+Usage:
+    from worker.competitor_analytics import recompute_competitor_analytics
+    with psycopg.connect(DATABASE_URL) as conn:
+        result = recompute_competitor_analytics(conn)
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import logging
+from typing import Any, Dict
+
+from .config import COMPETITOR_ANALYTICS_POST_WINDOW
+
+log = logging.getLogger(__name__)
+
+# competitor_profiles / competitor_snapshots rates are NUMERIC(5,2); one
+# outlier must not abort the whole batch with a numeric overflow
+RATE_LIMIT = 999.99
+
+# Profiles whose flag was set by an upload
+_QUEUED_TARGETS = """
+    dirty AS (
+        DELETE FROM competitor_analytics_queue
+        RETURNING profile_id
+    ),
+"""
+
+# Every profile (nightly full pass); the queue is cleared as well
+_ALL_TARGETS = """
+    cleared AS (
+        DELETE FROM competitor_analytics_queue
+    ),
+    dirty AS (
+        SELECT id AS profile_id FROM competitor_profiles
+    ),
+"""
+
+
+def recompute_sql(full: bool = False) -> str:
+    """The single recompute statement, for queued or all profiles."""
+    return f"""
+        WITH
+        {_ALL_TARGETS if full else _QUEUED_TARGETS}
+        targets AS (
+            SELECT cp.id, cp.competitor_id, cp.platform,
+                   COALESCE(cp.followers, 0) AS followers
+            FROM competitor_profiles cp
+            JOIN dirty d ON d.profile_id = cp.id
+        ),
+        ranked AS (
+            SELECT p.profile_id, p.posted_at,
+                   COALESCE((p.engagement->>'total_engagement')::numeric, 0) AS interactions,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY p.profile_id ORDER BY p.posted_at DESC NULLS LAST
+                   ) AS recency
+            FROM competitor_posts p
+            JOIN targets t ON t.id = p.profile_id
+        ),
+        post_stats AS (
+            SELECT profile_id,
+                   COUNT(*) AS posts,
+                   AVG(interactions) AS avg_interactions,
+                   EXTRACT(DAY FROM MAX(posted_at) - MIN(posted_at)) AS span_days
+            FROM ranked
+            WHERE recency <= %(post_window)s
+            GROUP BY profile_id
+        ),
+        previous AS (
+            SELECT DISTINCT ON (s.competitor_id) s.competitor_id, s.followers
+            FROM competitor_snapshots s
+            JOIN targets t ON t.competitor_id = s.competitor_id
+            WHERE s.snapshot_date < CURRENT_DATE
+            ORDER BY s.competitor_id, s.snapshot_date DESC
+        ),
+        computed AS (
+            SELECT
+                t.id,
+                t.competitor_id,
+                CASE
+                    WHEN ps.posts IS NULL THEN 0
+                    WHEN t.followers > 0 THEN ps.avg_interactions / t.followers * 100
+                    WHEN t.platform = 'tiktok' THEN ps.avg_interactions / 100
+                    ELSE 0
+                END AS engagement_rate,
+                CASE
+                    WHEN ps.posts IS NULL THEN 0
+                    WHEN ps.posts = 1 THEN 1
+                    WHEN ps.span_days IS NULL THEN 0
+                    WHEN ps.span_days = 0 THEN ps.posts
+                    ELSE ps.posts / (ps.span_days / 7.0)
+                END AS posting_frequency,
+                CASE
+                    WHEN t.followers > 0 AND pv.followers > 0
+                    THEN (t.followers - pv.followers)::numeric / pv.followers * 100
+                    ELSE 0
+                END AS growth_rate
+            FROM targets t
+            LEFT JOIN post_stats ps ON ps.profile_id = t.id
+            LEFT JOIN previous pv ON pv.competitor_id = t.competitor_id
+        ),
+        updated AS (
+            UPDATE competitor_profiles cp
+            SET engagement_rate = LEAST(GREATEST(c.engagement_rate, -%(limit)s), %(limit)s),
+                posting_frequency = LEAST(GREATEST(c.posting_frequency, 0), %(limit)s),
+                growth_rate = LEAST(GREATEST(c.growth_rate, -%(limit)s), %(limit)s)
+            FROM computed c
+            WHERE cp.id = c.id
+            RETURNING cp.id, cp.competitor_id, cp.engagement_rate
+        ),
+        snapshots AS (
+            UPDATE competitor_snapshots s
+            SET engagement_rate = u.engagement_rate
+            FROM updated u
+            WHERE s.competitor_id = u.competitor_id
+              AND s.snapshot_date = CURRENT_DATE
+            RETURNING s.competitor_id
+        )
+        SELECT (SELECT COUNT(*) FROM updated), (SELECT COUNT(*) FROM snapshots)
+    """
+
+
+def recompute_competitor_analytics(
+    conn,
+    full: bool = False,
+    post_window: int = COMPETITOR_ANALYTICS_POST_WINDOW,
+) -> Dict[str, Any]:
+    """
+    Recompute analytics for queued (or all) competitor profiles.
+
+    Args:
+        conn: psycopg connection (committed here)
+        full: Recompute every profile instead of only queued ones
+        post_window: Latest posts per profile the rates are based on
+
+    Returns:
+        dict: profiles_updated, snapshots_updated, mode
+    """
+    with conn.cursor() as cur:
+        cur.execute(recompute_sql(full), {"post_window": post_window, "limit": RATE_LIMIT})
+        profiles_updated, snapshots_updated = cur.fetchone()
+    conn.commit()
+
+    return {
+        "mode": "full" if full else "queued",
+        "profiles_updated": profiles_updated,
+        "snapshots_updated": snapshots_updated,
+    }
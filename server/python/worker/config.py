@@ -27,6 +27,31 @@ Environment Variables:
         UPLOADS_DIR: Directory for uploaded files
         DOCS_DIR: Directory for documents
 
+    Data Retention:
+        POST_RETENTION_MONTHS: Months of posts kept in the database (default: 0 = keep all)
+        POST_PARTITION_MONTHS_AHEAD: Monthly partitions created in advance (default: 3)
+        POST_ARCHIVE_DIR: Existing directory on persistent storage for archived post
+            partitions; required for POST_RETENTION_MONTHS > 0 (default: unset)
+
+    Competitor Analytics:
+        COMPETITOR_ANALYTICS_POST_WINDOW: Latest posts per profile used for rates (default: 30)
+        COMPETITOR_ANALYTICS_INTERVAL: Minutes between queued recomputations (default: 15)
+
+    Hashtag Discovery:
+        HASHTAG_DISCOVERY_INTERVAL: Hours between recursive discovery runs (default: 5)
+        HASHTAG_FRONTIER_WORKERS: Parallel frontier scrape chains per platform (default: 2)
+        HASHTAG_FRONTIER_FANOUT: Hashtags enqueued per scraped hashtag (default: 10)
+        HASHTAG_FRONTIER_MAX_ATTEMPTS: Scrape attempts per hashtag (default: 3)
+        HASHTAG_FRONTIER_CLAIM_TIMEOUT: Seconds before a claim counts as lost (default: 2 x TASK_TIMEOUT)
+        HASHTAG_FRONTIER_RESUME_INTERVAL: Minutes between frontier resume checks (default: 15)
+        HASHTAG_RANKING: Discovery order, relevance or frequency (default: relevance;
+            read by socialmedia/hashtag/hashtag_relevance.py)
+
+    Hashtag Trends (read by trends/hashtag_trends.py):
+        HASHTAG_TRENDS_REGION: Creative Center country code (default: the page's)
+        HASHTAG_TRENDS_PERIOD: Trend period in days, 7, 30 or 120 (default: 7)
+        HASHTAG_TRENDS_PAGES: "View More" presses per scrape (default: 5)
+
 Author: ProjectMonopoly Team
 Last Updated: 2025-12-27
 """
@@ -132,6 +157,33 @@ DOCS_DIR = os.getenv('DOCS_DIR', os.path.join(BASE_DIR, "uploads", "docs"))
 COOKIES_DIR = os.getenv('COOKIES_DIR', os.path.join(os.path.dirname(__file__), "..", "cookies"))
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Data Retention Configuration
+# ─────────────────────────────────────────────────────────────────────────────
+# competitor_posts / hashtag_posts are partitioned by posted_at month;
+# partitions older than this are detached and archived (0 = keep all)
+POST_RETENTION_MONTHS = int(os.getenv('POST_RETENTION_MONTHS', '0'))
+
+# Monthly partitions created ahead of time so inserts never hit the default partition
+POST_PARTITION_MONTHS_AHEAD = int(os.getenv('POST_PARTITION_MONTHS_AHEAD', '3'))
+
+# Archived partitions are written here as gzip-compressed CSV. Must be an
+# existing directory on persistent storage (a mounted volume, not the
+# container filesystem); partitions are never dropped while it is unset
+POST_ARCHIVE_DIR = os.getenv('POST_ARCHIVE_DIR', '')
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Competitor Analytics Configuration
+# ─────────────────────────────────────────────────────────────────────────────
+# Engagement rate and posting frequency use each profile's latest N posts
+# (the size of a typical profile scrape)
+COMPETITOR_ANALYTICS_POST_WINDOW = int(os.getenv('COMPETITOR_ANALYTICS_POST_WINDOW', '30'))
+
+# Profiles queued by the uploaders are recomputed this often (minutes)
+COMPETITOR_ANALYTICS_INTERVAL = float(os.getenv('COMPETITOR_ANALYTICS_INTERVAL', '15'))
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Scraper Configuration
 # ─────────────────────────────────────────────────────────────────────────────
@@ -147,6 +199,22 @@ PROXY_URL = os.getenv('PROXY_URL', '')
 # Hashtag Discovery
 HASHTAG_DISCOVERY_INTERVAL = float(os.getenv('HASHTAG_DISCOVERY_INTERVAL', '5.0'))  # Hours
 
+# Recursive discovery scrapes one hashtag_frontier row per task; this many
+# task chains drain a platform's frontier in parallel
+HASHTAG_FRONTIER_WORKERS = int(os.getenv('HASHTAG_FRONTIER_WORKERS', '2'))
+
+# Hashtags enqueued per scraped hashtag (its posts' most frequent ones)
+HASHTAG_FRONTIER_FANOUT = int(os.getenv('HASHTAG_FRONTIER_FANOUT', '10'))
+
+# Failed or lost scrapes of a hashtag before it is given up
+HASHTAG_FRONTIER_MAX_ATTEMPTS = int(os.getenv('HASHTAG_FRONTIER_MAX_ATTEMPTS', '3'))
+
+# Claims older than this (seconds) belong to a crashed worker and are released
+HASHTAG_FRONTIER_CLAIM_TIMEOUT = int(os.getenv('HASHTAG_FRONTIER_CLAIM_TIMEOUT', str(2 * TASK_TIMEOUT)))
+
+# Expired claims are released and idle frontiers restarted this often (minutes)
+HASHTAG_FRONTIER_RESUME_INTERVAL = float(os.getenv('HASHTAG_FRONTIER_RESUME_INTERVAL', '15'))
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Logging Configuration
@@ -236,6 +304,11 @@ __all__ = [
     'UPLOADS_DIR',
     'DOCS_DIR',
     'COOKIES_DIR',
+    'POST_RETENTION_MONTHS',
+    'POST_PARTITION_MONTHS_AHEAD',
+    'POST_ARCHIVE_DIR',
+    'COMPETITOR_ANALYTICS_POST_WINDOW',
+    'COMPETITOR_ANALYTICS_INTERVAL',
     'INSTAGRAM_USERNAME',
     'INSTAGRAM_PASSWORD',
     'SELENIUM_HEADLESS',
@@ -0,0 +1,413 @@
+"""
+Hashtag Frontier
+================
+
+Persistent work list of recursive hashtag discovery (table
+hashtag_frontier, migration 000007_hashtag_frontier).
+
+HashtagDiscovery.discover_and_scrape_recursive used to run every round
+inside one Celery task with one browser; a timeout or crash lost the
+round and nothing could run in parallel. Discovery now goes through the
+frontier instead:
+
+    - seed_frontier(): a discovery run enqueues the unscraped hashtags of
+      competitor posts at depth 0 under a new run_id
+    - claim_hashtag(): a worker takes the highest priority pending
+      hashtag of the tenant served least recently (so one tenant's run
+      can't starve the others) with FOR UPDATE SKIP LOCKED, so
+      concurrent workers never get the same row
+    - complete_hashtag(): marks it done and, below the run's max_depth,
+      enqueues the hashtags most associated with it in its posts at
+      depth + 1 (co-occurrences over sqrt of overall frequency, so
+      generic tags do not fill the slots), prioritized below their
+      parent on the same scale - at most fanout per hashtag
+      and depth_budget per depth of the run, and only ones never scraped
+      (hashtag_stats.last_scraped_at)
+    - pending_children() / set_priorities(): the caller rescores
+      enqueued hashtags by relevance to the run's tenant
+      (socialmedia/hashtag/hashtag_relevance.py)
+    - fail_hashtag() / release_stale_claims(): failed or lost scrapes go
+      back to pending until max_attempts, then stay failed
+
+Rows are unique per (run, platform, hashtag) (migration
+000012_hashtag_frontier_per_run): a finished hashtag can be enqueued by a
+later run, and each run keeps its own depth, budgets and tenant. A hashtag
+the same tenant already has pending or claimed is not enqueued twice.
+Every step is one statement, so a repeated or redelivered task does no
+harm. Budgets are checked without locking;
+two hashtags of the same depth finishing at the same moment can overshoot
+depth_budget by one fanout.
+
+Usage:
+    from worker.hashtag_frontier import claim_hashtag, complete_hashtag
+    with psycopg.connect(DATABASE_URL) as conn:
+        entry = claim_hashtag(conn, "tiktok")
+        ...
+        complete_hashtag(conn, entry.id, posts_scraped=42)
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .config import (
+    HASHTAG_FRONTIER_CLAIM_TIMEOUT,
+    HASHTAG_FRONTIER_FANOUT,
+    HASHTAG_FRONTIER_MAX_ATTEMPTS,
+)
+
+log = logging.getLogger(__name__)
+
+STATUSES = ("pending", "claimed", "done", "failed")
+
+# Shorter tags are noise (same cut-off as HashtagDiscovery)
+MIN_HASHTAG_LENGTH = 3
+
+# last_error is for humans; keep tracebacks from bloating the table
+MAX_ERROR_CHARS = 500
+
+
+@dataclass
+class FrontierEntry:
+    """One claimed hashtag_frontier row."""
+    id: int
+    platform: str
+    hashtag: str
+    depth: int
+    max_depth: int
+    max_posts: int
+    attempts: int
+
+
+def normalize_hashtag(tag: str) -> str:
+    """Frontier key of a hashtag: lower case, without '#' or spaces."""
+    return (tag or "").strip().lstrip("#").strip().lower()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SQL
+# ─────────────────────────────────────────────────────────────────────────────
+SEED_SQL = """
+    INSERT INTO hashtag_frontier
+        (platform, hashtag, depth, priority, run_id, max_depth, depth_budget, max_posts,
+         user_id, group_id)
+    SELECT %(platform)s::text, s.hashtag, 0, s.priority, %(run_id)s::uuid,
+           %(max_depth)s, %(depth_budget)s, %(max_posts)s, %(user_id)s, %(group_id)s
+    FROM UNNEST(%(hashtags)s::text[], %(priorities)s::bigint[]) AS s(hashtag, priority)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM hashtag_frontier hf
+        WHERE hf.platform = %(platform)s AND hf.hashtag = s.hashtag
+          AND hf.status IN ('pending', 'claimed')
+          AND hf.user_id IS NOT DISTINCT FROM %(user_id)s::int
+          AND hf.group_id IS NOT DISTINCT FROM %(group_id)s::int
+    )
+    ON CONFLICT (run_id, platform, hashtag) DO NOTHING
+"""
+
+# Round-robin over tenants: the tenant whose last claim is oldest (or who
+# has none yet) goes next, then its highest priority hashtag
+CLAIM_SQL = """
+    UPDATE hashtag_frontier f
+    SET status = 'claimed', claimed_at = NOW(), attempts = f.attempts + 1
+    WHERE f.id = (
+        SELECT hf.id FROM hashtag_frontier hf
+        JOIN (
+            SELECT user_id, group_id, MAX(claimed_at) AS served
+            FROM hashtag_frontier
+            WHERE platform = %(platform)s
+              AND run_id IN (SELECT run_id FROM hashtag_frontier
+                             WHERE platform = %(platform)s AND status = 'pending')
+            GROUP BY user_id, group_id
+        ) t ON t.user_id IS NOT DISTINCT FROM hf.user_id
+           AND t.group_id IS NOT DISTINCT FROM hf.group_id
+        WHERE hf.platform = %(platform)s AND hf.status = 'pending'
+        ORDER BY t.served NULLS FIRST, hf.priority DESC, hf.depth, hf.id
+        LIMIT 1
+        FOR UPDATE OF hf SKIP LOCKED
+    )
+    RETURNING f.id, f.platform, f.hashtag, f.depth, f.max_depth, f.max_posts, f.attempts
+"""
+
+# Done, plus the children of the scraped hashtag in the same statement.
+# hashtag_posts keeps the tags as scraped ('#Tag' on TikTok), hence the
+# normalization on read. A child's priority is its parent's scaled by the
+# share of the parent's posts carrying it, so it is on the seeds' scale
+# (candidate_priority) until relevance scoring replaces it.
+COMPLETE_SQL = """
+    WITH finished AS (
+        UPDATE hashtag_frontier
+        SET status = 'done', finished_at = NOW(), posts_scraped = %(posts_scraped)s,
+            last_error = NULL
+        WHERE id = %(id)s AND status = 'claimed'
+        RETURNING platform, hashtag, depth, priority, run_id, max_depth, depth_budget,
+                  max_posts, user_id, group_id
+    ),
+    room AS (
+        SELECT f.*,
+               LEAST(%(fanout)s, f.depth_budget - (
+                   SELECT COUNT(*) FROM hashtag_frontier hf
+                   WHERE hf.run_id = f.run_id AND hf.depth = f.depth + 1
+               )) AS slots
+        FROM finished f
+        WHERE f.depth < f.max_depth
+    ),
+    tags AS (
+        SELECT hp.id AS post, LOWER(LTRIM(TRIM(tag), '#')) AS hashtag
+        FROM room r
+        JOIN hashtag_posts hp ON hp.platform = r.platform AND hp.hashtag = r.hashtag
+        CROSS JOIN LATERAL UNNEST(hp.hashtags) AS tag
+    ),
+    parent_posts AS (
+        SELECT GREATEST(COUNT(DISTINCT post), 1) AS posts FROM tags
+    ),
+    children AS (
+        SELECT t.hashtag, COUNT(*) AS frequency
+        FROM tags t
+        CROSS JOIN room r
+        LEFT JOIN hashtag_stats hs ON hs.platform = r.platform AND hs.hashtag = t.hashtag
+        WHERE LENGTH(t.hashtag) >= %(min_length)s
+          AND t.hashtag <> r.hashtag
+          AND hs.last_scraped_at IS NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM hashtag_frontier hf
+              WHERE hf.platform = r.platform AND hf.hashtag = t.hashtag
+                AND hf.status IN ('pending', 'claimed')
+                AND hf.user_id IS NOT DISTINCT FROM r.user_id
+                AND hf.group_id IS NOT DISTINCT FROM r.group_id
+          )
+        GROUP BY t.hashtag, hs.competitor_frequency, hs.hashtag_post_frequency
+        ORDER BY COUNT(*) / SQRT(GREATEST(
+                     COALESCE(hs.competitor_frequency + hs.hashtag_post_frequency, 0), COUNT(*)
+                 )) DESC,
+                 frequency DESC, t.hashtag
+        LIMIT (SELECT GREATEST(slots, 0) FROM room)
+    ),
+    enqueued AS (
+        INSERT INTO hashtag_frontier
+            (platform, hashtag, depth, priority, run_id, max_depth, depth_budget,
+             max_posts, parent_hashtag, user_id, group_id)
+        SELECT r.platform, c.hashtag, r.depth + 1,
+               LEAST(r.priority * c.frequency / p.posts, r.priority), r.run_id, r.max_depth,
+               r.depth_budget, r.max_posts, r.hashtag, r.user_id, r.group_id
+        FROM children c, room r, parent_posts p
+        ON CONFLICT (run_id, platform, hashtag) DO NOTHING
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM finished), (SELECT COUNT(*) FROM enqueued)
+"""
+
+FAIL_SQL = """
+    UPDATE hashtag_frontier
+    SET status = CASE WHEN attempts >= %(max_attempts)s THEN 'failed' ELSE 'pending' END,
+        finished_at = CASE WHEN attempts >= %(max_attempts)s THEN NOW() END,
+        claimed_at = NULL,
+        last_error = %(error)s
+    WHERE id = %(id)s AND status = 'claimed'
+    RETURNING status
+"""
+
+RELEASE_SQL = """
+    UPDATE hashtag_frontier
+    SET status = CASE WHEN attempts >= %(max_attempts)s THEN 'failed' ELSE 'pending' END,
+        finished_at = CASE WHEN attempts >= %(max_attempts)s THEN NOW() END,
+        claimed_at = NULL,
+        last_error = 'claim expired'
+    WHERE status = 'claimed'
+      AND claimed_at < NOW() - make_interval(secs => %(timeout)s)
+"""
+
+# Enqueued hashtags awaiting their relevance score (seeds are scored at seeding)
+PENDING_CHILDREN_SQL = """
+    SELECT id, hashtag, user_id, group_id FROM hashtag_frontier
+    WHERE platform = %(platform)s AND status = 'pending' AND depth > 0
+    ORDER BY id DESC
+    LIMIT %(limit)s
+"""
+
+SET_PRIORITIES_SQL = """
+    UPDATE hashtag_frontier f
+    SET priority = p.priority
+    FROM UNNEST(%(ids)s::bigint[], %(priorities)s::bigint[]) AS p(id, priority)
+    WHERE f.id = p.id AND f.status = 'pending'
+"""
+
+COUNTS_SQL = """
+    SELECT status, COUNT(*) FROM hashtag_frontier
+    WHERE platform = %(platform)s
+    GROUP BY status
+"""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Database operations
+# ─────────────────────────────────────────────────────────────────────────────
+def seed_frontier(
+    conn,
+    platform: str,
+    hashtags: Iterable[Dict[str, Any]],
+    max_depth: int,
+    depth_budget: int,
+    max_posts: int,
+    user_id: Optional[int] = None,
+    group_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Start a discovery run with depth-0 hashtags.
+
+    Args:
+        conn: psycopg connection (committed here)
+        platform: 'instagram' or 'tiktok'
+        hashtags: Candidates as {'hashtag', 'frequency'} dicts
+            (HashtagDiscovery.get_unscraped_hashtags), with an optional
+            'priority' that replaces the frequency
+        max_depth: Deepest level the run expands to (rounds - 1)
+        depth_budget: Most hashtags the run enqueues per depth
+        max_posts: Posts scraped per hashtag
+        user_id, group_id: Tenant the run discovers for (relevance scoring)
+
+    Returns:
+        dict: run_id, seeded (hashtags the tenant didn't already have in
+        flight)
+    """
+    priorities: Dict[str, int] = {}
+    for candidate in hashtags:
+        tag = normalize_hashtag(candidate.get("hashtag", ""))
+        if len(tag) >= MIN_HASHTAG_LENGTH:
+            value = candidate.get("priority", candidate.get("frequency"))
+            priorities[tag] = priorities.get(tag, 0) + int(value or 0)
+
+    run_id = str(uuid.uuid4())
+    with conn.cursor() as cur:
+        cur.execute(SEED_SQL, {
+            "platform": platform,
+            "run_id": run_id,
+            "max_depth": max_depth,
+            "depth_budget": depth_budget,
+            "max_posts": max_posts,
+            "user_id": user_id,
+            "group_id": group_id,
+            "hashtags": list(priorities),
+            "priorities": list(priorities.values()),
+        })
+        seeded = cur.rowcount
+    conn.commit()
+
+    return {"run_id": run_id, "seeded": seeded}
+
+
+def claim_hashtag(conn, platform: str) -> Optional[FrontierEntry]:
+    """Claim the next pending hashtag of a platform, or None when there is none."""
+    with conn.cursor() as cur:
+        cur.execute(CLAIM_SQL, {"platform": platform})
+        row = cur.fetchone()
+    conn.commit()
+    return FrontierEntry(*row) if row else None
+
+
+def complete_hashtag(
+    conn,
+    entry_id: int,
+    posts_scraped: int,
+    fanout: int = HASHTAG_FRONTIER_FANOUT,
+) -> int:
+    """
+    Mark a claimed hashtag done and enqueue its children.
+
+    Returns:
+        int: Hashtags added to the frontier
+    """
+    with conn.cursor() as cur:
+        cur.execute(COMPLETE_SQL, {
+            "id": entry_id,
+            "posts_scraped": posts_scraped,
+            "fanout": fanout,
+            "min_length": MIN_HASHTAG_LENGTH,
+        })
+        finished, enqueued = cur.fetchone()
+    conn.commit()
+
+    if not finished:
+        log.warning("Frontier entry %s was no longer claimed; result dropped", entry_id)
+    return enqueued
+
+
+def fail_hashtag(
+    conn,
+    entry_id: int,
+    error: str,
+    max_attempts: int = HASHTAG_FRONTIER_MAX_ATTEMPTS,
+) -> Optional[str]:
+    """
+    Return a claimed hashtag to pending, or to failed once its attempts
+    are used up.
+
+    Returns:
+        str: The new status, None when the entry was no longer claimed
+    """
+    with conn.cursor() as cur:
+        cur.execute(FAIL_SQL, {
+            "id": entry_id,
+            "error": (error or "")[:MAX_ERROR_CHARS],
+            "max_attempts": max_attempts,
+        })
+        row = cur.fetchone()
+    conn.commit()
+    return row[0] if row else None
+
+
+def release_stale_claims(
+    conn,
+    timeout: int = HASHTAG_FRONTIER_CLAIM_TIMEOUT,
+    max_attempts: int = HASHTAG_FRONTIER_MAX_ATTEMPTS,
+) -> int:
+    """Release claims older than timeout seconds (their worker is gone)."""
+    with conn.cursor() as cur:
+        cur.execute(RELEASE_SQL, {"timeout": timeout, "max_attempts": max_attempts})
+        released = cur.rowcount
+    conn.commit()
+    return released
+
+
+def pending_children(conn, platform: str, limit: int = 500) -> List[Tuple[int, str, Optional[int], Optional[int]]]:
+    """Pending hashtags below depth 0 as (id, hashtag, user_id, group_id), newest first."""
+    with conn.cursor() as cur:
+        cur.execute(PENDING_CHILDREN_SQL, {"platform": platform, "limit": limit})
+        return cur.fetchall()
+
+
+def set_priorities(conn, priorities: Dict[int, int]) -> int:
+    """Set the priority of pending entries by id; returns the rows updated."""
+    if not priorities:
+        return 0
+    with conn.cursor() as cur:
+        cur.execute(SET_PRIORITIES_SQL, {
+            "ids": list(priorities),
+            "priorities": list(priorities.values()),
+        })
+        updated = cur.rowcount
+    conn.commit()
+    return updated
+
+
+def frontier_counts(conn, platform: str) -> Dict[str, int]:
+    """Rows of a platform's frontier per status."""
+    with conn.cursor() as cur:
+        cur.execute(COUNTS_SQL, {"platform": platform})
+        counts = dict(cur.fetchall())
+    return {status: counts.get(status, 0) for status in STATUSES}
+
+
+def idle_platforms(conn) -> List[str]:
+    """Platforms with pending hashtags and no claim in progress."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT platform FROM hashtag_frontier
+            GROUP BY platform
+            HAVING COUNT(*) FILTER (WHERE status = 'pending') > 0
+               AND COUNT(*) FILTER (WHERE status = 'claimed') = 0
+        """)
+        return [row[0] for row in cur.fetchall()]
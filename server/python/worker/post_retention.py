@@ -0,0 +1,265 @@
+"""
+Post Partition Retention
+========================
+
+Maintenance for the monthly partitions of competitor_posts and
+hashtag_posts (migration 000003_partition_post_tables):
+
+    1. Create upcoming monthly partitions so new posts never land in
+       the default partition.
+    2. Archive partitions that ended before the retention cutoff:
+       COPY the partition to a gzip-compressed CSV file, then detach
+       and drop it in one short transaction.
+
+Nothing is archived or dropped unless archive_dir names an existing
+directory, which must be on persistent storage (a mounted volume): an
+archive written into the container filesystem is lost with the
+container. The archive file is written (and renamed into place) before
+anything is removed from the database, and the partition is only dropped when
+its row count still matches what was archived, so a crash at any
+point leaves either the partition or a complete archive (or both).
+
+Usage:
+    from worker.post_retention import maintain_post_partitions
+    with psycopg.connect(DATABASE_URL) as conn:
+        result = maintain_post_partitions(conn)
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import gzip
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from psycopg import sql
+
+from .config import POST_ARCHIVE_DIR, POST_PARTITION_MONTHS_AHEAD, POST_RETENTION_MONTHS
+
+log = logging.getLogger(__name__)
+
+# Partitioned post tables managed by this module
+POST_TABLES = ("competitor_posts", "hashtag_posts")
+
+# Upper bound of a range partition as rendered by pg_get_expr(relpartbound)
+_UPPER_BOUND_RE = re.compile(r"TO \('([^']+)'\)")
+
+
+@dataclass
+class PostPartition:
+    """One attached partition of a post table."""
+    parent: str
+    name: str
+    upper_bound: Optional[date]  # exclusive; None for the DEFAULT partition
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pure helpers
+# ─────────────────────────────────────────────────────────────────────────────
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` away from `day`'s month."""
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def retention_cutoff(today: date, retention_months: int) -> date:
+    """
+    Oldest month kept in the database.
+
+    Partitions whose upper bound is on or before this date only contain
+    posts older than the retention window.
+    """
+    return add_months(today, -retention_months)
+
+
+def parse_upper_bound(bound_expr: str) -> Optional[date]:
+    """
+    Extract the exclusive upper bound of a range partition.
+
+    Args:
+        bound_expr: pg_get_expr(relpartbound) output, e.g.
+            "FOR VALUES FROM ('2026-01-01 00:00:00') TO ('2026-02-01 00:00:00')"
+
+    Returns:
+        date, or None for the DEFAULT partition.
+    """
+    match = _UPPER_BOUND_RE.search(bound_expr or "")
+    if not match:
+        return None
+    return datetime.fromisoformat(match.group(1)).date()
+
+
+def expired_partitions(partitions: Iterable[PostPartition], cutoff: date) -> List[PostPartition]:
+    """Partitions that end on or before the cutoff, oldest first."""
+    expired = [p for p in partitions if p.upper_bound is not None and p.upper_bound <= cutoff]
+    return sorted(expired, key=lambda p: p.upper_bound)
+
+
+def archive_path(archive_dir: str, partition: PostPartition) -> str:
+    """Archive file for a partition: <archive_dir>/<parent>/<partition>.csv.gz"""
+    return os.path.join(archive_dir, partition.parent, f"{partition.name}.csv.gz")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Database operations
+# ─────────────────────────────────────────────────────────────────────────────
+def list_partitions(conn, parent: str) -> List[PostPartition]:
+    """List the attached partitions of a post table."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = %s
+        """, (parent,))
+        rows = cur.fetchall()
+    return [PostPartition(parent, name, parse_upper_bound(expr)) for name, expr in rows]
+
+
+def ensure_partitions(conn, parent: str, today: date, months_ahead: int) -> int:
+    """Create missing monthly partitions from this month to months_ahead."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT ensure_monthly_partitions(%s, %s, %s)",
+            (parent, add_months(today, 0), add_months(today, months_ahead)),
+        )
+        created = cur.fetchone()[0]
+    conn.commit()
+    return created
+
+
+def archive_partition(conn, partition: PostPartition, archive_dir: str) -> int:
+    """
+    Archive one partition to disk, then detach and drop it.
+
+    Returns:
+        int: Number of rows archived.
+
+    Raises:
+        RuntimeError: If rows changed between the copy and the detach
+            (the partition is kept and retried on the next run).
+    """
+    path = archive_path(archive_dir, partition)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".part"
+
+    table = sql.Identifier(partition.name)
+    copy_query = sql.SQL("COPY {} TO STDOUT (FORMAT csv, HEADER)").format(table)
+
+    # 1. Stream the partition to a compressed file
+    with conn.cursor() as cur:
+        cur.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(table))
+        archived_rows = cur.fetchone()[0]
+        with open(tmp_path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as out:
+            with cur.copy(copy_query) as copy:
+                for chunk in copy:
+                    out.write(chunk)
+            out.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+    conn.commit()
+    os.replace(tmp_path, path)
+
+    # 2. Detach + drop, only if nothing changed since the copy
+    with conn.cursor() as cur:
+        cur.execute(sql.SQL("ALTER TABLE {} DETACH PARTITION {}").format(
+            sql.Identifier(partition.parent), table,
+        ))
+        cur.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(table))
+        current_rows = cur.fetchone()[0]
+        if current_rows != archived_rows:
+            conn.rollback()
+            raise RuntimeError(
+                f"{partition.name} changed during archiving "
+                f"({archived_rows} archived, {current_rows} now)"
+            )
+        cur.execute(sql.SQL("DROP TABLE {}").format(table))
+    conn.commit()
+
+    log.info("📦 Archived %s (%d rows) to %s", partition.name, archived_rows, path)
+    return archived_rows
+
+
+def maintain_post_partitions(
+    conn,
+    retention_months: int = POST_RETENTION_MONTHS,
+    months_ahead: int = POST_PARTITION_MONTHS_AHEAD,
+    archive_dir: str = POST_ARCHIVE_DIR,
+    today: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    Create upcoming partitions and archive expired ones for every post table.
+
+    Failures are isolated per partition so one bad month doesn't block
+    the rest. With retention on but no existing archive_dir, partitions
+    are still created but none are archived, and the run reports an error.
+
+    Args:
+        conn: psycopg connection (not autocommit).
+        retention_months: Months kept in the database (0 = keep all).
+        months_ahead: Monthly partitions to create in advance.
+        archive_dir: Existing root directory for archive files.
+        today: Reference date (defaults to today, UTC).
+
+    Returns:
+        dict: status, partitions_created, partitions_archived,
+              rows_archived, errors.
+    """
+    today = today or datetime.utcnow().date()
+    result = {
+        "partitions_created": 0,
+        "partitions_archived": [],
+        "rows_archived": 0,
+        "errors": [],
+    }
+
+    archiving = retention_months > 0
+    if archiving and not (archive_dir and os.path.isdir(archive_dir)):
+        archiving = False
+        log.error("Post retention is %d months but POST_ARCHIVE_DIR %r is not an existing "
+                  "directory; no partitions archived", retention_months, archive_dir)
+        result["errors"].append(f"archive directory not configured: {archive_dir!r}")
+
+    for parent in POST_TABLES:
+        try:
+            result["partitions_created"] += ensure_partitions(conn, parent, today, months_ahead)
+        except Exception as e:
+            conn.rollback()
+            log.error("Failed to create partitions for %s: %s", parent, e)
+            result["errors"].append(f"{parent}: {e}")
+
+        if not archiving:
+            continue
+
+        cutoff = retention_cutoff(today, retention_months)
+        for partition in expired_partitions(list_partitions(conn, parent), cutoff):
+            try:
+                result["rows_archived"] += archive_partition(conn, partition, archive_dir)
+                result["partitions_archived"].append(partition.name)
+            except Exception as e:
+                conn.rollback()
+                log.error("Failed to archive %s: %s", partition.name, e)
+                result["errors"].append(f"{partition.name}: {e}")
+
+    result["status"] = "partial" if result["errors"] else "success"
+    return result
+
+
+__all__ = [
+    "POST_TABLES",
+    "PostPartition",
+    "add_months",
+    "retention_cutoff",
+    "parse_upper_bound",
+    "expired_partitions",
+    "archive_path",
+    "list_partitions",
+    "ensure_partitions",
+    "archive_partition",
+    "maintain_post_partitions",
+]
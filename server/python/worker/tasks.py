@@ -10,6 +10,7 @@ Task Categories:
     2. Document Tasks: PDF ingestion for RAG system
     3. Scraping Tasks: Competitor and follower data collection
     4. Cookie Tasks: Session cookie extraction and management
+    5. Maintenance Tasks: Post partition creation and archiving
 
 Task Design Principles:
     - Idempotent: Safe to retry without side effects
@@ -127,6 +128,19 @@ def _split_text(txt: str, size: int = 3000, overlap: int = 500) -> List[str]:
     return out
 
 
+def _queue_unified_posts_refresh() -> None:
+    """
+    Queue a refresh of the materialized unified_posts after an ingest batch.
+    
+    Dispatched by name so the worker doesn't import the viral package;
+    failures are logged and ignored (the viral scan refreshes stale data).
+    """
+    try:
+        app.send_task("viral.tasks.refresh_unified_posts")
+    except Exception as e:
+        log.warning("Failed to queue unified_posts refresh: %s", e)
+
+
 def _validate_media_paths(paths: List[str]) -> List[str]:
     """
     Validate and resolve media file paths.
@@ -547,6 +561,7 @@ def weekly_instagram_scrape(self) -> Dict[str, Any]:
         result = scraper.run_weekly_scrape()
         
         log.info("✅ Weekly Instagram scraping completed successfully")
+        _queue_unified_posts_refresh()
         
         return {
             "status": "success",
@@ -616,6 +631,7 @@ def weekly_tiktok_scrape(self) -> Dict[str, Any]:
         result = scraper.run_weekly_scrape()
         
         log.info("✅ Weekly TikTok scraping completed successfully")
+        _queue_unified_posts_refresh()
         
         return {
             "status": "success",
@@ -786,15 +802,21 @@ def ai_web_scrape(self) -> Dict[str, Any]:
     default_retry_delay=180,
     acks_late=True,
 )
-def scrape_hashtag_trends(self) -> Dict[str, Any]:
+def scrape_hashtag_trends(self, region: Optional[str] = None, period: Optional[int] = None) -> Dict[str, Any]:
     """
-    Scrape trending hashtags from TikTok Creative Center.
+    Scrape trending hashtags from TikTok Creative Center and store them as
+    today's snapshot in hashtag_trends (a second run the same day updates
+    it). Read the trends with get_hashtag_trends.
+    
+    Args:
+        region: Country code (default: HASHTAG_TRENDS_REGION)
+        period: Period in days, 7, 30 or 120 (default: HASHTAG_TRENDS_PERIOD)
     
     Returns:
         dict: Result containing:
             - status: 'success', 'skipped', or 'failed'
-            - trends: List of trending hashtags
             - count: Number of trends found
+            - stored: Snapshot rows inserted or updated
             - error: Error message (if failed)
     """
     log.info("#️⃣ Starting hashtag trends scraping task")
@@ -805,18 +827,20 @@ def scrape_hashtag_trends(self) -> Dict[str, Any]:
         if parent_dir not in sys.path:
             sys.path.insert(0, parent_dir)
         
-        # Note: Original file has typo 'hastag.py' instead of 'hashtag.py'
-        from trends.hastag import scrape_hashtags
+        from trends.hashtag_trends import TRENDS_PERIOD, TRENDS_REGION, scrape_trending_hashtags, store_snapshot
         
-        trends = scrape_hashtags()
-        count = len(trends) if trends else 0
+        region = TRENDS_REGION if region is None else region
+        period = period or TRENDS_PERIOD
+        trends = scrape_trending_hashtags(region=region, period=period)
+        with psycopg.connect(DATABASE_URL) as conn:
+            stored = store_snapshot(conn, trends, region=region, period=period)
         
-        log.info("✅ Hashtag trends scraping completed: %d trends found", count)
+        log.info("✅ Hashtag trends scraping completed: %d trends found, %d stored", len(trends), stored)
         
         return {
             "status": "success",
-            "trends": trends,
-            "count": count
+            "count": len(trends),
+            "stored": stored,
         }
         
     except ImportError as e:
@@ -831,6 +855,136 @@ def scrape_hashtag_trends(self) -> Dict[str, Any]:
         return {"status": "failed", "error": str(e)}
 
 
+@app.task(
+    name="worker.tasks.get_hashtag_trends",
+    queue="celery",
+)
+def get_hashtag_trends(region: Optional[str] = None, period: Optional[int] = None,
+                       limit: int = 50, hashtag: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Trending hashtags from the stored snapshots; never starts a browser.
+    
+    Args:
+        region: Country code (default: HASHTAG_TRENDS_REGION)
+        period: Period in days (default: HASHTAG_TRENDS_PERIOD)
+        limit: Most hashtags returned
+        hashtag: Return this hashtag's daily history instead of the ranking
+    
+    Returns:
+        dict: status, snapshot_date (None when nothing is stored) and
+            trends (latest snapshot with rank_change / posts_change) or
+            history
+    """
+    parent_dir = os.path.join(os.path.dirname(__file__), '..')
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    
+    from trends.hashtag_trends import TRENDS_PERIOD, TRENDS_REGION, hashtag_history, latest_snapshot
+    
+    region = TRENDS_REGION if region is None else region
+    period = period or TRENDS_PERIOD
+    try:
+        with psycopg.connect(DATABASE_URL) as conn:
+            if hashtag:
+                history = hashtag_history(conn, hashtag, region=region, period=period)
+                return {
+                    "status": "success",
+                    "snapshot_date": history[-1]["snapshot_date"] if history else None,
+                    "history": history,
+                }
+            trends = latest_snapshot(conn, region=region, period=period, limit=limit)
+    except Exception as e:
+        log.exception("Reading hashtag trends failed")
+        return {"status": "failed", "error": str(e)}
+    
+    return {
+        "status": "success",
+        "snapshot_date": trends[0]["snapshot_date"] if trends else None,
+        "trends": trends,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Post Partition Retention Task
+# ─────────────────────────────────────────────────────────────────────────────
+@app.task(
+    name="worker.tasks.maintain_post_partitions",
+    queue="celery",
+    bind=True,
+    max_retries=1,
+    acks_late=True,
+)
+def maintain_post_partitions(self) -> Dict[str, Any]:
+    """
+    Create upcoming monthly partitions of competitor_posts/hashtag_posts
+    and archive partitions older than POST_RETENTION_MONTHS.
+
+    Returns:
+        dict: Result from worker.post_retention.maintain_post_partitions
+    """
+    log.info("🗄️ Starting post partition maintenance")
+
+    try:
+        from .post_retention import maintain_post_partitions as run_maintenance
+
+        with psycopg.connect(DATABASE_URL) as conn:
+            result = run_maintenance(conn)
+
+        log.info(
+            "✅ Post partitions: %d created, %d archived (%d rows), %d errors",
+            result["partitions_created"],
+            len(result["partitions_archived"]),
+            result["rows_archived"],
+            len(result["errors"]),
+        )
+        return result
+
+    except Exception as e:
+        log.exception("Post partition maintenance failed")
+        return {"status": "failed", "error": str(e)}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Competitor Analytics Task
+# ─────────────────────────────────────────────────────────────────────────────
+@app.task(
+    name="worker.tasks.recompute_competitor_analytics",
+    queue="celery",
+    bind=True,
+    max_retries=1,
+    acks_late=True,
+)
+def recompute_competitor_analytics(self, full: bool = False) -> Dict[str, Any]:
+    """
+    Recompute engagement rate, posting frequency and growth rate for the
+    competitor profiles queued by the uploaders (or all profiles).
+
+    Args:
+        full: Recompute every profile, not only queued ones
+
+    Returns:
+        dict: Result from worker.competitor_analytics.recompute_competitor_analytics
+    """
+    try:
+        from .competitor_analytics import recompute_competitor_analytics as run_recompute
+
+        with psycopg.connect(DATABASE_URL) as conn:
+            result = run_recompute(conn, full=full)
+
+        if result["profiles_updated"]:
+            log.info(
+                "📊 Competitor analytics (%s): %d profiles, %d snapshots updated",
+                result["mode"],
+                result["profiles_updated"],
+                result["snapshots_updated"],
+            )
+        return result
+
+    except Exception as e:
+        log.exception("Competitor analytics recomputation failed")
+        return {"status": "failed", "error": str(e)}
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # State Management for Scheduling
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1013,19 +1167,21 @@ def scrape_instagram_hashtag(hashtag, max_posts=50):
         password = os.getenv("INSTAGRAM_PASSWORD")
         
         scraper = InstagramScraper(username, password)
-        
-        # Attempt to login (which will handle guest mode if no creds)
-        if not scraper.login():
-            log.error("Failed to login to Instagram (even guest mode failed)")
+        try:
+            # Attempt to login (which will handle guest mode if no creds)
+            if not scraper.login():
+                log.error("Failed to login to Instagram (even guest mode failed)")
+                return {"status": "failed", "error": "Failed to login to Instagram"}
+            
+            # Scrape the hashtag
+            posts_data = scraper.scrape_hashtag(hashtag, max_posts=max_posts)
+        finally:
+            # Returns the browser to the worker's pool, also on errors
             scraper.close()
-            return {"status": "failed", "error": "Failed to login to Instagram"}
-        
-        # Scrape the hashtag
-        posts_data = scraper.scrape_hashtag(hashtag, max_posts=max_posts)
-        
-        scraper.close()
         
         log.info(f"Instagram hashtag scraping completed: {len(posts_data)} posts scraped for #{hashtag}")
+        if posts_data:
+            _queue_unified_posts_refresh()
         return {
             "status": "success",
             "hashtag": hashtag,
@@ -1046,6 +1202,10 @@ def discover_and_scrape_hashtags(user_id=None, group_id=None, max_hashtags=10, m
     """
     Task to discover and scrape hashtags from competitor posts.
     
+    A recursive run only seeds the hashtag frontier (worker/hashtag_frontier.py)
+    and starts scrape_frontier_hashtag chains; each round of the old loop is
+    one depth of the frontier, at most max_hashtags hashtags deep.
+    
     Note:
         max_iterations is capped at 10 to prevent infinite scraping loops.
     """
@@ -1074,16 +1234,37 @@ def discover_and_scrape_hashtags(user_id=None, group_id=None, max_hashtags=10, m
         )
         
         if recursive:
-            log.info(f"Running recursive discovery (max_iterations={max_iterations}, hard_limit={MAX_ITERATIONS_LIMIT})")
-            results = discovery.discover_and_scrape_recursive(
-                max_iterations=max_iterations,
-                max_hashtags_per_iteration=max_hashtags
-            )
-            log.info(f"Recursive discovery completed: {results['total_hashtags_scraped']} hashtags scraped across {results['iterations']} iterations, {results['total_posts_scraped']} total posts")
+            from socialmedia.hashtag.hashtag_relevance import candidate_priority
+            from .hashtag_frontier import frontier_counts, seed_frontier
+            
+            log.info(f"Seeding hashtag frontier (max_iterations={max_iterations}, hard_limit={MAX_ITERATIONS_LIMIT})")
+            candidates = [
+                dict(c, priority=candidate_priority(c))
+                for c in discovery.get_unscraped_hashtags(limit=max_hashtags)
+            ]
+            with psycopg.connect(DATABASE_URL) as conn:
+                seed = seed_frontier(
+                    conn,
+                    platform,
+                    candidates,
+                    max_depth=max(max_iterations, 1) - 1,
+                    depth_budget=max_hashtags,
+                    max_posts=max_posts_per_hashtag,
+                    user_id=user_id,
+                    group_id=group_id,
+                )
+                counts = frontier_counts(conn, platform)
+            
+            chains = _start_frontier_chains(platform, counts)
+            log.info(f"Hashtag frontier seeded: {seed['seeded']} new hashtags, {counts['pending']} pending, {chains} scrape chains started")
+            return {"status": "queued", "platform": platform, **seed, "frontier": counts, "chains_started": chains}
         else:
             results = discovery.scrape_new_hashtags(max_hashtags=max_hashtags)
             log.info(f"Hashtag discovery completed: {results['hashtags_scraped']} hashtags scraped, {results['total_posts_scraped']} total posts")
         
+        if results.get('total_posts_scraped'):
+            _queue_unified_posts_refresh()
+        
         return results
         
     except Exception as e:
@@ -1091,6 +1272,125 @@ def discover_and_scrape_hashtags(user_id=None, group_id=None, max_hashtags=10, m
         return {"status": "failed", "error": str(e)}
 
 
+def _start_frontier_chains(platform: str, counts: Dict[str, int]) -> int:
+    """Start scrape chains for pending frontier hashtags, up to HASHTAG_FRONTIER_WORKERS in flight."""
+    from .config import HASHTAG_FRONTIER_WORKERS
+    
+    chains = min(counts["pending"], max(HASHTAG_FRONTIER_WORKERS - counts["claimed"], 0))
+    for _ in range(chains):
+        scrape_frontier_hashtag.delay(platform)
+    return chains
+
+
+def _prioritize_frontier(conn, platform: str) -> int:
+    """Rescore enqueued frontier hashtags by relevance to their run's tenant."""
+    from socialmedia.hashtag.hashtag_relevance import HASHTAG_RANKING, relevance_priority, score_candidates
+    from .hashtag_frontier import pending_children, set_priorities
+    
+    if HASHTAG_RANKING != 'relevance':
+        return 0
+    try:
+        by_tenant = {}
+        for entry_id, hashtag, user_id, group_id in pending_children(conn, platform):
+            by_tenant.setdefault((user_id, group_id), []).append((entry_id, hashtag))
+        
+        priorities = {}
+        for (user_id, group_id), entries in by_tenant.items():
+            scores = score_candidates(conn, platform, [hashtag for _, hashtag in entries], user_id, group_id)
+            priorities.update({entry_id: relevance_priority(scores.get(hashtag, 0.0)) for entry_id, hashtag in entries})
+        return set_priorities(conn, priorities)
+    
+    except Exception as e:
+        # The parent-scaled priorities of the new entries stand
+        log.warning(f"Frontier relevance scoring failed: {e}")
+        conn.rollback()
+        return 0
+
+
+@app.task(
+    name="worker.tasks.scrape_frontier_hashtag",
+    queue="celery",
+    acks_late=True,
+    soft_time_limit=600,
+)
+def scrape_frontier_hashtag(platform='instagram'):
+    """
+    Claim one hashtag from the frontier, scrape it and enqueue its children.
+    
+    The task re-queues itself while the platform has pending hashtags, so
+    each chain scrapes one hashtag at a time with its own browser. A
+    redelivered or duplicate task only claims the next pending hashtag.
+    """
+    from .hashtag_frontier import claim_hashtag, complete_hashtag, fail_hashtag, frontier_counts
+    
+    with psycopg.connect(DATABASE_URL) as conn:
+        entry = claim_hashtag(conn, platform)
+    if entry is None:
+        return {"status": "idle", "platform": platform}
+    
+    log.info(f"Frontier: scraping #{entry.hashtag} (platform={platform}, depth={entry.depth}/{entry.max_depth}, attempt {entry.attempts})")
+    try:
+        sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+        
+        from socialmedia.hashtag.hashtag_discovery import HashtagDiscovery
+        from .config import PROXY_URL
+        
+        discovery = HashtagDiscovery(
+            max_posts_per_hashtag=entry.max_posts,
+            platform=platform,
+            proxy=PROXY_URL if PROXY_URL else None
+        )
+        results = discovery.scrape_new_hashtags(hashtags=[entry.hashtag])
+        detail = (results.get("details") or [{}])[0]
+        error = None if results.get("hashtags_scraped") else (
+            detail.get("error") or detail.get("status") or results.get("error") or "not scraped"
+        )
+    except Exception as e:
+        log.exception(f"Frontier scrape of #{entry.hashtag} failed")
+        results, error = {}, str(e)
+    
+    with psycopg.connect(DATABASE_URL) as conn:
+        if error is None:
+            enqueued = complete_hashtag(conn, entry.id, results.get("total_posts_scraped", 0))
+            if enqueued:
+                _prioritize_frontier(conn, platform)
+            result = {"status": "success", "hashtag": entry.hashtag, "posts_scraped": results.get("total_posts_scraped", 0), "enqueued": enqueued}
+        else:
+            status = fail_hashtag(conn, entry.id, error)
+            result = {"status": "failed", "hashtag": entry.hashtag, "error": error, "frontier_status": status}
+        pending = frontier_counts(conn, platform)["pending"]
+    
+    if result.get("posts_scraped"):
+        _queue_unified_posts_refresh()
+    if pending:
+        scrape_frontier_hashtag.delay(platform)
+    log.info(f"Frontier: #{entry.hashtag} {result['status']}, {pending} hashtags pending")
+    return result
+
+
+@app.task(name="worker.tasks.resume_hashtag_frontier", queue="celery")
+def resume_hashtag_frontier():
+    """
+    Release frontier claims of crashed or timed out workers and restart
+    scrape chains for platforms with pending hashtags but none in flight.
+    """
+    from .hashtag_frontier import frontier_counts, idle_platforms, release_stale_claims
+    
+    try:
+        with psycopg.connect(DATABASE_URL) as conn:
+            released = release_stale_claims(conn)
+            idle = {platform: frontier_counts(conn, platform) for platform in idle_platforms(conn)}
+        
+        chains = {platform: _start_frontier_chains(platform, counts) for platform, counts in idle.items()}
+        if released or chains:
+            log.info(f"Hashtag frontier resumed: {released} stale claims released, chains started {chains}")
+        return {"status": "success", "released": released, "chains_started": chains}
+    
+    except Exception as e:
+        log.exception("Hashtag frontier resume failed")
+        return {"status": "failed", "error": str(e)}
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Export
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1102,7 +1402,12 @@ __all__ = [
     'scrape_followers',
     'ai_web_scrape',
     'scrape_hashtag_trends',
+    'get_hashtag_trends',
     'scrape_instagram_hashtag',
     'discover_and_scrape_hashtags',
+    'scrape_frontier_hashtag',
+    'resume_hashtag_frontier',
     'refresh_proxies_and_scheduled_scrape',
+    'maintain_post_partitions',
+    'recompute_competitor_analytics',
 ]
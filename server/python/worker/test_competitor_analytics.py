@@ -0,0 +1,159 @@
+"""
+Competitor Analytics Tests
+==========================
+
+Tests for the batch recomputation in worker/competitor_analytics.py and
+the queue flag the uploaders set. The statement itself runs against
+PostgreSQL (TEST_DATABASE_URL, see conftest.py) and is skipped without it.
+
+Run with:
+    python -m pytest worker/test_competitor_analytics.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from worker.competitor_analytics import RATE_LIMIT, recompute_competitor_analytics
+
+
+def competitor(conn, followers, platform="instagram", queued=True):
+    """A competitor profile (optionally queued for recompute); returns (competitor_id, profile_id)."""
+    competitor_id = conn.execute("INSERT INTO competitors DEFAULT VALUES RETURNING id").fetchone()[0]
+    profile_id = conn.execute(
+        "INSERT INTO competitor_profiles (competitor_id, platform, handle, followers) "
+        "VALUES (%s, %s, 'brand', %s) RETURNING id",
+        (competitor_id, platform, followers),
+    ).fetchone()[0]
+    if queued:
+        conn.execute("INSERT INTO competitor_analytics_queue (profile_id) VALUES (%s)", (profile_id,))
+    conn.commit()
+    return competitor_id, profile_id
+
+
+def posts(conn, competitor_id, profile_id, engagements, days_apart=7):
+    """One post per total engagement, newest first, days_apart days apart."""
+    for n, total in enumerate(engagements):
+        conn.execute(
+            "INSERT INTO competitor_posts (competitor_id, profile_id, platform, post_id, posted_at, engagement) "
+            "VALUES (%s, %s, 'instagram', %s, NOW() - make_interval(days => %s), %s::jsonb)",
+            (competitor_id, profile_id, f"{profile_id}-{n}", n * days_apart,
+             json.dumps({"total_engagement": total})),
+        )
+    conn.commit()
+
+
+def snapshot(conn, competitor_id, followers, days_ago):
+    conn.execute(
+        "INSERT INTO competitor_snapshots (competitor_id, followers, snapshot_date) "
+        "VALUES (%s, %s, CURRENT_DATE - %s)",
+        (competitor_id, followers, days_ago),
+    )
+    conn.commit()
+
+
+def rates(conn, profile_id):
+    return conn.execute(
+        "SELECT engagement_rate, posting_frequency, growth_rate FROM competitor_profiles WHERE id = %s",
+        (profile_id,),
+    ).fetchone()
+
+
+def queued(conn):
+    return conn.execute("SELECT COUNT(*) FROM competitor_analytics_queue").fetchone()[0]
+
+
+class TestRecomputeOnPostgres:
+    def test_rates_of_the_latest_posts(self, pg_conn):
+        competitor_id, profile_id = competitor(pg_conn, followers=1000)
+        # The oldest post falls outside a window of three
+        posts(pg_conn, competitor_id, profile_id, [10, 20, 30, 5000])
+        snapshot(pg_conn, competitor_id, 800, days_ago=3)
+        snapshot(pg_conn, competitor_id, 500, days_ago=9)
+        snapshot(pg_conn, competitor_id, 1000, days_ago=0)
+
+        result = recompute_competitor_analytics(pg_conn, post_window=3)
+
+        assert result == {"mode": "queued", "profiles_updated": 1, "snapshots_updated": 1}
+        # 20 interactions / 1000 followers; 3 posts in 2 weeks; 1000 vs the latest earlier 800
+        assert rates(pg_conn, profile_id) == (Decimal("2.00"), Decimal("1.50"), Decimal("25.00"))
+        today = pg_conn.execute("SELECT engagement_rate FROM competitor_snapshots "
+                                "WHERE competitor_id = %s AND snapshot_date = CURRENT_DATE",
+                                (competitor_id,)).fetchone()[0]
+        assert today == Decimal("2.00")
+        assert queued(pg_conn) == 0
+
+    def test_queued_mode_leaves_other_profiles(self, pg_conn):
+        competitor_id, profile_id = competitor(pg_conn, followers=1000)
+        other_id, other_profile = competitor(pg_conn, followers=1000, queued=False)
+        posts(pg_conn, competitor_id, profile_id, [10])
+        posts(pg_conn, other_id, other_profile, [10])
+
+        assert recompute_competitor_analytics(pg_conn)["profiles_updated"] == 1
+        assert rates(pg_conn, other_profile) == (Decimal("0.00"), Decimal("0.00"), Decimal("0.00"))
+        # Nothing left in the queue
+        assert recompute_competitor_analytics(pg_conn)["profiles_updated"] == 0
+
+    def test_full_mode_updates_every_profile_and_clears_the_queue(self, pg_conn):
+        competitor(pg_conn, followers=1000)
+        competitor_id, profile_id = competitor(pg_conn, followers=1000, queued=False)
+        posts(pg_conn, competitor_id, profile_id, [50])
+
+        result = recompute_competitor_analytics(pg_conn, full=True)
+
+        assert (result["mode"], result["profiles_updated"]) == ("full", 2)
+        assert rates(pg_conn, profile_id)[:2] == (Decimal("5.00"), Decimal("1.00"))
+        assert queued(pg_conn) == 0
+
+    def test_outliers_are_clamped_instead_of_overflowing(self, pg_conn):
+        competitor_id, profile_id = competitor(pg_conn, followers=1)
+        posts(pg_conn, competitor_id, profile_id, [10 ** 6])
+        snapshot(pg_conn, competitor_id, 1, days_ago=1)
+        pg_conn.execute("UPDATE competitor_profiles SET followers = 1000000 WHERE id = %s", (profile_id,))
+        pg_conn.commit()
+
+        recompute_competitor_analytics(pg_conn)
+
+        assert rates(pg_conn, profile_id) == (Decimal("100.00"), Decimal("1.00"), Decimal("999.99"))
+
+    def test_tiktok_without_followers_keeps_the_raw_score(self, pg_conn):
+        competitor_id, profile_id = competitor(pg_conn, followers=0, platform="tiktok")
+        posts(pg_conn, competitor_id, profile_id, [4200])
+
+        recompute_competitor_analytics(pg_conn)
+
+        assert rates(pg_conn, profile_id)[0] == Decimal("42.00")
+
+
+class TestRecompute:
+    def test_runs_one_statement_and_commits(self, fake_conn):
+        conn, cur = fake_conn(row=(3, 2))
+
+        result = recompute_competitor_analytics(conn, post_window=10)
+
+        assert result == {"mode": "queued", "profiles_updated": 3, "snapshots_updated": 2}
+        cur.execute.assert_called_once()
+        assert cur.execute.call_args.args[1] == {"post_window": 10, "limit": RATE_LIMIT}
+        conn.commit.assert_called_once()
+
+
+def test_uploads_only_enqueue_the_profile(fake_conn):
+    from socialmedia.shared.upload_to_db import enqueue_competitor_analytics
+
+    conn, cur = fake_conn()
+    enqueue_competitor_analytics(conn, "profile-1")
+
+    statement, params = cur.execute.call_args.args
+    assert "INSERT INTO competitor_analytics_queue" in statement
+    assert "ON CONFLICT (profile_id)" in statement
+    assert params == ("profile-1",)
+    # Committed together with the posts by the caller
+    conn.commit.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
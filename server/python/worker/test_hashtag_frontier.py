@@ -0,0 +1,269 @@
+"""
+Hashtag Frontier Tests
+======================
+
+Tests for the recursive discovery work list in worker/hashtag_frontier.py.
+The statements themselves run against PostgreSQL (TEST_DATABASE_URL, see
+conftest.py) and are skipped without it.
+
+Run with:
+    python -m pytest worker/test_hashtag_frontier.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import pytest
+
+from worker.hashtag_frontier import (
+    CLAIM_SQL,
+    MAX_ERROR_CHARS,
+    FrontierEntry,
+    claim_hashtag,
+    complete_hashtag,
+    fail_hashtag,
+    frontier_counts,
+    normalize_hashtag,
+    pending_children,
+    release_stale_claims,
+    seed_frontier,
+    set_priorities,
+)
+
+
+def seed(conn, priorities, user_id=None, max_depth=1, depth_budget=10):
+    """Seed a run of hashtag -> priority for a tenant; returns the run_id."""
+    return seed_frontier(
+        conn, "tiktok", [{"hashtag": tag, "priority": p} for tag, p in priorities.items()],
+        max_depth=max_depth, depth_budget=depth_budget, max_posts=25, user_id=user_id,
+    )["run_id"]
+
+
+def scraped_posts(conn, hashtag, tag_lists):
+    """Store one hashtag_posts row per list of tags, as the scrape of hashtag."""
+    with conn.cursor() as cur:
+        for n, tags in enumerate(tag_lists):
+            cur.execute(
+                "INSERT INTO hashtag_posts (hashtag, platform, post_id, hashtags, posted_at) "
+                "VALUES (%s, 'tiktok', %s, %s, NOW())",
+                (hashtag, f"{hashtag}-{n}", tags),
+            )
+    conn.commit()
+
+
+def frontier(conn, *columns):
+    """hashtag -> (columns...) of every frontier row."""
+    rows = conn.execute(f"SELECT hashtag, {', '.join(columns)} FROM hashtag_frontier").fetchall()
+    return {row[0]: row[1:] for row in rows}
+
+
+class TestClaim:
+    def test_highest_priority_first_then_none(self, pg_conn):
+        seed(pg_conn, {"gym": 5, "fitness": 90})
+
+        first = claim_hashtag(pg_conn, "tiktok")
+        assert (first.hashtag, first.depth, first.max_depth, first.max_posts, first.attempts) == ("fitness", 0, 1, 25, 1)
+        assert claim_hashtag(pg_conn, "tiktok").hashtag == "gym"
+        assert claim_hashtag(pg_conn, "tiktok") is None
+        assert claim_hashtag(pg_conn, "instagram") is None
+
+    def test_concurrent_workers_skip_each_others_rows(self, pg_conn, pg_connect):
+        seed(pg_conn, {"gym": 5, "fitness": 90})
+
+        with pg_connect() as other:
+            # The other worker's claim is still uncommitted (row locked)
+            held = other.execute(CLAIM_SQL, {"platform": "tiktok"}).fetchone()
+            mine = claim_hashtag(pg_conn, "tiktok")
+            other.commit()
+
+        assert held[2] == "fitness"
+        assert mine.hashtag == "gym"
+
+    def test_tenants_take_turns(self, pg_conn):
+        seed(pg_conn, {"coffee": 100, "latte": 90}, user_id=1)
+        seed(pg_conn, {"gym": 1}, user_id=2)
+
+        claimed = [claim_hashtag(pg_conn, "tiktok").hashtag for _ in range(3)]
+
+        # Tenant 2's low priority hashtag goes before tenant 1's second one
+        assert claimed == ["coffee", "gym", "latte"]
+
+    def test_failed_claims_retry_until_max_attempts(self, pg_conn):
+        seed(pg_conn, {"fitness": 1})
+
+        entry = claim_hashtag(pg_conn, "tiktok")
+        assert fail_hashtag(pg_conn, entry.id, "timeout", max_attempts=2) == "pending"
+        entry = claim_hashtag(pg_conn, "tiktok")
+        assert entry.attempts == 2
+        assert fail_hashtag(pg_conn, entry.id, "timeout", max_attempts=2) == "failed"
+        assert fail_hashtag(pg_conn, entry.id, "timeout") is None
+        assert claim_hashtag(pg_conn, "tiktok") is None
+
+    def test_stale_claims_are_released(self, pg_conn):
+        seed(pg_conn, {"fitness": 1, "gym": 1})
+        stale = claim_hashtag(pg_conn, "tiktok")
+        claim_hashtag(pg_conn, "tiktok")
+        pg_conn.execute("UPDATE hashtag_frontier SET claimed_at = NOW() - INTERVAL '1 hour' WHERE id = %s",
+                        (stale.id,))
+
+        assert release_stale_claims(pg_conn, timeout=60) == 1
+        assert frontier(pg_conn, "status", "last_error")[stale.hashtag] == ("pending", "claim expired")
+
+
+class TestSeed:
+    def test_only_hashtags_the_tenant_has_in_flight_are_skipped(self, pg_conn):
+        seed(pg_conn, {"coffee": 1}, user_id=1)
+
+        # In flight for tenant 1; other tenants and new hashtags are enqueued
+        assert seed_frontier(pg_conn, "tiktok", [{"hashtag": "coffee"}, {"hashtag": "tea"}],
+                             max_depth=0, depth_budget=10, max_posts=25, user_id=1)["seeded"] == 1
+        assert seed_frontier(pg_conn, "tiktok", [{"hashtag": "coffee"}],
+                             max_depth=0, depth_budget=10, max_posts=25, user_id=2)["seeded"] == 1
+
+        # A finished hashtag can be enqueued by a later run
+        pg_conn.execute("UPDATE hashtag_frontier SET status = 'done'")
+        pg_conn.commit()
+        assert seed_frontier(pg_conn, "tiktok", [{"hashtag": "coffee"}],
+                             max_depth=0, depth_budget=10, max_posts=25, user_id=1)["seeded"] == 1
+
+
+class TestComplete:
+    def test_children_are_prioritized_by_their_share_of_the_parents_posts(self, pg_conn):
+        seed(pg_conn, {"coffee": 1000}, user_id=7)
+        scraped_posts(pg_conn, "coffee", [
+            ["#coffee", "#LatteArt", "#espresso"],
+            ["#latteart", "#ab"],
+            ["#latteart"],
+            ["#morning"],
+        ])
+        entry = claim_hashtag(pg_conn, "tiktok")
+
+        assert complete_hashtag(pg_conn, entry.id, posts_scraped=4, fanout=5) == 3
+
+        rows = frontier(pg_conn, "status", "depth", "priority", "parent_hashtag", "user_id")
+        assert rows.pop("coffee")[0] == "done"
+        assert rows == {
+            "latteart": ("pending", 1, 750, "coffee", 7),
+            "espresso": ("pending", 1, 250, "coffee", 7),
+            "morning": ("pending", 1, 250, "coffee", 7),
+        }
+
+    def test_scraped_and_in_flight_hashtags_are_not_enqueued(self, pg_conn):
+        seed(pg_conn, {"coffee": 1000, "espresso": 1})
+        pg_conn.execute("INSERT INTO hashtag_stats (platform, hashtag, last_scraped_at) "
+                        "VALUES ('tiktok', 'latteart', NOW())")
+        scraped_posts(pg_conn, "coffee", [["#latteart", "#espresso", "#barista"]])
+        entry = claim_hashtag(pg_conn, "tiktok")
+
+        assert complete_hashtag(pg_conn, entry.id, posts_scraped=1) == 1
+        assert frontier(pg_conn, "depth")["barista"] == (1,)
+
+    def test_run_budgets_bound_the_expansion(self, pg_conn):
+        seed(pg_conn, {"coffee": 1000}, max_depth=1, depth_budget=2)
+        scraped_posts(pg_conn, "coffee", [["#latteart", "#espresso", "#barista", "#morning"]])
+        entry = claim_hashtag(pg_conn, "tiktok")
+
+        # depth_budget caps the run's depth 1 below the fanout
+        assert complete_hashtag(pg_conn, entry.id, posts_scraped=1, fanout=5) == 2
+
+        # max_depth: a depth 1 hashtag is scraped but not expanded
+        child = claim_hashtag(pg_conn, "tiktok")
+        scraped_posts(pg_conn, child.hashtag, [["#deeper"]])
+        assert complete_hashtag(pg_conn, child.id, posts_scraped=1) == 0
+        assert "deeper" not in frontier(pg_conn, "depth")
+
+    def test_a_result_for_a_released_claim_is_dropped(self, pg_conn):
+        seed(pg_conn, {"coffee": 1000})
+        entry = claim_hashtag(pg_conn, "tiktok")
+        fail_hashtag(pg_conn, entry.id, "timeout")
+
+        assert complete_hashtag(pg_conn, entry.id, posts_scraped=3) == 0
+        assert frontier(pg_conn, "status")["coffee"] == ("pending",)
+
+
+class TestOperations:
+    @pytest.mark.parametrize("raw,expected", [
+        ("#Fitness", "fitness"),
+        ("  gym ", "gym"),
+        ("# Travel", "travel"),
+        (None, ""),
+    ])
+    def test_normalize_hashtag(self, raw, expected):
+        assert normalize_hashtag(raw) == expected
+
+    def test_seed_merges_and_filters_candidates(self, fake_conn):
+        conn, cur = fake_conn(rowcount=2)
+        result = seed_frontier(
+            conn, "tiktok",
+            [{"hashtag": "#Fitness", "frequency": 5}, {"hashtag": "fitness", "frequency": 999},
+             {"hashtag": "gym", "frequency": 3}, {"hashtag": "ab", "frequency": 40}],
+            max_depth=2, depth_budget=10, max_posts=25,
+        )
+
+        params = cur.execute.call_args[0][1]
+        assert params["hashtags"] == ["fitness", "gym"]
+        assert params["priorities"] == [1004, 3]
+        assert (params["max_depth"], params["depth_budget"], params["max_posts"]) == (2, 10, 25)
+        assert result["seeded"] == 2 and result["run_id"] == params["run_id"]
+        assert (params["user_id"], params["group_id"]) == (None, None)
+        conn.commit.assert_called_once()
+
+    def test_seed_prefers_candidate_priority(self, fake_conn):
+        conn, cur = fake_conn(rowcount=2)
+        seed_frontier(
+            conn, "tiktok",
+            [{"hashtag": "gym", "frequency": 50, "priority": 7}, {"hashtag": "yoga", "frequency": 3}],
+            max_depth=1, depth_budget=10, max_posts=25, user_id=4, group_id=2,
+        )
+
+        params = cur.execute.call_args[0][1]
+        assert dict(zip(params["hashtags"], params["priorities"])) == {"gym": 7, "yoga": 3}
+        assert (params["user_id"], params["group_id"]) == (4, 2)
+
+    def test_claim_returns_entry_or_none(self, fake_conn):
+        conn, _ = fake_conn(row=(7, "tiktok", "fitness", 1, 2, 25, 1))
+        assert claim_hashtag(conn, "tiktok") == FrontierEntry(7, "tiktok", "fitness", 1, 2, 25, 1)
+
+        conn, _ = fake_conn(row=None)
+        assert claim_hashtag(conn, "tiktok") is None
+
+    def test_complete_returns_enqueued_children(self, fake_conn):
+        conn, cur = fake_conn(row=(1, 4))
+        assert complete_hashtag(conn, 7, posts_scraped=30, fanout=5) == 4
+        params = cur.execute.call_args[0][1]
+        assert params["fanout"] == 5 and params["posts_scraped"] == 30
+
+    def test_fail_truncates_error_and_reports_status(self, fake_conn):
+        conn, cur = fake_conn(row=("failed",))
+        assert fail_hashtag(conn, 7, "x" * 2000, max_attempts=3) == "failed"
+        assert len(cur.execute.call_args[0][1]["error"]) == MAX_ERROR_CHARS
+
+        conn, _ = fake_conn(row=None)
+        assert fail_hashtag(conn, 7, "timeout") is None
+
+    def test_release_stale_claims(self, fake_conn):
+        conn, cur = fake_conn(rowcount=3)
+        assert release_stale_claims(conn, timeout=60) == 3
+        assert cur.execute.call_args[0][1]["timeout"] == 60
+
+    def test_pending_children_and_priorities(self, fake_conn):
+        conn, cur = fake_conn(rows=[(8, "gym", 4, None)])
+        assert pending_children(conn, "tiktok", limit=10) == [(8, "gym", 4, None)]
+        assert cur.execute.call_args[0][1] == {"platform": "tiktok", "limit": 10}
+
+        conn, cur = fake_conn(rowcount=2)
+        assert set_priorities(conn, {8: 500, 9: 20}) == 2
+        assert cur.execute.call_args[0][1] == {"ids": [8, 9], "priorities": [500, 20]}
+        conn.commit.assert_called_once()
+
+        conn, cur = fake_conn()
+        assert set_priorities(conn, {}) == 0
+        cur.execute.assert_not_called()
+
+    def test_counts_cover_every_status(self, fake_conn):
+        conn, _ = fake_conn(rows=[("pending", 4), ("done", 9)])
+        assert frontier_counts(conn, "tiktok") == {"pending": 4, "claimed": 0, "done": 9, "failed": 0}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,185 @@
+"""
+Post Retention Tests
+====================
+
+Tests for the partition retention helpers in worker/post_retention.py.
+
+Run with:
+    python -m pytest worker/test_post_retention.py -v
+
+Author: ProjectMonopoly Team
+Created: 2026-10-18
+"""
+
+import gzip
+import os
+from datetime import date
+
+import pytest
+
+from worker import post_retention
+from worker.post_retention import (
+    PostPartition,
+    add_months,
+    archive_partition,
+    archive_path,
+    expired_partitions,
+    maintain_post_partitions,
+    parse_upper_bound,
+    retention_cutoff,
+)
+
+
+class TestHelpers:
+    """Tests for date and bound helpers."""
+
+    @pytest.mark.parametrize("day,months,expected", [
+        (date(2026, 10, 18), 0, date(2026, 10, 1)),
+        (date(2026, 10, 18), 3, date(2027, 1, 1)),
+        (date(2026, 1, 31), -1, date(2025, 12, 1)),
+        (date(2026, 10, 18), -12, date(2025, 10, 1)),
+    ])
+    def test_add_months(self, day, months, expected):
+        assert add_months(day, months) == expected
+
+    def test_retention_cutoff(self):
+        assert retention_cutoff(date(2026, 10, 18), 12) == date(2025, 10, 1)
+
+    def test_parse_range_bound(self):
+        expr = "FOR VALUES FROM ('2026-01-01 00:00:00') TO ('2026-02-01 00:00:00')"
+        assert parse_upper_bound(expr) == date(2026, 2, 1)
+
+    def test_parse_history_bound(self):
+        expr = "FOR VALUES FROM (MINVALUE) TO ('2024-10-01 00:00:00')"
+        assert parse_upper_bound(expr) == date(2024, 10, 1)
+
+    def test_parse_default_bound(self):
+        assert parse_upper_bound("DEFAULT") is None
+
+    def test_expired_partitions(self):
+        partitions = [
+            PostPartition("competitor_posts", "competitor_posts_default", None),
+            PostPartition("competitor_posts", "competitor_posts_y2025m10", date(2025, 11, 1)),
+            PostPartition("competitor_posts", "competitor_posts_y2025m09", date(2025, 10, 1)),
+            PostPartition("competitor_posts", "competitor_posts_history", date(2024, 10, 1)),
+        ]
+
+        expired = expired_partitions(partitions, date(2025, 10, 1))
+
+        assert [p.name for p in expired] == ["competitor_posts_history", "competitor_posts_y2025m09"]
+
+
+class FakeCopy:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __enter__(self):
+        return iter(self.chunks)
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeCursor:
+    """Cursor returning scripted COUNT(*) results."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.statements.append(str(query))
+
+    def fetchone(self):
+        return (self.conn.counts.pop(0),)
+
+    def copy(self, query):
+        return FakeCopy([b"id,post_id\n", b"1,abc\n"])
+
+
+class FakeConnection:
+    def __init__(self, counts):
+        self.counts = list(counts)
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class TestArchivePartition:
+    """Tests for the copy → detach → drop sequence."""
+
+    partition = PostPartition("hashtag_posts", "hashtag_posts_y2025m01", date(2025, 2, 1))
+
+    def test_archives_then_drops(self, tmp_path):
+        conn = FakeConnection(counts=[1, 1])
+
+        rows = archive_partition(conn, self.partition, str(tmp_path))
+
+        path = archive_path(str(tmp_path), self.partition)
+        assert rows == 1
+        assert gzip.decompress(open(path, "rb").read()) == b"id,post_id\n1,abc\n"
+        assert not os.path.exists(path + ".part")
+        assert any("DROP TABLE" in s for s in conn.statements)
+
+    def test_keeps_partition_when_rows_changed(self, tmp_path):
+        conn = FakeConnection(counts=[1, 2])
+
+        with pytest.raises(RuntimeError):
+            archive_partition(conn, self.partition, str(tmp_path))
+
+        assert conn.rollbacks == 1
+        assert not any("DROP TABLE" in s for s in conn.statements)
+
+
+class TestMaintainPostPartitions:
+    """Tests for the archive directory guard."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(post_retention, "ensure_partitions", lambda conn, parent, today, ahead: 1)
+        monkeypatch.setattr(post_retention, "list_partitions", lambda conn, parent: [
+            PostPartition(parent, f"{parent}_y2024m01", date(2024, 2, 1))])
+        monkeypatch.setattr(post_retention, "archive_partition",
+                            lambda conn, partition, archive_dir: calls.append(partition.name) or 5)
+        return calls
+
+    @pytest.mark.parametrize("archive_dir", ["", "missing"])
+    def test_never_drops_without_an_archive_dir(self, calls, tmp_path, archive_dir):
+        archive_dir = archive_dir and str(tmp_path / archive_dir)
+        result = maintain_post_partitions(FakeConnection([]), retention_months=12,
+                                          archive_dir=archive_dir, today=date(2026, 10, 18))
+
+        assert calls == []
+        assert result["partitions_created"] == 2
+        assert result["status"] == "partial"
+        assert not os.path.exists(tmp_path / "missing")
+
+    def test_archives_into_existing_dir(self, calls, tmp_path):
+        result = maintain_post_partitions(FakeConnection([]), retention_months=12,
+                                          archive_dir=str(tmp_path), today=date(2026, 10, 18))
+
+        assert calls == ["competitor_posts_y2024m01", "hashtag_posts_y2024m01"]
+        assert result["rows_archived"] == 10 and result["status"] == "success"
+
+    def test_keeps_everything_by_default(self, calls):
+        result = maintain_post_partitions(FakeConnection([]), retention_months=0, archive_dir="")
+        assert calls == [] and result["status"] == "success"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])